@@ -0,0 +1,150 @@
+"""
+A2A Protocol Dialect - 에이전트별 JSON-RPC dialect 협상 결과 캐시
+
+Standard(PascalCase: SendMessage / StreamMessage)와 Legacy(message/send / message/stream)
+dialect를 에이전트 URL별로 기억해, 레거시 에이전트 호출마다 Standard 요청이 실패한 뒤
+Legacy로 재요청하는 이중 왕복을 없앱니다.
+
+- Agent Card의 protocolVersion으로 초기 dialect 추정 (hint)
+- 첫 성공 호출로 dialect 확정 (call)
+- 캐시된 dialect가 protocol error(-32601 등)를 받으면 무효화 후 재협상
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+
+class A2ADialect(str, Enum):
+    STANDARD = "standard"
+    LEGACY = "legacy"
+
+
+@dataclass(frozen=True)
+class DialectSpec:
+    """dialect별 JSON-RPC method 이름과 message part 형식"""
+    send_method: str
+    stream_method: str
+    typed_parts: bool  # Legacy: {"kind": "text", "text": ...}
+
+    def text_part(self, text: str) -> Dict[str, Any]:
+        return {"kind": "text", "text": text} if self.typed_parts else {"text": text}
+
+
+DIALECT_SPECS: Dict[A2ADialect, DialectSpec] = {
+    A2ADialect.STANDARD: DialectSpec("SendMessage", "StreamMessage", typed_parts=False),
+    A2ADialect.LEGACY: DialectSpec("message/send", "message/stream", typed_parts=True),
+}
+
+# 협상 순서 (캐시 없음)
+NEGOTIATION_ORDER: List[A2ADialect] = [A2ADialect.STANDARD, A2ADialect.LEGACY]
+
+# dialect 불일치로 판단하는 응답
+PROTOCOL_ERROR_HTTP_STATUSES = frozenset({400, 404, 405, 415, 422, 501})
+PROTOCOL_ERROR_RPC_CODES = frozenset({-32600, -32601, -32602})  # invalid request / method not found / invalid params
+
+
+def dialect_from_protocol_version(version: Optional[str]) -> Optional[A2ADialect]:
+    """
+    Agent Card protocolVersion으로 dialect 추정.
+    1.x 이상은 PascalCase method(Standard), 0.x는 slash method(Legacy).
+    """
+    if not version:
+        return None
+    try:
+        major = int(str(version).strip().lstrip("v").split(".")[0])
+    except ValueError:
+        return None
+    return A2ADialect.STANDARD if major >= 1 else A2ADialect.LEGACY
+
+
+def is_protocol_error(status_code: int, body: Optional[Dict[str, Any]] = None) -> bool:
+    if status_code in PROTOCOL_ERROR_HTTP_STATUSES:
+        return True
+    if status_code == 200 and isinstance(body, dict):
+        error = body.get("error")
+        return isinstance(error, dict) and error.get("code") in PROTOCOL_ERROR_RPC_CODES
+    return False
+
+
+@dataclass
+class _DialectEntry:
+    dialect: A2ADialect
+    source: str  # "card" (추정) / "call" (확정)
+    updated_at: datetime
+
+
+class ProtocolDialectCache:
+    """에이전트 URL -> 협상된 dialect, dialect별 호출/오류 카운터"""
+
+    def __init__(self):
+        self._entries: Dict[str, _DialectEntry] = {}
+        self._stats: Dict[str, Dict[str, int]] = {
+            d.value: {"calls": 0, "protocol_errors": 0} for d in A2ADialect
+        }
+        self._negotiations = 0
+        self._renegotiations = 0
+
+    @staticmethod
+    def _key(agent_url: str) -> str:
+        return agent_url.rstrip("/")
+
+    def get(self, agent_url: str) -> Optional[A2ADialect]:
+        entry = self._entries.get(self._key(agent_url))
+        return entry.dialect if entry else None
+
+    def remember(self, agent_url: str, dialect: A2ADialect, source: str = "call"):
+        key = self._key(agent_url)
+        entry = self._entries.get(key)
+        # 실제 호출로 확정된 dialect는 card 추정으로 덮어쓰지 않음
+        if entry and entry.source == "call" and source == "card":
+            return
+        self._entries[key] = _DialectEntry(dialect, source, datetime.utcnow())
+
+    def forget(self, agent_url: str):
+        self._entries.pop(self._key(agent_url), None)
+
+    def record_negotiation(self, renegotiation: bool = False):
+        if renegotiation:
+            self._renegotiations += 1
+        else:
+            self._negotiations += 1
+
+    def record_result(self, agent_url: str, dialect: A2ADialect, protocol_error: bool):
+        """
+        호출 결과 반영.
+        성공 -> dialect 확정, protocol error -> 해당 dialect가 캐시돼 있으면 무효화.
+        """
+        stats = self._stats[dialect.value]
+        stats["calls"] += 1
+        if protocol_error:
+            stats["protocol_errors"] += 1
+            if self.get(agent_url) == dialect:
+                self.forget(agent_url)
+        else:
+            self.remember(agent_url, dialect, source="call")
+
+    def export(self) -> Dict[str, Dict[str, str]]:
+        """snapshot 저장용 {url: {"dialect", "source"}}"""
+        return {url: {"dialect": e.dialect.value, "source": e.source} for url, e in self._entries.items()}
+
+    def restore(self, entries: Dict[str, Dict[str, str]]):
+        """snapshot에서 복원 (이미 있는 항목은 유지)"""
+        for url, entry in entries.items():
+            try:
+                dialect = A2ADialect(entry["dialect"])
+            except (KeyError, ValueError):
+                continue
+            if self._key(url) not in self._entries:
+                self._entries[self._key(url)] = _DialectEntry(dialect, entry.get("source", "card"), datetime.utcnow())
+
+    def get_stats(self) -> dict:
+        by_dialect: Dict[str, int] = {d.value: 0 for d in A2ADialect}
+        for entry in self._entries.values():
+            by_dialect[entry.dialect.value] += 1
+        return {
+            "dialects": {name: dict(stats) for name, stats in self._stats.items()},
+            "cached_agents": by_dialect,
+            "negotiations": self._negotiations,
+            "renegotiations": self._renegotiations,
+        }
@@ -0,0 +1,233 @@
+"""
+Agent Card Fetcher - Agent Card 조회 / conditional 재검증 / 주기적 갱신
+
+- 공유 커넥션 풀(GlobalHttpClient) 사용
+- 처음에는 A2A 표준/레거시 경로를 동시에 요청하고 가장 먼저 200을 준 경로를 기억
+- 이후에는 기억한 경로 1회 + If-None-Match / If-Modified-Since (304면 파싱/임베딩 생략)
+- validator를 주지 않는 에이전트는 card 본문 digest로 변경 여부 판단 (같으면 304와 동일하게 처리)
+- 주기적으로 온라인 에이전트의 card를 재검증해 skill 변경을 반영 (health check leader 워커만)
+"""
+import asyncio
+import hashlib
+import json
+import random
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from loguru import logger
+import httpx
+
+from .config import get_settings
+from .http_client import GlobalHttpClient
+
+if TYPE_CHECKING:
+    from .registry import AgentRegistry
+
+
+def card_digest(data: dict) -> str:
+    """card JSON의 정규화(키 정렬) 본문 해시"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AgentCardFetcher:
+    """
+    Agent Card fetch with path memory and HTTP validators.
+
+    fetch() 결과:
+        ("ok", card JSON) / ("not_modified", None) / ("failed", None)
+    """
+
+    # A2A Spec 경로 우선 (동시 요청 시 같은 시점에 200이면 먼저 도착한 쪽)
+    CARD_PATHS = [
+        "/.well-known/agent-card.json",  # A2A Spec standard
+        "/.well-known/agent.json",       # Legacy
+        "/agent-card",                   # Alternative
+    ]
+
+    def __init__(self, registry: "AgentRegistry"):
+        settings = get_settings()
+        self._registry = registry
+        self.timeout = settings.agent_card_fetch_timeout_seconds
+        self.refresh_interval = settings.agent_card_refresh_interval_seconds
+        self.refresh_concurrency = settings.agent_card_refresh_concurrency
+
+        # agent URL -> path / etag / last_modified / digest
+        self._validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "fetches": 0,
+            "not_modified": 0,
+            "unchanged_bodies": 0,
+            "path_probes": 0,
+            "failures": 0,
+            "refresh_sweeps": 0,
+            "last_refresh_ms": None,
+            "last_refresh": {"not_modified": 0, "updated": 0, "failed": 0},
+        }
+
+    # =========================================================================
+    # Validators
+    # =========================================================================
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url.rstrip("/")
+
+    def _remember(self, url: str, path: str, response: httpx.Response, data: dict):
+        self._validators[self._key(url)] = {
+            "path": path,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "digest": card_digest(data),
+        }
+
+    def forget(self, url: str):
+        self._validators.pop(self._key(url), None)
+
+    def export_validators(self) -> Dict[str, Dict[str, Optional[str]]]:
+        return dict(self._validators)
+
+    def restore_validators(self, validators: Dict[str, Dict[str, Optional[str]]]):
+        self._validators.update(validators)
+
+    # =========================================================================
+    # Fetch
+    # =========================================================================
+
+    async def _get(self, url: str, path: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        return await GlobalHttpClient.get_client(url).get(
+            f"{url.rstrip('/')}{path}", headers=headers, timeout=self.timeout
+        )
+
+    async def fetch(self, url: str, conditional: bool = False) -> Tuple[str, Optional[dict]]:
+        """
+        Agent Card 조회.
+
+        Args:
+            conditional: 기억한 validator로 conditional 요청 (변경 없으면 "not_modified").
+                validator 없이 200을 받아도 본문 digest가 같으면 "not_modified"
+        """
+        self._stats["fetches"] += 1
+        validators = self._validators.get(self._key(url))
+        previous_digest = validators.get("digest") if validators and conditional else None
+        if validators and validators.get("path"):
+            headers = {}
+            if conditional and validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if conditional and validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+            try:
+                response = await self._get(url, validators["path"], headers)
+                if response.status_code == 304:
+                    self._stats["not_modified"] += 1
+                    return "not_modified", None
+                if response.status_code == 200:
+                    data = response.json()
+                    self._remember(url, validators["path"], response, data)
+                    return self._unless_unchanged(url, data, previous_digest)
+                logger.debug(f"[AgentCard] {url}{validators['path']} returned {response.status_code}")
+            except (httpx.HTTPError, ValueError) as e:
+                logger.debug(f"[AgentCard] Remembered path failed for {url}: {type(e).__name__}: {e}")
+
+        # 기억된 경로가 없거나 더 이상 유효하지 않음 - 전체 경로 동시 탐색
+        data = await self._probe_paths(url)
+        if data is None:
+            self._stats["failures"] += 1
+            logger.warning(f"[AgentCard] All card paths failed for {url}")
+            return "failed", None
+        return self._unless_unchanged(url, data, previous_digest)
+
+    def _unless_unchanged(self, url: str, data: dict, previous_digest: Optional[str]) -> Tuple[str, Optional[dict]]:
+        # 200이지만 기억한 본문과 같음 (ETag / Last-Modified를 주지 않는 에이전트)
+        if previous_digest is not None and self._validators[self._key(url)]["digest"] == previous_digest:
+            self._stats["unchanged_bodies"] += 1
+            self._stats["not_modified"] += 1
+            return "not_modified", None
+        return "ok", data
+
+    async def _probe_paths(self, url: str) -> Optional[dict]:
+        """모든 card 경로를 동시에 요청하고 처음으로 200 + JSON을 준 경로 사용"""
+        self._stats["path_probes"] += 1
+        tasks = {asyncio.create_task(self._get(url, path)): path for path in self.CARD_PATHS}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    path = tasks[task]
+                    try:
+                        response = task.result()
+                        if response.status_code != 200:
+                            continue
+                        data = response.json()
+                    except (httpx.HTTPError, ValueError) as e:
+                        logger.debug(f"[AgentCard] {url}{path} failed: {type(e).__name__}: {e}")
+                        continue
+                    self._remember(url, path, response, data)
+                    return data
+        finally:
+            for task in pending:
+                task.cancel()
+        return None
+
+    # =========================================================================
+    # Refresh
+    # =========================================================================
+
+    def start(self):
+        if self.refresh_interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+            logger.info(f"[AgentCard] Periodic refresh started (interval: {self.refresh_interval}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            # 워커/재시작 간 갱신 시점 분산
+            await asyncio.sleep(self.refresh_interval * random.uniform(0.9, 1.1))
+            agent_ids = [agent.id for agent in self._registry.list_agents()]
+            if not agent_ids:
+                continue
+            start = time.perf_counter()
+            counts = await self.refresh(agent_ids)
+            self._stats["refresh_sweeps"] += 1
+            self._stats["last_refresh"] = counts
+            self._stats["last_refresh_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            if counts["updated"] or counts["failed"]:
+                logger.info(
+                    f"[AgentCard] Refreshed {len(agent_ids)} cards "
+                    f"(not modified: {counts['not_modified']}, updated: {counts['updated']}, failed: {counts['failed']})"
+                )
+
+    async def refresh(self, agent_ids: List[str], concurrency: Optional[int] = None) -> Dict[str, int]:
+        """에이전트 card conditional 재검증 (동시성 제한). 결과별 개수 반환"""
+        semaphore = asyncio.Semaphore(concurrency or self.refresh_concurrency)
+        counts = {"not_modified": 0, "updated": 0, "failed": 0}
+
+        async def refresh_one(agent_id: str):
+            async with semaphore:
+                try:
+                    result = await self._registry.revalidate_agent_card(agent_id)
+                except Exception as e:
+                    logger.debug(f"[AgentCard] Refresh failed for {agent_id}: {type(e).__name__}: {e}")
+                    result = "failed"
+            counts[result] = counts.get(result, 0) + 1
+
+        await asyncio.gather(*(refresh_one(agent_id) for agent_id in agent_ids))
+        return counts
+
+    def get_stats(self) -> dict:
+        return {
+            "refresh_interval_s": self.refresh_interval,
+            "remembered_paths": len(self._validators),
+            **self._stats,
+        }
@@ -0,0 +1,243 @@
+"""
+Agent Catalog - 라우팅 소비자가 공유하는 불변 에이전트 catalog snapshot
+
+레지스트리의 온라인 에이전트 목록이 바뀔 때마다 version이 증가한 새 snapshot을 만들고,
+요청마다 다시 만들던 파생 데이터는 version당 한 번만 (처음 사용할 때) 계산합니다.
+- dict view (workflow analyzer / executor / supervisor / handoff 입력)
+- LLM 프롬프트용 에이전트 목록 블록
+- skill tag 키워드 automaton (pyahocorasick 설치 시 Aho-Corasick, 없으면 distinct tag 스캔)
+- skill example 단어 postings (AgentRouter 직접 매칭)
+
+임베딩 행렬은 AgentVectorIndex가 변경분 기준으로 이미 한 번만 재구성하므로 여기서 다루지 않습니다.
+소비자는 snapshot을 참조로만 읽어야 합니다 (dict view 포함).
+"""
+from collections.abc import Sequence
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import AgentInfo
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+
+def format_agents_for_llm(agents: Iterable[Dict]) -> str:
+    """workflow analyzer 프롬프트용 에이전트 목록"""
+    lines = []
+    for agent in agents:
+        name = agent.get('name', 'Unknown')
+        desc = agent.get('description', 'No description')
+        agent_id = agent.get('id', '')
+
+        skills = agent.get('skills', [])
+        skill_names = [s.get('name', '') for s in skills if s.get('name')]
+        skill_str = ', '.join(skill_names) if skill_names else 'None'
+
+        lines.append(f"- **{name}** (ID: {agent_id})")
+        lines.append(f"  설명: {desc}")
+        lines.append(f"  스킬: {skill_str}")
+        lines.append("")
+
+    if not lines:
+        return "사용 가능한 에이전트가 없습니다."
+    return "\\n".join(lines)
+
+
+def _summary_line(agent: Dict) -> str:
+    return f"- {agent.get('name')}: {agent.get('description', '')[:100]}"
+
+
+def agent_summary_block(agents: Iterable[Dict], exclude: Optional[str] = None) -> str:
+    """supervisor / handoff 프롬프트용 요약 (exclude: 제외할 에이전트 이름)"""
+    if isinstance(agents, AgentCatalog):
+        return "\\n".join(line for name, line in agents.summary_lines if name != exclude)
+    return "\\n".join(_summary_line(a) for a in agents if a.get('name') != exclude)
+
+
+class KeywordAutomaton:
+    """
+    여러 키워드 중 텍스트에 (부분 문자열로) 포함된 것을 한 번에 찾습니다.
+    pyahocorasick이 있으면 텍스트 길이에 비례하는 단일 스캔, 없으면 키워드별 `in` 검사.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._keywords = tuple(dict.fromkeys(k for k in keywords if k))
+        self._automaton = None
+        if ahocorasick is not None and self._keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self._keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def find(self, text: str) -> Set[str]:
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        return {k for k in self._keywords if k in text}
+
+
+class AgentCatalog(Sequence):
+    """
+    Immutable, versioned view of the online agents.
+
+    Sequence로서 dict view(id / name / description / url / skills)를 제공하므로
+    기존 available_agents(List[Dict]) 자리에 그대로 전달할 수 있습니다.
+    에이전트는 snapshot 시점의 복사본이라 이후 레지스트리 변경의 영향을 받지 않습니다.
+    """
+
+    def __init__(self, version: int, agents: Iterable[AgentInfo]):
+        self._version = version
+        self._agents: Tuple[AgentInfo, ...] = tuple(a.model_copy(deep=True) for a in agents)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def agents(self) -> Tuple[AgentInfo, ...]:
+        return self._agents
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __getitem__(self, index):
+        return self.agent_dicts[index]
+
+    def __repr__(self) -> str:
+        return f"AgentCatalog(version={self._version}, agents={len(self._agents)})"
+
+    # =========================================================================
+    # Precomputed views (version당 한 번)
+    # =========================================================================
+
+    @cached_property
+    def agent_dicts(self) -> Tuple[Dict, ...]:
+        return tuple(
+            {
+                "id": a.id,
+                "name": a.name,
+                "description": a.description,
+                "url": a.url,
+                "skills": [s.model_dump() for s in a.skills]
+            }
+            for a in self._agents
+        )
+
+    @cached_property
+    def workflow_prompt(self) -> str:
+        """LLMWorkflowAnalyzer 프롬프트의 에이전트 목록 블록"""
+        return format_agents_for_llm(self.agent_dicts)
+
+    @cached_property
+    def summary_lines(self) -> Tuple[Tuple[str, str], ...]:
+        """(이름, "- 이름: 설명[:100]") - supervisor / handoff 프롬프트"""
+        return tuple((a.get('name'), _summary_line(a)) for a in self.agent_dicts)
+
+    @cached_property
+    def _routing_lines(self) -> Dict[str, str]:
+        return {a.id: f"- {a.name}: {a.description}" for a in self._agents}
+
+    @cached_property
+    def _full_routing_prompt(self) -> str:
+        return "\n".join(self._routing_lines.values())
+
+    def routing_prompt(self, agents: List[AgentInfo]) -> str:
+        """HybridRouter LLM 라우팅 프롬프트의 에이전트 목록 (필터링된 후보 기준)"""
+        if len(agents) == len(self._agents):
+            return self._full_routing_prompt
+        lines = self._routing_lines
+        return "\n".join(lines.get(a.id) or f"- {a.name}: {a.description}" for a in agents)
+
+    @cached_property
+    def _search_texts(self) -> Dict[str, str]:
+        return {a.id: f"{a.name} {a.description}".lower() for a in self._agents}
+
+    def search_text(self, agent: AgentInfo) -> str:
+        """소문자 "이름 설명" (키워드 매칭용)"""
+        text = self._search_texts.get(agent.id)
+        return text if text is not None else f"{agent.name} {agent.description}".lower()
+
+    @cached_property
+    def _tag_postings(self) -> Dict[str, Dict[str, int]]:
+        # 소문자 tag -> {agent_id: (skill, tag) 등장 횟수}
+        postings: Dict[str, Dict[str, int]] = {}
+        for agent in self._agents:
+            for skill in agent.skills:
+                for tag in skill.tags or ():
+                    counts = postings.setdefault(tag.lower(), {})
+                    counts[agent.id] = counts.get(agent.id, 0) + 1
+        return postings
+
+    @cached_property
+    def tag_automaton(self) -> KeywordAutomaton:
+        return KeywordAutomaton(self._tag_postings)
+
+    def matched_tags(self, message_lower: str) -> Set[str]:
+        """메시지에 포함된 (소문자) skill tag"""
+        return self.tag_automaton.find(message_lower)
+
+    @cached_property
+    def _positions(self) -> Dict[str, int]:
+        return {a.id: i for i, a in enumerate(self._agents)}
+
+    @cached_property
+    def _example_postings(self) -> Dict[str, Set[Tuple[str, int, int]]]:
+        # 소문자 skill example 단어 -> {(agent_id, skill 순번, example 순번)}
+        postings: Dict[str, Set[Tuple[str, int, int]]] = {}
+        for agent in self._agents:
+            for s_idx, skill in enumerate(agent.skills):
+                for e_idx, example in enumerate(skill.examples or ()):
+                    for word in set(example.lower().split()):
+                        postings.setdefault(word, set()).add((agent.id, s_idx, e_idx))
+        return postings
+
+    def keyword_match(
+        self,
+        message_lower: str,
+        agent_ids: Optional[Set[str]] = None
+    ) -> Optional[Tuple[AgentInfo, str, str]]:
+        """
+        메시지와 skill tag / example(공통 단어 2개 이상)의 직접 매칭.
+        후보는 automaton / example 단어 postings에서만 뽑으며, 카탈로그 순서상 첫 에이전트의
+        첫 매칭 skill 기준으로 (에이전트, "tag" | "example", 매칭된 tag 또는 example) 반환.
+
+        Args:
+            agent_ids: 후보 제한 (None이면 전체)
+        """
+        matched_tags = self.matched_tags(message_lower)
+        candidates = {agent_id for tag in matched_tags for agent_id in self._tag_postings[tag]}
+
+        example_hits: Dict[Tuple[str, int, int], int] = {}
+        for word in set(message_lower.split()):
+            for key in self._example_postings.get(word, ()):
+                example_hits[key] = example_hits.get(key, 0) + 1
+        matched_examples = {key for key, count in example_hits.items() if count >= 2}
+        candidates.update(agent_id for agent_id, _, _ in matched_examples)
+
+        if agent_ids is not None:
+            candidates &= agent_ids
+        if not candidates:
+            return None
+
+        agent = self._agents[min(self._positions[agent_id] for agent_id in candidates)]
+        for s_idx, skill in enumerate(agent.skills):
+            for tag in skill.tags or ():
+                if tag.lower() in matched_tags:
+                    return agent, "tag", tag
+            for e_idx, example in enumerate(skill.examples or ()):
+                if (agent.id, s_idx, e_idx) in matched_examples:
+                    return agent, "example", example
+        return None
+
+    def tag_hits(self, message_lower: str) -> Dict[str, int]:
+        """agent_id -> 메시지에 포함된 (skill, tag) 수"""
+        hits: Dict[str, int] = {}
+        for tag in self.matched_tags(message_lower):
+            for agent_id, count in self._tag_postings[tag].items():
+                hits[agent_id] = hits.get(agent_id, 0) + count
+        return hits
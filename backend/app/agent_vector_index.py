@@ -0,0 +1,166 @@
+"""
+Agent Vector Index - 프로세스 내 멀티 벡터 에이전트 인덱스
+
+에이전트마다 여러 벡터(description, 스킬 설명, 예시 발화)를 보관하고,
+쿼리와의 코사인 유사도 중 최댓값(max-sim)으로 에이전트 점수를 계산합니다.
+등록 에이전트 수가 수백~수천 수준이므로 exact 행렬곱으로 DB 왕복 없이 검색합니다.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class _AgentVectors:
+    """에이전트 하나의 벡터 묶음"""
+    info: Dict[str, Any]
+    vectors: np.ndarray  # (k, dim), L2 정규화
+    kinds: List[str]
+    texts: List[str]
+
+
+class AgentVectorIndex:
+    """
+    In-process multi-vector index with max-sim aggregation per agent.
+
+    변경(upsert/remove) 시 dirty 표시만 하고, 다음 검색 때 행렬을 한 번 재구성합니다.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, _AgentVectors] = {}
+        self._dirty = True
+        self._names: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._counts: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, agent_name: str) -> bool:
+        return agent_name in self._agents
+
+    @property
+    def vector_count(self) -> int:
+        return sum(len(a.kinds) for a in self._agents.values())
+
+    # =========================================================================
+    # Mutation
+    # =========================================================================
+
+    def upsert(
+        self,
+        agent_name: str,
+        info: Dict[str, Any],
+        vectors: np.ndarray,
+        kinds: List[str],
+        texts: List[str]
+    ):
+        """에이전트 벡터 추가/교체"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] == 0:
+            self.remove(agent_name)
+            return
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+        self._agents[agent_name] = _AgentVectors(
+            info=dict(info),
+            vectors=vectors,
+            kinds=list(kinds),
+            texts=list(texts)
+        )
+        self._dirty = True
+
+    def update_info(self, agent_name: str, info: Dict[str, Any]):
+        """벡터는 유지하고 메타데이터만 갱신"""
+        entry = self._agents.get(agent_name)
+        if entry:
+            entry.info = dict(info)
+
+    def remove(self, agent_name: str):
+        if self._agents.pop(agent_name, None) is not None:
+            self._dirty = True
+
+    def entries(self):
+        """(agent_name, 벡터 묶음) 목록 - snapshot 저장용"""
+        return list(self._agents.items())
+
+    def clear(self):
+        self._agents.clear()
+        self._dirty = True
+
+    def _rebuild(self):
+        """에이전트별 벡터를 하나의 행렬로 결합 (에이전트 row는 연속 구간)"""
+        self._names = list(self._agents.keys())
+        if self._names:
+            entries = [self._agents[name] for name in self._names]
+            self._matrix = np.vstack([e.vectors for e in entries])
+            self._counts = np.array([len(e.kinds) for e in entries], dtype=np.intp)
+            self._offsets = np.concatenate(([0], np.cumsum(self._counts)[:-1])).astype(np.intp)
+        else:
+            self._matrix = None
+            self._counts = None
+            self._offsets = None
+        self._dirty = False
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        limit: int = 5,
+        threshold: float = 0.0,
+        domain_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        max-sim 기반 에이전트 검색
+
+        Returns:
+            similarity 내림차순 결과 (AgentVectorStore.search_similar와 동일한 형태 +
+            matched_kind / matched_text)
+        """
+        if self._dirty:
+            self._rebuild()
+        if self._matrix is None:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        if query.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Query dimension {query.shape[0]} does not match index dimension {self._matrix.shape[1]}"
+            )
+
+        sims = self._matrix @ (query / norm)
+        agent_scores = np.maximum.reduceat(sims, self._offsets)
+
+        results = []
+        for i in np.argsort(-agent_scores, kind="stable"):
+            score = float(agent_scores[i])
+            if score <= threshold:
+                break
+
+            entry = self._agents[self._names[i]]
+            if domain_filter and entry.info.get("domain") != domain_filter:
+                continue
+
+            start = self._offsets[i]
+            best = int(np.argmax(sims[start:start + self._counts[i]]))
+            results.append({
+                **entry.info,
+                "agent_name": self._names[i],
+                "similarity": score,
+                "matched_kind": entry.kinds[best],
+                "matched_text": entry.texts[best],
+            })
+            if len(results) >= limit:
+                break
+
+        return results
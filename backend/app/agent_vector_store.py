@@ -1,16 +1,53 @@
 """
 Agent Vector Store - pgvector 기반 에이전트 벡터 검색
 """
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+import struct
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass, field
 import asyncpg
-from openai import AsyncOpenAI
+import numpy as np
 
 from app.config import get_settings
+from app.embedding_client import BaseEmbeddingClient, get_embedding_client
+from app.agent_vector_index import AgentVectorIndex
 
 logger = logging.getLogger(__name__)
 
+# pgvector `vector` 타입 최대 인덱스 차원 (초과 시 halfvec 인덱스 사용)
+MAX_VECTOR_INDEX_DIM = 2000
+
+_VECTOR_HEADER = struct.Struct(">HH")  # dim, unused
+
+
+def _encode_vector(value) -> bytes:
+    """pgvector binary format 인코딩: int16 dim + int16 unused + float32[dim] (big-endian)"""
+    array = np.asarray(value, dtype=">f4")
+    return _VECTOR_HEADER.pack(array.shape[0], 0) + array.tobytes()
+
+
+def _decode_vector(data: bytes) -> np.ndarray:
+    """pgvector binary format 디코딩"""
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=_VECTOR_HEADER.size).astype(np.float32)
+
+
+async def _register_vector_codec(conn: asyncpg.Connection):
+    """연결별 vector 타입 binary codec 등록 (확장이 아직 없으면 생략)"""
+    try:
+        await conn.set_type_codec(
+            "vector",
+            encoder=_encode_vector,
+            decoder=_decode_vector,
+            schema="public",
+            format="binary"
+        )
+    except ValueError:
+        # CREATE EXTENSION 이전 연결 - _ensure_schema 후 연결을 재생성함
+        pass
+
 
 @dataclass
 class AgentRoutingMetadata:
@@ -23,6 +60,38 @@ class AgentRoutingMetadata:
     keywords: List[str] = field(default_factory=list)
     capabilities: List[str] = field(default_factory=list)
     is_active: bool = True
+    # 멀티 벡터 라우팅용 (스킬 설명, 예시 발화)
+    skill_descriptions: List[str] = field(default_factory=list)
+    examples: List[str] = field(default_factory=list)
+    
+    def routing_texts(self) -> List[Tuple[str, str]]:
+        """임베딩 대상 (kind, text) 목록 - description, skill, example 순, 중복 제거"""
+        candidates = [("description", self.description)]
+        candidates += [("skill", t) for t in self.skill_descriptions]
+        candidates += [("example", t) for t in self.examples]
+        
+        texts = []
+        seen = set()
+        for kind, text in candidates:
+            text = (text or "").strip()
+            if text and text not in seen:
+                seen.add(text)
+                texts.append((kind, text))
+        
+        if not texts:
+            texts.append(("description", self.agent_name))
+        return texts
+    
+    def to_search_info(self) -> Dict[str, Any]:
+        """검색 결과에 포함되는 메타데이터"""
+        return {
+            "agent_url": self.agent_url,
+            "domain": self.domain,
+            "category": self.category,
+            "keywords": self.keywords,
+            "capabilities": self.capabilities,
+            "description": self.description,
+        }
     
     @classmethod
     def from_agent_card(cls, agent_card: Dict[str, Any], url: str) -> "AgentRoutingMetadata":
@@ -45,6 +114,16 @@ class AgentRoutingMetadata:
         if not capabilities and skills:
             capabilities = [s.get("id", s.get("name", "")) for s in skills if isinstance(s, dict)]
         
+        # 스킬 설명 / 예시 발화 (멀티 벡터)
+        skill_descriptions = []
+        examples = []
+        for s in skills:
+            if not isinstance(s, dict):
+                continue
+            if s.get("description"):
+                skill_descriptions.append(f"{s.get('name', '')}: {s['description']}".strip(": "))
+            examples.extend(e for e in s.get("examples", []) if e)
+        
         return cls(
             agent_name=name,
             agent_url=url,
@@ -53,7 +132,9 @@ class AgentRoutingMetadata:
             description=description,
             keywords=keywords,
             capabilities=capabilities,
-            is_active=True
+            is_active=True,
+            skill_descriptions=skill_descriptions,
+            examples=examples
         )
     
     @staticmethod
@@ -105,18 +186,109 @@ class AgentRoutingMetadata:
 
 
 class AgentVectorStore:
-    """pgvector 기반 에이전트 벡터 저장소"""
+    """
+    pgvector 기반 에이전트 벡터 저장소
+    
+    임베딩은 설정된 EmbeddingClient(openai / local)로 생성하며,
+    각 row에 embedding_model / embedding_dim을 저장하여 모델이 다른 벡터가 섞이지 않도록 합니다.
+    
+    에이전트마다 description / 스킬 설명 / 예시 발화 벡터를 agent_routing_vectors에 저장하고,
+    검색 시 에이전트별 최대 유사도(max-sim)로 순위를 매깁니다.
+    같은 벡터를 프로세스 내 인덱스(AgentVectorIndex)에도 유지하여 DB 왕복 없이 검색합니다.
+    """
+    
+    # agent_routing_metadata 테이블 (schema.sql과 동일, 기존 DB 마이그레이션 포함)
+    SCHEMA_SQL = [
+        "CREATE EXTENSION IF NOT EXISTS vector",
+        """
+        CREATE TABLE IF NOT EXISTS agent_routing_metadata (
+            id SERIAL PRIMARY KEY,
+            agent_name VARCHAR(255) UNIQUE NOT NULL,
+            agent_url VARCHAR(500) NOT NULL,
+            domain VARCHAR(100) DEFAULT 'general',
+            category VARCHAR(100) DEFAULT '',
+            keywords TEXT[] DEFAULT '{}',
+            capabilities TEXT[] DEFAULT '{}',
+            description TEXT,
+            description_embedding vector,
+            embedding_model VARCHAR(100),
+            embedding_dim INTEGER,
+            description_hash VARCHAR(64),
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "ALTER TABLE agent_routing_metadata ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(100)",
+        "ALTER TABLE agent_routing_metadata ADD COLUMN IF NOT EXISTS embedding_dim INTEGER",
+        "ALTER TABLE agent_routing_metadata ADD COLUMN IF NOT EXISTS description_hash VARCHAR(64)",
+        "CREATE INDEX IF NOT EXISTS idx_agent_routing_model ON agent_routing_metadata(embedding_model, embedding_dim)",
+        """
+        CREATE TABLE IF NOT EXISTS agent_routing_vectors (
+            id SERIAL PRIMARY KEY,
+            agent_name VARCHAR(255) NOT NULL
+                REFERENCES agent_routing_metadata(agent_name) ON DELETE CASCADE,
+            kind VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            embedding vector NOT NULL,
+            embedding_model VARCHAR(100) NOT NULL,
+            embedding_dim INTEGER NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_agent_routing_vectors_agent ON agent_routing_vectors(agent_name)",
+    ]
+    
+    # 에이전트별 벡터 테이블 (kind: description / skill / example)
+    VECTOR_INSERT_SQL = """
+        INSERT INTO agent_routing_vectors (agent_name, kind, content, embedding, embedding_model, embedding_dim)
+        VALUES ($1, $2, $3, $4, $5, $6)
+    """
+    
+    # SQL 검색 시 max-sim 집계 전 ANN 후보 수 = limit * 배수
+    CANDIDATE_MULTIPLIER = 8
     
-    EMBEDDING_MODEL = "text-embedding-ada-002"
-    EMBEDDING_DIMENSION = 1536
+    # 임베딩 API 1회 호출당 최대 입력 수
+    EMBEDDING_BATCH_SIZE = 256
     
-    def __init__(self):
+    UPSERT_SQL = """
+        INSERT INTO agent_routing_metadata 
+        (agent_name, agent_url, domain, category, keywords, capabilities, description,
+         description_embedding, embedding_model, embedding_dim, description_hash, is_active, updated_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, CURRENT_TIMESTAMP)
+        ON CONFLICT (agent_name) DO UPDATE SET
+            agent_url = EXCLUDED.agent_url,
+            domain = EXCLUDED.domain,
+            category = EXCLUDED.category,
+            keywords = EXCLUDED.keywords,
+            capabilities = EXCLUDED.capabilities,
+            description = EXCLUDED.description,
+            description_embedding = COALESCE(EXCLUDED.description_embedding, agent_routing_metadata.description_embedding),
+            embedding_model = EXCLUDED.embedding_model,
+            embedding_dim = EXCLUDED.embedding_dim,
+            description_hash = EXCLUDED.description_hash,
+            is_active = EXCLUDED.is_active,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    
+    def __init__(self, embedding_client: Optional[BaseEmbeddingClient] = None):
         self.settings = get_settings()
         self._pool: Optional[asyncpg.Pool] = None
-        self._openai_client: Optional[AsyncOpenAI] = None
+        self._embedding_client: Optional[BaseEmbeddingClient] = embedding_client
+        # 프로세스 내 멀티 벡터 인덱스 (DB에서 로드 완료 후 검색에 사용)
+        self._index = AgentVectorIndex()
+        self._index_ready = False
+        self._index_reload_task = None
     
     async def initialize(self):
         """데이터베이스 연결 풀 초기화"""
+        if self._embedding_client is None:
+            self._embedding_client = get_embedding_client()
+            logger.info(
+                f"AgentVectorStore: Embedding client initialized "
+                f"({self._embedding_client.model_name}, dim={self._embedding_client.dimension})"
+            )
+        
         if self._pool is None:
             self._pool = await asyncpg.create_pool(
                 host=self.settings.db_host,
@@ -125,56 +297,325 @@ class AgentVectorStore:
                 user=self.settings.db_user,
                 password=self.settings.db_password or "",
                 min_size=2,
-                max_size=10
+                max_size=10,
+                init=_register_vector_codec,
+                server_settings=self._search_server_settings()
             )
             logger.info("AgentVectorStore: Database pool initialized")
+            await self._ensure_schema()
+            if self.settings.vector_in_process_index:
+                if self._apply_warm_index():
+                    # warm-start 인덱스로 바로 검색하고, DB의 최신 벡터는 백그라운드로 재로드
+                    self._index_reload_task = asyncio.create_task(self._load_index())
+                else:
+                    await self._load_index()
+    
+    def _apply_warm_index(self) -> bool:
+        """registry snapshot에서 복원한 인덱스 적용 (임베딩 모델/차원이 같은 경우만)"""
+        global _warm_index
+        snapshot, _warm_index = _warm_index, None
+        if not snapshot:
+            return False
+        if (snapshot["embedding_model"], snapshot["embedding_dim"]) != (self.embedding_model, self.embedding_dim):
+            logger.info("AgentVectorStore: Snapshot index built with a different embedding model, ignored")
+            return False
         
-        if self._openai_client is None and self.settings.openai_api_key:
-            self._openai_client = AsyncOpenAI(api_key=self.settings.openai_api_key)
-            logger.info("AgentVectorStore: OpenAI client initialized")
+        self._index.clear()
+        for agent in snapshot["agents"]:
+            self._index.upsert(
+                agent["name"], info=agent["info"], vectors=agent["vectors"],
+                kinds=agent["kinds"], texts=agent["texts"]
+            )
+        self._index_ready = True
+        logger.info(
+            f"AgentVectorStore: In-process index restored from snapshot "
+            f"({len(self._index)} agents, {self._index.vector_count} vectors)"
+        )
+        return True
+    
+    def export_index_snapshot(self) -> Optional[Dict[str, Any]]:
+        """registry snapshot용 in-process 인덱스 (로드 전이면 None)"""
+        if not self._index_ready:
+            return None
+        return {
+            "embedding_model": self.embedding_model,
+            "embedding_dim": self.embedding_dim,
+            "agents": [
+                {"name": name, "info": entry.info, "kinds": entry.kinds, "texts": entry.texts, "vectors": entry.vectors}
+                for name, entry in self._index.entries()
+            ],
+        }
+    
+    async def _load_index(self):
+        """agent_routing_vectors에서 현재 모델/차원의 벡터를 프로세스 내 인덱스로 로드"""
+        try:
+            async with self._pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT v.agent_name, v.kind, v.content, v.embedding,
+                           m.agent_url, m.domain, m.category, m.keywords, m.capabilities, m.description
+                    FROM agent_routing_vectors v
+                    JOIN agent_routing_metadata m ON m.agent_name = v.agent_name
+                    WHERE m.is_active = true
+                    AND v.embedding_model = $1 AND v.embedding_dim = $2
+                    ORDER BY v.agent_name, v.id
+                """, self.embedding_model, self.embedding_dim)
+        except Exception as e:
+            logger.warning(f"AgentVectorStore: In-process index load failed, using SQL search: {e}")
+            return
+        
+        grouped: Dict[str, List[asyncpg.Record]] = {}
+        for row in rows:
+            grouped.setdefault(row["agent_name"], []).append(row)
+        
+        self._index.clear()
+        for agent_name, agent_rows in grouped.items():
+            first = agent_rows[0]
+            self._index.upsert(
+                agent_name,
+                info={
+                    "agent_url": first["agent_url"],
+                    "domain": first["domain"],
+                    "category": first["category"],
+                    "keywords": first["keywords"],
+                    "capabilities": first["capabilities"],
+                    "description": first["description"],
+                },
+                vectors=np.vstack([r["embedding"] for r in agent_rows]),
+                kinds=[r["kind"] for r in agent_rows],
+                texts=[r["content"] for r in agent_rows]
+            )
+        
+        self._index_ready = True
+        logger.info(
+            f"AgentVectorStore: In-process index loaded "
+            f"({len(self._index)} agents, {self._index.vector_count} vectors)"
+        )
+    
+    def _search_server_settings(self) -> Dict[str, str]:
+        """ANN 검색 파라미터 기본값 (연결 단위 GUC)"""
+        index_type = self.settings.vector_index_type
+        if index_type == "hnsw":
+            return {"hnsw.ef_search": str(self.settings.vector_hnsw_ef_search)}
+        if index_type == "ivfflat":
+            return {"ivfflat.probes": str(self.settings.vector_ivfflat_probes)}
+        return {}
+    
+    async def _ensure_schema(self):
+        """agent_routing_metadata 테이블/컬럼/ANN 인덱스 생성 (idempotent)"""
+        try:
+            async with self._pool.acquire() as conn:
+                for statement in self.SCHEMA_SQL:
+                    await conn.execute(statement)
+            # vector 확장 생성 이전에 열린 연결은 codec이 없으므로 재생성
+            await self._pool.expire_connections()
+        except Exception as e:
+            logger.warning(f"AgentVectorStore: Schema check failed: {e}")
+            return
+        
+        index_statements = self._ann_index_sql(self.embedding_dim)
+        if not index_statements:
+            return
+        try:
+            async with self._pool.acquire() as conn:
+                for statement in index_statements:
+                    await conn.execute(statement)
+            logger.info(
+                f"AgentVectorStore: {self.settings.vector_index_type.upper()} index ready "
+                f"(dim={self.embedding_dim})"
+            )
+        except Exception as e:
+            # pgvector 버전에 따라 HNSW 미지원 - exact scan으로 동작
+            logger.warning(f"AgentVectorStore: ANN index creation failed, using exact scan: {e}")
+    
+    @staticmethod
+    def _index_expressions(dim: int, column: str = "description_embedding") -> tuple:
+        """
+        차원별 (컬럼 식, 쿼리 파라미터 식, operator class)
+        
+        벡터 컬럼은 차원 없는 vector 타입이므로 인덱스/쿼리 모두
+        동일한 캐스트 식을 사용해야 planner가 인덱스를 선택합니다.
+        """
+        if dim > MAX_VECTOR_INDEX_DIM:
+            return (
+                f"({column}::halfvec({dim}))",
+                f"($1::vector({dim})::halfvec({dim}))",
+                "halfvec_cosine_ops"
+            )
+        return (
+            f"({column}::vector({dim}))",
+            f"$1::vector({dim})",
+            "vector_cosine_ops"
+        )
+    
+    def _ann_index_sql(self, dim: int) -> List[str]:
+        """현재 임베딩 차원에 대한 partial expression ANN 인덱스 DDL (메타데이터/벡터 테이블)"""
+        index_type = self.settings.vector_index_type
+        if index_type == "none" or dim <= 0:
+            return []
+        
+        if index_type == "hnsw":
+            options = (
+                f"WITH (m = {int(self.settings.vector_hnsw_m)}, "
+                f"ef_construction = {int(self.settings.vector_hnsw_ef_construction)})"
+            )
+        else:
+            options = f"WITH (lists = {int(self.settings.vector_ivfflat_lists)})"
+        
+        statements = []
+        for table, column, prefix in (
+            ("agent_routing_metadata", "description_embedding", "idx_agent_routing"),
+            ("agent_routing_vectors", "embedding", "idx_agent_routing_vectors"),
+        ):
+            column_expr, _, opclass = self._index_expressions(dim, column)
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {prefix}_{index_type}_{dim} "
+                f"ON {table} USING {index_type} ({column_expr} {opclass}) "
+                f"{options} WHERE embedding_dim = {dim}"
+            )
+        return statements
+    
+    @property
+    def embedding_model(self) -> str:
+        """현재 임베딩 모델 식별자"""
+        return self._embedding_client.model_name if self._embedding_client else ""
+    
+    @property
+    def embedding_dim(self) -> int:
+        """현재 임베딩 차원"""
+        return self._embedding_client.dimension if self._embedding_client else 0
+    
+    @property
+    def routing_threshold(self) -> float:
+        """현재 임베딩 모델 기준 라우팅 유사도 임계값"""
+        return self._embedding_client.routing_threshold if self._embedding_client else 0.5
     
     async def close(self):
         """연결 풀 종료"""
+        if self._index_reload_task:
+            self._index_reload_task.cancel()
         if self._pool:
             await self._pool.close()
             self._pool = None
     
-    async def _generate_embedding(self, text: str) -> List[float]:
+    async def _generate_embedding(self, text: str) -> np.ndarray:
         """텍스트 임베딩 생성"""
-        if not self._openai_client:
-            raise ValueError("OpenAI client not initialized. Set OPENAI_API_KEY.")
+        if not self._embedding_client:
+            raise ValueError("Embedding client not initialized.")
         
-        response = await self._openai_client.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=text
+        return await self._embedding_client.embed_one(text)
+    
+    def _description_hash(self, metadata: AgentRoutingMetadata) -> str:
+        """임베딩 재생성 여부 판단용 해시 (모델/차원 + 모든 라우팅 텍스트)"""
+        texts = "\n".join(f"{kind}:{text}" for kind, text in metadata.routing_texts())
+        key = f"v2:{self.embedding_model}:{self.embedding_dim}:{texts}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _is_row_unchanged(row: asyncpg.Record, metadata: AgentRoutingMetadata) -> bool:
+        """임베딩 외 메타데이터 변경 여부 확인"""
+        return (
+            row["agent_url"] == metadata.agent_url
+            and row["domain"] == metadata.domain
+            and row["category"] == metadata.category
+            and sorted(row["keywords"] or []) == sorted(metadata.keywords)
+            and sorted(row["capabilities"] or []) == sorted(metadata.capabilities)
+            and row["is_active"] == metadata.is_active
         )
-        return response.data[0].embedding
     
-    async def upsert_agent(self, metadata: AgentRoutingMetadata) -> bool:
-        """에이전트 메타데이터 추가/업데이트"""
+    def _needs_vectors(self, row: asyncpg.Record, metadata: AgentRoutingMetadata) -> bool:
+        """
+        라우팅 텍스트가 같아도 벡터를 다시 넣어야 하는지 확인
+        
+        soft delete된 에이전트가 다시 활성화되거나, 인덱스에서 빠져 있으면
+        update_info만으로는 인덱스에 복귀하지 않으므로 재임베딩합니다.
+        """
+        if not metadata.is_active:
+            return False
+        if not row["is_active"]:
+            return True
+        return self._index_ready and metadata.agent_name not in self._index
+    
+    async def _embed_batched(self, texts: List[str]) -> np.ndarray:
+        """임베딩 배치 생성 (EMBEDDING_BATCH_SIZE 단위로 API 호출)"""
+        chunks = [
+            await self._embedding_client.embed(texts[i:i + self.EMBEDDING_BATCH_SIZE])
+            for i in range(0, len(texts), self.EMBEDDING_BATCH_SIZE)
+        ]
+        if not chunks:
+            return np.zeros((0, self.embedding_dim), dtype=np.float32)
+        return np.vstack(chunks)
+    
+    async def upsert_agents(self, metadata_list: List[AgentRoutingMetadata]) -> Dict[str, int]:
+        """
+        에이전트 메타데이터 일괄 추가/업데이트
+        
+        - 라우팅 텍스트(description/skill/example) 해시가 동일하면 임베딩을 재생성하지 않음
+          (단, soft delete 후 재등록 / 인덱스에 없는 에이전트는 재생성)
+        - 메타데이터까지 동일한 row는 쓰기 생략
+        - 임베딩은 배치 호출, DB 쓰기는 한 트랜잭션에서 executemany
+        - 프로세스 내 인덱스도 함께 갱신
+        
+        Returns:
+            {"requested", "upserted", "embedded", "vectors", "skipped", "failed"} 카운트
+        """
         await self.initialize()
         
+        # 동일 에이전트가 여러 번 들어오면 마지막 값만 사용
+        latest = {m.agent_name: m for m in metadata_list}
+        stats = {"requested": len(latest), "upserted": 0, "embedded": 0, "vectors": 0, "skipped": 0, "failed": 0}
+        if not latest:
+            return stats
+        
         try:
-            # 임베딩 생성
-            embedding = await self._generate_embedding(metadata.description)
-            embedding_str = f"[{','.join(map(str, embedding))}]"
-            
             async with self._pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO agent_routing_metadata 
-                    (agent_name, agent_url, domain, category, keywords, capabilities, description, description_embedding, is_active, updated_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8::vector, $9, CURRENT_TIMESTAMP)
-                    ON CONFLICT (agent_name) DO UPDATE SET
-                        agent_url = EXCLUDED.agent_url,
-                        domain = EXCLUDED.domain,
-                        category = EXCLUDED.category,
-                        keywords = EXCLUDED.keywords,
-                        capabilities = EXCLUDED.capabilities,
-                        description = EXCLUDED.description,
-                        description_embedding = EXCLUDED.description_embedding,
-                        is_active = EXCLUDED.is_active,
-                        updated_at = CURRENT_TIMESTAMP
-                """,
+                rows = await conn.fetch("""
+                    SELECT agent_name, agent_url, domain, category, keywords, capabilities,
+                           is_active, description_hash
+                    FROM agent_routing_metadata
+                    WHERE agent_name = ANY($1::text[])
+                """, list(latest.keys()))
+            existing = {row["agent_name"]: row for row in rows}
+            
+            # 변경 사항 분류
+            pending = []  # (metadata, description_hash, routing_texts, embed_offset or None)
+            texts_to_embed = []
+            for metadata in latest.values():
+                desc_hash = self._description_hash(metadata)
+                row = existing.get(metadata.agent_name)
+                
+                if row and row["description_hash"] == desc_hash and not self._needs_vectors(row, metadata):
+                    if self._is_row_unchanged(row, metadata):
+                        stats["skipped"] += 1
+                        continue
+                    pending.append((metadata, desc_hash, None, None))
+                else:
+                    routing_texts = metadata.routing_texts()
+                    pending.append((metadata, desc_hash, routing_texts, len(texts_to_embed)))
+                    texts_to_embed.extend(text for _, text in routing_texts)
+            
+            if not pending:
+                logger.info(f"Upsert skipped: {stats['skipped']} agents unchanged")
+                return stats
+            
+            # 임베딩 배치 생성
+            embeddings = await self._embed_batched(texts_to_embed)
+            
+            records = []
+            vector_records = []
+            reembedded = []
+            for metadata, desc_hash, routing_texts, offset in pending:
+                description_embedding = None
+                if routing_texts is not None:
+                    vectors = embeddings[offset:offset + len(routing_texts)]
+                    description_embedding = vectors[0]
+                    reembedded.append(metadata.agent_name)
+                    for (kind, text), vector in zip(routing_texts, vectors):
+                        vector_records.append((
+                            metadata.agent_name, kind, text, vector,
+                            self.embedding_model, self.embedding_dim
+                        ))
+                
+                records.append((
                     metadata.agent_name,
                     metadata.agent_url,
                     metadata.domain,
@@ -182,15 +623,77 @@ class AgentVectorStore:
                     metadata.keywords,
                     metadata.capabilities,
                     metadata.description,
-                    embedding_str,
+                    description_embedding,
+                    self.embedding_model,
+                    self.embedding_dim,
+                    desc_hash,
                     metadata.is_active
-                )
+                ))
             
-            logger.info(f"Upserted agent: {metadata.agent_name} (domain: {metadata.domain})")
-            return True
+            async with self._pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.executemany(self.UPSERT_SQL, records)
+                    if reembedded:
+                        await conn.execute(
+                            "DELETE FROM agent_routing_vectors WHERE agent_name = ANY($1::text[])",
+                            reembedded
+                        )
+                        await conn.executemany(self.VECTOR_INSERT_SQL, vector_records)
             
+            self._update_index(pending, embeddings)
+            
+            stats["upserted"] = len(records)
+            stats["embedded"] = len(reembedded)
+            stats["vectors"] = len(vector_records)
+            logger.info(
+                f"Upserted {stats['upserted']} agents "
+                f"(embedded: {stats['embedded']} agents / {stats['vectors']} vectors, "
+                f"unchanged: {stats['skipped']})"
+            )
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(latest)} agents: {e}")
+            stats["failed"] = len(latest) - stats["skipped"]
+            return stats
+    
+    def _update_index(self, pending: List[tuple], embeddings: np.ndarray):
+        """DB 쓰기 성공 후 프로세스 내 인덱스 반영"""
+        for metadata, _, routing_texts, offset in pending:
+            if not metadata.is_active:
+                self._index.remove(metadata.agent_name)
+            elif routing_texts is not None:
+                self._index.upsert(
+                    metadata.agent_name,
+                    info=metadata.to_search_info(),
+                    vectors=embeddings[offset:offset + len(routing_texts)],
+                    kinds=[kind for kind, _ in routing_texts],
+                    texts=[text for _, text in routing_texts]
+                )
+            else:
+                self._index.update_info(metadata.agent_name, metadata.to_search_info())
+    
+    async def upsert_agent(self, metadata: AgentRoutingMetadata) -> bool:
+        """에이전트 메타데이터 추가/업데이트"""
+        stats = await self.upsert_agents([metadata])
+        return stats["failed"] == 0
+    
+    async def remove_agents(self, agent_names: List[str]) -> bool:
+        """에이전트 일괄 제거 (soft delete)"""
+        await self.initialize()
+        
+        try:
+            async with self._pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE agent_routing_metadata SET is_active = false WHERE agent_name = ANY($1::text[])",
+                    agent_names
+                )
+            for agent_name in agent_names:
+                self._index.remove(agent_name)
+            logger.info(f"Removed {len(agent_names)} agents")
+            return True
         except Exception as e:
-            logger.error(f"Failed to upsert agent {metadata.agent_name}: {e}")
+            logger.error(f"Failed to remove agents {agent_names}: {e}")
             return False
     
     async def remove_agent(self, agent_name: str) -> bool:
@@ -203,6 +706,7 @@ class AgentVectorStore:
                     "UPDATE agent_routing_metadata SET is_active = false WHERE agent_name = $1",
                     agent_name
                 )
+            self._index.remove(agent_name)
             logger.info(f"Removed agent: {agent_name}")
             return True
         except Exception as e:
@@ -214,55 +718,36 @@ class AgentVectorStore:
         query: str,
         limit: int = 5,
         domain_filter: Optional[str] = None,
-        threshold: float = 0.3
+        threshold: float = 0.3,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """유사 에이전트 벡터 검색"""
+        """
+        유사 에이전트 벡터 검색 (에이전트별 max-sim)
+        
+        프로세스 내 인덱스가 로드되어 있으면 DB 왕복 없이 검색하고,
+        아니면 agent_routing_vectors에서 ANN 후보(ORDER BY distance LIMIT)를 먼저 뽑은 뒤
+        에이전트별 최소 거리로 집계하고 similarity threshold를 적용합니다.
+        
+        Args:
+            ef_search: HNSW 검색 후보 수 (None이면 설정값, 후보 수보다 작으면 후보 수 사용)
+        """
         await self.initialize()
         
         try:
-            # 쿼리 임베딩 생성
+            # 쿼리 임베딩 생성 (binary codec으로 그대로 전달)
             query_embedding = await self._generate_embedding(query)
-            embedding_str = f"[{','.join(map(str, query_embedding))}]"
-            
-            # 도메인 필터 조건
-            domain_condition = ""
-            params = [embedding_str, threshold, limit]
             
-            if domain_filter:
-                domain_condition = "AND domain = $4"
-                params.append(domain_filter)
-            
-            async with self._pool.acquire() as conn:
-                rows = await conn.fetch(f"""
-                    SELECT 
-                        agent_name,
-                        agent_url,
-                        domain,
-                        category,
-                        keywords,
-                        capabilities,
-                        description,
-                        1 - (description_embedding <=> $1::vector) as similarity
-                    FROM agent_routing_metadata
-                    WHERE is_active = true
-                    AND 1 - (description_embedding <=> $1::vector) > $2
-                    {domain_condition}
-                    ORDER BY description_embedding <=> $1::vector
-                    LIMIT $3
-                """, *params)
-            
-            results = []
-            for row in rows:
-                results.append({
-                    "agent_name": row["agent_name"],
-                    "agent_url": row["agent_url"],
-                    "domain": row["domain"],
-                    "category": row["category"],
-                    "keywords": row["keywords"],
-                    "capabilities": row["capabilities"],
-                    "description": row["description"],
-                    "similarity": float(row["similarity"])
-                })
+            if self._index_ready:
+                results = self._index.search(
+                    query_embedding,
+                    limit=limit,
+                    threshold=threshold,
+                    domain_filter=domain_filter
+                )
+            else:
+                results = await self._search_similar_sql(
+                    query_embedding, limit, domain_filter, threshold, ef_search
+                )
             
             logger.info(f"Vector search for '{query[:50]}...' returned {len(results)} results")
             return results
@@ -271,6 +756,97 @@ class AgentVectorStore:
             logger.error(f"Vector search failed: {e}")
             return []
     
+    async def _search_similar_sql(
+        self,
+        query_embedding: np.ndarray,
+        limit: int,
+        domain_filter: Optional[str],
+        threshold: float,
+        ef_search: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """agent_routing_vectors ANN 검색 + 에이전트별 max-sim 집계"""
+        # 현재 임베딩 모델/차원의 row만 검색 (차원은 partial index 조건과 일치해야 하므로 literal)
+        dim = int(self.embedding_dim)
+        column_expr, query_expr, _ = self._index_expressions(dim, "embedding")
+        distance_expr = f"{column_expr} <=> {query_expr}"
+        candidate_limit = limit * self.CANDIDATE_MULTIPLIER
+        
+        params = [query_embedding, limit, self.embedding_model, threshold, candidate_limit]
+        domain_condition = ""
+        if domain_filter:
+            domain_condition = "AND m.domain = $6"
+            params.append(domain_filter)
+        
+        sql = f"""
+            SELECT
+                m.agent_name,
+                m.agent_url,
+                m.domain,
+                m.category,
+                m.keywords,
+                m.capabilities,
+                m.description,
+                best.kind,
+                best.content,
+                best.distance
+            FROM (
+                SELECT DISTINCT ON (agent_name) agent_name, kind, content, distance
+                FROM (
+                    SELECT agent_name, kind, content, {distance_expr} AS distance
+                    FROM agent_routing_vectors
+                    WHERE embedding_dim = {dim}
+                    AND embedding_model = $3
+                    ORDER BY {distance_expr}
+                    LIMIT $5
+                ) AS candidates
+                ORDER BY agent_name, distance
+            ) AS best
+            JOIN agent_routing_metadata m ON m.agent_name = best.agent_name
+            WHERE m.is_active = true
+            AND 1 - best.distance > $4
+            {domain_condition}
+            ORDER BY best.distance
+            LIMIT $2
+        """
+        
+        async with self._pool.acquire() as conn:
+            search_params = self._search_params_override(candidate_limit, ef_search)
+            if search_params:
+                async with conn.transaction():
+                    for name, value in search_params.items():
+                        await conn.execute(f"SET LOCAL {name} = {value}")
+                    rows = await conn.fetch(sql, *params)
+            else:
+                rows = await conn.fetch(sql, *params)
+        
+        results = []
+        for row in rows:
+            results.append({
+                "agent_name": row["agent_name"],
+                "agent_url": row["agent_url"],
+                "domain": row["domain"],
+                "category": row["category"],
+                "keywords": row["keywords"],
+                "capabilities": row["capabilities"],
+                "description": row["description"],
+                "similarity": 1 - float(row["distance"]),
+                "matched_kind": row["kind"],
+                "matched_text": row["content"]
+            })
+        return results
+    
+    def _search_params_override(self, limit: int, ef_search: Optional[int]) -> Dict[str, int]:
+        """연결 기본값과 다른 검색 파라미터 (SET LOCAL 대상)"""
+        if self.settings.vector_index_type != "hnsw":
+            return {}
+        
+        default_ef = self.settings.vector_hnsw_ef_search
+        # ef_search < limit이면 HNSW가 limit보다 적은 후보를 반환
+        ef = max(int(ef_search or default_ef), int(limit))
+        if ef == default_ef:
+            return {}
+        return {"hnsw.ef_search": ef}
+    
     async def search_by_keywords(
         self,
         keywords: List[str],
@@ -374,6 +950,19 @@ class AgentVectorStore:
 
 # 싱글톤 인스턴스
 _vector_store: Optional[AgentVectorStore] = None
+# registry snapshot에서 복원한 인덱스 (initialize()에서 1회 사용)
+_warm_index: Optional[Dict[str, Any]] = None
+
+
+def preload_index_snapshot(snapshot: Optional[Dict[str, Any]]):
+    """warm-start 인덱스 등록 - 벡터 저장소 초기화 시 DB 전체 로드 대신 사용"""
+    global _warm_index
+    _warm_index = snapshot
+
+
+def get_loaded_vector_store() -> Optional[AgentVectorStore]:
+    """초기화된 벡터 저장소 (아직 없으면 None, 초기화하지 않음)"""
+    return _vector_store
 
 
 async def get_vector_store() -> AgentVectorStore:
@@ -3,25 +3,31 @@ FastAPI REST API endpoints for Agent Orchestrator
 """
 import json
 from typing import List, Optional, Dict
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response, UploadFile, File
 from pydantic import BaseModel
 from loguru import logger
 from sse_starlette.sse import EventSourceResponse
 from sqlalchemy import text
 
 from .models import (
-    ChatRequest, ChatResponse, AgentInfo, AgentRegistration, AgentURLRegistration,
+    ChatRequest, ChatResponse, AgentInfo, AgentRegistration, AgentURLRegistration, AgentBulkURLRegistration,
+    AgentHeartbeatBatch,
     Conversation
 )
-from .registry import registry
+from .registry import AgentConflictError, registry
 from .orchestrator import orchestrator
 from .conversation_service import conversation_service
 from .hybrid_router import get_hybrid_router
+from .conversation_affinity import get_conversation_affinity
 from .agent_vector_store import get_vector_store
+from .vector_sync import get_vector_sync_pipeline
 from .auth.dependencies import get_current_user, get_current_admin_user, get_current_user_optional
 from .auth.models import UserInDB
 from .database import get_db_session
 from .mcp_token_service import get_mcp_token_service
+from .token_cache import get_token_cache
+from .metrics import render_metrics, track_sse_stream
+from .request_timing import get_request_timings
 
 
 # =============================================================================
@@ -34,11 +40,13 @@ chat_router = APIRouter(tags=["Chat"])
 @chat_router.post("/message", response_model=ChatResponse)
 async def send_message(
     request: ChatRequest,
+    response: Response,
     current_user: Optional[UserInDB] = Depends(get_current_user_optional)
 ):
     """
     Send a message and get a response from the appropriate agent.
     Authenticated users get their conversations saved to DB.
+    단계별 소요 시간은 Server-Timing 헤더로 반환됩니다.
     """
     try:
         # 인증된 사용자는 DB에 대화 저장
@@ -49,13 +57,16 @@ async def send_message(
         jwt_token = current_user.access_token if current_user else None
         
         logger.info(f"[API] user_id={user_id}, kauth_user_id={kauth_user_id}")  # DEBUG
-        response = await orchestrator.process_message(
+        chat_response = await orchestrator.process_message(
             request, 
             user_id=user_id, 
             kauth_user_id=kauth_user_id,
             jwt_token=jwt_token
         )
-        return response
+        timings = get_request_timings()
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.to_server_timing()
+        return chat_response
     except Exception as e:
         logger.error(f"Error processing message: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -77,16 +88,17 @@ async def send_message_stream(
     
     async def event_generator():
         try:
-            async for event in orchestrator.process_message_stream(
-                request, 
-                user_id=user_id, 
-                kauth_user_id=kauth_user_id,
-                jwt_token=jwt_token
-            ):
-                yield {
-                    "event": event.event,
-                    "data": json.dumps(event.data)
-                }
+            with track_sse_stream():
+                async for event in orchestrator.process_message_stream(
+                    request, 
+                    user_id=user_id, 
+                    kauth_user_id=kauth_user_id,
+                    jwt_token=jwt_token
+                ):
+                    yield {
+                        "event": event.event,
+                        "data": json.dumps(event.data)
+                    }
         except Exception as e:
             logger.error(f"Streaming error: {e}")
             yield {
@@ -197,6 +209,16 @@ async def test_routing(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@chat_router.get("/routing/affinity")
+async def get_affinity_stats(
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Get conversation affinity (sticky routing) counters (Admin only).
+    """
+    return get_conversation_affinity().get_stats()
+
+
 @chat_router.get("/vector-search")
 async def vector_search(
     query: str = Query(..., description="Search query"),
@@ -264,6 +286,8 @@ async def register_agent(
     try:
         agent = await registry.register_agent(registration)
         return agent
+    except AgentConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Agent registration failed: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -282,11 +306,72 @@ async def register_agent_by_url(
     try:
         agent = await registry.register_agent_by_url(registration.url)
         return agent
+    except AgentConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Agent URL registration failed: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
 
+MAX_BULK_REGISTRATION_URLS = 1000
+
+
+@agent_router.post("/register/bulk")
+async def register_agents_bulk(
+    registration: AgentBulkURLRegistration,
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Register many agents by URL in one request (Admin only).
+    Agent Cards are discovered concurrently; vector-store sync and the catalog update
+    happen once for the whole batch. Per-URL results are returned (failures do not abort the batch).
+    """
+    if len(registration.urls) > MAX_BULK_REGISTRATION_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_REGISTRATION_URLS} URLs per request")
+    return await registry.register_agents_by_url(registration.urls, registration.concurrency)
+
+
+@agent_router.post("/register/bulk/manifest")
+async def register_agents_from_manifest(
+    manifest: UploadFile = File(..., description="JSON (URL list, {\"urls\": [...]} or {\"agents\": [{\"url\": ...}]}) or one URL per line"),
+    concurrency: Optional[int] = Query(None, ge=1, le=100),
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Bulk registration from an uploaded manifest file (Admin only).
+    """
+    try:
+        urls = _parse_agent_manifest((await manifest.read()).decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid manifest: {e}")
+    if len(urls) > MAX_BULK_REGISTRATION_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_REGISTRATION_URLS} URLs per manifest")
+    return await registry.register_agents_by_url(urls, concurrency)
+
+
+def _parse_agent_manifest(content: str) -> List[str]:
+    """manifest -> URL 목록 (JSON 또는 줄 단위 텍스트, '#' 주석 허용)"""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return [
+            line.strip() for line in content.splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+    
+    if isinstance(data, dict):
+        data = data.get("urls", data.get("agents"))
+    if not isinstance(data, list):
+        raise ValueError("expected a list of URLs or an object with 'urls' / 'agents'")
+    urls = []
+    for entry in data:
+        url = entry.get("url") if isinstance(entry, dict) else entry
+        if not isinstance(url, str):
+            raise ValueError(f"invalid manifest entry: {entry!r}")
+        urls.append(url)
+    return urls
+
+
 @agent_router.delete("/{agent_id}")
 async def unregister_agent(
     agent_id: str,
@@ -300,13 +385,79 @@ async def unregister_agent(
     raise HTTPException(status_code=404, detail="Agent not found")
 
 
+@agent_router.post("/{agent_id}/replicas", response_model=AgentInfo)
+async def add_agent_replica(
+    agent_id: str,
+    registration: AgentURLRegistration,
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Add a replica URL to an existing agent (Admin only).
+    A2A calls are load-balanced across the agent's healthy replicas.
+    """
+    agent = registry.add_replica(agent_id, registration.url)
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return agent
+
+
+@agent_router.delete("/{agent_id}/replicas")
+async def remove_agent_replica(
+    agent_id: str,
+    url: str = Query(..., description="Replica URL to remove"),
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Remove a replica URL from an agent (Admin only).
+    The last replica cannot be removed; unregister the agent instead.
+    """
+    if registry.get_agent(agent_id) is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    if not registry.remove_replica(agent_id, url):
+        raise HTTPException(status_code=400, detail="Unknown replica or last remaining replica")
+    return {"status": "removed", "agent_id": agent_id, "replicas": registry.get_replica_urls(agent_id)}
+
+
+@agent_router.post("/heartbeat")
+async def agent_heartbeat_batch(batch: AgentHeartbeatBatch):
+    """
+    Batched heartbeat: renew health-check leases for many agents in one request.
+    Agents with a valid lease are not polled by the health checker.
+    """
+    agent_ids = list(batch.agent_ids)
+    unknown_urls = []
+    for url in batch.agent_urls:
+        agent = registry.get_agent_by_url(url)
+        if agent:
+            agent_ids.append(agent.id)
+        else:
+            unknown_urls.append(url)
+    
+    renewed, unknown_ids = registry.heartbeat_many(agent_ids, batch.lease_seconds)
+    return {
+        "status": "ok",
+        "renewed": renewed,
+        "unknown_agent_ids": unknown_ids,
+        "unknown_agent_urls": unknown_urls,
+        "lease_seconds": registry.resolve_lease_seconds(batch.lease_seconds)
+    }
+
+
 @agent_router.post("/{agent_id}/heartbeat")
-async def agent_heartbeat(agent_id: str):
+async def agent_heartbeat(
+    agent_id: str,
+    lease_seconds: Optional[float] = Query(None, description="Requested lease duration (seconds)")
+):
     """
     Agent heartbeat to indicate it's still alive.
+    Renews the agent's health-check lease (polling is skipped while the lease is valid).
     """
-    if registry.heartbeat(agent_id):
-        return {"status": "ok", "agent_id": agent_id}
+    if registry.heartbeat(agent_id, lease_seconds):
+        return {
+            "status": "ok",
+            "agent_id": agent_id,
+            "lease_seconds": registry.resolve_lease_seconds(lease_seconds)
+        }
     raise HTTPException(status_code=404, detail="Agent not found")
 
 
@@ -334,6 +485,32 @@ async def get_monitoring_status(
     return registry.get_monitoring_status()
 
 
+@agent_router.get("/vector-sync/status")
+async def get_vector_sync_status(
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Get vector store sync pipeline status (Admin only).
+    Includes pending queue size, flush counts and embedding/skip metrics.
+    """
+    return get_vector_sync_pipeline().get_status()
+
+
+@agent_router.post("/vector-sync")
+async def resync_vector_store(
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """
+    Re-sync all registered agents to the vector store (Admin only).
+    Agents whose description is unchanged are not re-embedded.
+    """
+    synced = await get_hybrid_router().sync_agents_to_vector_store()
+    return {
+        "synced": synced,
+        "status": get_vector_sync_pipeline().get_status()
+    }
+
+
 @agent_router.get("/{agent_id}/metrics")
 async def get_agent_metrics(
     agent_id: str,
@@ -398,6 +575,15 @@ async def health_check():
     }
 
 
+@status_router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus/OpenMetrics exposition (aggregated across workers in multiprocess mode).
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @status_router.get("/")
 async def root():
     """
@@ -411,7 +597,8 @@ async def root():
             "chat": "/api/chat/message",
             "chat_stream": "/api/chat/message/stream",
             "agents": "/api/agents",
-            "health": "/health"
+            "health": "/health",
+            "metrics": "/metrics"
         }
     }
 
@@ -580,7 +767,9 @@ async def register_mcp_token(
                 token_name=request.token_name,
                 expires_at=expires_at
             )
-            return {"status": "success", "token_info": result}
+        # 이전 토큰 / "토큰 없음" 캐시 제거
+        await get_token_cache().delete(current_user.id, request.token_name)
+        return {"status": "success", "token_info": result}
             
     except Exception as e:
         logger.error(f"Failed to register MCP token: {e}")
@@ -659,6 +848,7 @@ async def delete_mcp_token(
             )
             
             if deleted:
+                await get_token_cache().delete(current_user.id, token_name)
                 return {"status": "success", "message": "Token deleted"}
             else:
                 raise HTTPException(status_code=404, detail="Token not found")
@@ -688,6 +878,7 @@ async def deactivate_mcp_token(
             )
             
             if deactivated:
+                await get_token_cache().delete(current_user.id, token_name)
                 return {"status": "success", "message": "Token deactivated"}
             else:
                 raise HTTPException(status_code=404, detail="Token not found")
@@ -4,25 +4,26 @@ FastAPI dependencies for authentication
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from ..database import get_db
 from .security import decode_token
-from .service import auth_service
 from .models import UserInDB
+from .user_cache import get_user_cache
 
 # HTTP Bearer token scheme
 security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> UserInDB:
     """
     Dependency to get current authenticated user.
     Raises 401 if not authenticated.
+
+    Does not depend on get_db: a pooled session is checked out only on a user
+    cache miss and returned right after the lookup, so it is never held for the
+    lifetime of the endpoint (e.g. an SSE stream).
     """
     if not credentials:
         raise HTTPException(
@@ -58,7 +59,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = await auth_service.get_user_by_id(db, user_id)
+    user = await get_user_cache().get_user(user_id)
     
     if not user:
         raise HTTPException(
@@ -89,18 +90,18 @@ async def get_current_user(
 
 
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[UserInDB]:
     """
     Dependency to get current user if authenticated.
     Returns None if not authenticated (doesn't raise error).
+    Anonymous requests never touch the database.
     """
     if not credentials:
         return None
     
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(credentials)
     except HTTPException:
         return None
 
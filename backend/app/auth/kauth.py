@@ -19,6 +19,7 @@ from sqlalchemy import text
 
 from ..database import get_db_session
 from .service import create_access_token, get_password_hash
+from .user_cache import get_user_cache
 
 
 # ==================== PKCE Helper Functions ====================
@@ -285,7 +286,10 @@ async def find_or_create_user(db: AsyncSession, kauth_user: dict) -> dict:
             """),
             {"email": email, "name": full_name, "role_id": role_id, "kauth_id": kauth_user_id}
         )
+        # 로그인 시 role / email 동기화 - 캐시된 사용자 정보 무효화
+        await get_user_cache().notify(db, [user_row.id])
         await db.commit()
+        await get_user_cache().invalidate([user_row.id])
         
         return {
             "id": user_row.id,
@@ -314,7 +318,10 @@ async def find_or_create_user(db: AsyncSession, kauth_user: dict) -> dict:
             """),
             {"kauth_id": kauth_user_id, "role_id": role_id, "email": email}
         )
+        # 로그인 시 role / email 동기화 - 캐시된 사용자 정보 무효화
+        await get_user_cache().notify(db, [user_row.id])
         await db.commit()
+        await get_user_cache().invalidate([user_row.id])
         
         return {
             "id": user_row.id,
@@ -344,7 +351,10 @@ async def find_or_create_user(db: AsyncSession, kauth_user: dict) -> dict:
             """),
             {"kauth_id": kauth_user_id, "email": email, "role_id": role_id, "username": username}
         )
+        # 로그인 시 role / email 동기화 - 캐시된 사용자 정보 무효화
+        await get_user_cache().notify(db, [user_row.id])
         await db.commit()
+        await get_user_cache().invalidate([user_row.id])
         
         return {
             "id": user_row.id,
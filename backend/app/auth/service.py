@@ -301,7 +301,10 @@ class AuthService:
                 text("UPDATE users SET role_id = :role_id WHERE id = :id"),
                 {"role_id": role_id, "id": user_id}
             )
+            from .user_cache import get_user_cache  # user_cache가 auth_service를 import
+            await get_user_cache().notify(db, [user_id])
             await db.commit()
+            await get_user_cache().invalidate([user_id])
             return True
         except Exception as e:
             logger.error(f"Error updating user role: {e}")
@@ -316,7 +319,10 @@ class AuthService:
                 text("DELETE FROM users WHERE id = :id"),
                 {"id": user_id}
             )
+            from .user_cache import get_user_cache
+            await get_user_cache().notify(db, [user_id])
             await db.commit()
+            await get_user_cache().invalidate([user_id])
             return True
         except Exception as e:
             logger.error(f"Error deleting user: {e}")
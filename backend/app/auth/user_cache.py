@@ -0,0 +1,298 @@
+"""
+User Cache - 인증된 요청의 사용자 조회 캐시
+
+get_current_user는 모든 인증 요청(SSE 스트림 포함)에서 users ⋈ roles 조회를 수행했습니다.
+- L1: 워커 프로세스 내 dict (TTL + 최대 개수), hit 시 JWT 디코드 + dict 조회만 수행
+- L2 (선택): Redis, 워커 간 공유 (AUTH_USER_CACHE_REDIS_ENABLED)
+- 무효화: K-Auth webhook / role 변경이 같은 트랜잭션에서 pg_notify → 모든 워커가 LISTEN으로 L1 제거
+  (LISTEN 연결이 끊긴 동안 놓친 무효화에 대비해 재연결 시 L1 전체 비움, 최종적으로는 TTL이 상한)
+
+캐시에는 password_hash를 비운 사본만 저장합니다 (인증 이후 경로에서는 사용하지 않음).
+"""
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..database import get_db_session
+from ..metrics import observe_redis, record_cache_lookup
+from .models import UserInDB
+from .service import auth_service
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+NOTIFY_CHANNEL = "auth_user_cache"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_KEY_PREFIX = "auth_user:"
+LISTENER_RETRY_SECONDS = 5.0
+
+
+class UserCache:
+    """TTL-bounded user lookup cache with cross-worker invalidation"""
+
+    def __init__(self):
+        settings = get_settings()
+        self.ttl = settings.auth_user_cache_ttl_seconds
+        self.max_entries = settings.auth_user_cache_max_entries
+        self.enabled = self.ttl > 0
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._entries: Dict[str, Tuple[UserInDB, float]] = {}  # user_id -> (user, 만료 시각)
+        # 조회 도중 해당 사용자가 무효화됐으면 (이전 값일 수 있으므로) 결과를 저장하지 않음.
+        # 세대는 조회 중인 사용자에 대해서만 유지 (user_id -> [진행 중 조회 수, 세대])
+        self._loading: Dict[str, List[int]] = {}
+        self._epoch = 0  # clear() (전체 무효화) 횟수
+        self._redis = None
+        self._listener = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+        self._stats = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "notifications_sent": 0,
+            "notifications_received": 0,
+            "evictions": 0,
+        }
+
+        if self.enabled and settings.auth_user_cache_redis_enabled:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+            except ImportError:
+                logger.warning("[UserCache] redis library not installed, Redis tier disabled")
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    async def get_user(self, user_id: str, db: Optional[AsyncSession] = None) -> Optional[UserInDB]:
+        """
+        사용자 조회 (L1 -> Redis -> DB).
+
+        db를 넘기지 않으면 DB 조회가 실제로 필요할 때만 세션을 열고 조회 직후 반환합니다.
+        """
+        key = str(user_id)
+        if not self.enabled:
+            return await self._load(key, db)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            user, expires_at = entry
+            if expires_at > time.monotonic():
+                self._stats["hits"] += 1
+                record_cache_lookup("auth_user", "l1", "hit")
+                return user
+            del self._entries[key]
+        record_cache_lookup("auth_user", "l1", "miss")
+
+        generation = self._begin_load(key)
+        try:
+            user = await self._redis_get(key)
+            if user is not None:
+                self._stats["redis_hits"] += 1
+            else:
+                self._stats["misses"] += 1
+                user = await self._load(key, db)
+                if user is None:
+                    return None
+                user = user.model_copy(update={"password_hash": ""})
+                if self._is_current(key, generation):
+                    await self._redis_set(key, user)
+
+            if self._is_current(key, generation):
+                self._store(key, user)
+            return user
+        finally:
+            self._end_load(key)
+
+    def _begin_load(self, key: str) -> Tuple[int, int]:
+        state = self._loading.setdefault(key, [0, 0])
+        state[0] += 1
+        return self._epoch, state[1]
+
+    def _end_load(self, key: str):
+        state = self._loading[key]
+        state[0] -= 1
+        if state[0] == 0:
+            del self._loading[key]
+
+    def _is_current(self, key: str, generation: Tuple[int, int]) -> bool:
+        """조회 시작 이후 이 사용자(또는 전체)가 무효화되지 않았는지"""
+        return generation == (self._epoch, self._loading[key][1])
+
+    @staticmethod
+    async def _load(key: str, db: Optional[AsyncSession]) -> Optional[UserInDB]:
+        if db is not None:
+            return await auth_service.get_user_by_id(db, key)
+        async with get_db_session() as session:
+            return await auth_service.get_user_by_id(session, key)
+
+    def _store(self, key: str, user: UserInDB):
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_entries:
+            # 가장 오래 전에 저장된 항목부터 제거
+            del self._entries[next(iter(self._entries))]
+            self._stats["evictions"] += 1
+        self._entries[key] = (user, time.monotonic() + self.ttl)
+
+    async def _redis_get(self, key: str) -> Optional[UserInDB]:
+        if self._redis is None:
+            return None
+        try:
+            with observe_redis("get"):
+                cached = await self._redis.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.debug(f"[UserCache] Redis get failed: {e}")
+            return None
+        record_cache_lookup("auth_user", "redis", "hit" if cached else "miss")
+        return UserInDB.model_validate_json(cached) if cached else None
+
+    async def _redis_set(self, key: str, user: UserInDB):
+        if self._redis is None:
+            return
+        try:
+            with observe_redis("setex"):
+                await self._redis.setex(REDIS_KEY_PREFIX + key, max(1, int(self.ttl)), user.model_dump_json())
+        except Exception as e:
+            logger.debug(f"[UserCache] Redis set failed: {e}")
+
+    # =========================================================================
+    # Invalidation
+    # =========================================================================
+
+    async def notify(self, db: AsyncSession, user_ids: Iterable[str]):
+        """
+        다른 워커에 무효화 전파 (호출자의 트랜잭션 안에서 pg_notify - commit 시점에 전달).
+        commit 후에는 invalidate()로 이 워커와 Redis를 정리합니다.
+        """
+        ids = [str(user_id) for user_id in user_ids]
+        if not self.enabled or not ids:
+            return
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": json.dumps({"origin": self.worker_id, "ids": ids})}
+        )
+        self._stats["notifications_sent"] += 1
+
+    async def invalidate(self, user_ids: Iterable[str]):
+        """이 워커의 L1과 Redis에서 사용자 제거"""
+        ids = [str(user_id) for user_id in user_ids]
+        if not self.enabled or not ids:
+            return
+        self._invalidate_local(ids)
+        if self._redis is not None:
+            try:
+                with observe_redis("delete"):
+                    await self._redis.delete(*(REDIS_KEY_PREFIX + user_id for user_id in ids))
+            except Exception as e:
+                logger.warning(f"[UserCache] Redis invalidation failed: {e}")
+
+    def _invalidate_local(self, ids: Iterable[str]):
+        for user_id in ids:
+            self._entries.pop(user_id, None)
+            state = self._loading.get(user_id)
+            if state is not None:
+                state[1] += 1
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        self._epoch += 1
+        self._entries.clear()
+
+    # =========================================================================
+    # LISTEN (다른 워커의 무효화 수신)
+    # =========================================================================
+
+    def start(self):
+        if not self.enabled or not ASYNCPG_AVAILABLE:
+            return
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_loop())
+
+    async def stop(self):
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        await self._close_listener()
+        if self._redis is not None:
+            await self._redis.close()
+
+    async def _close_listener(self):
+        if self._listener is not None:
+            try:
+                await self._listener.close()
+            except Exception:
+                pass
+            self._listener = None
+
+    async def _listen_loop(self):
+        settings = get_settings()
+        while True:
+            try:
+                self._listener = await asyncpg.connect(
+                    host=settings.db_host,
+                    port=settings.db_port,
+                    database=settings.db_name,
+                    user=settings.db_user,
+                    password=settings.db_password or ""
+                )
+                await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                # 연결 전/끊긴 동안의 무효화를 놓쳤을 수 있음
+                self.clear()
+                logger.info("[UserCache] Listening for user invalidations")
+                while not self._listener.is_closed():
+                    await asyncio.sleep(LISTENER_RETRY_SECONDS)
+                logger.warning("[UserCache] Invalidation listener disconnected")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[UserCache] Invalidation listener unavailable ({type(e).__name__}: {e}); relying on TTL")
+            await self._close_listener()
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.worker_id:
+            return
+        self._stats["notifications_received"] += 1
+        self._invalidate_local(message.get("ids", []))
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl_s": self.ttl,
+            "entries": len(self._entries),
+            "redis": self._redis is not None,
+            "listening": self._listener is not None and not self._listener.is_closed(),
+            **self._stats,
+        }
+
+
+_user_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    """UserCache 싱글톤"""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache()
+    return _user_cache
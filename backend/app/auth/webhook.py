@@ -12,6 +12,8 @@ from loguru import logger
 from sqlalchemy import text
 
 from ..database import get_db_session
+from ..token_cache import get_token_cache
+from .user_cache import get_user_cache
 
 # Webhook secret (must match the one registered in K-Auth)
 WEBHOOK_SECRET = os.getenv("KAUTH_WEBHOOK_SECRET", "k-auth-webhook-secret-key")
@@ -146,7 +148,11 @@ async def handle_user_deleted(user_id: str, data: dict):
             {"user_id": local_user_id}
         )
         
+        # 다른 워커의 사용자 캐시 무효화 (commit 시 전달)
+        await get_user_cache().notify(db, [local_user_id])
         await db.commit()
+        await get_user_cache().invalidate([local_user_id])
+        await get_token_cache().clear_user_tokens(local_user_id)
         logger.info(f"[Webhook] User {username} deleted successfully")
 
 
@@ -165,16 +171,20 @@ async def handle_role_changed(user_id: str, data: dict):
         is_admin = new_role == "admin"
         role_id = 1 if is_admin else 2
         
-        await db.execute(
+        result = await db.execute(
             text("""
                 UPDATE users 
                 SET role_id = :role_id, updated_at = NOW()
                 WHERE kauth_user_id = :kauth_id
+                RETURNING id
             """),
             {"role_id": role_id, "kauth_id": user_id}
         )
+        local_user_ids = [row.id for row in result.fetchall()]
         
+        await get_user_cache().notify(db, local_user_ids)
         await db.commit()
+        await get_user_cache().invalidate(local_user_ids)
         logger.info(f"[Webhook] Role updated for {username}: {new_role}")
 
 
@@ -217,7 +227,9 @@ async def handle_user_disabled(user_id: str, data: dict):
             {"user_id": local_user_id}
         )
         
+        await get_user_cache().notify(db, [local_user_id])
         await db.commit()
+        await get_user_cache().invalidate([local_user_id])
         logger.info(f"[Webhook] User {username} disabled and sessions revoked")
 
 
@@ -230,11 +242,14 @@ async def handle_user_enabled(user_id: str, data: dict):
     logger.info(f"[Webhook] Processing user enable: {username}")
     
     async with get_db_session() as db:
-        await db.execute(
-            text("UPDATE users SET is_active = true, updated_at = NOW() WHERE kauth_user_id = :kauth_id"),
+        result = await db.execute(
+            text("UPDATE users SET is_active = true, updated_at = NOW() WHERE kauth_user_id = :kauth_id RETURNING id"),
             {"kauth_id": user_id}
         )
+        local_user_ids = [row.id for row in result.fetchall()]
+        await get_user_cache().notify(db, local_user_ids)
         await db.commit()
+        await get_user_cache().invalidate(local_user_ids)
         logger.info(f"[Webhook] User {username} enabled")
 
 
@@ -0,0 +1,210 @@
+"""
+Adaptive Concurrency Limiter - 에이전트별 동시 요청 수 제한 (AIMD) 및 retry budget
+
+에이전트가 감당할 수 있는 동시 요청 수를 관측 지연시간으로 추정합니다.
+- 지연이 기준(최근 5분 p50 x tolerance) 이내로 성공하면 limit을 천천히 증가 (additive increase)
+  (지연은 send 응답 시간, 스트리밍은 전체 시간 대신 TTFB)
+- 실패 또는 지연 증가 시 limit을 비율로 감소 (multiplicative decrease, 기준 지연당 1회)
+- limit 초과 요청은 deadline까지 대기열에서 기다리고, 대기열이 가득 차거나 deadline을 넘기면 즉시 거절
+
+Retry budget: 재시도는 요청 수의 일정 비율(+ 초당 최소 허용량) 이내로만 허용해
+과부하 상태에서 재시도가 부하를 증폭시키지 않도록 합니다.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+
+class AgentOverloadedError(Exception):
+    """동시 요청 limit 초과로 거절된 요청 (reason: queue_full / queue_timeout)"""
+
+    def __init__(self, reason: str, limit: int):
+        self.reason = reason
+        self.limit = limit
+        super().__init__(f"Agent overloaded ({reason}, limit={limit})")
+
+
+class RetryBudget:
+    """
+    요청마다 ratio 만큼 적립되고 재시도마다 1씩 차감되는 budget.
+    적립 잔액이 없어도 초당 min_per_second 만큼은 재시도를 허용합니다 (저트래픽 에이전트).
+    """
+
+    __slots__ = ("ratio", "min_per_second", "max_balance", "_balance", "_reserve", "_reserve_at", "allowed", "denied")
+
+    def __init__(self, ratio: float, min_per_second: float):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        # 최근 약 100개 요청분까지만 적립
+        self.max_balance = max(1.0, ratio * 100)
+        self._balance = 0.0
+        self._reserve = min_per_second
+        self._reserve_at = time.monotonic()
+        self.allowed = 0
+        self.denied = 0
+
+    def deposit(self):
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        self._reserve = min(self.min_per_second, self._reserve + (now - self._reserve_at) * self.min_per_second)
+        self._reserve_at = now
+
+        if self._balance >= 1.0:
+            self._balance -= 1.0
+        elif self._reserve >= 1.0:
+            self._reserve -= 1.0
+        else:
+            self.denied += 1
+            return False
+        self.allowed += 1
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            "balance": round(self._balance, 2),
+            "retries_allowed": self.allowed,
+            "retries_denied": self.denied,
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """에이전트 1개의 AIMD 동시성 limit + 대기열"""
+
+    # 기준 지연(baseline) 재계산 주기
+    BASELINE_REFRESH_SECONDS = 5.0
+
+    def __init__(
+        self,
+        baseline_ms: Callable[[], float],
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+        queue_size: int = 50,
+        queue_timeout: float = 2.0,
+        retry_budget: Optional[RetryBudget] = None
+    ):
+        self._baseline_source = baseline_ms
+        self._limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_budget = retry_budget or RetryBudget(0.1, 1.0)
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._baseline_ms = 0.0
+        self._baseline_at = 0.0
+        self._next_decrease_at = 0.0
+        self._stats: Dict[str, int] = {"admitted": 0, "queued": 0, "queue_full": 0, "queue_timeout": 0, "decreases": 0}
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """슬롯 획득. 대기열이 가득 차거나 timeout 초과 시 AgentOverloadedError"""
+        if self.in_flight < self.limit and not self._waiters:
+            self._admit()
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self._stats["queue_full"] += 1
+            raise AgentOverloadedError("queue_full", self.limit)
+
+        self._stats["queued"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self._discard_waiter(waiter)
+            self._stats["queue_timeout"] += 1
+            raise AgentOverloadedError("queue_timeout", self.limit)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됨 -> 반환
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._discard_waiter(waiter)
+            raise
+        # 슬롯은 release()에서 넘겨받음 (in_flight 증가 완료)
+        self._stats["admitted"] += 1
+        self.retry_budget.deposit()
+
+    def try_acquire(self) -> bool:
+        """대기 없이 남는 슬롯이 있을 때만 획득 (hedge 등 부가 요청용, 대기열은 건드리지 않음)"""
+        if self.in_flight < self.limit and not self._waiters:
+            self._admit()
+            return True
+        return False
+
+    def release(self, latency_ms: float, outcome: str):
+        """
+        슬롯 반환 및 limit 조정.
+        outcome: success / failure / cancelled (cancelled는 limit에 반영하지 않음)
+        """
+        utilized = self.in_flight >= self.limit / 2
+        self.in_flight = max(0, self.in_flight - 1)
+        if outcome != "cancelled":
+            self._adjust(latency_ms, outcome == "success", utilized)
+        self._wake()
+
+    def _admit(self):
+        self.in_flight += 1
+        self._stats["admitted"] += 1
+        self.retry_budget.deposit()
+
+    def _discard_waiter(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _baseline(self) -> float:
+        now = time.monotonic()
+        if now - self._baseline_at >= self.BASELINE_REFRESH_SECONDS:
+            self._baseline_ms = self._baseline_source()
+            self._baseline_at = now
+        return self._baseline_ms
+
+    def _adjust(self, latency_ms: float, success: bool, utilized: bool):
+        baseline = self._baseline()
+        congested = not success or (baseline > 0 and latency_ms > baseline * self.latency_tolerance)
+
+        if congested:
+            now = time.monotonic()
+            # 같은 혼잡 구간(기준 지연 1회분)에서 여러 번 감소하지 않도록
+            if now >= self._next_decrease_at:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                self._next_decrease_at = now + max(0.1, baseline / 1000)
+                self._stats["decreases"] += 1
+        elif utilized:
+            # limit을 채워 쓰는 경우에만 증가 (limit 1개 창당 +1)
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "baseline_latency_ms": round(self._baseline_ms, 2),
+            **self._stats,
+            "retry_budget": self.retry_budget.to_dict(),
+        }
@@ -51,7 +51,97 @@ class Settings(BaseSettings):
     
     # Legacy compatibility (deprecated, use openai_model instead)
     llm_model: str = "gpt-4o"
+
+    # ==========================================================================
+    # Embedding Configuration (Agent vector routing)
+    # ==========================================================================
+    # Embedding Provider: "openai" (API) or "local" (offline n-gram hashing)
+    # Falls back to "local" when the configured provider is unavailable
+    embedding_provider: Literal["openai", "local"] = "openai"
+    openai_embedding_model: str = "text-embedding-ada-002"
+    local_embedding_dimension: int = 512
+
+    # pgvector ANN index for agent search: "hnsw", "ivfflat", or "none" (exact scan)
+    # 인덱스는 임베딩 차원별 partial expression index로 스키마 초기화 시 생성
+    vector_index_type: Literal["hnsw", "ivfflat", "none"] = "hnsw"
+    vector_hnsw_m: int = 16
+    vector_hnsw_ef_construction: int = 64
+    vector_hnsw_ef_search: int = 40  # 검색 시 후보 수 (높을수록 정확, 느림)
+    vector_ivfflat_lists: int = 100
+    vector_ivfflat_probes: int = 10
+    # 멀티 벡터(description/skill/example) 인덱스를 프로세스 메모리에 유지하여 검색
+    vector_in_process_index: bool = True
+
+    # Conversation affinity (후속 발화는 직전 에이전트 재사용)
+    affinity_enabled: bool = True
+    # 다른 에이전트 유사도가 직전 에이전트보다 이 값 이상 높으면 토픽 전환으로 판단
+    affinity_shift_margin: float = 0.1
+
+    # Agent health checks (registry)
+    health_check_interval_seconds: float = 30.0
+    health_check_concurrency: int = 20  # 동시 probe 수
+    health_check_timeout_seconds: float = 5.0
+    health_check_jitter: float = 0.2  # 점검 주기 ±20% 분산
+    health_check_max_backoff_seconds: float = 300.0  # 오프라인 에이전트 최대 점검 간격
+    # Heartbeat lease: lease 유효 기간 동안 health check 생략
+    heartbeat_lease_seconds: float = 45.0
+    heartbeat_max_lease_seconds: float = 300.0
+    # Agent Card fetch: 경로 동시 탐색 + ETag/Last-Modified conditional 재검증
+    agent_card_fetch_timeout_seconds: float = 10.0
+    agent_card_refresh_interval_seconds: float = 300.0  # 주기적 card 재검증 (0이면 비활성화)
+    agent_card_refresh_concurrency: int = 8
+    agent_bulk_register_concurrency: int = 16  # bulk 등록 시 동시 Agent Card 조회 수
+    
+    # Prometheus metrics (/metrics)
+    # 멀티 워커 배포 시 PROMETHEUS_MULTIPROC_DIR 환경변수 설정 필요
+    metrics_sample_interval_seconds: float = 5.0  # 커넥션 풀 사용량 샘플링 주기
     
+    # Agent HTTP connection pools (에이전트 origin별 분리)
+    agent_http_max_connections: int = 20  # origin당 최대 커넥션
+    agent_http_max_keepalive: int = 10  # origin당 유휴 keepalive 커넥션
+    agent_http_keepalive_expiry_seconds: float = 30.0
+    agent_http_http2: bool = False  # HTTP/2 (ALPN 협상, h2 패키지 필요)
+    agent_http_connect_timeout_seconds: float = 5.0
+    agent_http_read_timeout_seconds: float = 90.0
+    agent_http_pool_timeout_seconds: float = 5.0  # 풀에서 커넥션 대기 최대 시간
+    agent_http_prewarm: bool = True  # 등록 시 커넥션 미리 연결
+    
+    # Adaptive per-agent concurrency (AIMD) & retry budget
+    agent_concurrency_initial_limit: int = 20
+    agent_concurrency_min_limit: int = 1
+    agent_concurrency_max_limit: int = 200
+    agent_concurrency_latency_tolerance: float = 2.0  # 최근 p50 대비 이 배수 초과 시 혼잡으로 판단
+    agent_concurrency_backoff_ratio: float = 0.9  # 혼잡 시 limit 감소 비율
+    agent_concurrency_queue_size: int = 50  # limit 초과 시 대기 가능한 요청 수
+    agent_concurrency_queue_timeout_seconds: float = 2.0  # 대기 deadline, 초과 시 거절
+    a2a_max_attempts: int = 3  # 재시도 포함 최대 시도 횟수 (retry budget 내에서만 재시도)
+    a2a_retry_budget_ratio: float = 0.1  # 재시도는 요청 수의 10% 이내
+    a2a_retry_min_per_second: float = 1.0  # budget과 무관하게 허용되는 초당 재시도
+    
+    # Multi-replica agents (load balancing & hedged requests)
+    agent_replica_balancing: str = "p2c"  # p2c (power-of-two-choices) / least_outstanding
+    agent_replica_eject_failures: int = 3  # 연속 실패 시 replica를 후보에서 제외
+    agent_replica_eject_seconds: float = 30.0
+    a2a_hedging_enabled: bool = True  # idempotent 호출을 두 번째 replica로 hedge
+    a2a_hedge_quantile: float = 0.95  # hedge 지연 = 최근 5분 지연 분위수
+    a2a_hedge_min_delay_ms: float = 50.0
+    
+    # Shared registry across workers (registered_agents + LISTEN/NOTIFY)
+    registry_persistence_enabled: bool = True  # DB 연결 실패 시 워커별 메모리 레지스트리로 동작
+    registry_leader_retry_seconds: float = 5.0  # health probe leader 선출 / LISTEN 재연결 주기
+    
+    # Registry warm-start snapshot (msgpack + mmap 벡터 블록)
+    registry_snapshot_path: str = "data/registry_snapshot.bin"  # 빈 값이면 비활성화
+    registry_snapshot_interval_seconds: float = 60.0  # 변경이 있을 때만 저장
+    registry_snapshot_max_age_seconds: float = 7 * 24 * 3600  # 이보다 오래된 snapshot은 무시
+    registry_snapshot_revalidate_concurrency: int = 8  # 시작 후 Agent Card 재검증 동시 요청 수
+
+    # Authenticated user cache (get_current_user): L1 in-process + optional Redis L2
+    # K-Auth webhook / role 변경 시 LISTEN/NOTIFY로 모든 워커에서 즉시 무효화
+    auth_user_cache_ttl_seconds: float = 60.0  # 0이면 비활성화
+    auth_user_cache_max_entries: int = 10000
+    auth_user_cache_redis_enabled: bool = False
+
     # Database Configuration
     db_host: str = "localhost"
     db_port: int = 5432
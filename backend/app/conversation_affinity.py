@@ -0,0 +1,360 @@
+"""
+Conversation Affinity - 후속 발화에 대한 에이전트 고정(sticky) 라우팅
+
+"그거 담당자 바꿔줘" 처럼 직전 에이전트와 이어지는 발화는 workflow 분석/라우팅을
+다시 거치지 않고 직전 에이전트를 재사용합니다. 다음 중 하나라도 해당하면 토픽 전환으로
+판단하여 전체 라우팅으로 돌아갑니다.
+
+1. 다른 에이전트를 명시적으로 언급 (HybridRouter.EXPLICIT_KEYWORDS)
+2. 멀티 에이전트 워크플로우 패턴 ("검색하고 정리해줘", "이 결과 문서로 저장해줘" 등)
+3. 임베딩 유사도상 다른 에이전트가 직전 에이전트보다 확실히 가까움
+   (단, 직전 사용자 발화와 충분히 유사하면 이어지는 대화로 간주)
+
+에이전트 프로필(설명 / 스킬 설명 / 예시 발화) 임베딩은 AgentCatalog version마다 한 번
+행렬로 구성하고 (바뀐 텍스트만 새로 임베딩), 턴마다 행렬곱 한 번으로 에이전트 점수를 계산합니다.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .agent_catalog import AgentCatalog
+from .config import get_settings
+from .embedding_client import get_embedding_client
+from .models import AgentInfo, ChatMessage, Conversation, MessageRole, RoutingDecision
+from .registry import registry
+from .hybrid_router import HybridRouter
+from .workflow import PatternBasedWorkflowAnalyzer
+
+
+@dataclass
+class _AgentProfiles:
+    """catalog version 하나의 에이전트 프로필 임베딩 행렬 (에이전트 row는 연속 구간)"""
+    version: int
+    positions: Dict[str, int]  # agent_id -> 에이전트 순번
+    matrix: Optional[np.ndarray]  # (전체 텍스트 수, dim), L2 정규화
+    offsets: Optional[np.ndarray]  # 에이전트별 시작 row
+    text_vectors: Dict[str, np.ndarray]  # 다음 version 재구성 시 재사용
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """에이전트별 max-sim 점수 (positions 순번 기준)"""
+        if self.matrix is None:
+            return np.zeros(0, dtype=np.float32)
+        return np.maximum.reduceat(self.matrix @ query, self.offsets)
+
+
+class ConversationAffinity:
+    """
+    Sticky agent affinity with a cheap topic-shift detector.
+
+    에이전트 프로필은 catalog version당 한 번 행렬로 임베딩하고, 발화 임베딩은 작은 LRU에
+    보관하므로 턴마다 새로 임베딩하는 것은 현재 메시지 하나뿐입니다.
+    """
+
+    # 멀티스텝 요청 연결어 (워크플로우 분석 필요)
+    CHAIN_CONNECTORS = ["그리고", "다음에", "후에", "그 결과", "바탕으로"]
+
+    def __init__(self, cache_size: int = 256):
+        self.settings = get_settings()
+        self._cache_size = cache_size
+        # 사용자 발화 임베딩 (현재 메시지가 다음 턴의 직전 발화)
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._profiles: Optional[_AgentProfiles] = None
+        self._pattern_analyzer = PatternBasedWorkflowAnalyzer()
+        self._stats: Dict[str, int] = {
+            "checks": 0,
+            "hits": 0,
+            "no_previous_agent": 0,
+            "agent_unavailable": 0,
+            "shift_explicit": 0,
+            "shift_workflow": 0,
+            "shift_semantic": 0,
+            "disabled_by_request": 0,
+            "errors": 0,
+        }
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def resolve(
+        self,
+        conversation: Conversation,
+        message: str,
+        enabled_agent_ids: Optional[List[str]] = None,
+        sticky_routing: Optional[bool] = None
+    ) -> Optional[RoutingDecision]:
+        """
+        직전 에이전트 재사용 여부 판단
+
+        Args:
+            conversation: 현재 사용자 메시지가 이미 추가된 대화
+            message: 현재 사용자 메시지
+            enabled_agent_ids: 활성화된 에이전트 ID 목록
+            sticky_routing: 요청 단위 override (False면 항상 전체 라우팅)
+
+        Returns:
+            재사용할 RoutingDecision, 전체 라우팅이 필요하면 None
+        """
+        if sticky_routing is False:
+            self._stats["disabled_by_request"] += 1
+            return None
+        if not self.settings.affinity_enabled and sticky_routing is None:
+            return None
+
+        self._stats["checks"] += 1
+
+        previous_agent_name, previous_user_message = self._find_previous_turn(conversation)
+        if not previous_agent_name:
+            self._stats["no_previous_agent"] += 1
+            return None
+
+        catalog = registry.get_catalog()
+        agents = self._available_agents(catalog, enabled_agent_ids)
+        sticky_agent = next((a for a in agents if a.name == previous_agent_name), None)
+        if not sticky_agent:
+            self._stats["agent_unavailable"] += 1
+            logger.debug(f"[Affinity] Previous agent no longer available: {previous_agent_name}")
+            return None
+
+        message_lower = message.lower()
+
+        if self._mentions_other_agent(message_lower, sticky_agent, agents):
+            self._stats["shift_explicit"] += 1
+            logger.debug(f"[Affinity] Explicit shift away from {sticky_agent.name}")
+            return None
+
+        if self._is_workflow_request(message, agents, catalog, conversation):
+            self._stats["shift_workflow"] += 1
+            logger.debug("[Affinity] Multi-agent workflow request, full routing")
+            return None
+
+        try:
+            shifted, continuity, sticky_score, best_other = await self._semantic_shift(
+                message, previous_user_message, sticky_agent, agents, catalog
+            )
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"[Affinity] Topic-shift check failed, full routing: {e}")
+            return None
+
+        if shifted:
+            self._stats["shift_semantic"] += 1
+            logger.debug(
+                f"[Affinity] Semantic shift from {sticky_agent.name} "
+                f"(sticky={sticky_score:.3f}, other={best_other:.3f}, continuity={continuity:.3f})"
+            )
+            return None
+
+        self._stats["hits"] += 1
+        logger.info(f"[Affinity] Reusing {sticky_agent.name} for follow-up (continuity={continuity:.3f})")
+        return RoutingDecision(
+            agent_id=sticky_agent.id,
+            agent_name=sticky_agent.name,
+            agent_url=sticky_agent.url,
+            confidence=max(sticky_score, continuity, 0.5),
+            reasoning=f"Conversation affinity (continuity: {continuity:.3f})"
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        """affinity 카운터 및 hit rate"""
+        checks = self._stats["checks"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / checks, 4) if checks else 0.0,
+            "embedding_cache_size": len(self._embedding_cache),
+            "profile_version": self._profiles.version if self._profiles else None,
+            "profile_vectors": len(self._profiles.text_vectors) if self._profiles else 0,
+        }
+
+    # =========================================================================
+    # Checks
+    # =========================================================================
+
+    @staticmethod
+    def _find_previous_turn(conversation: Conversation) -> Tuple[Optional[str], Optional[str]]:
+        """직전 assistant 메시지의 에이전트와 그 직전 사용자 발화"""
+        messages: List[ChatMessage] = conversation.messages
+        # 마지막 메시지는 현재 사용자 메시지
+        for i in range(len(messages) - 2, -1, -1):
+            if messages[i].role != MessageRole.ASSISTANT:
+                continue
+            agent_name = (messages[i].metadata or {}).get("agent")
+            previous_user = next(
+                (m.content for m in reversed(messages[:i]) if m.role == MessageRole.USER),
+                None
+            )
+            return agent_name, previous_user
+        return None, None
+
+    @staticmethod
+    def _available_agents(catalog: AgentCatalog, enabled_agent_ids: Optional[List[str]]) -> List[AgentInfo]:
+        """catalog의 온라인 에이전트 중 circuit이 열려 있지 않고 활성화된 에이전트 (catalog 순서)"""
+        enabled = set(enabled_agent_ids) if enabled_agent_ids is not None else None
+        return [
+            a for a in catalog.agents
+            if (enabled is None or a.id in enabled) and registry.is_agent_available(a.id)
+        ]
+
+    def _mentions_other_agent(self, message_lower: str, sticky_agent: AgentInfo, agents: List[AgentInfo]) -> bool:
+        """다른 에이전트(이름 또는 명시 키워드) 언급 여부"""
+        for agent in agents:
+            if agent.id != sticky_agent.id and agent.name.lower() in message_lower:
+                return True
+
+        sticky_name = sticky_agent.name.lower()
+        sticky_profile = " ".join(self._agent_texts(sticky_agent)).lower()
+        for agent_type, keywords in HybridRouter.EXPLICIT_KEYWORDS.items():
+            if agent_type in sticky_name:
+                continue
+            # 직전 에이전트 프로필에도 있는 키워드("페이지", "이슈" 등)는 전환 근거로 보지 않음
+            mentioned = [kw for kw in keywords if kw in message_lower and kw not in sticky_profile]
+            # 해당 타입의 에이전트가 실제로 있을 때만 전환
+            if mentioned and any(agent_type in a.name.lower() for a in agents):
+                return True
+        return False
+
+    def _is_workflow_request(
+        self,
+        message: str,
+        agents: List[AgentInfo],
+        catalog: AgentCatalog,
+        conversation: Conversation
+    ) -> bool:
+        """멀티 에이전트 체이닝 요청 여부 (패턴 분석기 재사용)"""
+        if any(c in message for c in self.CHAIN_CONNECTORS):
+            return True
+
+        previous_response = next(
+            (m.content for m in reversed(conversation.messages) if m.role == MessageRole.ASSISTANT),
+            None
+        )
+        # agents는 catalog.agents의 부분열 - 미리 만들어 둔 dict view 사용
+        agent_dicts: Sequence[Dict] = catalog.agent_dicts
+        if len(agents) != len(catalog):
+            ids = {a.id for a in agents}
+            agent_dicts = [d for d in catalog.agent_dicts if d["id"] in ids]
+        return self._pattern_analyzer.analyze(message, agent_dicts, previous_response) is not None
+
+    async def _semantic_shift(
+        self,
+        message: str,
+        previous_user_message: Optional[str],
+        sticky_agent: AgentInfo,
+        agents: List[AgentInfo],
+        catalog: AgentCatalog
+    ) -> Tuple[bool, float, float, float]:
+        """
+        임베딩 기반 토픽 전환 판단
+
+        Returns:
+            (shifted, continuity, sticky_score, best_other_score)
+        """
+        client = get_embedding_client()
+        profiles = await self._agent_profiles(catalog)
+
+        texts = [message]
+        if previous_user_message:
+            texts.append(previous_user_message)
+        vectors = await self._embed_cached(texts)
+        query = vectors[message]
+
+        continuity = float(query @ vectors[previous_user_message]) if previous_user_message else 0.0
+
+        scores = profiles.scores(query)
+        sticky_score = float(scores[profiles.positions[sticky_agent.id]])
+        others = [profiles.positions[a.id] for a in agents if a.id != sticky_agent.id]
+        best_other = float(scores[others].max()) if others else 0.0
+
+        # 직전 발화와 이어지면 유지, 아니면 다른 에이전트가 임계값 이상이고 margin 이상 앞설 때만 전환
+        shifted = (
+            continuity < client.routing_threshold
+            and best_other > client.routing_threshold
+            and best_other - sticky_score > self.settings.affinity_shift_margin
+        )
+        return shifted, continuity, sticky_score, best_other
+
+    async def _agent_profiles(self, catalog: AgentCatalog) -> _AgentProfiles:
+        """catalog version의 프로필 행렬 (이전 version에 없던 텍스트만 임베딩)"""
+        profiles = self._profiles
+        if profiles is not None and profiles.version == catalog.version:
+            return profiles
+
+        previous = profiles.text_vectors if profiles else {}
+        agent_texts = [self._agent_texts(a) for a in catalog.agents]
+        unique_texts = list(dict.fromkeys(t for texts in agent_texts for t in texts))
+        text_vectors = {t: previous[t] for t in unique_texts if t in previous}
+        missing = [t for t in unique_texts if t not in text_vectors]
+        if missing:
+            text_vectors.update(zip(missing, await self._embed_normalized(missing)))
+
+        matrix = offsets = None
+        if agent_texts:
+            matrix = np.vstack([text_vectors[t] for texts in agent_texts for t in texts])
+            counts = np.array([len(texts) for texts in agent_texts], dtype=np.intp)
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+
+        profiles = _AgentProfiles(
+            version=catalog.version,
+            positions={a.id: i for i, a in enumerate(catalog.agents)},
+            matrix=matrix,
+            offsets=offsets,
+            text_vectors=text_vectors
+        )
+        self._profiles = profiles
+        logger.debug(
+            f"[Affinity] Agent profiles rebuilt for catalog v{catalog.version} "
+            f"({len(unique_texts)} texts, {len(missing)} embedded)"
+        )
+        return profiles
+
+    @staticmethod
+    def _agent_texts(agent: AgentInfo) -> List[str]:
+        """에이전트 프로필 텍스트 (description, 스킬 설명, 예시 발화)"""
+        texts = [agent.description or agent.name]
+        for skill in agent.skills:
+            if skill.description:
+                texts.append(f"{skill.name}: {skill.description}")
+            texts.extend(e for e in skill.examples if e)
+        return texts
+
+    @staticmethod
+    async def _embed_normalized(texts: List[str]) -> np.ndarray:
+        embedded = await get_embedding_client().embed(texts)
+        norms = np.linalg.norm(embedded, axis=1, keepdims=True)
+        return np.divide(embedded, norms, out=np.zeros_like(embedded), where=norms > 0)
+
+    async def _embed_cached(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """LRU 캐시를 거쳐 L2 정규화된 발화 임베딩 반환 (미스만 배치 임베딩)"""
+        result: Dict[str, np.ndarray] = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            cached = self._embedding_cache.get(text)
+            if cached is not None:
+                self._embedding_cache.move_to_end(text)
+                result[text] = cached
+            else:
+                missing.append(text)
+
+        if missing:
+            for text, vector in zip(missing, await self._embed_normalized(missing)):
+                result[text] = vector
+                self._embedding_cache[text] = vector
+            while len(self._embedding_cache) > self._cache_size:
+                self._embedding_cache.popitem(last=False)
+
+        return result
+
+
+# 싱글톤 인스턴스
+_affinity: Optional[ConversationAffinity] = None
+
+
+def get_conversation_affinity() -> ConversationAffinity:
+    """ConversationAffinity 싱글톤 인스턴스 반환"""
+    global _affinity
+    if _affinity is None:
+        _affinity = ConversationAffinity()
+    return _affinity
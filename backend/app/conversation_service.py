@@ -10,6 +10,8 @@ from sqlalchemy import text
 
 from .database import get_db_session
 from .models import Conversation, ChatMessage, MessageRole
+from .request_timing import timed_async
+from .tracing import traced
 
 
 class ConversationService:
@@ -18,6 +20,8 @@ class ConversationService:
     대화와 메시지를 PostgreSQL에 저장/조회/삭제합니다.
     """
     
+    @traced("db.create_conversation", {"db.system": "postgresql", "db.operation": "create_conversation"})
+    @timed_async("db.create_conversation")
     async def create_conversation(
         self,
         user_id: str,
@@ -42,6 +46,8 @@ class ConversationService:
                 messages=[]
             )
     
+    @traced("db.get_conversation", {"db.system": "postgresql", "db.operation": "get_conversation"})
+    @timed_async("db.get_conversation")
     async def get_conversation(
         self,
         conversation_id: str,
@@ -108,6 +114,8 @@ class ConversationService:
                 updated_at=row[3]
             )
     
+    @traced("db.list_conversations", {"db.system": "postgresql", "db.operation": "list_conversations"})
+    @timed_async("db.list_conversations")
     async def list_conversations(
         self,
         user_id: str,
@@ -138,6 +146,8 @@ class ConversationService:
             
             return conversations
     
+    @traced("db.add_message", {"db.system": "postgresql", "db.operation": "add_message"})
+    @timed_async("db.add_message")
     async def add_message(
         self,
         conversation_id: str,
@@ -196,6 +206,8 @@ class ConversationService:
                 metadata=msg_metadata
             )
     
+    @traced("db.update_conversation_title", {"db.system": "postgresql", "db.operation": "update_conversation_title"})
+    @timed_async("db.update_conversation_title")
     async def update_conversation_title(
         self,
         conversation_id: str,
@@ -213,6 +225,8 @@ class ConversationService:
             await session.commit()
             return result.rowcount > 0
     
+    @traced("db.delete_conversation", {"db.system": "postgresql", "db.operation": "delete_conversation"})
+    @timed_async("db.delete_conversation")
     async def delete_conversation(
         self,
         conversation_id: str,
@@ -161,9 +161,11 @@ async def initialize_schema():
             name VARCHAR(255) NOT NULL,
             description TEXT,
             url VARCHAR(500) UNIQUE NOT NULL,
+            replicas JSONB DEFAULT '[]',
             version VARCHAR(50) DEFAULT '1.0.0',
             skills JSONB DEFAULT '[]',
             capabilities JSONB DEFAULT '{}',
+            requirements JSONB DEFAULT '{}',
             status VARCHAR(20) DEFAULT 'offline',
             registered_by UUID REFERENCES users(id),
             last_seen TIMESTAMP WITH TIME ZONE,
@@ -0,0 +1,231 @@
+"""
+Embedding Client abstraction layer for agent vector routing.
+Supports OpenAI embeddings and a local (offline) n-gram hashing vectorizer
+with a unified interface.
+"""
+import re
+import unicodedata
+import zlib
+from abc import ABC, abstractmethod
+from typing import Optional, List
+from loguru import logger
+import numpy as np
+
+from .config import get_settings
+
+
+class BaseEmbeddingClient(ABC):
+    """Abstract base class for embedding clients"""
+
+    # Identifier stored per row so that vectors from different models never mix
+    model_name: str = ""
+    # Default similarity threshold for routing decisions with this model
+    routing_threshold: float = 0.5
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Dimension of the produced vectors"""
+        pass
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension)
+        """
+        pass
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Check if the embedding client is properly configured and available"""
+        pass
+
+    async def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text"""
+        vectors = await self.embed([text])
+        return vectors[0]
+
+
+class OpenAIEmbeddingClient(BaseEmbeddingClient):
+    """OpenAI embeddings API client implementation"""
+
+    routing_threshold = 0.5
+
+    # Known output dimensions of OpenAI embedding models
+    MODEL_DIMENSIONS = {
+        "text-embedding-ada-002": 1536,
+        "text-embedding-3-small": 1536,
+        "text-embedding-3-large": 3072,
+    }
+
+    def __init__(self):
+        settings = get_settings()
+        self.api_key = settings.openai_api_key
+        self.model_name = settings.openai_embedding_model
+        self._client = None
+
+        if self.api_key:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key)
+            logger.info(f"OpenAI embedding client initialized (model: {self.model_name})")
+        else:
+            logger.warning("OpenAI API key not configured, OpenAI embeddings unavailable")
+
+    @property
+    def dimension(self) -> int:
+        return self.MODEL_DIMENSIONS.get(self.model_name, 1536)
+
+    def is_available(self) -> bool:
+        return self._client is not None
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not self.is_available():
+            raise RuntimeError("OpenAI embedding client is not available")
+
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        response = await self._client.embeddings.create(
+            model=self.model_name,
+            input=texts
+        )
+        # API preserves input order via `index`
+        ordered = sorted(response.data, key=lambda d: d.index)
+        return np.asarray([d.embedding for d in ordered], dtype=np.float32)
+
+
+class LocalHashingEmbeddingClient(BaseEmbeddingClient):
+    """
+    Local character n-gram hashing vectorizer (no network, no model files).
+
+    Each token contributes its whole-word feature plus character n-grams
+    (Hangul: 1-3 syllables, others: 3-4 chars with word boundaries), which are
+    hashed into a fixed-size signed vector and L2-normalized. Hashing uses
+    CRC32 so vectors are stable across processes and restarts.
+    """
+
+    routing_threshold = 0.2
+
+    TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+    HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+    def __init__(self, dimension: Optional[int] = None):
+        settings = get_settings()
+        self._dimension = dimension or settings.local_embedding_dimension
+        self.model_name = "local-ngram-hash-v1"
+        logger.info(f"Local hashing embedding client initialized (dim: {self._dimension})")
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def is_available(self) -> bool:
+        return True
+
+    def _features(self, text: str) -> List[str]:
+        """Extract word and character n-gram features from text"""
+        normalized = unicodedata.normalize("NFKC", text).lower()
+        features = []
+
+        for token in self.TOKEN_PATTERN.findall(normalized):
+            features.append(f"w:{token}")
+
+            if self.HANGUL_PATTERN.search(token):
+                ngram_sizes = (1, 2, 3)
+                padded = token
+            else:
+                ngram_sizes = (3, 4)
+                padded = f"<{token}>"
+
+            for n in ngram_sizes:
+                for i in range(len(padded) - n + 1):
+                    features.append(padded[i:i + n])
+
+        return features
+
+    def embed_sync(self, texts: List[str]) -> np.ndarray:
+        """Embed texts synchronously (pure CPU, microseconds per text)"""
+        dim = self._dimension
+        vectors = np.zeros((len(texts), dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode("utf-8")) for f in features),
+                dtype=np.uint64,
+                count=len(features)
+            )
+            indices = (hashes % dim).astype(np.intp)
+            signs = np.where((hashes // dim) & 1, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], indices, signs)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        return self.embed_sync(texts)
+
+
+class EmbeddingClientFactory:
+    """Factory class to create the appropriate embedding client based on configuration"""
+
+    _instance: Optional[BaseEmbeddingClient] = None
+
+    # Supported providers and their client classes
+    _providers = {
+        "openai": OpenAIEmbeddingClient,
+        "local": LocalHashingEmbeddingClient,
+    }
+
+    @classmethod
+    def get_client(cls) -> BaseEmbeddingClient:
+        """
+        Get or create the embedding client based on configuration.
+        Falls back to the local hashing client when the configured
+        provider is not available (e.g. no API key / offline).
+        """
+        if cls._instance is not None:
+            return cls._instance
+
+        settings = get_settings()
+        provider = settings.embedding_provider.lower()
+
+        client_class = cls._providers.get(provider)
+        if client_class is None:
+            logger.warning(f"Unknown embedding provider: {provider}")
+        else:
+            client = client_class()
+            if client.is_available():
+                cls._instance = client
+                logger.info(f"Using {provider.upper()} embeddings ({client.model_name}, dim={client.dimension})")
+                return cls._instance
+            logger.warning(f"{provider.upper()} embeddings configured but not available")
+
+        cls._instance = LocalHashingEmbeddingClient()
+        logger.info("Falling back to LOCAL hashing embeddings")
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        """Reset the singleton instance (useful for testing)"""
+        cls._instance = None
+
+
+def get_embedding_client() -> BaseEmbeddingClient:
+    """
+    Convenience function to get the configured embedding client.
+
+    Returns:
+        Embedding client instance (local hashing client as last resort)
+    """
+    return EmbeddingClientFactory.get_client()
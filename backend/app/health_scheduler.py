@@ -0,0 +1,274 @@
+"""
+Agent Health Check Scheduler
+에이전트별 다음 점검 시각을 관리하고, 도래한 에이전트만 동시성 제한 하에 병렬로 점검
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from loguru import logger
+import httpx
+
+from .config import get_settings
+from .http_client import GlobalHttpClient
+from .models import AgentInfo
+
+if TYPE_CHECKING:
+    from .registry import AgentRegistry
+
+
+@dataclass
+class ProbeState:
+    """에이전트별 probe 상태"""
+    probe_path: Optional[str] = None  # 마지막으로 성공한 경로 (다음 점검은 이 경로 1회)
+    next_check_at: float = 0.0  # time.monotonic() 기준
+    consecutive_failures: int = 0
+    last_probe_ms: float = 0.0
+    last_checked_at: Optional[datetime] = None
+    lease_until: Optional[float] = None  # heartbeat lease 만료 시각 (time.monotonic() 기준)
+
+    def has_lease(self, now: Optional[float] = None) -> bool:
+        return self.lease_until is not None and self.lease_until > (now or time.monotonic())
+
+    def to_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            "probe_path": self.probe_path,
+            "lease_remaining_s": round(self.lease_until - now, 1) if self.has_lease(now) else None,
+            "next_check_in_s": round(max(0.0, self.next_check_at - time.monotonic()), 1),
+            "consecutive_failures": self.consecutive_failures,
+            "last_probe_ms": round(self.last_probe_ms, 2),
+            "last_checked_at": self.last_checked_at.isoformat() if self.last_checked_at else None
+        }
+
+
+class HealthCheckScheduler:
+    """
+    Concurrent, adaptive health-check scheduler.
+
+    - 공유 커넥션 풀(GlobalHttpClient) 사용, Semaphore로 동시 probe 수 제한
+    - 성공한 probe 경로를 기억하여 평소에는 요청 1회로 점검
+    - 에이전트별 점검 주기에 jitter를 적용하여 요청이 한 시점에 몰리지 않도록 분산
+    - 실패가 이어지는 에이전트는 지수 backoff (max_backoff까지)
+    - heartbeat lease가 유효한 에이전트는 점검하지 않고, lease 만료 시점에 즉시 점검
+    """
+
+    # A2A Spec 경로 우선, 마지막은 일반 health endpoint
+    PROBE_PATHS = [
+        "/.well-known/agent-card.json",
+        "/.well-known/agent.json",
+        "/agent-card",
+        "/health",
+    ]
+
+    def __init__(self, registry: "AgentRegistry"):
+        settings = get_settings()
+        self._registry = registry
+        self.interval = settings.health_check_interval_seconds
+        self.max_concurrency = settings.health_check_concurrency
+        self.probe_timeout = settings.health_check_timeout_seconds
+        self.jitter = settings.health_check_jitter
+        self.max_backoff = settings.health_check_max_backoff_seconds
+        # 도래한 에이전트를 찾는 주기
+        self.tick_seconds = min(1.0, self.interval)
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._states: Dict[str, ProbeState] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self._stats = {
+            "sweeps": 0,
+            "probes": 0,
+            "probe_requests": 0,
+            "probe_failures": 0,
+            "last_sweep_agents": 0,
+            "last_sweep_duration_ms": 0.0,
+            "max_sweep_duration_ms": 0.0,
+            "last_sweep_at": None,
+            "heartbeats": 0,
+            "lease_expired_probes": 0,
+        }
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"[HealthScheduler] Started (interval: {self.interval}s, "
+                f"concurrency: {self.max_concurrency}, timeout: {self.probe_timeout}s)"
+            )
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # =========================================================================
+    # Scheduling
+    # =========================================================================
+
+    def get_state(self, agent_id: str) -> ProbeState:
+        state = self._states.get(agent_id)
+        if state is None:
+            # 첫 점검 시각을 interval 전체에 분산
+            state = ProbeState(next_check_at=time.monotonic() + random.uniform(0, self.interval))
+            self._states[agent_id] = state
+        return state
+
+    def forget(self, agent_id: str):
+        """등록 해제된 에이전트 상태 제거"""
+        self._states.pop(agent_id, None)
+
+    def renew_lease(self, agent_id: str, lease_seconds: float):
+        """
+        Heartbeat lease 갱신.
+        lease 동안은 점검을 생략하고, 갱신되지 않으면 만료 시점에 바로 점검합니다.
+        """
+        state = self.get_state(agent_id)
+        state.lease_until = time.monotonic() + lease_seconds
+        state.next_check_at = state.lease_until
+        state.consecutive_failures = 0
+        self._stats["heartbeats"] += 1
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _schedule_next(self, state: ProbeState, healthy: bool):
+        if healthy:
+            delay = self.interval
+        else:
+            delay = min(self.interval * (2 ** state.consecutive_failures), self.max_backoff)
+        state.next_check_at = time.monotonic() + self._jittered(delay)
+        if state.has_lease():
+            state.next_check_at = max(state.next_check_at, state.lease_until)
+
+    def _due_agents(self) -> List[AgentInfo]:
+        now = time.monotonic()
+        agents = self._registry.list_agents(include_offline=True)
+
+        live_ids = {a.id for a in agents}
+        for agent_id in list(self._states):
+            if agent_id not in live_ids:
+                del self._states[agent_id]
+
+        due = []
+        for agent in agents:
+            state = self.get_state(agent.id)
+            if state.next_check_at <= now and not state.has_lease(now):
+                due.append(agent)
+        return due
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.sleep(self.tick_seconds)
+
+                due = self._due_agents()
+                if due:
+                    await self.sweep(due)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Health check error: {e}")
+
+    async def sweep(self, agents: List[AgentInfo]):
+        """에이전트 묶음을 병렬로 점검하고 sweep 메트릭 기록"""
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.check(agent) for agent in agents))
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        self._stats["sweeps"] += 1
+        self._stats["last_sweep_agents"] = len(agents)
+        self._stats["last_sweep_duration_ms"] = round(duration_ms, 2)
+        self._stats["max_sweep_duration_ms"] = round(max(self._stats["max_sweep_duration_ms"], duration_ms), 2)
+        self._stats["last_sweep_at"] = datetime.utcnow().isoformat()
+
+        logger.debug(f"Health check sweep: {sum(results)}/{len(agents)} healthy in {duration_ms:.0f}ms")
+
+    # =========================================================================
+    # Probing
+    # =========================================================================
+
+    async def check(self, agent: AgentInfo) -> bool:
+        """
+        에이전트 1개 점검 (동시성 제한) 후 registry에 결과 반영 및 다음 점검 예약.
+        replica는 모두 병렬로 점검하며, 하나라도 정상이면 논리 에이전트는 정상입니다.
+        """
+        state = self.get_state(agent.id)
+        if state.lease_until is not None and not state.has_lease():
+            # heartbeat가 끊긴 에이전트 - lease 만료 후 첫 점검
+            self._stats["lease_expired_probes"] += 1
+            state.lease_until = None
+
+        urls = self._registry.get_replica_urls(agent.id) or [agent.url]
+        async with self._semaphore:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(self._probe(url, state.probe_path) for url in urls))
+            state.last_probe_ms = (time.perf_counter() - start) * 1000
+
+        for url, (replica_healthy, _, _) in zip(urls, results):
+            self._registry.apply_replica_health(agent.id, url, replica_healthy)
+        healthy = any(r[0] for r in results)
+        path = next((r[1] for r in results if r[0]), None)
+        error = None if healthy else results[0][2]
+
+        state.last_checked_at = datetime.utcnow()
+        if healthy:
+            state.probe_path = path
+            state.consecutive_failures = 0
+        else:
+            state.consecutive_failures += 1
+            self._stats["probe_failures"] += 1
+
+        self._stats["probes"] += 1
+        self._schedule_next(state, healthy)
+        self._registry.apply_health_result(agent, healthy, error)
+        return healthy
+
+    async def _probe(self, url: str, known_path: Optional[str]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        기억된 경로로 1회 요청, 실패(비 200 응답) 시에만 나머지 경로 탐색.
+        연결 오류/timeout은 호스트 문제이므로 다른 경로를 시도하지 않음.
+        """
+        client = GlobalHttpClient.get_client(url)
+        base_url = url.rstrip("/")
+        paths = [known_path] + [p for p in self.PROBE_PATHS if p != known_path] if known_path else self.PROBE_PATHS
+
+        last_error = None
+        for path in paths:
+            self._stats["probe_requests"] += 1
+            try:
+                response = await client.get(f"{base_url}{path}", timeout=self.probe_timeout)
+            except httpx.HTTPError as e:
+                return False, None, f"{type(e).__name__}: {e}"
+
+            if response.status_code == 200:
+                return True, path, None
+            last_error = f"HTTP {response.status_code} at {path}"
+
+        return False, None, last_error
+
+    def get_stats(self) -> dict:
+        """스케줄러 메트릭"""
+        now = time.monotonic()
+        backing_off = sum(1 for s in self._states.values() if s.consecutive_failures > 0)
+        active_leases = sum(1 for s in self._states.values() if s.has_lease(now))
+        return {
+            "interval_seconds": self.interval,
+            "max_concurrency": self.max_concurrency,
+            "probe_timeout_seconds": self.probe_timeout,
+            "tracked_agents": len(self._states),
+            "backing_off_agents": backing_off,
+            "active_leases": active_leases,
+            **self._stats,
+        }
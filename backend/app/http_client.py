@@ -0,0 +1,242 @@
+"""
+Shared HTTP client for agent communication (A2A calls, health probes)
+
+에이전트 origin(scheme://host:port)별로 커넥션 풀을 분리합니다.
+- 느린 에이전트의 스트리밍 호출이 다른 에이전트의 커넥션까지 고갈시키지 않도록 origin별 limit 적용
+- HTTP/2 (ALPN 협상, 지원하는 https 에이전트에서 한 커넥션으로 multiplexing)
+- 풀 대기 timeout(pool)을 read timeout과 분리 -> 풀 고갈 시 빠르게 PoolTimeout
+- 등록 시 커넥션 pre-warming, origin별 풀 사용량 통계
+  (진행 중 요청 수는 transport wrapper가 직접 집계, 커넥션 상태는 httpcore 풀에서 가능한 만큼만)
+"""
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+from loguru import logger
+import httpx
+
+from .config import get_settings
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def agent_origin(url: str) -> str:
+    """URL의 origin (scheme://host[:port])"""
+    parsed = httpx.URL(url)
+    port = f":{parsed.port}" if parsed.port else ""
+    return f"{parsed.scheme}://{parsed.host}{port}"
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """응답 본문 스트림 - 닫힐 때 한 번 콜백 (스트리밍 응답은 본문을 다 읽거나 닫을 때까지 진행 중)"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class _TrackedTransport(httpx.AsyncBaseTransport):
+    """origin 풀 transport wrapper - 요청 시작부터 응답 본문이 닫힐 때까지를 진행 중으로 집계"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_connections: Optional[int]):
+        self.transport = transport
+        self.max_connections = max_connections
+        self.in_flight = 0
+
+    def _finished(self):
+        self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        if response.is_closed:
+            # 본문을 이미 메모리에 읽어 둔 응답 (mock transport 등)
+            self._finished()
+            return response
+        response.stream = _TrackedStream(response.stream, self._finished)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class GlobalHttpClient:
+    """
+    Global HTTP Client Singleton for Connection Pooling.
+
+    - get_client(): 에이전트 외 요청(Agent Card discovery 등)용 공유 클라이언트
+    - get_client(agent_url): 에이전트 origin 전용 풀을 가진 클라이언트
+    """
+    _client: Optional[httpx.AsyncClient] = None
+    _origin_clients: Dict[str, httpx.AsyncClient] = {}
+    # 테스트/로컬 mock: 모든 클라이언트가 이 transport를 사용
+    _transport_override: Optional[httpx.AsyncBaseTransport] = None
+    _background_tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def _timeout(cls) -> httpx.Timeout:
+        settings = get_settings()
+        return httpx.Timeout(
+            connect=settings.agent_http_connect_timeout_seconds,
+            read=settings.agent_http_read_timeout_seconds,
+            write=settings.agent_http_read_timeout_seconds,
+            pool=settings.agent_http_pool_timeout_seconds
+        )
+
+    @classmethod
+    def _create_shared_client(cls) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=cls._timeout(),
+            verify=False,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            transport=cls._transport_override
+        )
+
+    @classmethod
+    def _create_origin_client(cls, origin: str) -> httpx.AsyncClient:
+        settings = get_settings()
+        http2 = settings.agent_http_http2 and HTTP2_AVAILABLE
+        limits = httpx.Limits(
+            max_connections=settings.agent_http_max_connections,
+            max_keepalive_connections=settings.agent_http_max_keepalive,
+            keepalive_expiry=settings.agent_http_keepalive_expiry_seconds
+        )
+        transport = _TrackedTransport(
+            cls._transport_override or httpx.AsyncHTTPTransport(verify=False, http2=http2, limits=limits),
+            limits.max_connections
+        )
+        logger.debug(
+            f"[GlobalHttpClient] New pool for {origin} "
+            f"(max={limits.max_connections}, keepalive={limits.max_keepalive_connections}, http2={http2})"
+        )
+        return httpx.AsyncClient(timeout=cls._timeout(), transport=transport)
+
+    @classmethod
+    def get_client(cls, agent_url: Optional[str] = None) -> httpx.AsyncClient:
+        if agent_url:
+            origin = agent_origin(agent_url)
+            client = cls._origin_clients.get(origin)
+            if client is None:
+                client = cls._origin_clients[origin] = cls._create_origin_client(origin)
+            return client
+
+        if cls._client is None:
+            # Lazy initialization if not initialized via lifespan (safety net)
+            # Ideally initialized in main.py lifespan
+            cls._client = cls._create_shared_client()
+        return cls._client
+
+    @classmethod
+    async def initialize(cls):
+        settings = get_settings()
+        if settings.agent_http_http2 and not HTTP2_AVAILABLE:
+            logger.warning("[GlobalHttpClient] AGENT_HTTP_HTTP2 enabled but h2 is not installed; using HTTP/1.1")
+        if cls._client is None:
+            logger.info(
+                f"[GlobalHttpClient] Initializing HTTP clients "
+                f"(per-agent pool: {settings.agent_http_max_connections} max, "
+                f"pool timeout {settings.agent_http_pool_timeout_seconds}s)"
+            )
+            cls._client = cls._create_shared_client()
+
+    @classmethod
+    async def prewarm(cls, agent_url: str):
+        """
+        에이전트 origin 풀에 커넥션을 미리 연결 (TCP/TLS handshake, HTTP/2 협상).
+        응답 상태와 무관하게 keepalive 커넥션이 풀에 남습니다.
+        """
+        client = cls.get_client(agent_url)
+        try:
+            await client.head(agent_origin(agent_url), timeout=get_settings().agent_http_connect_timeout_seconds)
+            logger.debug(f"[GlobalHttpClient] Pre-warmed connection to {agent_origin(agent_url)}")
+        except httpx.HTTPError as e:
+            logger.debug(f"[GlobalHttpClient] Pre-warm failed for {agent_url}: {e}")
+
+    @classmethod
+    def schedule_prewarm(cls, agent_url: str):
+        """실행 중인 event loop가 있으면 백그라운드로 pre-warm"""
+        if not get_settings().agent_http_prewarm:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(cls.prewarm(agent_url))
+        except RuntimeError:
+            return
+        cls._background_tasks.add(task)
+        task.add_done_callback(cls._background_tasks.discard)
+
+    @classmethod
+    def discard(cls, agent_url: str):
+        """origin 풀 제거 (해당 origin의 마지막 에이전트가 등록 해제된 경우)"""
+        client = cls._origin_clients.pop(agent_origin(agent_url), None)
+        if client is None or cls._transport_override is not None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(client.aclose())
+        except RuntimeError:
+            return
+        cls._background_tasks.add(task)
+        task.add_done_callback(cls._background_tasks.discard)
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, dict]:
+        """
+        origin별 커넥션 풀 사용량 (in_flight / active / idle / queued / http2 / max).
+        커넥션 상태는 httpcore 풀 내부에서 읽으므로, httpx/httpcore 버전이 달라 읽을 수 없는 값은 None.
+        """
+        stats = {}
+        for origin, client in list(cls._origin_clients.items()):
+            transport = getattr(client, "_transport", None)
+            if not isinstance(transport, _TrackedTransport):
+                continue
+            entry = {
+                "in_flight": transport.in_flight,
+                "active": None,
+                "idle": None,
+                "queued": None,
+                "http2": None,
+                "max": transport.max_connections,
+            }
+            pool = getattr(transport.transport, "_pool", None)
+            if pool is not None:
+                try:
+                    connections = list(pool.connections)
+                    idle = sum(1 for c in connections if c.is_idle())
+                    entry.update(
+                        active=len(connections) - idle,
+                        idle=idle,
+                        http2=sum(1 for c in connections if "HTTP/2" in c.info())
+                    )
+                    entry["queued"] = sum(1 for r in pool._requests if r.is_queued())
+                except Exception as e:
+                    logger.debug(f"[GlobalHttpClient] Partial pool stats for {origin}: {type(e).__name__}: {e}")
+            stats[origin] = entry
+        return stats
+
+    @classmethod
+    async def close(cls):
+        clients = list(cls._origin_clients.values())
+        cls._origin_clients.clear()
+        if cls._client:
+            clients.append(cls._client)
+            cls._client = None
+        if clients:
+            logger.info(f"[GlobalHttpClient] Closing {len(clients)} HTTP client(s)")
+            await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
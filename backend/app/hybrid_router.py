@@ -2,18 +2,23 @@
 Hybrid Agent Router - 키워드 매칭 + pgvector RAG 기반 라우팅
 """
 import json
+import time
 from typing import Optional, List, Dict, Any
 from loguru import logger
 
 from .config import get_settings
 from .models import AgentInfo, RoutingDecision
 from .registry import registry
+from .agent_catalog import AgentCatalog
 from .llm_client import get_llm_client, BaseLLMClient
 from .agent_vector_store import (
     AgentVectorStore, 
     AgentRoutingMetadata,
     get_vector_store
 )
+from .vector_sync import get_vector_sync_pipeline
+from .metrics import record_router_tier
+from .tracing import set_span_attributes, start_span
 
 
 class HybridRouter:
@@ -72,15 +77,23 @@ class HybridRouter:
         Returns:
             RoutingDecision 또는 None
         """
-        # 레지스트리에서 에이전트 목록 조회
-        all_agents = registry.list_agents()
+        # 레지스트리의 불변 catalog snapshot (키워드 automaton / 프롬프트 블록 공유)
+        catalog = registry.get_catalog()
+        all_agents = catalog.agents
         
         # 활성화된 에이전트만 필터링
         if enabled_agent_ids is not None:
-            agents = [a for a in all_agents if a.id in enabled_agent_ids]
+            enabled = set(enabled_agent_ids)
+            agents = [a for a in all_agents if a.id in enabled]
             logger.info(f"Filtering to {len(agents)} enabled agents out of {len(all_agents)} total")
         else:
-            agents = all_agents
+            agents = list(all_agents)
+        
+        # Circuit breaker가 열린 에이전트 제외 (half-open 시험 요청 진행 중 포함)
+        routable = [a for a in agents if registry.is_agent_available(a.id)]
+        if len(routable) < len(agents):
+            logger.info(f"Skipping {len(agents) - len(routable)} circuit-open agent(s)")
+        agents = routable
         
         if not agents:
             logger.warning("No agents available for routing")
@@ -91,7 +104,11 @@ class HybridRouter:
         # ========================================
         # Step 1: 명시적 에이전트 이름 매칭
         # ========================================
-        explicit_match = self._explicit_agent_match(message_lower, agents)
+        with self._tier_span("explicit", agents) as span:
+            tier_started = time.perf_counter()
+            explicit_match = self._explicit_agent_match(message_lower, agents)
+            record_router_tier("hybrid", "explicit", tier_started, "hit" if explicit_match else "miss")
+            self._annotate_tier(span, explicit_match)
         if explicit_match:
             logger.info(f"[HybridRouter] Explicit match: {explicit_match.agent_name}")
             return explicit_match
@@ -99,50 +116,29 @@ class HybridRouter:
         # ========================================
         # Step 2: pgvector RAG 기반 검색
         # ========================================
-        try:
-            vector_store = await self._get_vector_store()
-            
-            # 도메인 추론
-            inferred_domain = self._infer_domain(message_lower)
-            
-            # 벡터 검색
-            vector_results = await vector_store.search_similar(
-                query=message,
-                limit=3,
-                domain_filter=inferred_domain if inferred_domain else None,
-                threshold=0.5
-            )
-            
-            if vector_results:
-                best_match = vector_results[0]
-                
-                # 레지스트리에서 에이전트 찾기
-                matched_agent = None
-                for agent in agents:
-                    if agent.name == best_match["agent_name"]:
-                        matched_agent = agent
-                        break
-                
-                if matched_agent:
-                    logger.info(
-                        f"[HybridRouter] Vector search match: {matched_agent.name} "
-                        f"(similarity: {best_match['similarity']:.3f})"
-                    )
-                    return RoutingDecision(
-                        agent_id=matched_agent.id,
-                        agent_name=matched_agent.name,
-                        agent_url=matched_agent.url,
-                        confidence=best_match["similarity"],
-                        reasoning=f"Vector similarity search (domain: {best_match['domain']})"
-                    )
-        
-        except Exception as e:
-            logger.warning(f"[HybridRouter] Vector search failed: {e}")
+        with self._tier_span("vector", agents) as span:
+            tier_started = time.perf_counter()
+            try:
+                vector_match = await self._vector_match(message, message_lower, agents)
+            except Exception as e:
+                logger.warning(f"[HybridRouter] Vector search failed: {e}")
+                record_router_tier("hybrid", "vector", tier_started, "error")
+                span.set_attributes({"router.result": "error", "error.type": type(e).__name__})
+                vector_match = None
+            else:
+                record_router_tier("hybrid", "vector", tier_started, "hit" if vector_match else "miss")
+                self._annotate_tier(span, vector_match)
+        if vector_match:
+            return vector_match
         
         # ========================================
         # Step 3: 키워드 기반 매칭 (Fallback)
         # ========================================
-        keyword_match = self._keyword_match(message_lower, agents)
+        with self._tier_span("keyword", agents) as span:
+            tier_started = time.perf_counter()
+            keyword_match = self._keyword_match(message_lower, agents, catalog)
+            record_router_tier("hybrid", "keyword", tier_started, "hit" if keyword_match else "miss")
+            self._annotate_tier(span, keyword_match)
         if keyword_match:
             logger.info(f"[HybridRouter] Keyword match: {keyword_match.agent_name}")
             return keyword_match
@@ -151,7 +147,11 @@ class HybridRouter:
         # Step 4: LLM 기반 라우팅 (최종 Fallback)
         # ========================================
         if self.use_llm:
-            llm_match = await self._llm_route(message, agents)
+            with self._tier_span("llm", agents) as span:
+                tier_started = time.perf_counter()
+                llm_match = await self._llm_route(message, agents, catalog)
+                record_router_tier("hybrid", "llm", tier_started, "hit" if llm_match else "miss")
+                self._annotate_tier(span, llm_match)
             if llm_match:
                 logger.info(f"[HybridRouter] LLM match: {llm_match.agent_name}")
                 return llm_match
@@ -159,6 +159,72 @@ class HybridRouter:
         logger.warning(f"[HybridRouter] No suitable agent found for: {message[:50]}...")
         return None
     
+    @staticmethod
+    def _tier_span(tier: str, agents: List[AgentInfo]):
+        return start_span("router.tier", {
+            "router.name": "hybrid",
+            "router.tier": tier,
+            "router.candidates": len(agents)
+        })
+    
+    @staticmethod
+    def _annotate_tier(span, decision: Optional[RoutingDecision]):
+        span.set_attribute("router.result", "hit" if decision else "miss")
+        if decision:
+            span.set_attributes({
+                "router.agent_id": decision.agent_id,
+                "router.agent_name": decision.agent_name,
+                "router.confidence": decision.confidence
+            })
+    
+    async def _vector_match(
+        self,
+        message: str,
+        message_lower: str,
+        agents: List[AgentInfo]
+    ) -> Optional[RoutingDecision]:
+        """pgvector RAG 기반 매칭 (검색 실패 시 예외 전파)"""
+        vector_store = await self._get_vector_store()
+        
+        # 도메인 추론
+        inferred_domain = self._infer_domain(message_lower)
+        
+        # 벡터 검색
+        vector_results = await vector_store.search_similar(
+            query=message,
+            limit=3,
+            domain_filter=inferred_domain if inferred_domain else None,
+            threshold=vector_store.routing_threshold
+        )
+        set_span_attributes({
+            "router.vector.domain": inferred_domain,
+            "router.vector.results": len(vector_results),
+            "router.vector.top_similarity": vector_results[0]["similarity"] if vector_results else None
+        })
+        
+        # 유사도 순으로 라우팅 가능한 첫 후보 선택 (circuit-open 에이전트는 agents에서 제외됨)
+        agents_by_name = {agent.name: agent for agent in agents}
+        for candidate in vector_results:
+            matched_agent = agents_by_name.get(candidate["agent_name"])
+            if not matched_agent:
+                continue
+            
+            logger.info(
+                f"[HybridRouter] Vector search match: {matched_agent.name} "
+                f"(similarity: {candidate['similarity']:.3f})"
+            )
+            return RoutingDecision(
+                agent_id=matched_agent.id,
+                agent_name=matched_agent.name,
+                agent_url=matched_agent.url,
+                confidence=candidate["similarity"],
+                reasoning=(
+                    f"Vector similarity search (domain: {candidate['domain']}, "
+                    f"matched {candidate.get('matched_kind', 'description')})"
+                )
+            )
+        return None
+    
     def _explicit_agent_match(
         self,
         message_lower: str,
@@ -195,28 +261,22 @@ class HybridRouter:
     def _keyword_match(
         self,
         message_lower: str,
-        agents: List[AgentInfo]
+        agents: List[AgentInfo],
+        catalog: AgentCatalog
     ) -> Optional[RoutingDecision]:
         """키워드 기반 에이전트 매칭"""
         best_match = None
         best_score = 0
         
+        words = [word for word in message_lower.split() if len(word) > 2]
+        # 스킬 태그 매칭 - catalog의 tag automaton으로 메시지를 한 번만 스캔
+        tag_hits = catalog.tag_hits(message_lower)
+        
         for agent in agents:
-            score = 0
-            
             # 에이전트 이름/설명에서 키워드 매칭
-            agent_text = f"{agent.name} {agent.description}".lower()
-            
-            for word in message_lower.split():
-                if len(word) > 2 and word in agent_text:
-                    score += 1
-            
-            # 스킬 태그 매칭
-            for skill in agent.skills:
-                if skill.tags:
-                    for tag in skill.tags:
-                        if tag.lower() in message_lower:
-                            score += 2
+            agent_text = catalog.search_text(agent)
+            score = sum(1 for word in words if word in agent_text)
+            score += 2 * tag_hits.get(agent.id, 0)
             
             if score > best_score:
                 best_score = score
@@ -236,16 +296,14 @@ class HybridRouter:
     async def _llm_route(
         self,
         message: str,
-        agents: List[AgentInfo]
+        agents: List[AgentInfo],
+        catalog: AgentCatalog
     ) -> Optional[RoutingDecision]:
         """LLM 기반 라우팅"""
         if not self.use_llm:
             return None
         
-        agents_info = "\n".join([
-            f"- {a.name}: {a.description}"
-            for a in agents
-        ])
+        agents_info = catalog.routing_prompt(agents)
         
         prompt = f"""당신은 에이전트 라우팅 시스템입니다.
 사용자 메시지를 분석하여 가장 적합한 에이전트를 선택하세요.
@@ -270,7 +328,8 @@ JSON 형식으로 응답하세요:
                     {"role": "system", "content": "Always respond with valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="hybrid_router.llm_route"
             )
             
             result = json.loads(response)
@@ -296,15 +355,14 @@ JSON 형식으로 응답하세요:
             return None
     
     async def sync_agents_to_vector_store(self):
-        """레지스트리의 에이전트를 벡터 저장소에 동기화"""
-        vector_store = await self._get_vector_store()
+        """레지스트리의 에이전트를 벡터 저장소에 동기화 (배치 + 변경분만 임베딩)"""
         agents = registry.list_agents()
         
-        synced_count = 0
+        metadata_list = []
         for agent in agents:
             try:
                 # AgentInfo에서 메타데이터 생성
-                metadata = AgentRoutingMetadata(
+                metadata_list.append(AgentRoutingMetadata(
                     agent_name=agent.name,
                     agent_url=agent.url,
                     domain=self._infer_agent_domain(agent),
@@ -312,17 +370,20 @@ JSON 형식으로 응답하세요:
                     description=agent.description or f"{agent.name} agent",
                     keywords=self._extract_keywords(agent),
                     capabilities=[s.name for s in agent.skills] if agent.skills else [],
-                    is_active=True
-                )
-                
-                success = await vector_store.upsert_agent(metadata)
-                if success:
-                    synced_count += 1
-                    
+                    is_active=True,
+                    skill_descriptions=[f"{s.name}: {s.description}" for s in agent.skills if s.description],
+                    examples=[e for s in agent.skills for e in s.examples if e]
+                ))
             except Exception as e:
-                logger.error(f"Failed to sync agent {agent.name}: {e}")
+                logger.error(f"Failed to build metadata for agent {agent.name}: {e}")
+        
+        result = await get_vector_sync_pipeline().sync_now(metadata_list)
+        synced_count = result["upserted"] + result["skipped"]
         
-        logger.info(f"[HybridRouter] Synced {synced_count}/{len(agents)} agents to vector store")
+        logger.info(
+            f"[HybridRouter] Synced {synced_count}/{len(agents)} agents to vector store "
+            f"(embedded: {result['embedded']}, unchanged: {result['skipped']})"
+        )
         return synced_count
     
     def _infer_agent_domain(self, agent: AgentInfo) -> str:
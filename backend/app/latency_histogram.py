@@ -0,0 +1,229 @@
+"""
+Latency Histogram - 병합 가능한 로그 버킷 지연시간 스케치
+
+HDR histogram과 같은 방식으로 값을 로그 스케일 버킷에 카운트합니다.
+- 상대 오차 1% 이내의 분위수(p50/p90/p99) 계산, 메모리는 값 개수와 무관
+- 버킷 카운트를 더하는 것만으로 병합 가능 (워커/시간 구간 간 합산)
+- 시간 슬롯 ring으로 1m/5m/1h sliding window 제공
+"""
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+# 버킷 경계 비율 (상대 오차 ~1%)
+BUCKET_GROWTH = 1.02
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+# 이 값 미만(ms)은 0번 버킷으로 취급
+MIN_TRACKABLE_MS = 0.01
+
+# 조회 window (이름 -> 초)
+WINDOWS: Dict[str, int] = {"1m": 60, "5m": 300, "1h": 3600}
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _bucket_index(value_ms: float) -> int:
+    if value_ms <= MIN_TRACKABLE_MS:
+        return 0
+    return int(math.log(value_ms / MIN_TRACKABLE_MS) / _LOG_GROWTH) + 1
+
+
+def _bucket_value(index: int) -> float:
+    """버킷 대표값 (구간 중앙값)"""
+    if index == 0:
+        return MIN_TRACKABLE_MS
+    return MIN_TRACKABLE_MS * BUCKET_GROWTH ** (index - 0.5)
+
+
+class LatencyHistogram:
+    """Sparse log-bucketed histogram (mergeable)"""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        index = _bucket_index(value_ms)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """other를 현재 히스토그램에 합산 (in-place)"""
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        result = cls()
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def quantiles(self, qs: Iterable[float] = QUANTILES) -> List[float]:
+        """분위수 목록 (버킷 정렬 1회)"""
+        qs = list(qs)
+        results = [0.0] * len(qs)
+        if self.count == 0:
+            return results
+
+        pending = sorted(range(len(qs)), key=lambda i: qs[i])
+        cumulative = 0
+        for index in sorted(self.counts):
+            cumulative += self.counts[index]
+            while pending and cumulative >= qs[pending[0]] * self.count:
+                # 최댓값을 넘지 않도록 (상위 분위수가 버킷 대표값으로 부풀려지는 것 방지)
+                results[pending.pop(0)] = min(_bucket_value(index), self.max_ms)
+            if not pending:
+                break
+        return results
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def summary(self) -> dict:
+        p50, p90, p99 = self.quantiles(QUANTILES)
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(p50, 2),
+            "p90_ms": round(p90, 2),
+            "p99_ms": round(p99, 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+    def to_dict(self) -> dict:
+        """워커 간 병합용 직렬화"""
+        return {
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(k): int(v) for k, v in data.get("counts", {}).items()}
+        histogram.count = int(data.get("count", 0))
+        histogram.total_ms = float(data.get("total_ms", 0.0))
+        histogram.max_ms = float(data.get("max_ms", 0.0))
+        return histogram
+
+
+class SlidingWindowHistogram:
+    """
+    시간 슬롯 ring 기반 sliding window 히스토그램.
+
+    1m window는 10초 슬롯, 5m/1h window는 1분 슬롯으로 집계하므로
+    window 경계 오차는 슬롯 크기 이내입니다.
+    """
+
+    __slots__ = ("_fine", "_coarse")
+
+    FINE_SLOT_SECONDS = 10
+    COARSE_SLOT_SECONDS = 60
+
+    def __init__(self):
+        self._fine = _SlotRing(self.FINE_SLOT_SECONDS, WINDOWS["1m"] // self.FINE_SLOT_SECONDS)
+        self._coarse = _SlotRing(self.COARSE_SLOT_SECONDS, max(WINDOWS.values()) // self.COARSE_SLOT_SECONDS)
+
+    def record(self, value_ms: float, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self._fine.slot(now).record(value_ms)
+        self._coarse.slot(now).record(value_ms)
+
+    def window(self, seconds: int, now: Optional[float] = None) -> LatencyHistogram:
+        """최근 seconds 구간 병합 히스토그램"""
+        now = time.time() if now is None else now
+        ring = self._fine if seconds <= self._fine.span_seconds else self._coarse
+        return LatencyHistogram.merged(ring.recent(seconds, now))
+
+    def windows(self, now: Optional[float] = None) -> Dict[str, LatencyHistogram]:
+        now = time.time() if now is None else now
+        return {name: self.window(seconds, now) for name, seconds in WINDOWS.items()}
+
+    def merge(self, other: "SlidingWindowHistogram"):
+        self._fine.merge(other._fine)
+        self._coarse.merge(other._coarse)
+
+    def to_dict(self) -> dict:
+        return {"fine": self._fine.to_dict(), "coarse": self._coarse.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SlidingWindowHistogram":
+        histogram = cls()
+        histogram._fine.merge(_SlotRing.from_dict(data.get("fine", {}), histogram._fine))
+        histogram._coarse.merge(_SlotRing.from_dict(data.get("coarse", {}), histogram._coarse))
+        return histogram
+
+
+class _SlotRing:
+    """epoch(= now // slot_seconds) 단위 슬롯 ring"""
+
+    __slots__ = ("slot_seconds", "size", "_epochs", "_histograms")
+
+    def __init__(self, slot_seconds: int, size: int):
+        self.slot_seconds = slot_seconds
+        self.size = size
+        self._epochs: List[int] = [-1] * size
+        self._histograms: List[Optional[LatencyHistogram]] = [None] * size
+
+    @property
+    def span_seconds(self) -> int:
+        return self.slot_seconds * self.size
+
+    def slot(self, now: float) -> LatencyHistogram:
+        epoch = int(now // self.slot_seconds)
+        i = epoch % self.size
+        if self._epochs[i] != epoch or self._histograms[i] is None:
+            self._epochs[i] = epoch
+            self._histograms[i] = LatencyHistogram()
+        return self._histograms[i]
+
+    def recent(self, seconds: int, now: float) -> List[LatencyHistogram]:
+        current = int(now // self.slot_seconds)
+        oldest = current - max(1, math.ceil(seconds / self.slot_seconds)) + 1
+        return [
+            h for epoch, h in zip(self._epochs, self._histograms)
+            if h is not None and oldest <= epoch <= current
+        ]
+
+    def merge(self, other: "_SlotRing"):
+        """같은 epoch 슬롯끼리 합산 (더 최신 epoch가 ring 위치를 차지)"""
+        for epoch, histogram in zip(other._epochs, other._histograms):
+            if histogram is None:
+                continue
+            i = epoch % self.size
+            if self._epochs[i] == epoch and self._histograms[i] is not None:
+                self._histograms[i].merge(histogram)
+            elif epoch > self._epochs[i]:
+                self._epochs[i] = epoch
+                self._histograms[i] = LatencyHistogram().merge(histogram)
+
+    def to_dict(self) -> dict:
+        return {
+            str(epoch): h.to_dict()
+            for epoch, h in zip(self._epochs, self._histograms)
+            if h is not None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, template: "_SlotRing") -> "_SlotRing":
+        ring = cls(template.slot_seconds, template.size)
+        for epoch, histogram in data.items():
+            epoch = int(epoch)
+            i = epoch % ring.size
+            if epoch > ring._epochs[i]:
+                ring._epochs[i] = epoch
+                ring._histograms[i] = LatencyHistogram.from_dict(histogram)
+        return ring
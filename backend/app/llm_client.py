@@ -7,6 +7,7 @@ from typing import Optional, Dict, List
 from loguru import logger
 
 from .config import get_settings
+from .metrics import observe_llm_call, record_llm_usage
 
 
 class BaseLLMClient(ABC):
@@ -29,6 +30,7 @@ class BaseLLMClient(ABC):
             model: Model to use (optional, uses default from config)
             temperature: Temperature for generation (optional)
             response_format: Response format specification (e.g., {"type": "json_object"})
+            call_site: (kwarg) Caller label for LLM metrics (e.g. "hybrid_router")
             
         Returns:
             Response content as string
@@ -86,7 +88,14 @@ class OpenAIClient(BaseLLMClient):
         if response_format:
             params["response_format"] = response_format
         
-        response = await self._client.chat.completions.create(**params)
+        with observe_llm_call("openai", use_model, kwargs.get("call_site", "unknown")):
+            response = await self._client.chat.completions.create(**params)
+            if response.usage:
+                record_llm_usage(
+                    response.usage.prompt_tokens,
+                    response.usage.completion_tokens,
+                    getattr(getattr(response.usage, "prompt_tokens_details", None), "cached_tokens", None)
+                )
         return response.choices[0].message.content
 
 
@@ -147,7 +156,14 @@ class AzureOpenAIClient(BaseLLMClient):
         if response_format:
             params["response_format"] = response_format
         
-        response = await self._client.chat.completions.create(**params)
+        with observe_llm_call("azure_openai", self.deployment, kwargs.get("call_site", "unknown")):
+            response = await self._client.chat.completions.create(**params)
+            if response.usage:
+                record_llm_usage(
+                    response.usage.prompt_tokens,
+                    response.usage.completion_tokens,
+                    getattr(getattr(response.usage, "prompt_tokens_details", None), "cached_tokens", None)
+                )
         return response.choices[0].message.content
 
 
@@ -232,7 +248,14 @@ class ClaudeClient(BaseLLMClient):
         else:
             params["temperature"] = self.default_temperature
         
-        response = await self._client.messages.create(**params)
+        with observe_llm_call("claude", use_model, kwargs.get("call_site", "unknown")):
+            response = await self._client.messages.create(**params)
+            if response.usage:
+                record_llm_usage(
+                    response.usage.input_tokens,
+                    response.usage.output_tokens,
+                    getattr(response.usage, "cache_read_input_tokens", None)
+                )
         return response.content[0].text
 
 
@@ -322,10 +345,18 @@ class GeminiClient(BaseLLMClient):
         chat = model_instance.start_chat(history=history)
         
         # Send message
-        response = await chat.send_message_async(
-            last_message,
-            generation_config=generation_config
-        )
+        with observe_llm_call("gemini", model or self.default_model, kwargs.get("call_site", "unknown")):
+            response = await chat.send_message_async(
+                last_message,
+                generation_config=generation_config
+            )
+            usage = getattr(response, "usage_metadata", None)
+            if usage:
+                record_llm_usage(
+                    usage.prompt_token_count,
+                    usage.candidates_token_count,
+                    getattr(usage, "cached_content_token_count", None)
+                )
         
         return response.text
 
@@ -13,9 +13,12 @@ from .api import chat_router, agent_router, status_router, user_prefs_router, mc
 from .auth.router import auth_router, users_router
 from .auth.kauth import kauth_router
 from .auth.webhook import webhook_router
+from .auth.user_cache import get_user_cache
 from .registry import registry
 from .database import init_db, close_db
-from .orchestrator import GlobalHttpClient
+from .http_client import GlobalHttpClient
+from .metrics import get_metrics_sampler, mark_worker_dead
+from .token_cache import get_token_cache
 
 
 # Configure logging
@@ -48,15 +51,22 @@ async def lifespan(app: FastAPI):
     await GlobalHttpClient.initialize()
     
     await registry.start()
+    get_user_cache().start()
+    get_token_cache().start()
+    get_metrics_sampler().start()
     logger.info("Agent Orchestrator started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Agent Orchestrator...")
+    await get_metrics_sampler().stop()
     await registry.stop()
+    await get_user_cache().stop()
+    await get_token_cache().stop()
     await GlobalHttpClient.close()
     await close_db()
+    mark_worker_dead()
     logger.info("Agent Orchestrator shutdown complete")
 
 
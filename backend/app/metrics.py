@@ -0,0 +1,402 @@
+"""
+Prometheus Metrics - 요청 파이프라인 전 구간 계측 및 /metrics exposition
+
+- orchestrator 단계별 소요 시간 (affinity, workflow 분석, 라우팅, 요약, A2A 호출)
+- HybridRouter tier별(explicit/vector/keyword/llm) 소요 시간과 hit 여부
+- 에이전트별 A2A 호출 지연 (total / 스트리밍 TTFB)
+- LLM 호출 (provider/model/call site) 지연 및 토큰 사용량
+- SQLAlchemy / asyncpg 커넥션 풀 사용량, Redis 명령 지연, 활성 SSE 스트림, event loop lag
+
+멀티 워커 배포에서는 PROMETHEUS_MULTIPROC_DIR 환경변수를 워커 시작 전에 설정하면
+prometheus_client multiprocess 모드로 동작하고, /metrics는 모든 워커 값을 합산해 노출합니다.
+prometheus_client가 설치되어 있지 않으면 모든 계측은 no-op입니다.
+"""
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+
+from loguru import logger
+
+from .config import get_settings
+from .request_timing import record_timing
+from .tracing import set_span_attributes, start_span
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+METRICS_NAMESPACE = "orchestrator"
+
+# 초 단위 버킷 (in-process 단계 ~ 장시간 에이전트 호출)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _NoopMetric:
+    """prometheus_client 미설치 시 사용하는 no-op metric"""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float):
+        pass
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+
+def _metric(kind: str, name: str, documentation: str, labelnames: Tuple[str, ...] = (), **kwargs):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    metric_class = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[kind]
+    kwargs.setdefault("namespace", METRICS_NAMESPACE)
+    if kind != "gauge":
+        kwargs.pop("multiprocess_mode", None)
+    return metric_class(name, documentation, labelnames, **kwargs)
+
+
+# =============================================================================
+# Metric definitions
+# =============================================================================
+
+STAGE_DURATION = _metric(
+    "histogram", "stage_duration_seconds",
+    "Orchestrator pipeline stage duration", ("stage",), buckets=SLOW_BUCKETS
+)
+ROUTER_TIER_DURATION = _metric(
+    "histogram", "router_tier_duration_seconds",
+    "Routing tier duration", ("router", "tier"), buckets=FAST_BUCKETS
+)
+ROUTER_TIER_RESULTS = _metric(
+    "counter", "router_tier_results_total",
+    "Routing tier outcomes (hit / miss / error)", ("router", "tier", "result")
+)
+A2A_REQUEST_DURATION = _metric(
+    "histogram", "a2a_request_duration_seconds",
+    "A2A call latency by agent", ("agent", "mode", "outcome"), buckets=SLOW_BUCKETS
+)
+A2A_DIALECT_CALLS = _metric(
+    "counter", "a2a_dialect_calls_total",
+    "A2A JSON-RPC calls by protocol dialect", ("dialect", "result")
+)
+A2A_REJECTIONS = _metric(
+    "counter", "a2a_rejections_total",
+    "A2A calls rejected before sending (circuit open / concurrency limit)", ("agent", "reason")
+)
+A2A_RETRIES = _metric(
+    "counter", "a2a_retries_total",
+    "A2A transport retries by retry budget decision", ("agent", "result")
+)
+A2A_HEDGES = _metric(
+    "counter", "a2a_hedged_requests_total",
+    "Hedged A2A requests by outcome (primary_won / hedge_won / both_failed / skipped / no_slot)", ("agent", "outcome")
+)
+AGENT_CONCURRENCY = _metric(
+    "gauge", "agent_concurrency",
+    "Adaptive per-agent concurrency limit and usage", ("agent", "state"), multiprocess_mode="livesum"
+)
+A2A_TTFB = _metric(
+    "histogram", "a2a_stream_ttfb_seconds",
+    "Time to first streamed chunk by agent", ("agent",), buckets=SLOW_BUCKETS
+)
+LLM_REQUEST_DURATION = _metric(
+    "histogram", "llm_request_duration_seconds",
+    "LLM call latency", ("provider", "model", "call_site", "outcome"), buckets=SLOW_BUCKETS
+)
+LLM_TOKENS = _metric(
+    "counter", "llm_tokens_total",
+    "LLM token usage", ("provider", "model", "call_site", "type")
+)
+DB_POOL_CONNECTIONS = _metric(
+    "gauge", "db_pool_connections",
+    "Database connection pool utilization", ("pool", "state"), multiprocess_mode="livesum"
+)
+AGENT_HTTP_POOL_CONNECTIONS = _metric(
+    "gauge", "agent_http_pool_connections",
+    "Per-agent-origin HTTP connection pool utilization", ("origin", "state"), multiprocess_mode="livesum"
+)
+REDIS_COMMAND_DURATION = _metric(
+    "histogram", "redis_command_duration_seconds",
+    "Redis command latency", ("command", "outcome"), buckets=FAST_BUCKETS
+)
+CACHE_LOOKUPS = _metric(
+    "counter", "cache_lookups_total",
+    "In-process / Redis cache lookups by cache, tier and result", ("cache", "tier", "result")
+)
+SSE_ACTIVE_STREAMS = _metric(
+    "gauge", "sse_active_streams",
+    "Active SSE chat streams", multiprocess_mode="livesum"
+)
+EVENT_LOOP_LAG = _metric(
+    "histogram", "event_loop_lag_seconds",
+    "Event loop scheduling lag", buckets=FAST_BUCKETS
+)
+EVENT_LOOP_LAG_CURRENT = _metric(
+    "gauge", "event_loop_lag_current_seconds",
+    "Most recent event loop lag sample", multiprocess_mode="livemax"
+)
+
+
+# =============================================================================
+# Instrumentation helpers
+# =============================================================================
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """orchestrator 단계 소요 시간 기록 (Prometheus + 요청 단위 타이밍)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.labels(stage=stage).observe(elapsed)
+        record_timing(stage, elapsed * 1000)
+
+
+def record_router_tier(router: str, tier: str, started: float, result: str):
+    """라우팅 tier 결과 기록 (result: hit / miss / error)"""
+    elapsed = time.perf_counter() - started
+    ROUTER_TIER_DURATION.labels(router=router, tier=tier).observe(elapsed)
+    record_timing(f"route.{tier}", elapsed * 1000)
+    ROUTER_TIER_RESULTS.labels(router=router, tier=tier, result=result).inc()
+
+
+def record_a2a_call(agent: str, mode: str, outcome: str, duration_seconds: float, ttfb_seconds: Optional[float] = None):
+    A2A_REQUEST_DURATION.labels(agent=agent, mode=mode, outcome=outcome).observe(duration_seconds)
+    record_timing("agent", duration_seconds * 1000)
+    if ttfb_seconds is not None:
+        A2A_TTFB.labels(agent=agent).observe(ttfb_seconds)
+        record_timing("agent.ttfb", ttfb_seconds * 1000)
+
+
+def record_a2a_dialect(dialect: str, result: str):
+    """A2A dialect별 호출 결과 (result: ok / protocol_error)"""
+    A2A_DIALECT_CALLS.labels(dialect=dialect, result=result).inc()
+
+
+def record_a2a_rejection(agent: str, reason: str):
+    A2A_REJECTIONS.labels(agent=agent, reason=reason).inc()
+
+
+def record_a2a_retry(agent: str, allowed: bool):
+    A2A_RETRIES.labels(agent=agent, result="allowed" if allowed else "denied").inc()
+
+
+def record_a2a_hedge(agent: str, outcome: str):
+    A2A_HEDGES.labels(agent=agent, outcome=outcome).inc()
+
+
+# 현재 진행 중인 LLM 호출 라벨 (provider, model, call_site) - 토큰 사용량 기록용
+_llm_call_labels: ContextVar[Optional[Tuple[str, str, str]]] = ContextVar("llm_call_labels", default=None)
+
+
+@contextmanager
+def observe_llm_call(provider: str, model: str, call_site: str) -> Iterator[None]:
+    """LLM 호출 지연/결과 기록 (llm.call span 포함). 블록 안에서 record_llm_usage()로 토큰 사용량 기록"""
+    token = _llm_call_labels.set((provider, model, call_site))
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with start_span("llm.call", {
+            "gen_ai.system": provider,
+            "gen_ai.request.model": model,
+            "llm.call_site": call_site
+        }):
+            yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started
+        LLM_REQUEST_DURATION.labels(
+            provider=provider, model=model, call_site=call_site, outcome=outcome
+        ).observe(elapsed)
+        record_timing(f"llm.{call_site}", elapsed * 1000)
+        _llm_call_labels.reset(token)
+
+
+def record_llm_usage(
+    prompt_tokens: Optional[int],
+    completion_tokens: Optional[int],
+    cached_tokens: Optional[int] = None
+):
+    labels = _llm_call_labels.get()
+    if labels is None:
+        return
+    set_span_attributes({
+        "gen_ai.usage.input_tokens": prompt_tokens,
+        "gen_ai.usage.output_tokens": completion_tokens,
+        "llm.cached_tokens": cached_tokens,
+        "llm.cache_hit": bool(cached_tokens) if cached_tokens is not None else None
+    })
+    provider, model, call_site = labels
+    if prompt_tokens:
+        LLM_TOKENS.labels(provider=provider, model=model, call_site=call_site, type="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(provider=provider, model=model, call_site=call_site, type="completion").inc(completion_tokens)
+
+
+@contextmanager
+def observe_redis(command: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        REDIS_COMMAND_DURATION.labels(command=command, outcome=outcome).observe(time.perf_counter() - started)
+
+
+def record_cache_lookup(cache: str, tier: str, result: str):
+    CACHE_LOOKUPS.labels(cache=cache, tier=tier, result=result).inc()
+
+
+@contextmanager
+def track_sse_stream() -> Iterator[None]:
+    SSE_ACTIVE_STREAMS.inc()
+    try:
+        yield
+    finally:
+        SSE_ACTIVE_STREAMS.dec()
+
+
+# =============================================================================
+# Background sampler (pool utilization, event loop lag)
+# =============================================================================
+
+class MetricsSampler:
+    """커넥션 풀 사용량을 주기적으로 샘플링하고 event loop lag를 측정"""
+
+    # event loop lag 측정 주기 (풀 샘플링은 metrics_sample_interval_seconds마다)
+    LAG_PROBE_SECONDS = 0.5
+
+    def __init__(self):
+        self.interval = get_settings().metrics_sample_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        next_pool_sample = 0.0
+        while True:
+            try:
+                expected = time.perf_counter() + self.LAG_PROBE_SECONDS
+                await asyncio.sleep(self.LAG_PROBE_SECONDS)
+                now = time.perf_counter()
+                lag = max(0.0, now - expected)
+                EVENT_LOOP_LAG.observe(lag)
+                EVENT_LOOP_LAG_CURRENT.set(lag)
+
+                if now >= next_pool_sample:
+                    next_pool_sample = now + self.interval
+                    self._sample_pools()
+                    self._sample_concurrency()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.debug(f"[Metrics] Sampling failed: {e}")
+
+    @staticmethod
+    def _sample_pools():
+        from . import database, agent_vector_store
+        from .http_client import GlobalHttpClient
+
+        engine = database._engine
+        if engine is not None:
+            pool = engine.sync_engine.pool
+            DB_POOL_CONNECTIONS.labels(pool="sqlalchemy", state="checked_out").set(pool.checkedout())
+            DB_POOL_CONNECTIONS.labels(pool="sqlalchemy", state="idle").set(pool.checkedin())
+            DB_POOL_CONNECTIONS.labels(pool="sqlalchemy", state="overflow").set(max(0, pool.overflow()))
+            DB_POOL_CONNECTIONS.labels(pool="sqlalchemy", state="size").set(pool.size())
+
+        store = agent_vector_store._vector_store
+        asyncpg_pool = store._pool if store is not None else None
+        if asyncpg_pool is not None:
+            size = asyncpg_pool.get_size()
+            idle = asyncpg_pool.get_idle_size()
+            DB_POOL_CONNECTIONS.labels(pool="asyncpg_vector", state="checked_out").set(size - idle)
+            DB_POOL_CONNECTIONS.labels(pool="asyncpg_vector", state="idle").set(idle)
+            DB_POOL_CONNECTIONS.labels(pool="asyncpg_vector", state="size").set(asyncpg_pool.get_max_size())
+
+        for origin, stats in GlobalHttpClient.get_pool_stats().items():
+            for state in ("in_flight", "active", "idle", "queued", "http2", "max"):
+                if stats[state] is not None:
+                    AGENT_HTTP_POOL_CONNECTIONS.labels(origin=origin, state=state).set(stats[state])
+
+    @staticmethod
+    def _sample_concurrency():
+        from .registry import registry
+
+        for agent_id, stats in registry.get_concurrency_stats().items():
+            agent = registry.get_agent(agent_id)
+            label = agent.name if agent else agent_id
+            for state in ("limit", "in_flight", "waiting"):
+                AGENT_CONCURRENCY.labels(agent=label, state=state).set(stats[state])
+
+
+_sampler: Optional[MetricsSampler] = None
+
+
+def get_metrics_sampler() -> MetricsSampler:
+    """MetricsSampler 싱글톤 인스턴스 반환"""
+    global _sampler
+    if _sampler is None:
+        _sampler = MetricsSampler()
+    return _sampler
+
+
+# =============================================================================
+# Exposition
+# =============================================================================
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    OpenMetrics/Prometheus 텍스트 exposition.
+    multiprocess 모드에서는 모든 워커의 값을 합산합니다.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    from prometheus_client import REGISTRY
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead():
+    """워커 종료 시 live gauge 파일 정리 (multiprocess 모드)"""
+    if PROMETHEUS_AVAILABLE and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -59,7 +59,8 @@ class AgentInfo(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     description: str
-    url: str
+    url: str  # primary URL
+    replicas: List[str] = []  # 같은 에이전트의 모든 replica URL (primary 포함)
     version: str = "1.0.0"
     skills: List[AgentSkill] = []
     capabilities: Dict[str, Any] = {}
@@ -86,6 +87,19 @@ class AgentURLRegistration(BaseModel):
     url: str  # Base URL of the A2A agent server
 
 
+class AgentBulkURLRegistration(BaseModel):
+    """Bulk A2A discovery registration"""
+    urls: List[str]
+    concurrency: Optional[int] = Field(None, ge=1, le=100)  # 미지정 시 서버 기본값
+
+
+class AgentHeartbeatBatch(BaseModel):
+    """Batched heartbeat - 한 호스트가 여러 에이전트의 lease를 한 번에 갱신"""
+    agent_ids: List[str] = []
+    agent_urls: List[str] = []  # ID를 모르는 경우 등록 URL로 지정
+    lease_seconds: Optional[float] = None  # 미지정 시 서버 기본값
+
+
 class AgentRoutingInfo(BaseModel):
     """Agent routing metadata for intelligent routing"""
     domain: str = "general"  # 도메인: project_management, documentation, communication 등
@@ -152,6 +166,8 @@ class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
     enabled_agent_ids: Optional[List[str]] = None  # 사용자가 활성화한 에이전트 ID 목록
+    # 직전 에이전트 재사용 override (None: 서버 설정, False: 항상 전체 라우팅, True: 설정과 무관하게 시도)
+    sticky_routing: Optional[bool] = None
 
 
 class ChatResponse(BaseModel):
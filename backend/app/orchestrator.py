@@ -2,67 +2,38 @@
 A2A Agent Orchestrator
 Core orchestration logic for routing requests to agents and handling responses
 """
+import asyncio
 import json
 import re
+import time
 import uuid
 from datetime import datetime
-from typing import AsyncGenerator, Optional, Dict, Any, List
+from typing import AsyncGenerator, Awaitable, Callable, Optional, Dict, Any, List
 from loguru import logger
 import httpx
-from tenacity import AsyncRetrying, retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import AsyncRetrying, retry, stop_after_attempt, wait_exponential
 
 from .config import get_settings
 from .models import (
     ChatRequest, ChatResponse, ChatMessage, Conversation,
-    MessageRole, TaskState, StreamEvent, AgentRoutingInfo
+    MessageRole, TaskState, StreamEvent, AgentRoutingInfo, RoutingDecision
 )
 from .registry import registry
 from .router import router  # Legacy router (fallback)
 from .hybrid_router import get_hybrid_router  # New hybrid router with pgvector
+from .conversation_affinity import get_conversation_affinity
 from .conversation_service import conversation_service
 from .workflow import analyze_workflow, WorkflowExecutor, Workflow, WorkflowStepStatus
 from .llm_client import get_llm_client
 from .mcp_token_service import get_mcp_token_service
 from .token_cache import get_token_cache
 from .database import get_db_session
-
-class GlobalHttpClient:
-    """
-    Global HTTP Client Singleton for Connection Pooling.
-    Initializes a shared httpx.AsyncClient to reuse TCP connections.
-    """
-    _client: Optional[httpx.AsyncClient] = None
-
-    @classmethod
-    def get_client(cls) -> httpx.AsyncClient:
-        if cls._client is None:
-            # Lazy initialization if not initialized via lifespan (safety net)
-            # Ideally initialized in main.py lifespan
-            cls._client = httpx.AsyncClient(
-                timeout=90.0,
-                verify=False,
-                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
-            )
-        return cls._client
-
-    @classmethod
-    async def initialize(cls):
-        if cls._client is None:
-            logger.info("[GlobalHttpClient] Initializing global HTTP client (Pool: 20/100)")
-            cls._client = httpx.AsyncClient(
-                timeout=90.0,
-                verify=False,
-                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
-            )
-
-    @classmethod
-    async def close(cls):
-        if cls._client:
-            logger.info("[GlobalHttpClient] Closing global HTTP client")
-            await cls._client.aclose()
-            cls._client = None
-
-
+from .http_client import GlobalHttpClient
+from .metrics import observe_stage, record_a2a_call, record_a2a_hedge, record_a2a_rejection, record_a2a_retry
+from .request_timing import get_request_timings, start_request_timing
+from .tracing import add_span_event, start_detached_span, start_span
+from .a2a_dialect import A2ADialect, DIALECT_SPECS, NEGOTIATION_ORDER, is_protocol_error
+from .concurrency_limiter import AgentOverloadedError
 
 class ConversationSummarizer:
     """
@@ -208,7 +179,7 @@ class ConversationSummarizer:
             
             response = await self.llm_client.chat_completion([
                 {"role": "user", "content": prompt}
-            ], temperature=0.3, max_tokens=200)
+            ], temperature=0.3, max_tokens=200, call_site="summarizer")
             
             return response.strip()
             
@@ -235,6 +206,8 @@ class A2AOrchestrator:
         self._workflow_executor = WorkflowExecutor(self)
         # Conversation summarizer for context-aware agent communication
         self._summarizer = ConversationSummarizer(max_history=5, use_llm_summary=True)
+        # Sticky agent affinity for follow-up turns
+        self._affinity = get_conversation_affinity()
     
     def get_or_create_conversation(self, conversation_id: Optional[str] = None) -> Conversation:
         """Get existing conversation or create new one (in-memory)"""
@@ -260,6 +233,19 @@ class A2AOrchestrator:
             return True
         return False
     
+    async def _route(self, request: ChatRequest) -> Optional[RoutingDecision]:
+        """Full routing: Hybrid Router (pgvector + keyword), legacy router as fallback"""
+        hybrid_router = get_hybrid_router()
+        with observe_stage("routing"):
+            routing_decision = await hybrid_router.route(request.message, request.enabled_agent_ids)
+            
+            # Fallback to legacy router if hybrid router fails
+            if not routing_decision:
+                logger.debug("[Routing] Hybrid router returned None, falling back to legacy router")
+                routing_decision = await router.route(request.message, request.enabled_agent_ids)
+        
+        return routing_decision
+    
     async def process_message(
         self, 
         request: ChatRequest,
@@ -273,7 +259,11 @@ class A2AOrchestrator:
         2. Route to appropriate agent
         3. Get response from agent (with conversation history for context)
         4. Return response
+        
+        단계별 소요 시간은 request timing context에 수집되어 metadata["timings"]로 반환/저장됩니다.
         """
+        timings = start_request_timing()
+        
         # Get or create conversation
         if user_id:
             # DB-backed conversation for authenticated users
@@ -304,54 +294,54 @@ class A2AOrchestrator:
             )
         
         # ========================================
-        # Check for Multi-Agent Workflow (Agent Chaining) - Phase 1 Improved
-        # Now uses LLM-based analysis with pattern fallback
-        # ========================================
-        available_agents = [
-            {
-                "id": a.id,
-                "name": a.name,
-                "description": a.description,
-                "url": a.url,
-                "skills": [s.model_dump() for s in a.skills]
-            }
-            for a in registry.list_agents(include_offline=False)
-        ]
-        
-        # Get previous response for context (supports "이 결과를 저장해줘" type requests)
-        previous_response = None
-        if conversation.messages:
-            for msg in reversed(conversation.messages):
-                if msg.role == MessageRole.ASSISTANT:
-                    previous_response = msg.content
-                    break
-        
-        # Use new async LLM-based workflow analyzer (with pattern fallback)
-        workflow = await analyze_workflow(
-            request.message, 
-            available_agents,
-            previous_response
-        )
-        
-        if workflow and len(workflow.steps) >= 1:
-            analyzer_type = workflow.metadata.get("analyzer", "unknown")
-            logger.info(f"[WORKFLOW] Multi-agent workflow detected ({analyzer_type}): {workflow.name} ({len(workflow.steps)} steps)")
-            if workflow.reasoning:
-                logger.info(f"   Reasoning: {workflow.reasoning}")
-            # Phase 2: Pass available_agents for Supervisor fallback support
-            return await self._execute_workflow(workflow, conversation, user_id, available_agents)
-        
-        # ========================================
-        # Single Agent Routing (Normal Flow)
+        # Conversation Affinity (follow-up fast path)
+        # 직전 에이전트와 이어지는 발화는 workflow 분석/라우팅 생략
         # ========================================
-        # Route to agent using Hybrid Router (pgvector + keyword)
-        hybrid_router = get_hybrid_router()
-        routing_decision = await hybrid_router.route(request.message, request.enabled_agent_ids)
+        with observe_stage("affinity"):
+            routing_decision = await self._affinity.resolve(
+                conversation,
+                request.message,
+                request.enabled_agent_ids,
+                request.sticky_routing
+            )
+        affinity_hit = routing_decision is not None
         
-        # Fallback to legacy router if hybrid router fails
-        if not routing_decision:
-            logger.debug("[Routing] Hybrid router returned None, falling back to legacy router")
-            routing_decision = await router.route(request.message, request.enabled_agent_ids)
+        if not affinity_hit:
+            # ========================================
+            # Check for Multi-Agent Workflow (Agent Chaining) - Phase 1 Improved
+            # Now uses LLM-based analysis with pattern fallback
+            # ========================================
+            # 불변 catalog snapshot (dict view / 프롬프트 블록은 version당 한 번만 생성)
+            available_agents = registry.get_catalog()
+            
+            # Get previous response for context (supports "이 결과를 저장해줘" type requests)
+            previous_response = None
+            if conversation.messages:
+                for msg in reversed(conversation.messages):
+                    if msg.role == MessageRole.ASSISTANT:
+                        previous_response = msg.content
+                        break
+            
+            # Use new async LLM-based workflow analyzer (with pattern fallback)
+            with observe_stage("workflow_analysis"):
+                workflow = await analyze_workflow(
+                    request.message, 
+                    available_agents,
+                    previous_response
+                )
+            
+            if workflow and len(workflow.steps) >= 1:
+                analyzer_type = workflow.metadata.get("analyzer", "unknown")
+                logger.info(f"[WORKFLOW] Multi-agent workflow detected ({analyzer_type}): {workflow.name} ({len(workflow.steps)} steps)")
+                if workflow.reasoning:
+                    logger.info(f"   Reasoning: {workflow.reasoning}")
+                # Phase 2: Pass available_agents for Supervisor fallback support
+                return await self._execute_workflow(workflow, conversation, user_id, available_agents)
+            
+            # ========================================
+            # Single Agent Routing (Normal Flow)
+            # ========================================
+            routing_decision = await self._route(request)
         
         if routing_decision:
             logger.info(f"Routing to agent: {routing_decision.agent_name} ({routing_decision.reasoning})")
@@ -360,11 +350,12 @@ class A2AOrchestrator:
             reference_task_ids = self._get_reference_task_ids(conversation)
             
             # Generate context-enriched message with conversation history
-            enriched_message = await self._summarizer.summarize(
-                conversation,
-                request.message,
-                target_agent=routing_decision.agent_name
-            )
+            with observe_stage("summarization"):
+                enriched_message = await self._summarizer.summarize(
+                    conversation,
+                    request.message,
+                    target_agent=routing_decision.agent_name
+                )
             logger.debug(f"[CONTEXT] Enriched message with history: {len(enriched_message)} chars")
             
             # Option C: Pass kauth_user_id to agent for MCPHub token lookup
@@ -379,7 +370,8 @@ class A2AOrchestrator:
                 reference_task_ids,
                 user_id,
                 kauth_user_id,  # Option C: K-Auth user ID for MCPHub token lookup
-                jwt_token  # Directive 007: Pass Raw Token
+                jwt_token,  # Directive 007: Pass Raw Token
+                agent_id=routing_decision.agent_id
             )
             
             # Extract task_id from response (A2A Standard)
@@ -396,7 +388,8 @@ class A2AOrchestrator:
                     "routing": {
                         "agent_id": routing_decision.agent_id,
                         "confidence": routing_decision.confidence,
-                        "reasoning": routing_decision.reasoning
+                        "reasoning": routing_decision.reasoning,
+                        "affinity": affinity_hit
                     },
                     "task_id": task_id  # A2A Standard: Store for referenceTaskIds
                 }
@@ -413,13 +406,16 @@ class A2AOrchestrator:
                 metadata={"routing": {"status": "no_agent_matched"}}
             )
         
+        response.metadata["timings"] = timings.to_dict()
+        
         # Add assistant message to conversation with task_id (A2A Standard)
         assistant_message = ChatMessage(
             role=MessageRole.ASSISTANT,
             content=response.content,
             metadata={
                 "agent": response.agent_used,
-                "task_id": task_id  # Store task_id for referenceTaskIds
+                "task_id": task_id,  # Store task_id for referenceTaskIds
+                "timings": response.metadata["timings"]
             }
         )
         conversation.messages.append(assistant_message)
@@ -432,7 +428,10 @@ class A2AOrchestrator:
                 response.content,
                 agent_used=response.agent_used,
                 task_id=task_id,
-                metadata={"routing": response.metadata.get("routing")}
+                metadata={
+                    "routing": response.metadata.get("routing"),
+                    "timings": response.metadata["timings"]
+                }
             )
         
         # Update conversation title if first message
@@ -469,12 +468,13 @@ class A2AOrchestrator:
         logger.info(f"   Supervisor: {'enabled' if workflow.supervisor_enabled else 'disabled'}")
         
         # Execute the workflow with Supervisor support
-        completed_workflow = await self._workflow_executor.execute(
-            workflow,
-            conversation.id,
-            user_id,
-            available_agents or []
-        )
+        with observe_stage("workflow_execution"):
+            completed_workflow = await self._workflow_executor.execute(
+                workflow,
+                conversation.id,
+                user_id,
+                available_agents or []
+            )
         
         # Build response based on workflow results
         if completed_workflow.status == WorkflowStepStatus.COMPLETED:
@@ -530,13 +530,18 @@ class A2AOrchestrator:
                 }
             )
         
+        timings = get_request_timings()
+        if timings is not None:
+            response.metadata["timings"] = timings.to_dict()
+        
         # Add assistant message to conversation
         assistant_message = ChatMessage(
             role=MessageRole.ASSISTANT,
             content=response.content,
             metadata={
                 "workflow": workflow.name,
-                "agents": response.metadata.get("workflow", {}).get("agents", [])
+                "agents": response.metadata.get("workflow", {}).get("agents", []),
+                "timings": response.metadata.get("timings")
             }
         )
         conversation.messages.append(assistant_message)
@@ -564,7 +569,11 @@ class A2AOrchestrator:
     ) -> AsyncGenerator[StreamEvent, None]:
         """
         Process a user message with streaming response.
+        
+        마지막 "done" 직전에 단계별 소요 시간을 담은 "timing" 이벤트를 보냅니다.
         """
+        timings = start_request_timing()
+        
         # Get or create conversation
         if user_id:
             conversation = await conversation_service.get_or_create_conversation(
@@ -599,21 +608,25 @@ class A2AOrchestrator:
             }
         )
         
-        # Route to agent using Hybrid Router (pgvector + keyword)
-        hybrid_router = get_hybrid_router()
-        routing_decision = await hybrid_router.route(request.message, request.enabled_agent_ids)
-        
-        # Fallback to legacy router if hybrid router fails
-        if not routing_decision:
-            logger.debug("[Routing] Hybrid router returned None, falling back to legacy router")
-            routing_decision = await router.route(request.message, request.enabled_agent_ids)
+        # Conversation affinity fast path, then full routing
+        with observe_stage("affinity"):
+            routing_decision = await self._affinity.resolve(
+                conversation,
+                request.message,
+                request.enabled_agent_ids,
+                request.sticky_routing
+            )
+        affinity_hit = routing_decision is not None
+        if not affinity_hit:
+            routing_decision = await self._route(request)
         
         # Emit routing info
         yield StreamEvent(
             event="routing",
             data={
                 "agent": routing_decision.agent_name if routing_decision else None,
-                "confidence": routing_decision.confidence if routing_decision else 0
+                "confidence": routing_decision.confidence if routing_decision else 0,
+                "affinity": affinity_hit
             }
         )
         
@@ -622,11 +635,12 @@ class A2AOrchestrator:
             reference_task_ids = self._get_reference_task_ids(conversation)
             
             # Generate context-enriched message with conversation history
-            enriched_message = await self._summarizer.summarize(
-                conversation,
-                request.message,
-                target_agent=routing_decision.agent_name
-            )
+            with observe_stage("summarization"):
+                enriched_message = await self._summarizer.summarize(
+                    conversation,
+                    request.message,
+                    target_agent=routing_decision.agent_name
+                )
             
             # Stream from agent
             full_content = ""
@@ -634,10 +648,10 @@ class A2AOrchestrator:
                 routing_decision.agent_url,
                 enriched_message,  # Now includes conversation history context
                 conversation.id,
-                conversation.id,
                 reference_task_ids,
                 user_id,
-                jwt_token=jwt_token  # Directive 007: Pass Raw Token
+                jwt_token=jwt_token,  # Directive 007: Pass Raw Token
+                agent_id=routing_decision.agent_id
             ):
                 full_content += chunk
                 yield StreamEvent(
@@ -649,7 +663,7 @@ class A2AOrchestrator:
             assistant_message = ChatMessage(
                 role=MessageRole.ASSISTANT,
                 content=full_content,
-                metadata={"agent": routing_decision.agent_name}
+                metadata={"agent": routing_decision.agent_name, "timings": timings.to_dict()}
             )
             conversation.messages.append(assistant_message)
             
@@ -659,7 +673,8 @@ class A2AOrchestrator:
                     conversation.id,
                     MessageRole.ASSISTANT,
                     full_content,
-                    agent_used=routing_decision.agent_name
+                    agent_used=routing_decision.agent_name,
+                    metadata={"timings": assistant_message.metadata["timings"]}
                 )
             
         else:
@@ -672,7 +687,8 @@ class A2AOrchestrator:
             
             assistant_message = ChatMessage(
                 role=MessageRole.ASSISTANT,
-                content=fallback
+                content=fallback,
+                metadata={"timings": timings.to_dict()}
             )
             conversation.messages.append(assistant_message)
             
@@ -681,7 +697,8 @@ class A2AOrchestrator:
                 await conversation_service.add_message(
                     conversation.id,
                     MessageRole.ASSISTANT,
-                    fallback
+                    fallback,
+                    metadata=assistant_message.metadata
                 )
         
         # Update title if first message
@@ -689,7 +706,11 @@ class A2AOrchestrator:
             new_title = request.message[:50] + ("..." if len(request.message) > 50 else "")
             await conversation_service.update_conversation_title(conversation.id, new_title)
         
-        # Emit completion
+        # Emit stage timings, then completion
+        yield StreamEvent(
+            event="timing",
+            data=timings.to_dict()
+        )
         yield StreamEvent(
             event="done",
             data={"conversation_id": conversation.id}
@@ -710,6 +731,100 @@ class A2AOrchestrator:
     
 
     
+    def _resolve_agent_id(self, agent_url: str) -> Optional[str]:
+        """Agent URL -> registry agent ID (metrics / circuit breaker key)"""
+        agent = registry.get_agent_by_url(agent_url)
+        return agent.id if agent else None
+    
+    def _record_agent_call(
+        self,
+        agent_id: Optional[str],
+        agent_url: str,
+        mode: str,
+        started: float,
+        result: Optional[Dict[str, Any]],
+        ttfb_ms: Optional[float] = None,
+        replica_url: Optional[str] = None
+    ):
+        """
+        A2A 호출 결과를 AgentMetrics / Prometheus에 기록
+        (result가 None이면 결과 없이 종료된 호출 - 취소/연결 종료)
+        replica_url이 주어지면 replica별 상태에도 반영합니다.
+        """
+        elapsed = time.perf_counter() - started
+        agent_label = self._agent_label(agent_id, agent_url)
+        
+        if result is None:
+            outcome = "cancelled"
+            record_a2a_call(agent_label, mode, outcome, elapsed)
+            if agent_id:
+                registry.release_request(agent_id)
+        elif result.get("state") == "failed":
+            outcome = "failure"
+            record_a2a_call(agent_label, mode, outcome, elapsed)
+            if agent_id:
+                registry.record_request_failure(agent_id, result.get("content", "A2A call failed"))
+        else:
+            outcome = "success"
+            record_a2a_call(agent_label, mode, outcome, elapsed, ttfb_ms / 1000 if ttfb_ms is not None else None)
+            if agent_id:
+                registry.record_request_success(agent_id, elapsed * 1000, ttfb_ms)
+        
+        if agent_id:
+            # 스트림은 응답 길이에 따라 전체 시간이 달라지므로 limiter에는 TTFB를 지연 신호로 전달
+            signal_ms = ttfb_ms if ttfb_ms is not None else elapsed * 1000
+            registry.release_concurrency(agent_id, signal_ms, outcome)
+            if replica_url:
+                registry.replica_finished(agent_id, replica_url, elapsed * 1000, outcome)
+    
+    @staticmethod
+    def _agent_label(agent_id: Optional[str], agent_url: str) -> str:
+        agent = registry.get_agent(agent_id) if agent_id else None
+        return agent.name if agent else agent_url
+    
+    async def _admit_agent_call(self, agent_id: Optional[str], agent_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Circuit breaker + adaptive concurrency gate.
+        
+        Returns a failed response if the call is rejected, None if admitted.
+        An admitted call must be finished with _record_agent_call().
+        """
+        if not agent_id:
+            return None
+        
+        if not registry.try_acquire_request(agent_id):
+            record_a2a_rejection(self._agent_label(agent_id, agent_url), "circuit_open")
+            return self._circuit_open_response(agent_url)
+        
+        try:
+            await registry.acquire_concurrency(agent_id)
+        except AgentOverloadedError as e:
+            registry.release_request(agent_id)
+            record_a2a_rejection(self._agent_label(agent_id, agent_url), e.reason)
+            return self._overloaded_response(agent_url, e)
+        except asyncio.CancelledError:
+            registry.release_request(agent_id)
+            raise
+        return None
+    
+    @staticmethod
+    def _circuit_open_response(agent_url: str) -> Dict[str, Any]:
+        logger.warning(f"[A2A] Circuit open, request rejected: {agent_url}")
+        return {
+            "content": "Agent is temporarily unavailable (circuit breaker open).",
+            "state": "failed",
+            "circuit_open": True
+        }
+    
+    @staticmethod
+    def _overloaded_response(agent_url: str, error: AgentOverloadedError) -> Dict[str, Any]:
+        logger.warning(f"[A2A] Concurrency limit reached, request rejected: {agent_url} ({error})")
+        return {
+            "content": "Agent is overloaded, please try again shortly.",
+            "state": "failed",
+            "overloaded": True
+        }
+    
     async def _send_to_agent(
         self,
         agent_url: str,
@@ -718,13 +833,171 @@ class A2AOrchestrator:
         reference_task_ids: list = None,
         user_id: Optional[str] = None,
         kauth_user_id: Optional[str] = None,
-        jwt_token: Optional[str] = None  # Directive 007: Raw Token
+        jwt_token: Optional[str] = None,  # Directive 007: Raw Token
+        agent_id: Optional[str] = None,
+        idempotent: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Send message to agent via A2A, timed and recorded in AgentMetrics.
+        
+        Circuit-open agents are rejected without a network call; in half-open state
+        only one trial request is admitted at a time. Calls beyond the agent's adaptive
+        concurrency limit wait in a bounded queue, then are rejected fast.
+        
+        Multi-replica agents: each call goes to one replica (p2c / least-outstanding).
+        Idempotent calls (idempotent=True, or the agent declares the "idempotent"
+        capability) are hedged to a second replica after the agent's recent p95 latency.
+        """
+        agent_id = agent_id or self._resolve_agent_id(agent_url)
+        rejection = await self._admit_agent_call(agent_id, agent_url)
+        if rejection:
+            return rejection
+        
+        if idempotent is None:
+            agent = registry.get_agent(agent_id) if agent_id else None
+            idempotent = bool(agent and agent.capabilities.get("idempotent"))
+        
+        async def send(replica_url: str) -> Dict[str, Any]:
+            return await self._send_a2a_message(
+                replica_url, message, context_id, reference_task_ids,
+                user_id, kauth_user_id, jwt_token, agent_id=agent_id
+            )
+        
+        started = time.perf_counter()
+        result = None
+        with start_span("a2a.send", {"a2a.agent_id": agent_id, "a2a.agent_url": agent_url}) as span:
+            try:
+                result = await self._send_to_replicas(agent_id, agent_url, send, idempotent)
+                span.set_attribute("a2a.state", result.get("state", "unknown"))
+                return result
+            finally:
+                self._record_agent_call(agent_id, agent_url, "send", started, result)
+    
+    async def _send_to_replicas(
+        self,
+        agent_id: Optional[str],
+        agent_url: str,
+        send: Callable[[str], Awaitable[Dict[str, Any]]],
+        idempotent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Replica 선택 후 전송, idempotent 호출은 hedge.
+        
+        Hedge: 첫 replica가 hedge 지연(최근 p95) 안에 응답하지 않으면 다른 정상 replica로
+        같은 요청을 보내고, 먼저 성공한 응답을 사용한 뒤 나머지는 취소합니다.
+        hedge 요청은 대기 없이 얻은 동시성 슬롯과 retry budget을 소비하므로
+        (둘 중 하나라도 없으면 hedge하지 않음) 과부하 시 부하를 두 배로 늘리지 않습니다.
+        """
+        replica_url = registry.pick_replica(agent_id) if agent_id else None
+        if not replica_url:
+            return await send(agent_url)
+        
+        hedge_delay = registry.hedge_delay_seconds(agent_id) if idempotent else None
+        if hedge_delay is None:
+            return await self._call_replica(agent_id, replica_url, send)
+        
+        primary = asyncio.create_task(self._call_replica(agent_id, replica_url, send))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            
+            agent_label = self._agent_label(agent_id, agent_url)
+            hedge_url = registry.pick_replica(agent_id, exclude=(replica_url,))
+            if not hedge_url:
+                record_a2a_hedge(agent_label, "skipped")
+                return await primary
+            if not registry.try_acquire_concurrency(agent_id):
+                record_a2a_hedge(agent_label, "no_slot")
+                return await primary
+            if not registry.try_spend_retry(agent_id):
+                registry.release_concurrency(agent_id, 0.0, "cancelled")
+                record_a2a_hedge(agent_label, "skipped")
+                return await primary
+            
+            logger.debug(f"[A2A] Hedging {agent_label} after {hedge_delay * 1000:.0f}ms: {replica_url} -> {hedge_url}")
+            add_span_event("a2a.hedge", {"a2a.hedge.delay_ms": round(hedge_delay * 1000, 2), "a2a.hedge.url": hedge_url})
+            hedge = asyncio.create_task(self._call_hedge(agent_id, hedge_url, send))
+            tasks.append(hedge)
+            
+            pending = set(tasks)
+            result = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result.get("state") != "failed":
+                        record_a2a_hedge(agent_label, "hedge_won" if task is hedge else "primary_won")
+                        return result
+            record_a2a_hedge(agent_label, "both_failed")
+            return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _call_hedge(
+        self,
+        agent_id: str,
+        replica_url: str,
+        send: Callable[[str], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """hedge 전송 - 미리 확보한 동시성 슬롯을 종료 시 반환"""
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await self._call_replica(agent_id, replica_url, send)
+            return result
+        finally:
+            if result is None:
+                outcome = "cancelled"
+            else:
+                outcome = "failure" if result.get("state") == "failed" else "success"
+            registry.release_concurrency(agent_id, (time.perf_counter() - started) * 1000, outcome)
+    
+    async def _call_replica(
+        self,
+        agent_id: str,
+        replica_url: str,
+        send: Callable[[str], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """replica 1개로 전송하고 replica별 outstanding / 지연 / 실패를 기록"""
+        registry.replica_started(agent_id, replica_url)
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await send(replica_url)
+            return result
+        finally:
+            if result is None:
+                outcome = "cancelled"
+            else:
+                outcome = "failure" if result.get("state") == "failed" else "success"
+            registry.replica_finished(agent_id, replica_url, (time.perf_counter() - started) * 1000, outcome)
+    
+    async def _send_a2a_message(
+        self,
+        agent_url: str,
+        message: str,
+        context_id: str,
+        reference_task_ids: list = None,
+        user_id: Optional[str] = None,
+        kauth_user_id: Optional[str] = None,
+        jwt_token: Optional[str] = None,  # Directive 007: Raw Token
+        agent_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Send message to agent using A2A protocol (Standard + Legacy) with Global Client & Retries.
         
+        Dialect Negotiation:
+        - The registry remembers each agent's dialect (Agent Card protocolVersion or
+          first successful call), so legacy agents get message/send directly.
+        - Unknown agents: Standard first, then Legacy on a non-200 / protocol error.
+        - Cached dialect: re-negotiated only on protocol errors (-32601, HTTP 404 ...).
+        
         Retry Policy:
-        - Retries performed on HTTP transport layer only.
+        - Retries performed on HTTP transport layer only, within the agent's retry budget.
         - Message IDs and Request IDs are generated ONCE to ensure idempotency.
         """
         try:
@@ -754,60 +1027,51 @@ class A2AOrchestrator:
             
             logger.debug(f"[A2A] Request ID: {request_id}")
             
-            # Use Global Client (Connection Pooling)
-            client = GlobalHttpClient.get_client()
+            # Per-agent-origin connection pool
+            client = GlobalHttpClient.get_client(agent_url)
             
-            # Message Construction (ONCE)
-            message_parts = [{"text": message}]
-            message_obj = {
-                "role": "user",
-                "parts": message_parts,
-                "messageId": str(uuid.uuid4()),
-                "contextId": context_id
-            }
-            if reference_task_ids:
-                message_obj["referenceTaskIds"] = reference_task_ids
-            
-            # Standard Payload (PascalCase) (ONCE)
-            standard_payload = {
-                "jsonrpc": "2.0",
-                "id": str(uuid.uuid4()),
-                "method": "SendMessage",
-                "params": {"message": message_obj}
-            }
+            cached_dialect = registry.get_agent_dialect(agent_url)
+            if cached_dialect:
+                dialects = [cached_dialect] + [d for d in NEGOTIATION_ORDER if d != cached_dialect]
+            else:
+                registry.record_dialect_negotiation()
+                dialects = NEGOTIATION_ORDER
             
-            # Execute Request with Retry Logic (Idempotent)
             response = None
-            async for attempt in AsyncRetrying(
-                retry=retry_if_exception_type((httpx.ConnectError, httpx.ReadTimeout, httpx.PoolTimeout)),
-                stop=stop_after_attempt(3),
-                wait=wait_exponential(multiplier=1, min=1, max=4),
-                reraise=True
-            ):
-                with attempt:
-                    response = await client.post(
-                        f"{agent_url}/tasks/send",
-                        json=standard_payload,
-                        headers=headers
+            result = None
+            for attempt_index, dialect in enumerate(dialects):
+                if attempt_index > 0:
+                    logger.info(
+                        f"[A2A] {dialects[attempt_index - 1].value} dialect rejected by {agent_url} "
+                        f"(HTTP {response.status_code}), trying {dialect.value}"
                     )
+                
+                payload = self._build_a2a_payload(
+                    DIALECT_SPECS[dialect].send_method, dialect, message, context_id, reference_task_ids
+                )
+                response = await self._post_a2a(client, agent_url, payload, headers, agent_id)
+                result = response.json() if response.status_code == 200 else None
+                protocol_error = is_protocol_error(response.status_code, result)
+                
+                if response.status_code == 200 and not protocol_error:
+                    registry.record_dialect_result(agent_url, dialect, protocol_error=False)
+                    return self._parse_a2a_response(result)
+                
+                if protocol_error:
+                    registry.record_dialect_result(agent_url, dialect, protocol_error=True)
+                    if dialect == cached_dialect:
+                        registry.record_dialect_negotiation(renegotiation=True)
+                elif cached_dialect:
+                    # 확정된 dialect의 일반 오류 (5xx 등)는 재협상하지 않음
+                    break
             
-            # Process Response
-            if response and response.status_code == 200:
-                result = response.json()
-                if "error" in result and result.get("error", {}).get("code") == -32601:
-                    logger.info("[A2A] Standard method not supported, falling back to legacy method")
-                    # Legacy fallback logic here (Note: Legacy fallback does NOT auto-retry internally yet)
-                    return await self._send_to_agent_legacy(
-                        client, agent_url, message, context_id, 
-                        reference_task_ids, headers
-                    )
+            if result is not None:
                 return self._parse_a2a_response(result)
-            else:
-                logger.info(f"[A2A] Standard method failed (HTTP {response.status_code if response else 'None'}), trying legacy")
-                return await self._send_to_agent_legacy(
-                    client, agent_url, message, context_id,
-                    reference_task_ids, headers
-                )
+            logger.error(f"Agent returned status {response.status_code}")
+            return {
+                "content": f"Agent error: HTTP {response.status_code}",
+                "state": "failed"
+            }
                     
         except httpx.TimeoutException:
             logger.error(f"Timeout connecting to agent at {agent_url}")
@@ -815,104 +1079,164 @@ class A2AOrchestrator:
         except Exception as e:
             logger.error(f"Error communicating with agent: {e}")
             return {"content": f"Error communicating with agent: {str(e)}", "state": "failed"}
-
-    async def _send_to_agent_legacy(
-        self,
-        client: httpx.AsyncClient,
-        agent_url: str,
+    
+    @staticmethod
+    def _build_a2a_payload(
+        method: str,
+        dialect: A2ADialect,
         message: str,
         context_id: str,
-        reference_task_ids: list = None,
-        headers: Dict[str, str] = None
+        reference_task_ids: list = None
     ) -> Dict[str, Any]:
         """
-        Legacy A2A method for backward compatibility.
-        Uses lowercase/slash method names (message/send).
+        Build A2A JSON-RPC payload (ONCE per dialect; IDs are reused across retries).
         
-        This will be deprecated in Phase 2.
+        Standard: PascalCase method, { "text": "..." } parts
+        Legacy: lowercase/slash method, { "kind": "text", "text": "..." } parts
         """
-        try:
-            # Legacy Part structure with "kind" key
-            message_parts = [
-                {
-                    "kind": "text",
-                    "text": message
-                }
-            ]
-            
-            message_obj = {
-                "role": "user",
-                "parts": message_parts,
-                "messageId": str(uuid.uuid4()),
-                "contextId": context_id
-            }
-            
-            if reference_task_ids:
-                message_obj["referenceTaskIds"] = reference_task_ids
-            
-            # Legacy method name
-            legacy_payload = {
-                "jsonrpc": "2.0",
-                "id": str(uuid.uuid4()),
-                "method": "message/send",  # Legacy: lowercase/slash
-                "params": {
-                    "message": message_obj
-                }
-            }
-            
-            response = await client.post(
-                f"{agent_url}/tasks/send",
-                json=legacy_payload,
-                headers=headers or {}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return self._parse_a2a_response(result)
-            else:
-                logger.error(f"Agent returned status {response.status_code}")
-                return {
-                    "content": f"Agent error: HTTP {response.status_code}",
-                    "state": "failed"
-                }
-                
-        except Exception as e:
-            logger.error(f"Legacy A2A call failed: {e}")
-            return {"content": f"Error communicating with agent: {str(e)}", "state": "failed"}
+        message_obj = {
+            "role": "user",
+            "parts": [DIALECT_SPECS[dialect].text_part(message)],
+            "messageId": str(uuid.uuid4()),
+            "contextId": context_id
+        }
+        if reference_task_ids:
+            message_obj["referenceTaskIds"] = reference_task_ids
+        
+        return {
+            "jsonrpc": "2.0",
+            "id": str(uuid.uuid4()),
+            "method": method,
+            "params": {"message": message_obj}
+        }
+    
+    async def _post_a2a(
+        self,
+        client: httpx.AsyncClient,
+        agent_url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        agent_id: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        POST /tasks/send with transport-level retries (idempotent payload).
+        
+        Retries are capped by a2a_max_attempts and only taken while the agent's
+        retry budget allows, so an overloaded agent is not hit with retry storms.
+        """
+        max_attempts = get_settings().a2a_max_attempts
+        
+        def should_retry(retry_state) -> bool:
+            error = retry_state.outcome.exception()
+            if not isinstance(error, (httpx.ConnectError, httpx.ReadTimeout, httpx.PoolTimeout)):
+                return False
+            if retry_state.attempt_number >= max_attempts:
+                return False
+            allowed = registry.try_spend_retry(agent_id)
+            record_a2a_retry(self._agent_label(agent_id, agent_url), allowed)
+            return allowed
+        
+        response = None
+        async for attempt in AsyncRetrying(
+            retry=should_retry,
+            stop=stop_after_attempt(max_attempts),
+            wait=wait_exponential(multiplier=1, min=1, max=4),
+            reraise=True
+        ):
+            with attempt:
+                response = await client.post(
+                    f"{agent_url}/tasks/send",
+                    json=payload,
+                    headers=headers
+                )
+        return response
     
     async def _get_user_mcp_token(self, user_id: str) -> Optional[str]:
         """
         사용자의 MCP Hub 토큰을 가져옵니다.
         
-        1. Redis 캐시 확인 (TTL 5분)
-        2. 캐시 miss면 DB에서 조회 후 캐시에 저장
+        1. 워커 내 L1 / Redis 캐시 확인 (토큰 없음 결과 포함)
+        2. 캐시 miss면 DB에서 조회 후 캐시에 저장 (같은 사용자의 동시 miss는 1회 조회)
         """
         try:
             from uuid import UUID
             user_uuid = UUID(user_id)
             
-            # 1. 캐시 확인
-            cache = get_token_cache()
-            cached_token = await cache.get(user_uuid)
-            if cached_token:
-                return cached_token
+            async def load_from_db() -> Optional[str]:
+                async with get_db_session() as db:
+                    return await get_mcp_token_service().get_token(db, user_uuid)
+            
+            return await get_token_cache().get_or_load(user_uuid, load_from_db)
             
-            # 2. DB에서 조회
-            async with get_db_session() as db:
-                service = get_mcp_token_service()
-                token = await service.get_token(db, user_uuid)
-                
-                # 3. 캐시에 저장
-                if token:
-                    await cache.set(user_uuid, token)
-                
-                return token
-                
         except Exception as e:
             logger.warning(f"[MCP Token] Failed to get token for user {user_id}: {e}")
             return None
     
     async def _stream_from_agent(
+        self,
+        agent_url: str,
+        message: str,
+        context_id: str,
+        reference_task_ids: list = None,
+        user_id: Optional[str] = None,
+        jwt_token: Optional[str] = None,  # Directive 007: Raw Token
+        agent_id: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream response from agent (A2A SSE), timed and recorded in AgentMetrics.
+        
+        Circuit-open / overloaded agents are rejected without a network call. On a
+        streaming error the failure is recorded and the call falls back to non-streaming.
+        """
+        agent_id = agent_id or self._resolve_agent_id(agent_url)
+        rejection = await self._admit_agent_call(agent_id, agent_url)
+        if rejection:
+            yield rejection["content"]
+            return
+        
+        replica_url = (registry.pick_replica(agent_id) if agent_id else None) or agent_url
+        if agent_id:
+            registry.replica_started(agent_id, replica_url)
+        
+        started = time.perf_counter()
+        ttfb_ms = None
+        recorded = False
+        span_attributes = {"a2a.agent_id": agent_id, "a2a.agent_url": agent_url, "a2a.replica_url": replica_url}
+        with start_detached_span("a2a.stream", span_attributes) as span:
+            try:
+                async for chunk in self._stream_a2a_message(
+                    replica_url, message, context_id, reference_task_ids, user_id, jwt_token
+                ):
+                    if ttfb_ms is None:
+                        ttfb_ms = (time.perf_counter() - started) * 1000
+                        span.set_attribute("a2a.ttfb_ms", round(ttfb_ms, 2))
+                    yield chunk
+                self._record_agent_call(
+                    agent_id, agent_url, "stream", started, {"state": "completed"}, ttfb_ms, replica_url=replica_url
+                )
+                recorded = True
+                span.set_attribute("a2a.state", "completed")
+            except Exception as e:
+                logger.error(f"Streaming error: {e}")
+                self._record_agent_call(
+                    agent_id, agent_url, "stream", started, {"state": "failed", "content": f"Streaming error: {e}"},
+                    replica_url=replica_url
+                )
+                recorded = True
+                span.set_attribute("a2a.state", "failed")
+                span.add_event("a2a.stream.fallback", {"error": str(e)})
+                # Fallback to non-streaming (A2A Standard) - a2a.send span은 이 span과 같은 부모 아래에 기록
+                result = await self._send_to_agent(
+                    agent_url, message, context_id, reference_task_ids, user_id, agent_id=agent_id
+                )
+                yield result.get("content", "Error occurred during streaming.")
+            finally:
+                if not recorded:
+                    # 소비자가 스트림을 중단한 경우 (클라이언트 연결 종료 등)
+                    self._record_agent_call(agent_id, agent_url, "stream", started, None, replica_url=replica_url)
+                    span.set_attribute("a2a.state", "cancelled")
+    
+    async def _stream_a2a_message(
         self,
         agent_url: str,
         message: str,
@@ -933,81 +1257,59 @@ class A2AOrchestrator:
         - X-Request-Id: Request tracking ID for distributed tracing
         - X-User-Id: User identifier
         """
-        try:
-            # Generate request ID for distributed tracing
-            request_id = str(uuid.uuid4())
-            
-            # Build headers
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "text/event-stream",
-                "X-Request-Id": request_id  # 분산 트레이싱용 요청 ID
-            }
-            
-            # Add User-Id header if available
-            if user_id:
-                headers["X-User-Id"] = user_id
-            
-            # Add MCP Hub Token if user is authenticated
-            if user_id:
-                mcp_token = await self._get_user_mcp_token(user_id)
-                if mcp_token:
-                    headers["X-MCP-Hub-Token"] = mcp_token
-            
-            # Directive 007: Identity Propagation
-            if jwt_token:
-                headers["Authorization"] = f"Bearer {jwt_token}"
-                logger.debug(f"[A2A Stream] Added Authorization header: Bearer {jwt_token[:10]}...")
-            
-            logger.debug(f"[A2A Stream] Request ID: {request_id}")
-            
-            # Use Global Client (Connection Pooling)
-            client = GlobalHttpClient.get_client()
-            
-            # A2A Standard message object (Google Spec)
-            message_obj = {
-                "role": "user",
-                "parts": [{"text": message}],  # A2A Standard: Direct text key
-                "messageId": str(uuid.uuid4()),
-                "contextId": context_id
-            }
-            
-            # Add referenceTaskIds if available (A2A Standard)
-            if reference_task_ids:
-                message_obj["referenceTaskIds"] = reference_task_ids
-            
-            # A2A Standard: StreamMessage (PascalCase)
-            # Legacy fallback: message/stream
-            payload = {
-                "jsonrpc": "2.0",
-                "id": str(uuid.uuid4()),
-                "method": "StreamMessage",  # A2A Standard: PascalCase
-                "params": {
-                    "message": message_obj
-                }
-            }
-            
-            # Use /tasks/send for streaming (some agents use this endpoint)
-            # method: "message/stream"으로 구분, Accept 헤더로 SSE 요청
-            async with client.stream(
-                "POST",
-                f"{agent_url}/tasks/send",
-                json=payload,
-                headers=headers
-            ) as response:
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = json.loads(line[6:])
-                            if "content" in data:
-                                yield data["content"]
-                            elif "text" in data:
-                                yield data["text"]
-                                
-        except Exception as e:
-            logger.error(f"Streaming error: {e}")
-            # Fallback to non-streaming (A2A Standard)
-            result = await self._send_to_agent(agent_url, message, context_id, reference_task_ids, user_id)
-            yield result.get("content", "Error occurred during streaming.")
+        # Generate request ID for distributed tracing
+        request_id = str(uuid.uuid4())
+        
+        # Build headers
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "X-Request-Id": request_id  # 분산 트레이싱용 요청 ID
+        }
+        
+        # Add User-Id header if available
+        if user_id:
+            headers["X-User-Id"] = user_id
+        
+        # Add MCP Hub Token if user is authenticated
+        if user_id:
+            mcp_token = await self._get_user_mcp_token(user_id)
+            if mcp_token:
+                headers["X-MCP-Hub-Token"] = mcp_token
+        
+        # Directive 007: Identity Propagation
+        if jwt_token:
+            headers["Authorization"] = f"Bearer {jwt_token}"
+            logger.debug(f"[A2A Stream] Added Authorization header: Bearer {jwt_token[:10]}...")
+        
+        logger.debug(f"[A2A Stream] Request ID: {request_id}")
+        
+        # Per-agent-origin connection pool
+        client = GlobalHttpClient.get_client(agent_url)
+        
+        # Negotiated dialect: StreamMessage (Standard) or message/stream (Legacy)
+        # 미협상 에이전트는 Standard로 시도, 실패 시 _send_to_agent fallback에서 협상
+        dialect = registry.get_agent_dialect(agent_url) or A2ADialect.STANDARD
+        payload = self._build_a2a_payload(
+            DIALECT_SPECS[dialect].stream_method, dialect, message, context_id, reference_task_ids
+        )
+        
+        # Use /tasks/send for streaming (some agents use this endpoint)
+        # method: "message/stream"으로 구분, Accept 헤더로 SSE 요청
+        async with client.stream(
+            "POST",
+            f"{agent_url}/tasks/send",
+            json=payload,
+            headers=headers
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    data = json.loads(line[6:])
+                    if "content" in data:
+                        yield data["content"]
+                    elif "text" in data:
+                        yield data["text"]
     
     def _parse_a2a_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """
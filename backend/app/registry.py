@@ -3,21 +3,49 @@ Agent Registry Service
 Manages agent registration, discovery, and health monitoring
 """
 import asyncio
-from collections import deque
+import uuid
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
-import httpx
-import time
 
+from .config import get_settings
 from .models import AgentInfo, AgentRegistration, AgentStatus, AgentSkill, AgentCard, AgentRoutingInfo, AgentRequirements
-from .agent_vector_store import AgentRoutingMetadata, get_vector_store
+from .agent_vector_store import AgentRoutingMetadata
+from .vector_sync import get_vector_sync_pipeline
+from .health_scheduler import HealthCheckScheduler
+from .latency_histogram import SlidingWindowHistogram
+from .a2a_dialect import A2ADialect, ProtocolDialectCache, dialect_from_protocol_version
+from .metrics import record_a2a_dialect
+from .http_client import GlobalHttpClient, agent_origin
+from .concurrency_limiter import AdaptiveConcurrencyLimiter, RetryBudget
+from .replica_set import ReplicaSet
+from .registry_store import RegistryStore
+from .registry_snapshot import RegistrySnapshotter
+from .agent_card_fetcher import AgentCardFetcher
+from .registry_index import RegistryIndex, skill_tokens
+from .agent_catalog import AgentCatalog
 
 
-@dataclass
+class AgentConflictError(Exception):
+    """이미 등록된 에이전트와 이름은 같지만 Agent Card가 다른 등록 (replica로 묶을 수 없음)"""
+
+
+# bulk 등록 중 벡터 동기화를 모아 두는 곳 (agent name -> metadata), 등록 task들이 공유
+_deferred_vector_sync: ContextVar[Optional[Dict[str, AgentRoutingMetadata]]] = ContextVar(
+    "deferred_vector_sync", default=None
+)
+
+
+@dataclass(slots=True)
 class AgentMetrics:
-    """Metrics for monitoring agent performance"""
+    """
+    Metrics for monitoring agent performance.
+    
+    Latency is kept in mergeable log-bucketed sketches with 1m/5m/1h sliding windows
+    (total latency for every call, time-to-first-byte for streaming calls).
+    """
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
@@ -26,11 +54,14 @@ class AgentMetrics:
     consecutive_failures: int = 0
     circuit_breaker_open: bool = False
     circuit_breaker_until: Optional[datetime] = None
+    half_open_trial_in_flight: bool = False
     health_check_failures: int = 0
     last_error: Optional[str] = None
     last_error_time: Optional[datetime] = None
-    # Recent response times (last 100)
-    recent_response_times: deque = field(default_factory=lambda: deque(maxlen=100))
+    latency: SlidingWindowHistogram = field(default_factory=SlidingWindowHistogram)
+    ttfb: SlidingWindowHistogram = field(default_factory=SlidingWindowHistogram)
+    # send 응답 시간 / stream TTFB (스트림 전체 시간 제외 - 동시성 limiter baseline용)
+    response: SlidingWindowHistogram = field(default_factory=SlidingWindowHistogram)
     
     @property
     def success_rate(self) -> float:
@@ -48,27 +79,27 @@ class AgentMetrics:
     
     @property
     def p95_response_time_ms(self) -> float:
-        """Calculate P95 response time from recent requests"""
-        if len(self.recent_response_times) == 0:
-            return 0.0
-        sorted_times = sorted(self.recent_response_times)
-        idx = int(len(sorted_times) * 0.95)
-        return sorted_times[min(idx, len(sorted_times) - 1)]
+        """P95 response time over the last hour"""
+        return self.latency.window(3600).quantile(0.95)
     
-    def record_success(self, response_time_ms: float):
-        """Record a successful request"""
+    def record_success(self, response_time_ms: float, ttfb_ms: Optional[float] = None):
+        """Record a successful request (ttfb_ms: time to first chunk for streaming calls)"""
         self.total_requests += 1
         self.successful_requests += 1
         self.total_response_time_ms += response_time_ms
         self.last_response_time_ms = response_time_ms
-        self.recent_response_times.append(response_time_ms)
+        self.latency.record(response_time_ms)
+        if ttfb_ms is not None:
+            self.ttfb.record(ttfb_ms)
+        self.response.record(response_time_ms if ttfb_ms is None else ttfb_ms)
         self.consecutive_failures = 0
+        self.half_open_trial_in_flight = False
         
         # Reset circuit breaker on success
         if self.circuit_breaker_open:
             self.circuit_breaker_open = False
             self.circuit_breaker_until = None
-            logger.info(f"Circuit breaker closed after successful request")
+            logger.info("Circuit breaker closed after successful request")
     
     def record_failure(self, error: str):
         """Record a failed request"""
@@ -78,8 +109,15 @@ class AgentMetrics:
         self.last_error = error
         self.last_error_time = datetime.utcnow()
         
+        # Half-open trial failed: re-open for another cool-down period
+        if self.circuit_breaker_open:
+            self.half_open_trial_in_flight = False
+            self.circuit_breaker_until = datetime.utcnow() + timedelta(seconds=60)
+            logger.warning("Circuit breaker re-opened after failed half-open trial")
+            return
+        
         # Open circuit breaker after 3 consecutive failures
-        if self.consecutive_failures >= 3 and not self.circuit_breaker_open:
+        if self.consecutive_failures >= 3:
             self.circuit_breaker_open = True
             self.circuit_breaker_until = datetime.utcnow() + timedelta(seconds=60)
             logger.warning(f"Circuit breaker opened due to {self.consecutive_failures} consecutive failures")
@@ -92,10 +130,26 @@ class AgentMetrics:
         # Check if circuit breaker timeout has passed
         if self.circuit_breaker_until and datetime.utcnow() > self.circuit_breaker_until:
             # Allow one test request (half-open state)
-            return True
+            return not self.half_open_trial_in_flight
         
         return False
     
+    def try_acquire(self) -> bool:
+        """
+        Admit a request. In half-open state only one trial request may be in flight;
+        it is released by record_success/record_failure (or release).
+        """
+        if not self.circuit_breaker_open:
+            return True
+        if not self.is_available():
+            return False
+        self.half_open_trial_in_flight = True
+        return True
+    
+    def release(self):
+        """Release a half-open trial that ended without an outcome (e.g. cancelled)"""
+        self.half_open_trial_in_flight = False
+    
     def to_dict(self) -> dict:
         """Convert metrics to dictionary"""
         return {
@@ -108,10 +162,44 @@ class AgentMetrics:
             "last_response_time_ms": round(self.last_response_time_ms, 2),
             "consecutive_failures": self.consecutive_failures,
             "circuit_breaker_open": self.circuit_breaker_open,
+            "half_open_trial_in_flight": self.half_open_trial_in_flight,
             "health_check_failures": self.health_check_failures,
             "last_error": self.last_error,
-            "last_error_time": self.last_error_time.isoformat() if self.last_error_time else None
+            "last_error_time": self.last_error_time.isoformat() if self.last_error_time else None,
+            "latency": self.latency_summary()
         }
+    
+    def latency_summary(self) -> dict:
+        """p50/p90/p99/max per window for total latency and streaming TTFB"""
+        return {
+            "total": {name: h.summary() for name, h in self.latency.windows().items()},
+            "ttfb": {name: h.summary() for name, h in self.ttfb.windows().items()}
+        }
+    
+    # Cross-worker aggregation: counters add, sketches merge bucket-wise
+    _SUMMED_FIELDS = (
+        "total_requests", "successful_requests", "failed_requests",
+        "total_response_time_ms", "health_check_failures"
+    )
+    
+    def export(self) -> dict:
+        """Serializable snapshot for merging in another worker"""
+        return {
+            **{name: getattr(self, name) for name in self._SUMMED_FIELDS},
+            "circuit_breaker_open": self.circuit_breaker_open,
+            "latency": self.latency.to_dict(),
+            "ttfb": self.ttfb.to_dict(),
+            "response": self.response.to_dict()
+        }
+    
+    def merge(self, snapshot: dict):
+        """Merge an exported snapshot from another worker into this one"""
+        for name in self._SUMMED_FIELDS:
+            setattr(self, name, getattr(self, name) + snapshot.get(name, 0))
+        self.circuit_breaker_open = self.circuit_breaker_open or snapshot.get("circuit_breaker_open", False)
+        self.latency.merge(SlidingWindowHistogram.from_dict(snapshot.get("latency", {})))
+        self.ttfb.merge(SlidingWindowHistogram.from_dict(snapshot.get("ttfb", {})))
+        self.response.merge(SlidingWindowHistogram.from_dict(snapshot.get("response", {})))
 
 
 class AgentRegistry:
@@ -122,32 +210,95 @@ class AgentRegistry:
     
     def __init__(self):
         self._agents: Dict[str, AgentInfo] = {}
+        # 보조 인덱스 (URL / 이름 / tag / skill 토큰 / 상태) - 조회 비용이 에이전트 수와 무관
+        self._index = RegistryIndex()
+        self._catalog = AgentCatalog(0, ())
+        self._catalog_index_version = self._index.version
+        self._catalog_holds = 0  # bulk 등록 중에는 중간 상태 catalog를 발행하지 않음
         self._metrics: Dict[str, AgentMetrics] = {}  # agent_id -> metrics
-        self._health_check_interval = 30  # seconds
         self._agent_timeout = 120  # seconds
-        self._health_check_task: Optional[asyncio.Task] = None
+        self._health_scheduler = HealthCheckScheduler(self)
+        self._dialects = ProtocolDialectCache()  # agent URL -> 협상된 A2A dialect
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}  # agent_id -> AIMD limiter
+        self._replica_sets: Dict[str, ReplicaSet] = {}  # agent_id -> replica 부하 분산 상태
+        # 워커 간 공유 (registered_agents + LISTEN/NOTIFY), 비활성 시 워커별 메모리
+        self._store = RegistryStore(self)
+        self._published_health: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        # Agent Card 조회 (경로 기억 + ETag/Last-Modified conditional 재검증 + 주기적 갱신)
+        self._card_fetcher = AgentCardFetcher(self)
+        self._snapshotter = RegistrySnapshotter(self)
     
     async def start(self):
-        """Start the registry background tasks"""
-        self._health_check_task = asyncio.create_task(self._health_check_loop())
+        """
+        Start the registry background tasks.
+        With the shared store, agents are loaded from registered_agents and only the
+        elected leader worker runs health checks.
+        """
+        restored = self._snapshotter.load()
+        if not await self._store.start():
+            self._health_scheduler.start()
+            self._card_fetcher.start()
+        self._snapshotter.start(restored)
         logger.info("Agent Registry started")
     
     async def stop(self):
         """Stop the registry background tasks"""
-        if self._health_check_task:
-            self._health_check_task.cancel()
-            try:
-                await self._health_check_task
-            except asyncio.CancelledError:
-                pass
+        await self._snapshotter.stop()
+        await self._store.stop()
+        await self._health_scheduler.stop()
+        await self._card_fetcher.stop()
+        
+        # 대기 중인 벡터 저장소 변경 사항 반영
+        await get_vector_sync_pipeline().stop()
         logger.info("Agent Registry stopped")
     
+    async def on_leadership_change(self, leader: bool):
+        """Health probe leader 변경 - leader 워커만 health check / card 갱신 수행"""
+        if leader:
+            self._health_scheduler.start()
+            self._card_fetcher.start()
+        else:
+            await self._health_scheduler.stop()
+            await self._card_fetcher.stop()
+    
+    def _stable_agent_id(self, url: str, name: str) -> str:
+        """
+        여러 워커가 같은 에이전트(URL + 이름)를 동시에 등록해도 같은 ID.
+        replica 제거로 풀려난 URL에 다른 에이전트가 등록되면 이름이 달라 기존 ID와 겹치지 않고,
+        그래도 살아 있는 에이전트와 겹치면 임의 ID를 사용합니다.
+        """
+        agent_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{url.rstrip('/')}#{name}"))
+        if agent_id in self._agents:
+            logger.warning(f"[Registry] Stable ID {agent_id} already in use, using a random ID for {name} at {url}")
+            return str(uuid.uuid4())
+        return agent_id
+    
+    @staticmethod
+    def _check_replica_identity(existing: AgentInfo, url: str, version: str, skills: List[AgentSkill]):
+        """같은 이름의 새 URL은 Agent Card(버전 + 스킬)가 같을 때만 replica로 묶음"""
+        if existing.version != version or [s.model_dump() for s in existing.skills] != [s.model_dump() for s in skills]:
+            raise AgentConflictError(
+                f"Agent '{existing.name}' is already registered (ID: {existing.id}) with a different "
+                f"Agent Card; {url} cannot be added as its replica"
+            )
+    
     async def register_agent(self, registration: AgentRegistration) -> AgentInfo:
         """
         Register a new agent or update existing registration.
+        The same agent name at a new URL is added as a replica of the existing agent.
+        
+        Raises:
+            AgentConflictError: 같은 이름이지만 버전 / 스킬이 다른 에이전트
         """
         # Check if agent already exists by URL
         existing_agent = self.get_agent_by_url(registration.url)
+        if not existing_agent:
+            existing_agent = self.get_agent_by_name(registration.name)
+            if existing_agent:
+                self._check_replica_identity(
+                    existing_agent, registration.url, registration.version, registration.skills
+                )
+                self.add_replica(existing_agent.id, registration.url)
         
         if existing_agent:
             # Update existing agent
@@ -158,15 +309,19 @@ class AgentRegistry:
             existing_agent.capabilities = registration.capabilities
             existing_agent.last_seen = datetime.utcnow()
             existing_agent.status = AgentStatus.ONLINE
+            self._index.update(existing_agent)
+            self._store.publish_upsert(existing_agent)
             
             logger.info(f"Updated agent registration: {registration.name} at {registration.url}")
             return existing_agent
         
         # Create new agent
         agent = AgentInfo(
+            id=self._stable_agent_id(registration.url, registration.name),
             name=registration.name,
             description=registration.description,
             url=registration.url,
+            replicas=[registration.url],
             version=registration.version,
             skills=registration.skills,
             capabilities=registration.capabilities,
@@ -175,7 +330,10 @@ class AgentRegistry:
         )
         
         self._agents[agent.id] = agent
+        self._index.update(agent)
         self._metrics[agent.id] = AgentMetrics()  # Initialize metrics
+        GlobalHttpClient.schedule_prewarm(agent.url)
+        self._store.publish_upsert(agent)
         logger.info(f"Registered new agent: {registration.name} (ID: {agent.id}) at {registration.url}")
         
         return agent
@@ -184,34 +342,97 @@ class AgentRegistry:
         """
         Register an agent by fetching its Agent Card from URL (A2A Discovery).
         This is the A2A standard way to discover and register agents.
+        An Agent Card whose name is already registered at another URL adds a replica.
+        
+        Raises:
+            AgentConflictError: 같은 이름이지만 Agent Card(버전 / 스킬)가 다른 에이전트
+        """
+        agent, _ = await self._register_by_url(url)
+        return agent
+    
+    async def register_agents_by_url(self, urls: List[str], concurrency: Optional[int] = None) -> dict:
+        """
+        Bulk A2A discovery registration.
+        
+        Agent Card는 동시성 제한 하에 병렬로 가져오고, 벡터 저장소 동기화는 끝에서 한 번
+        (배치 임베딩 + 일괄 쓰기), catalog snapshot도 끝에서 한 번만 새 version을 발행합니다.
+        
+        Returns:
+            {"results": URL별 결과, "summary": 결과별 개수, "vector_sync": 동기화 결과}
+        """
+        urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        semaphore = asyncio.Semaphore(concurrency or get_settings().agent_bulk_register_concurrency)
+        deferred: Dict[str, AgentRoutingMetadata] = {}
+        
+        async def register_one(url: str) -> dict:
+            async with semaphore:
+                try:
+                    agent, action = await self._register_by_url(url)
+                except AgentConflictError as e:
+                    return {"url": url, "status": "conflict", "error": str(e)}
+                except Exception as e:
+                    return {"url": url, "status": "failed", "error": str(e)}
+            return {"url": url, "status": action, "agent_id": agent.id, "name": agent.name}
+        
+        token = _deferred_vector_sync.set(deferred)
+        self._catalog_holds += 1
+        try:
+            results = await asyncio.gather(*(register_one(url) for url in urls))
+        finally:
+            self._catalog_holds -= 1
+            _deferred_vector_sync.reset(token)
+        
+        vector_sync = None
+        if deferred:
+            vector_sync = await get_vector_sync_pipeline().sync_now(list(deferred.values()))
+        
+        summary: Dict[str, int] = {}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+        logger.info(f"Bulk registration of {len(urls)} URLs: {summary} (catalog v{self.get_catalog().version})")
+        return {"results": results, "summary": summary, "vector_sync": vector_sync}
+    
+    async def _register_by_url(self, url: str) -> Tuple[AgentInfo, str]:
+        """
+        A2A discovery 등록 본체.
+        
+        Returns:
+            (agent, registered / replica_added / updated / unchanged)
         """
         # Check if agent already exists by URL
         existing_agent = self.get_agent_by_url(url)
         if existing_agent:
-            # Refresh agent card
-            card = await self._fetch_agent_card(url)
-            if card:
-                existing_agent.name = card.name
-                existing_agent.description = card.description
-                existing_agent.version = card.version
-                existing_agent.skills = card.skills
-                existing_agent.capabilities = card.capabilities
-                existing_agent.last_seen = datetime.utcnow()
-                existing_agent.status = AgentStatus.ONLINE
-                logger.info(f"Refreshed agent: {card.name} at {url}")
-                return existing_agent
-            raise Exception(f"Failed to fetch Agent Card from {url}")
+            # Refresh agent card (304면 재파싱 / 재임베딩 생략)
+            result = await self.revalidate_agent_card(existing_agent.id)
+            if result == "failed":
+                raise Exception(f"Failed to fetch Agent Card from {url}")
+            logger.info(f"Refreshed agent: {existing_agent.name} at {url} ({result})")
+            return existing_agent, "unchanged" if result == "not_modified" else "updated"
         
         # Fetch Agent Card from URL
         card = await self._fetch_agent_card(url)
         if not card:
             raise Exception(f"Failed to fetch Agent Card from {url}. Make sure the agent is running and accessible.")
         
+        # 같은 이름 + 같은 Agent Card의 에이전트가 이미 있으면 replica로 추가
+        existing_agent = self.get_agent_by_name(card.name)
+        if existing_agent:
+            self._check_replica_identity(existing_agent, url, card.version, card.skills)
+            self.add_replica(existing_agent.id, url)
+            existing_agent.last_seen = datetime.utcnow()
+            existing_agent.status = AgentStatus.ONLINE
+            self._index.update_status(existing_agent)
+            self._remember_card_dialect(url, card)
+            logger.info(f"Added replica via A2A discovery: {card.name} (ID: {existing_agent.id}) at {url}")
+            return existing_agent, "replica_added"
+        
         # Create new agent from card
         agent = AgentInfo(
+            id=self._stable_agent_id(url, card.name),
             name=card.name,
             description=card.description,
             url=url,
+            replicas=[url],
             version=card.version,
             skills=card.skills,
             capabilities=card.capabilities,
@@ -221,87 +442,90 @@ class AgentRegistry:
         )
         
         self._agents[agent.id] = agent
+        self._index.update(agent)
         self._metrics[agent.id] = AgentMetrics()  # Initialize metrics
+        self._remember_card_dialect(url, card)
+        GlobalHttpClient.schedule_prewarm(url)
+        self._store.publish_upsert(agent)
         logger.info(f"Registered agent via A2A discovery: {card.name} (ID: {agent.id}) at {url}")
         
-        # Sync to vector store for RAG-based routing
-        asyncio.create_task(self._sync_to_vector_store(agent, card))
+        # Sync to vector store for RAG-based routing (batched)
+        self._sync_to_vector_store(agent, card)
         
-        return agent
+        return agent, "registered"
+    
+    def _apply_card(self, agent: AgentInfo, url: str, card: AgentCard):
+        """Refresh an agent from its (re)fetched Agent Card"""
+        agent.name = card.name
+        agent.description = card.description
+        agent.version = card.version
+        agent.skills = card.skills
+        agent.capabilities = card.capabilities
+        agent.last_seen = datetime.utcnow()
+        agent.status = AgentStatus.ONLINE
+        self._index.update(agent)
+        self._remember_card_dialect(url, card)
+        self._store.publish_upsert(agent)
+        # 변경 없으면 파이프라인에서 description 해시 비교로 생략됨
+        self._sync_to_vector_store(agent, card)
     
     async def _fetch_agent_card(self, url: str) -> Optional[AgentCard]:
         """
         Fetch Agent Card from A2A agent URL.
-        Tries multiple standard paths according to A2A spec.
+        Probes the standard paths concurrently on the shared pool (remembered path first).
         """
-        paths_to_try = [
-            "/.well-known/agent-card.json",  # A2A Spec standard
-            "/.well-known/agent.json",       # Legacy
-            "/agent-card",                   # Alternative
-        ]
+        status, data = await self._card_fetcher.fetch(url)
+        return self._card_from_json(data, url) if status == "ok" else None
+    
+    def _card_from_json(self, data: dict, url: str) -> AgentCard:
+        """Agent Card JSON -> AgentCard (skills / routing / requirements 변환)"""
+        # Convert skills if needed
+        if 'skills' in data:
+            skills = []
+            for s in data.get('skills', []):
+                skill = AgentSkill(
+                    id=s.get('id', ''),
+                    name=s.get('name', ''),
+                    description=s.get('description', ''),
+                    tags=s.get('tags', []),
+                    examples=s.get('examples', []),
+                    inputModes=s.get('inputModes', ['text/plain']),
+                    outputModes=s.get('outputModes', ['text/plain'])
+                )
+                skills.append(skill)
+            data['skills'] = skills
         
-        async with httpx.AsyncClient(timeout=10.0, verify=False) as client:
-            for path in paths_to_try:
-                try:
-                    full_url = f"{url.rstrip('/')}{path}"
-                    response = await client.get(full_url)
-                    if response.status_code == 200:
-                        data = response.json()
-                        # Convert skills if needed
-                        if 'skills' in data:
-                            skills = []
-                            for s in data.get('skills', []):
-                                skill = AgentSkill(
-                                    id=s.get('id', ''),
-                                    name=s.get('name', ''),
-                                    description=s.get('description', ''),
-                                    tags=s.get('tags', []),
-                                    examples=s.get('examples', []),
-                                    inputModes=s.get('inputModes', ['text/plain']),
-                                    outputModes=s.get('outputModes', ['text/plain'])
-                                )
-                                skills.append(skill)
-                            data['skills'] = skills
-                        
-                        # LangGraph 에이전트 호환: url 필드가 없으면 요청 URL 사용
-                        if 'url' not in data or not data['url']:
-                            data['url'] = url
-                        
-                        # routing 필드 변환 (에이전트 팀 제공)
-                        if 'routing' in data and isinstance(data['routing'], dict):
-                            routing_data = data['routing']
-                            data['routing'] = AgentRoutingInfo(
-                                domain=routing_data.get('domain', 'general'),
-                                category=routing_data.get('category', ''),
-                                keywords=routing_data.get('keywords', []),
-                                capabilities=routing_data.get('capabilities', [])
-                            )
-                            logger.info(f"[Registry] Loaded routing info: domain={data['routing'].domain}, keywords={len(data['routing'].keywords)}")
-                        
-                        # requirements 필드 변환 (MCPHub 토큰 등)
-                        if 'requirements' in data and isinstance(data['requirements'], dict):
-                            req_data = data['requirements']
-                            data['requirements'] = AgentRequirements(
-                                mcpHubToken=req_data.get('mcpHubToken', False),
-                                mcpServers=req_data.get('mcpServers', [])
-                            )
-                            logger.info(f"[Registry] Loaded requirements: mcpHubToken={data['requirements'].mcpHubToken}, mcpServers={data['requirements'].mcpServers}")
-                        else:
-                            data['requirements'] = AgentRequirements()
-                        
-                        return AgentCard(**data)
-                except Exception as e:
-                    logger.error(f"Failed to fetch from {full_url}: {type(e).__name__}: {e}")
-                    continue
+        # LangGraph 에이전트 호환: url 필드가 없으면 요청 URL 사용
+        if 'url' not in data or not data['url']:
+            data['url'] = url
+        
+        # routing 필드 변환 (에이전트 팀 제공)
+        if 'routing' in data and isinstance(data['routing'], dict):
+            routing_data = data['routing']
+            data['routing'] = AgentRoutingInfo(
+                domain=routing_data.get('domain', 'general'),
+                category=routing_data.get('category', ''),
+                keywords=routing_data.get('keywords', []),
+                capabilities=routing_data.get('capabilities', [])
+            )
+            logger.info(f"[Registry] Loaded routing info: domain={data['routing'].domain}, keywords={len(data['routing'].keywords)}")
         
-        logger.error(f"All paths failed for {url}")
-        return None
+        # requirements 필드 변환 (MCPHub 토큰 등)
+        if 'requirements' in data and isinstance(data['requirements'], dict):
+            req_data = data['requirements']
+            data['requirements'] = AgentRequirements(
+                mcpHubToken=req_data.get('mcpHubToken', False),
+                mcpServers=req_data.get('mcpServers', [])
+            )
+            logger.info(f"[Registry] Loaded requirements: mcpHubToken={data['requirements'].mcpHubToken}, mcpServers={data['requirements'].mcpServers}")
+        else:
+            data['requirements'] = AgentRequirements()
+        
+        return AgentCard(**data)
     
-    async def _sync_to_vector_store(self, agent: AgentInfo, card: Optional[AgentCard] = None):
-        """Sync agent to vector store for RAG-based routing"""
+    def _sync_to_vector_store(self, agent: AgentInfo, card: Optional[AgentCard] = None):
+        """Queue agent sync to vector store for RAG-based routing"""
         try:
-            vector_store = await get_vector_store()
-            
             # Extract routing info from card if available (에이전트 팀 제공)
             routing = {}
             if card and card.routing:
@@ -318,39 +542,381 @@ class AgentRegistry:
                 agent_card={
                     "name": agent.name,
                     "description": agent.description or f"{agent.name} AI Agent",
-                    "skills": [{"id": s.id, "name": s.name, "tags": s.tags} for s in agent.skills],
+                    "skills": [
+                        {"id": s.id, "name": s.name, "description": s.description, "tags": s.tags, "examples": s.examples}
+                        for s in agent.skills
+                    ],
                     "routing": routing
                 },
                 url=agent.url
             )
             
-            await vector_store.upsert_agent(metadata)
-            logger.info(f"[VectorStore] Synced agent: {agent.name} (domain: {metadata.domain}, keywords: {len(metadata.keywords)})")
+            deferred = _deferred_vector_sync.get()
+            if deferred is not None:
+                # bulk 등록 - 끝에서 한 번에 동기화
+                deferred[metadata.agent_name] = metadata
+                return
+            get_vector_sync_pipeline().enqueue_upsert(metadata)
+            logger.debug(f"[VectorStore] Queued sync: {agent.name} (domain: {metadata.domain}, keywords: {len(metadata.keywords)})")
             
         except Exception as e:
-            logger.warning(f"[VectorStore] Failed to sync agent {agent.name}: {e}")
-    
-    async def _remove_from_vector_store(self, agent_name: str):
-        """Remove agent from vector store"""
-        try:
-            vector_store = await get_vector_store()
-            await vector_store.remove_agent(agent_name)
-            logger.info(f"[VectorStore] Removed agent: {agent_name}")
-        except Exception as e:
-            logger.warning(f"[VectorStore] Failed to remove agent {agent_name}: {e}")
+            logger.warning(f"[VectorStore] Failed to queue sync for {agent.name}: {e}")
     
     def unregister_agent(self, agent_id: str) -> bool:
         """Remove an agent from the registry"""
-        if agent_id in self._agents:
-            agent = self._agents.pop(agent_id)
-            self._metrics.pop(agent_id, None)  # Remove metrics too
-            logger.info(f"Unregistered agent: {agent.name} (ID: {agent_id})")
+        agent = self._remove_local(agent_id)
+        if agent is None:
+            return False
+        logger.info(f"Unregistered agent: {agent.name} (ID: {agent_id})")
+        self._store.publish_delete(agent_id)
+        
+        # Remove from vector store (batched)
+        get_vector_sync_pipeline().enqueue_removal(agent.name)
+        return True
+    
+    def _remove_local(self, agent_id: str) -> Optional[AgentInfo]:
+        """이 워커의 에이전트 상태 제거 (메트릭, limiter, replica, probe 상태, 커넥션 풀)"""
+        agent = self._agents.pop(agent_id, None)
+        if agent is None:
+            return None
+        self._index.remove(agent_id)
+        self._metrics.pop(agent_id, None)  # Remove metrics too
+        self._limiters.pop(agent_id, None)
+        self._replica_sets.pop(agent_id, None)
+        self._published_health.pop(agent_id, None)
+        self._health_scheduler.forget(agent_id)
+        for url in agent.replicas or [agent.url]:
+            self._release_replica_url(url)
+        return agent
+    
+    # =========================================================================
+    # Shared Registry (changes from other workers)
+    # =========================================================================
+    
+    def apply_remote_snapshot(self, agents: List[AgentInfo]):
+        """registered_agents 전체 상태 반영 (시작 / LISTEN 재연결 후)"""
+        live_ids = {agent.id for agent in agents}
+        for agent_id in [a for a in self._agents if a not in live_ids]:
+            self._remove_local(agent_id)
+        for agent in agents:
+            self.apply_remote_upsert(agent)
+    
+    def apply_remote_upsert(self, agent: AgentInfo):
+        """다른 워커가 등록/수정한 에이전트 반영"""
+        existing = self._agents.get(agent.id)
+        if existing is None:
+            self._agents[agent.id] = agent
+            self._index.update(agent)
+            self._metrics[agent.id] = AgentMetrics()
+            for url in agent.replicas or [agent.url]:
+                GlobalHttpClient.schedule_prewarm(url)
+            logger.debug(f"[Registry] Loaded shared agent: {agent.name} (ID: {agent.id})")
+            return
+        
+        removed = set(existing.replicas) - set(agent.replicas)
+        for field_name in (
+            "name", "description", "url", "replicas", "version", "skills",
+            "capabilities", "requirements", "status", "last_seen"
+        ):
+            setattr(existing, field_name, getattr(agent, field_name))
+        self._index.update(existing)
+        
+        replicas = self._replica_sets.get(agent.id)
+        if replicas is not None:
+            for url in agent.replicas:
+                if replicas.add(url):
+                    GlobalHttpClient.schedule_prewarm(url)
+            for url in removed:
+                replicas.remove(url)
+        for url in removed:
+            self._release_replica_url(url)
+    
+    def apply_remote_delete(self, agent_id: str):
+        agent = self._remove_local(agent_id)
+        if agent:
+            logger.debug(f"[Registry] Removed shared agent: {agent.name} (ID: {agent_id})")
+    
+    def apply_remote_health(self, agent_id: str, status: str, down_replicas: List[str]):
+        """leader 워커의 health check 결과 반영"""
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            return
+        agent.status = status
+        self._index.update_status(agent)
+        if status == AgentStatus.ONLINE:
+            agent.last_seen = datetime.utcnow()
+        replicas = self._replica_set(agent_id)
+        down = {url.rstrip("/") for url in down_replicas}
+        for url in replicas.urls:
+            replicas.set_health(url, url.rstrip("/") not in down)
+    
+    def apply_remote_lease(self, agent_ids: List[str], lease_seconds: float):
+        """follower 워커가 받은 heartbeat lease 반영 (leader의 probe 생략용)"""
+        for agent_id in agent_ids:
+            self._renew_lease(agent_id, lease_seconds)
+    
+    # =========================================================================
+    # Warm-start Snapshot
+    # =========================================================================
+    
+    def export_snapshot(self) -> dict:
+        """snapshot 파일에 저장할 레지스트리 상태 (last_seen 제외)"""
+        return {
+            "agents": [a.model_dump(mode="json", exclude={"last_seen"}) for a in self._agents.values()],
+            "card_validators": self._card_fetcher.export_validators(),
+            "dialects": self._dialects.export(),
+        }
+    
+    def restore_snapshot(
+        self,
+        agents: List[AgentInfo],
+        card_validators: Dict[str, Dict[str, str]],
+        dialects: Dict[str, Dict[str, str]]
+    ):
+        """snapshot 복원 - 재검증 / health check 전까지 최근에 확인된 것으로 간주"""
+        now = datetime.utcnow()
+        for agent in agents:
+            agent.last_seen = now
+        self.apply_remote_snapshot(agents)
+        self._card_fetcher.restore_validators(card_validators)
+        self._dialects.restore(dialects)
+    
+    def discard_snapshot(
+        self,
+        card_validators: Dict[str, Dict[str, str]],
+        dialects: Dict[str, Dict[str, str]]
+    ):
+        """실패한 snapshot 복원 되돌리기 (시작 전 상태로, 이후 cold start)"""
+        self.apply_remote_snapshot([])
+        for url in card_validators:
+            self._card_fetcher.forget(url)
+        for url in dialects:
+            self._dialects.forget(url)
+    
+    async def revalidate_agent_card(self, agent_id: str) -> str:
+        """
+        Agent Card conditional 재검증 (If-None-Match / If-Modified-Since).
+        304이거나 200이지만 본문이 이전과 같으면 last_seen만 갱신하고
+        card 파싱 / 인덱스 갱신 / 전파(NOTIFY) / 벡터 동기화를 생략합니다.
+        
+        Returns:
+            not_modified / updated / failed
+        """
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            return "failed"
+        url = agent.url
+        status, data = await self._card_fetcher.fetch(url, conditional=True)
+        if agent_id not in self._agents:
+            return "failed"
+        if status == "not_modified":
+            agent.last_seen = datetime.utcnow()
+            agent.status = AgentStatus.ONLINE
+            self._index.update_status(agent)
+            return "not_modified"
+        if status != "ok":
+            return "failed"
+        self._apply_card(agent, url, self._card_from_json(data, url))
+        return "updated"
+    
+    async def refresh_agent_cards(self, agent_ids: List[str], concurrency: Optional[int] = None) -> Dict[str, int]:
+        """여러 에이전트 card 재검증 (동시성 제한) - not_modified / updated / failed 개수"""
+        return await self._card_fetcher.refresh(agent_ids, concurrency)
+    
+    def _publish_health_if_changed(self, agent: AgentInfo):
+        replicas = self._replica_set(agent.id)
+        down = tuple(replicas.unhealthy_urls()) if replicas else ()
+        state = (agent.status, down)
+        if self._published_health.get(agent.id) != state:
+            self._published_health[agent.id] = state
+            self._store.publish_health(agent, list(down))
+    
+    # =========================================================================
+    # Replicas (load balancing & hedging)
+    # =========================================================================
+    
+    def _replica_set(self, agent_id: str) -> Optional[ReplicaSet]:
+        replicas = self._replica_sets.get(agent_id)
+        if replicas is None:
+            agent = self._agents.get(agent_id)
+            if agent is None:
+                return None
+            if not agent.replicas:
+                agent.replicas = [agent.url]
+            settings = get_settings()
+            replicas = self._replica_sets[agent_id] = ReplicaSet(
+                agent.replicas,
+                strategy=settings.agent_replica_balancing,
+                eject_after_failures=settings.agent_replica_eject_failures,
+                eject_seconds=settings.agent_replica_eject_seconds
+            )
+        return replicas
+    
+    def _release_replica_url(self, url: str):
+        """제거된 replica URL의 dialect 캐시와 (더 이상 쓰지 않는) origin 풀 정리"""
+        self._dialects.forget(url)
+        self._card_fetcher.forget(url)
+        origin = agent_origin(url)
+        in_use = (
+            r for a in self._agents.values() for r in (a.replicas or [a.url])
+        )
+        if not any(agent_origin(r) == origin for r in in_use):
+            GlobalHttpClient.discard(url)
+    
+    def add_replica(self, agent_id: str, url: str) -> Optional[AgentInfo]:
+        """에이전트에 replica URL 추가 (이미 있으면 변경 없음)"""
+        replicas = self._replica_set(agent_id)
+        if replicas is None:
+            return None
+        agent = self._agents[agent_id]
+        if replicas.add(url):
+            agent.replicas = replicas.urls
+            self._index.update(agent)
+            GlobalHttpClient.schedule_prewarm(url)
+            self._store.publish_upsert(agent)
+            logger.info(f"Added replica for {agent.name} (ID: {agent_id}): {url} ({len(replicas)} replicas)")
+        return agent
+    
+    def remove_replica(self, agent_id: str, url: str) -> bool:
+        """
+        replica URL 제거. 마지막 replica는 제거하지 않음 (unregister_agent 사용).
+        primary URL이 제거되면 남은 replica 중 첫 번째가 primary가 됩니다.
+        """
+        replicas = self._replica_set(agent_id)
+        if replicas is None or url not in replicas or len(replicas) <= 1:
+            return False
+        replicas.remove(url)
+        agent = self._agents[agent_id]
+        agent.replicas = replicas.urls
+        if agent.url.rstrip("/") == url.rstrip("/"):
+            agent.url = agent.replicas[0]
+        self._index.update(agent)
+        self._release_replica_url(url)
+        self._store.publish_upsert(agent)
+        logger.info(f"Removed replica for {agent.name} (ID: {agent_id}): {url} ({len(replicas)} replicas)")
+        return True
+    
+    def get_replica_urls(self, agent_id: str) -> List[str]:
+        replicas = self._replica_set(agent_id)
+        return replicas.urls if replicas else []
+    
+    def pick_replica(self, agent_id: str, exclude: Tuple[str, ...] = ()) -> Optional[str]:
+        """다음 A2A 호출을 보낼 replica URL (p2c / least-outstanding)"""
+        replicas = self._replica_set(agent_id)
+        return replicas.pick(exclude) if replicas else None
+    
+    def replica_started(self, agent_id: str, url: str):
+        replicas = self._replica_sets.get(agent_id)
+        if replicas:
+            replicas.start(url)
+    
+    def replica_finished(self, agent_id: str, url: str, latency_ms: float, outcome: str):
+        replicas = self._replica_sets.get(agent_id)
+        if replicas:
+            replicas.finish(url, latency_ms, outcome)
+    
+    def apply_replica_health(self, agent_id: str, url: str, healthy: bool):
+        replicas = self._replica_set(agent_id)
+        if replicas:
+            replicas.set_health(url, healthy)
+    
+    def hedge_delay_seconds(self, agent_id: str) -> Optional[float]:
+        """
+        Hedge 요청을 보내기까지의 대기 시간 (논리 에이전트의 최근 5분 p95).
+        정상 replica가 2개 미만이거나 지연 분포가 아직 없으면 None (hedge하지 않음).
+        """
+        settings = get_settings()
+        if not settings.a2a_hedging_enabled:
+            return None
+        replicas = self._replica_set(agent_id)
+        if replicas is None or replicas.available_count() < 2:
+            return None
+        metrics = self._metrics.get(agent_id)
+        window = metrics.latency.window(300) if metrics else None
+        if not window or window.count == 0:
+            return None
+        delay_ms = max(settings.a2a_hedge_min_delay_ms, window.quantile(settings.a2a_hedge_quantile))
+        return delay_ms / 1000
+    
+    # =========================================================================
+    # Adaptive Concurrency & Retry Budget
+    # =========================================================================
+    
+    def _limiter(self, agent_id: str) -> AdaptiveConcurrencyLimiter:
+        limiter = self._limiters.get(agent_id)
+        if limiter is None:
+            settings = get_settings()
             
-            # Remove from vector store
-            asyncio.create_task(self._remove_from_vector_store(agent.name))
+            def baseline_ms() -> float:
+                # 스트림은 TTFB로 release되므로 baseline도 send 응답 / TTFB 분포 기준
+                metrics = self._metrics.get(agent_id)
+                return metrics.response.window(300).quantile(0.5) if metrics else 0.0
             
+            limiter = self._limiters[agent_id] = AdaptiveConcurrencyLimiter(
+                baseline_ms,
+                initial_limit=settings.agent_concurrency_initial_limit,
+                min_limit=settings.agent_concurrency_min_limit,
+                max_limit=settings.agent_concurrency_max_limit,
+                latency_tolerance=settings.agent_concurrency_latency_tolerance,
+                backoff_ratio=settings.agent_concurrency_backoff_ratio,
+                queue_size=settings.agent_concurrency_queue_size,
+                queue_timeout=settings.agent_concurrency_queue_timeout_seconds,
+                retry_budget=RetryBudget(settings.a2a_retry_budget_ratio, settings.a2a_retry_min_per_second)
+            )
+        return limiter
+    
+    async def acquire_concurrency(self, agent_id: str):
+        """
+        에이전트 동시성 슬롯 획득 (limit 초과 시 대기열에서 deadline까지 대기).
+        
+        Raises:
+            AgentOverloadedError: 대기열이 가득 찼거나 deadline 초과
+        """
+        if agent_id in self._agents:
+            await self._limiter(agent_id).acquire()
+    
+    def try_acquire_concurrency(self, agent_id: str) -> bool:
+        """대기 없이 동시성 슬롯 획득 시도 (limit에 여유가 없으면 False)"""
+        if agent_id not in self._agents:
+            return False
+        return self._limiter(agent_id).try_acquire()
+    
+    def release_concurrency(self, agent_id: str, latency_ms: float, outcome: str):
+        limiter = self._limiters.get(agent_id)
+        if limiter:
+            limiter.release(latency_ms, outcome)
+    
+    def try_spend_retry(self, agent_id: Optional[str]) -> bool:
+        """retry budget 내에서 재시도 허용 여부 (ID 없는 에이전트는 제한 없음)"""
+        if not agent_id or agent_id not in self._agents:
             return True
-        return False
+        return self._limiter(agent_id).retry_budget.try_spend()
+    
+    def get_concurrency_stats(self) -> Dict[str, dict]:
+        return {agent_id: limiter.to_dict() for agent_id, limiter in self._limiters.items()}
+    
+    # =========================================================================
+    # A2A Protocol Dialect
+    # =========================================================================
+    
+    def _remember_card_dialect(self, url: str, card: AgentCard):
+        # protocolVersion은 기본값이 있으므로 Agent Card에 명시된 경우만 사용
+        if "protocolVersion" not in card.model_fields_set:
+            return
+        dialect = dialect_from_protocol_version(card.protocolVersion)
+        if dialect:
+            self._dialects.remember(url, dialect, source="card")
+    
+    def get_agent_dialect(self, agent_url: str) -> Optional[A2ADialect]:
+        """협상(또는 Agent Card로 추정)된 dialect, 모르면 None"""
+        return self._dialects.get(agent_url)
+    
+    def record_dialect_result(self, agent_url: str, dialect: A2ADialect, protocol_error: bool):
+        self._dialects.record_result(agent_url, dialect, protocol_error)
+        record_a2a_dialect(dialect.value, "protocol_error" if protocol_error else "ok")
+    
+    def record_dialect_negotiation(self, renegotiation: bool = False):
+        self._dialects.record_negotiation(renegotiation)
     
     # =========================================================================
     # Metrics & Monitoring
@@ -360,16 +926,33 @@ class AgentRegistry:
         """Get metrics for a specific agent"""
         return self._metrics.get(agent_id)
     
-    def record_request_success(self, agent_id: str, response_time_ms: float):
+    def record_request_success(self, agent_id: str, response_time_ms: float, ttfb_ms: Optional[float] = None):
         """Record a successful request to an agent"""
         if agent_id in self._metrics:
-            self._metrics[agent_id].record_success(response_time_ms)
+            self._metrics[agent_id].record_success(response_time_ms, ttfb_ms)
     
     def record_request_failure(self, agent_id: str, error: str):
         """Record a failed request to an agent"""
         if agent_id in self._metrics:
             self._metrics[agent_id].record_failure(error)
     
+    def try_acquire_request(self, agent_id: str) -> bool:
+        """Admit a request to an agent (circuit breaker gate, one half-open trial at a time)"""
+        metrics = self._metrics.get(agent_id)
+        return metrics.try_acquire() if metrics else True
+    
+    def release_request(self, agent_id: str):
+        """Release an admitted request that finished without success/failure"""
+        if agent_id in self._metrics:
+            self._metrics[agent_id].release()
+    
+    def list_available_agents(self, enabled_agent_ids: Optional[List[str]] = None) -> List[AgentInfo]:
+        """Online agents whose circuit breaker admits traffic (routing candidates)"""
+        agents = [a for a in self.list_agents() if self.is_agent_available(a.id)]
+        if enabled_agent_ids is not None:
+            agents = [a for a in agents if a.id in enabled_agent_ids]
+        return agents
+    
     def is_agent_available(self, agent_id: str) -> bool:
         """Check if agent is available (not circuit-broken and online)"""
         agent = self._agents.get(agent_id)
@@ -382,12 +965,32 @@ class AgentRegistry:
         
         return True
     
-    def get_all_metrics(self) -> Dict[str, dict]:
-        """Get metrics for all agents"""
-        return {
-            agent_id: metrics.to_dict()
-            for agent_id, metrics in self._metrics.items()
-        }
+    def get_all_metrics(self, worker_snapshots: Optional[List[Dict[str, dict]]] = None) -> Dict[str, dict]:
+        """
+        Get metrics for all agents.
+        
+        Args:
+            worker_snapshots: export_metrics() results from other workers; counters and
+                latency sketches are merged into this worker's view
+        """
+        if not worker_snapshots:
+            return {
+                agent_id: metrics.to_dict()
+                for agent_id, metrics in self._metrics.items()
+            }
+        
+        merged: Dict[str, AgentMetrics] = {}
+        for agent_id, metrics in self._metrics.items():
+            merged[agent_id] = AgentMetrics()
+            merged[agent_id].merge(metrics.export())
+        for snapshot in worker_snapshots:
+            for agent_id, exported in snapshot.items():
+                merged.setdefault(agent_id, AgentMetrics()).merge(exported)
+        return {agent_id: metrics.to_dict() for agent_id, metrics in merged.items()}
+    
+    def export_metrics(self) -> Dict[str, dict]:
+        """Serializable per-agent metrics snapshot (for cross-worker merge)"""
+        return {agent_id: metrics.export() for agent_id, metrics in self._metrics.items()}
     
     def get_monitoring_status(self) -> dict:
         """Get comprehensive monitoring status for all agents"""
@@ -415,6 +1018,10 @@ class AgentRegistry:
                 "health": health,
                 "last_seen": agent.last_seen.isoformat() if agent.last_seen else None,
                 "metrics": metrics.to_dict(),
+                "health_check": self._health_scheduler.get_state(agent_id).to_dict(),
+                "protocol_dialect": getattr(self._dialects.get(agent.url), "value", None),
+                "concurrency": self._limiters[agent_id].to_dict() if agent_id in self._limiters else None,
+                "replicas": self._replica_set(agent_id).to_dict(),
                 "skills_count": len(agent.skills)
             })
         
@@ -433,34 +1040,43 @@ class AgentRegistry:
                 "overall_health": "healthy" if healthy == total else ("degraded" if online > 0 else "critical")
             },
             "agents": agents_status,
+            "health_checks": self._health_scheduler.get_stats(),
+            "protocol_dialects": self._dialects.get_stats(),
+            "registry_store": self._store.get_stats(),
+            "snapshot": self._snapshotter.get_stats(),
+            "agent_cards": self._card_fetcher.get_stats(),
+            "catalog_version": self.get_catalog().version,
             "timestamp": datetime.utcnow().isoformat()
         }
     
+    def get_catalog(self) -> AgentCatalog:
+        """
+        Immutable snapshot of the online agents shared by all routing consumers.
+        A new snapshot (version + 1) is built only after the registry changed, and not
+        while a bulk registration is in progress (one version bump per bulk).
+        """
+        if self._catalog_holds == 0 and self._catalog_index_version != self._index.version:
+            self._catalog_index_version = self._index.version
+            self._catalog = AgentCatalog(self._catalog.version + 1, self._index.with_status(AgentStatus.ONLINE))
+        return self._catalog
+    
     def get_agent(self, agent_id: str) -> Optional[AgentInfo]:
         """Get agent by ID"""
         return self._agents.get(agent_id)
     
     def get_agent_by_url(self, url: str) -> Optional[AgentInfo]:
-        """Get agent by URL"""
-        for agent in self._agents.values():
-            if agent.url == url:
-                return agent
-        return None
+        """Get agent by URL (primary or any replica)"""
+        return self._index.by_url(url)
     
     def get_agent_by_name(self, name: str) -> Optional[AgentInfo]:
         """Get agent by name (case-insensitive)"""
-        name_lower = name.lower()
-        for agent in self._agents.values():
-            if agent.name.lower() == name_lower:
-                return agent
-        return None
+        return self._index.by_name(name)
     
     def list_agents(self, include_offline: bool = False) -> List[AgentInfo]:
         """List all registered agents"""
-        agents = list(self._agents.values())
-        if not include_offline:
-            agents = [a for a in agents if a.status == AgentStatus.ONLINE]
-        return agents
+        if include_offline:
+            return list(self._agents.values())
+        return list(self._index.with_status(AgentStatus.ONLINE))
     
     def search_agents(
         self,
@@ -469,90 +1085,104 @@ class AgentRegistry:
         skill: Optional[str] = None
     ) -> List[AgentInfo]:
         """
-        Search agents by query, tags, or skill.
-        """
-        results = self.list_agents()
-        
-        if query:
-            query_lower = query.lower()
-            results = [
-                a for a in results
-                if query_lower in a.name.lower() or query_lower in a.description.lower()
-            ]
+        Search online agents by query, tags, or skill.
         
+        tags / skill are answered from the secondary indexes; skill matches whole
+        skill-name tokens (e.g. "search" matches "Web Search", "sear" does not).
+        """
+        candidates = None
         if tags:
-            tag_set = set(t.lower() for t in tags)
-            filtered = []
-            for agent in results:
-                agent_tags = set()
-                for skill_obj in agent.skills:
-                    agent_tags.update(t.lower() for t in skill_obj.tags)
-                if agent_tags & tag_set:
-                    filtered.append(agent)
-            results = filtered
+            candidates = self._index.ids_with_any_tag(tags)
+        if skill:
+            skill_ids = self._index.ids_with_skill_tokens(skill_tokens(skill))
+            candidates = skill_ids if candidates is None else candidates & skill_ids
+        
+        if candidates is None:
+            results = self._index.with_status(AgentStatus.ONLINE)
+        else:
+            results = self._index.ordered(candidates & self._index.ids_with_status(AgentStatus.ONLINE))
         
         if skill:
+            # 여러 토큰이면 원래 순서의 연속 문자열로 포함되는지 확인
             skill_lower = skill.lower()
+            results = [a for a in results if any(skill_lower in s.name.lower() for s in a.skills)]
+        
+        if query:
+            query_lower = query.lower()
             results = [
                 a for a in results
-                if any(skill_lower in s.name.lower() for s in a.skills)
+                if query_lower in a.name.lower() or query_lower in a.description.lower()
             ]
         
-        return results
+        return list(results)
+    
+    def heartbeat(self, agent_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """Update agent last seen timestamp and renew its health-check lease"""
+        lease = self.resolve_lease_seconds(lease_seconds)
+        if self._renew_lease(agent_id, lease):
+            self._store.publish_lease([agent_id], lease)
+            return True
+        return False
     
-    def heartbeat(self, agent_id: str) -> bool:
-        """Update agent last seen timestamp"""
+    def _renew_lease(self, agent_id: str, lease_seconds: float) -> bool:
         agent = self._agents.get(agent_id)
         if agent:
             agent.last_seen = datetime.utcnow()
             agent.status = AgentStatus.ONLINE
+            self._index.update_status(agent)
+            self._health_scheduler.renew_lease(agent_id, lease_seconds)
             return True
         return False
     
+    def heartbeat_many(
+        self,
+        agent_ids: List[str],
+        lease_seconds: Optional[float] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Batched heartbeat.
+        
+        Returns:
+            (renewed agent IDs, unknown agent IDs)
+        """
+        lease = self.resolve_lease_seconds(lease_seconds)
+        renewed, unknown = [], []
+        for agent_id in dict.fromkeys(agent_ids):
+            if self._renew_lease(agent_id, lease):
+                renewed.append(agent_id)
+            else:
+                unknown.append(agent_id)
+        if renewed:
+            self._store.publish_lease(renewed, lease)
+        return renewed, unknown
+    
+    def resolve_lease_seconds(self, lease_seconds: Optional[float] = None) -> float:
+        """Requested lease clamped to (0, heartbeat_max_lease_seconds]"""
+        settings = get_settings()
+        if not lease_seconds or lease_seconds <= 0:
+            return settings.heartbeat_lease_seconds
+        return min(lease_seconds, settings.heartbeat_max_lease_seconds)
+    
     async def check_agent_health(self, agent: AgentInfo) -> bool:
-        """Check if an agent is healthy by attempting to fetch its agent card (A2A spec)"""
-        start_time = time.time()
+        """Check if an agent is healthy by probing its agent card (A2A spec) or /health"""
+        return await self._health_scheduler.check(agent)
+    
+    def apply_health_result(self, agent: AgentInfo, healthy: bool, error: Optional[str] = None):
+        """Apply a health probe result to agent status and metrics"""
         metrics = self._metrics.get(agent.id, AgentMetrics())
         
-        try:
-            async with httpx.AsyncClient(timeout=10.0, verify=False) as client:
-                # A2A Spec: Try well-known location first (official spec path)
-                response = await client.get(f"{agent.url}/.well-known/agent-card.json")
-                if response.status_code == 200:
-                    agent.status = AgentStatus.ONLINE
-                    agent.last_seen = datetime.utcnow()
-                    metrics.health_check_failures = 0
-                    return True
-                
-                # Fallback: Try legacy path
-                response = await client.get(f"{agent.url}/.well-known/agent.json")
-                if response.status_code == 200:
-                    agent.status = AgentStatus.ONLINE
-                    agent.last_seen = datetime.utcnow()
-                    metrics.health_check_failures = 0
-                    return True
-                
-                # Fallback: Try alternative endpoint
-                response = await client.get(f"{agent.url}/agent-card")
-                if response.status_code == 200:
-                    agent.status = AgentStatus.ONLINE
-                    agent.last_seen = datetime.utcnow()
-                    metrics.health_check_failures = 0
-                    return True
-                
-                # Fallback: Health endpoint
-                response = await client.get(f"{agent.url}/health")
-                if response.status_code == 200:
-                    agent.status = AgentStatus.ONLINE
-                    agent.last_seen = datetime.utcnow()
-                    metrics.health_check_failures = 0
-                    return True
-                    
-        except Exception as e:
-            logger.debug(f"Health check failed for {agent.name}: {e}")
-            metrics.health_check_failures += 1
-            metrics.last_error = str(e)
-            metrics.last_error_time = datetime.utcnow()
+        if healthy:
+            agent.status = AgentStatus.ONLINE
+            self._index.update_status(agent)
+            agent.last_seen = datetime.utcnow()
+            metrics.health_check_failures = 0
+            self._publish_health_if_changed(agent)
+            return
+        
+        logger.debug(f"Health check failed for {agent.name}: {error}")
+        metrics.health_check_failures += 1
+        metrics.last_error = error
+        metrics.last_error_time = datetime.utcnow()
         
         # Check if agent has timed out
         if agent.last_seen:
@@ -561,27 +1191,12 @@ class AgentRegistry:
                 agent.status = AgentStatus.OFFLINE
         else:
             agent.status = AgentStatus.OFFLINE
-        
-        return False
+        self._index.update_status(agent)
+        self._publish_health_if_changed(agent)
     
-    async def _health_check_loop(self):
-        """Background task to periodically check agent health"""
-        while True:
-            try:
-                await asyncio.sleep(self._health_check_interval)
-                
-                for agent in list(self._agents.values()):
-                    await self.check_agent_health(agent)
-                
-                # Log status
-                online = sum(1 for a in self._agents.values() if a.status == AgentStatus.ONLINE)
-                total = len(self._agents)
-                logger.debug(f"Health check complete: {online}/{total} agents online")
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Health check error: {e}")
+    def get_health_check_stats(self) -> dict:
+        """Health check scheduler metrics (sweep duration, probe counts)"""
+        return self._health_scheduler.get_stats()
 
 
 # Global registry instance
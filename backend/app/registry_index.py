@@ -0,0 +1,197 @@
+"""
+Registry Index - AgentRegistry 보조 인덱스
+
+조회 비용이 등록된 에이전트 수와 무관하도록 등록/해제/상태 변경 시점에 유지합니다.
+- URL (primary + replica, 끝 '/' 제거) -> agent_id
+- 소문자 이름 -> agent_id
+- 소문자 skill tag -> agent_ids
+- skill 이름 토큰 -> agent_ids
+- 상태(online/offline/...) -> agent_ids (등록 순서 유지 목록은 변경 시에만 재구성)
+
+version은 에이전트 내용(상태 / last_seen 제외) 또는 상태가 실제로 바뀐 경우에만 증가하며
+AgentCatalog snapshot 재생성 기준으로 쓰입니다.
+"""
+import itertools
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import AgentInfo
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def skill_tokens(text: str) -> List[str]:
+    """skill 이름 토큰화 (소문자, 영숫자/한글 단위)"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _status_key(status) -> str:
+    # AgentInfo는 use_enum_values라 str / AgentStatus 둘 다 올 수 있음
+    return getattr(status, "value", status)
+
+
+class RegistryIndex:
+    """
+    AgentRegistry의 보조 인덱스.
+
+    update()는 에이전트 1개의 키를 다시 계산해 이전 키와의 차이만 반영하므로
+    비용은 해당 에이전트의 URL/skill 수에만 비례합니다.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, AgentInfo] = {}
+        self._seq: Dict[str, int] = {}  # agent_id -> 등록 순서 (결과 정렬용)
+        self._counter = itertools.count()
+        self.version = 0  # 실제 변경마다 단조 증가
+
+        self._by_url: Dict[str, str] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_skill_token: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+
+        # agent_id -> 인덱스에 반영된 키 (diff 계산용)
+        self._keys: Dict[str, Tuple[frozenset, str, frozenset, frozenset]] = {}
+        self._content: Dict[str, dict] = {}  # agent_id -> 상태 / last_seen 제외한 내용 (변경 감지용)
+        self._status: Dict[str, str] = {}
+        self._status_lists: Dict[str, List[AgentInfo]] = {}  # 상태별 정렬 목록 캐시
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    def update(self, agent: AgentInfo):
+        """에이전트 추가 또는 변경 반영 (이름 / URL / skill / 상태). 내용이 같으면 version 유지"""
+        agent_id = agent.id
+        content = agent.model_dump(exclude={"status", "last_seen"})
+        if self._content.get(agent_id) != content:
+            self._content[agent_id] = content
+            self.version += 1
+        if agent_id not in self._seq:
+            self._seq[agent_id] = next(self._counter)
+        previous = self._agents.get(agent_id)
+        if previous is not None and previous is not agent:
+            # 다른 객체로 교체 - 상태별 목록 캐시가 이전 객체를 참조하지 않도록
+            self._status_lists.pop(self._status.get(agent_id), None)
+        self._agents[agent_id] = agent
+
+        urls = frozenset(u.rstrip("/") for u in [agent.url, *(agent.replicas or ())])
+        name = agent.name.lower()
+        tags = frozenset(t.lower() for s in agent.skills for t in s.tags)
+        tokens = frozenset(tok for s in agent.skills for tok in skill_tokens(s.name))
+
+        old = self._keys.get(agent_id)
+        if old != (urls, name, tags, tokens):
+            old_urls, old_name, old_tags, old_tokens = old or (frozenset(), None, frozenset(), frozenset())
+            for url in old_urls - urls:
+                if self._by_url.get(url) == agent_id:
+                    del self._by_url[url]
+            for url in urls - old_urls:
+                self._by_url[url] = agent_id
+            if old_name != name:
+                if old_name is not None:
+                    self._discard(self._by_name, old_name, agent_id)
+                self._by_name.setdefault(name, set()).add(agent_id)
+            self._replace(self._by_tag, old_tags, tags, agent_id)
+            self._replace(self._by_skill_token, old_tokens, tokens, agent_id)
+            self._keys[agent_id] = (urls, name, tags, tokens)
+
+        self.update_status(agent)
+
+    def update_status(self, agent: AgentInfo):
+        """상태 변경 반영 (heartbeat / health check 경로 - URL/skill 재계산 없음)"""
+        status = _status_key(agent.status)
+        old = self._status.get(agent.id)
+        if old == status:
+            return
+        self.version += 1
+        if old is not None:
+            self._discard(self._by_status, old, agent.id)
+            self._status_lists.pop(old, None)
+        self._by_status.setdefault(status, set()).add(agent.id)
+        self._status_lists.pop(status, None)
+        self._status[agent.id] = status
+
+    def remove(self, agent_id: str):
+        if self._agents.pop(agent_id, None) is None:
+            return
+        self.version += 1
+        self._seq.pop(agent_id, None)
+        self._content.pop(agent_id, None)
+        urls, name, tags, tokens = self._keys.pop(agent_id)
+        for url in urls:
+            if self._by_url.get(url) == agent_id:
+                del self._by_url[url]
+        self._discard(self._by_name, name, agent_id)
+        self._replace(self._by_tag, tags, frozenset(), agent_id)
+        self._replace(self._by_skill_token, tokens, frozenset(), agent_id)
+        status = self._status.pop(agent_id, None)
+        if status is not None:
+            self._discard(self._by_status, status, agent_id)
+            self._status_lists.pop(status, None)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, agent_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(agent_id)
+            if not ids:
+                del index[key]
+
+    def _replace(self, index: Dict[str, Set[str]], old: frozenset, new: frozenset, agent_id: str):
+        for key in old - new:
+            self._discard(index, key, agent_id)
+        for key in new - old:
+            index.setdefault(key, set()).add(agent_id)
+
+    # =========================================================================
+    # Lookups
+    # =========================================================================
+
+    def _ordered(self, agent_ids: Iterable[str]) -> List[AgentInfo]:
+        return [self._agents[i] for i in sorted(agent_ids, key=self._seq.__getitem__)]
+
+    def by_url(self, url: str) -> Optional[AgentInfo]:
+        agent_id = self._by_url.get(url.rstrip("/"))
+        return self._agents.get(agent_id) if agent_id else None
+
+    def by_name(self, name: str) -> Optional[AgentInfo]:
+        ids = self._by_name.get(name.lower())
+        if not ids:
+            return None
+        # 같은 이름이 여럿이면 먼저 등록된 에이전트
+        return self._agents[min(ids, key=self._seq.__getitem__)]
+
+    def with_status(self, status) -> List[AgentInfo]:
+        """상태별 에이전트 (등록 순서). 반환 목록은 캐시이므로 수정하지 말 것"""
+        key = _status_key(status)
+        cached = self._status_lists.get(key)
+        if cached is None:
+            cached = self._status_lists[key] = self._ordered(self._by_status.get(key, ()))
+        return cached
+
+    def ids_with_status(self, status) -> Set[str]:
+        return self._by_status.get(_status_key(status), set())
+
+    def ids_with_any_tag(self, tags: Iterable[str]) -> Set[str]:
+        ids: Set[str] = set()
+        for tag in tags:
+            ids |= self._by_tag.get(tag.lower(), set())
+        return ids
+
+    def ids_with_skill_tokens(self, tokens: List[str]) -> Set[str]:
+        """모든 토큰을 skill 이름에 가진 에이전트 (토큰 교집합)"""
+        if not tokens:
+            return set()
+        postings = sorted((self._by_skill_token.get(t, set()) for t in tokens), key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids &= posting
+        return ids
+
+    def ordered(self, agent_ids: Iterable[str]) -> List[AgentInfo]:
+        """agent_id 목록 -> 등록 순서의 AgentInfo 목록"""
+        return self._ordered(i for i in agent_ids if i in self._agents)
@@ -0,0 +1,341 @@
+"""
+Registry Snapshot - 빠른 재시작을 위한 레지스트리 warm-start 파일
+
+배포 직후 에이전트가 재등록될 때까지 레지스트리가 비어 "no suitable agent" fallback이 발생하고,
+재등록 시 Agent Card 조회와 임베딩 호출이 한꺼번에 몰리는 문제를 줄입니다.
+
+파일 형식 (memory-mappable):
+    MAGIC(8) | header 길이(uint32, LE) | header(msgpack) | float32 벡터 블록(LE)
+
+- header: 에이전트 정보, Agent Card validator(ETag / Last-Modified / 경로), 협상된 A2A dialect,
+  in-process 벡터 인덱스 메타데이터(에이전트별 벡터 블록 offset)
+- 벡터 블록은 mmap 위에서 np.frombuffer로 바로 읽음 (복사/파싱 없음)
+
+시작 시 로드 후 백그라운드에서 conditional Agent Card 요청(If-None-Match)으로 재검증합니다.
+msgpack(ormsgpack / msgpack)이 설치되어 있지 않으면 snapshot은 비활성화됩니다.
+"""
+import asyncio
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from loguru import logger
+import numpy as np
+
+from .config import get_settings
+from .models import AgentInfo
+
+if TYPE_CHECKING:
+    from .registry import AgentRegistry
+
+try:
+    import ormsgpack as _msgpack
+except ImportError:
+    try:
+        import msgpack as _msgpack
+    except ImportError:
+        _msgpack = None
+
+MSGPACK_AVAILABLE = _msgpack is not None
+
+MAGIC = b"AGRSNAP1"
+_HEADER_LEN = struct.Struct("<I")
+_VECTOR_DTYPE = np.dtype("<f4")
+SNAPSHOT_VERSION = 1
+
+
+class RegistrySnapshot:
+    """로드된 snapshot (header + mmap된 벡터 블록)"""
+
+    def __init__(self, header: Dict[str, Any], buffer, vector_offset: int):
+        self.header = header
+        self._buffer = buffer
+        self._vector_offset = vector_offset
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.header.get("created_at", 0)
+
+    def vectors(self, row_offset: int, rows: int, dim: int) -> np.ndarray:
+        """벡터 블록의 (rows, dim) view"""
+        offset = self._vector_offset + row_offset * dim * _VECTOR_DTYPE.itemsize
+        return np.frombuffer(self._buffer, dtype=_VECTOR_DTYPE, count=rows * dim, offset=offset).reshape(rows, dim)
+
+    def vector_index(self) -> Optional[Dict[str, Any]]:
+        """벡터 인덱스 복원 데이터 {"embedding_model", "embedding_dim", "agents": [...]}"""
+        section = self.header.get("vector_index")
+        if not section:
+            return None
+        dim = section["embedding_dim"]
+        for entry in section["agents"]:
+            if not len(entry["kinds"]) == len(entry["texts"]) == entry["rows"]:
+                raise ValueError(f"vector index entry {entry['name']!r} is inconsistent")
+        return {
+            "embedding_model": section["embedding_model"],
+            "embedding_dim": dim,
+            "agents": [
+                {
+                    "name": entry["name"],
+                    "info": entry["info"],
+                    "kinds": entry["kinds"],
+                    "texts": entry["texts"],
+                    "vectors": self.vectors(entry["offset"], entry["rows"], dim),
+                }
+                for entry in section["agents"]
+            ],
+        }
+
+
+def write_snapshot(path: Path, header: Dict[str, Any], vector_index: Optional[Dict[str, Any]] = None):
+    """snapshot 파일 쓰기 (임시 파일 + rename으로 원자적 교체)"""
+    blocks: List[np.ndarray] = []
+    if vector_index:
+        entries = []
+        row = 0
+        for agent in vector_index["agents"]:
+            vectors = np.ascontiguousarray(agent["vectors"], dtype=_VECTOR_DTYPE)
+            entries.append({
+                "name": agent["name"],
+                "info": agent["info"],
+                "kinds": list(agent["kinds"]),
+                "texts": list(agent["texts"]),
+                "offset": row,
+                "rows": vectors.shape[0],
+            })
+            blocks.append(vectors)
+            row += vectors.shape[0]
+        header = {
+            **header,
+            "vector_index": {
+                "embedding_model": vector_index["embedding_model"],
+                "embedding_dim": vector_index["embedding_dim"],
+                "agents": entries,
+            },
+        }
+
+    packed = _msgpack.packb(header)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(packed)))
+        f.write(packed)
+        for block in blocks:
+            f.write(block.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: Path) -> Optional[RegistrySnapshot]:
+    """snapshot 파일 로드 (없거나 형식이 다르면 None)"""
+    if not path.exists() or path.stat().st_size < len(MAGIC) + _HEADER_LEN.size:
+        return None
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        return None
+    start = len(MAGIC) + _HEADER_LEN.size
+    (header_len,) = _HEADER_LEN.unpack_from(buffer, len(MAGIC))
+    header = _msgpack.unpackb(memoryview(buffer)[start:start + header_len])
+    if header.get("version") != SNAPSHOT_VERSION:
+        return None
+    return RegistrySnapshot(header, buffer, start + header_len)
+
+
+class RegistrySnapshotter:
+    """
+    레지스트리 snapshot 로드 / 주기적 저장 / 백그라운드 재검증.
+
+    저장은 내용(생성 시각 제외)이 바뀐 경우에만 수행합니다.
+    """
+
+    def __init__(self, registry: "AgentRegistry"):
+        settings = get_settings()
+        self._registry = registry
+        self.path = Path(settings.registry_snapshot_path) if settings.registry_snapshot_path else None
+        self.enabled = self.path is not None and MSGPACK_AVAILABLE
+        self.interval = settings.registry_snapshot_interval_seconds
+        self.max_age = settings.registry_snapshot_max_age_seconds
+        self.revalidate_concurrency = settings.registry_snapshot_revalidate_concurrency
+
+        # 이 워커가 벡터 저장소를 아직 초기화하지 않았으면 로드한 인덱스를 그대로 다시 저장
+        self._loaded_vector_index: Optional[Dict[str, Any]] = None
+        self._last_saved: Optional[bytes] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stats: Dict[str, Any] = {
+            "loaded_agents": 0,
+            "load_ms": None,
+            "snapshot_age_s": None,
+            "saves": 0,
+            "save_failures": 0,
+            "last_saved_at": None,
+            "revalidated": {"not_modified": 0, "updated": 0, "failed": 0},
+            "revalidation_ms": None,
+        }
+
+    # =========================================================================
+    # Load
+    # =========================================================================
+
+    def load(self) -> List[str]:
+        """
+        snapshot을 레지스트리에 복원 (동기, 수 ms).
+
+        Returns:
+            복원된 에이전트 ID 목록 (백그라운드 재검증 대상)
+        """
+        if not self.enabled:
+            if self.path is not None:
+                logger.warning("[Snapshot] msgpack is not installed; registry warm start disabled")
+            return []
+
+        start = time.perf_counter()
+        try:
+            snapshot = read_snapshot(self.path)
+        except Exception as e:
+            logger.warning(f"[Snapshot] Failed to read {self.path}: {type(e).__name__}: {e}")
+            return []
+        if snapshot is None:
+            return []
+        if snapshot.age_seconds > self.max_age:
+            logger.info(f"[Snapshot] Ignoring stale snapshot ({snapshot.age_seconds / 3600:.1f}h old)")
+            return []
+
+        header = snapshot.header
+        card_validators = header.get("card_validators", {})
+        dialects = header.get("dialects", {})
+        try:
+            # 레지스트리를 바꾸기 전에 전부 파싱 (손상된 파일은 여기서 대부분 걸러짐)
+            agents = [AgentInfo(**data) for data in header.get("agents", [])]
+            vector_index = snapshot.vector_index()
+
+            self._registry.restore_snapshot(agents, card_validators, dialects)
+            if vector_index:
+                from .agent_vector_store import preload_index_snapshot
+                preload_index_snapshot(vector_index)
+                self._loaded_vector_index = vector_index
+        except Exception as e:
+            logger.warning(
+                f"[Snapshot] Failed to restore {self.path}, starting cold: {type(e).__name__}: {e}"
+            )
+            self._discard(card_validators, dialects)
+            return []
+
+        load_ms = (time.perf_counter() - start) * 1000
+        self._stats.update(
+            loaded_agents=len(agents),
+            load_ms=round(load_ms, 2),
+            snapshot_age_s=round(snapshot.age_seconds, 1)
+        )
+        logger.info(
+            f"[Snapshot] Warm start: {len(agents)} agents, "
+            f"{sum(len(a['kinds']) for a in vector_index['agents']) if vector_index else 0} vectors "
+            f"in {load_ms:.1f}ms (snapshot age {snapshot.age_seconds:.0f}s)"
+        )
+        return [agent.id for agent in agents]
+
+    def _discard(self, card_validators: Dict[str, Any], dialects: Dict[str, Any]):
+        """일부만 복원된 상태를 되돌림 (cold start 경로로 진행)"""
+        from .agent_vector_store import preload_index_snapshot
+        preload_index_snapshot(None)
+        self._loaded_vector_index = None
+        try:
+            self._registry.discard_snapshot(card_validators, dialects)
+        except Exception as e:
+            logger.error(f"[Snapshot] Failed to reset registry after restore failure: {type(e).__name__}: {e}")
+
+    # =========================================================================
+    # Background tasks
+    # =========================================================================
+
+    def start(self, revalidate_ids: List[str]):
+        if not self.enabled:
+            return
+        self._tasks.append(asyncio.create_task(self._save_loop()))
+        if revalidate_ids:
+            self._tasks.append(asyncio.create_task(self.revalidate(revalidate_ids)))
+        if self._loaded_vector_index:
+            # 첫 요청 전에 벡터 저장소(DB 풀 + 복원 인덱스) 준비
+            self._tasks.append(asyncio.create_task(self._warm_vector_store()))
+
+    async def _warm_vector_store(self):
+        from .agent_vector_store import get_vector_store
+        try:
+            await get_vector_store()
+        except Exception as e:
+            logger.warning(f"[Snapshot] Vector store warm-up failed: {type(e).__name__}: {e}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.enabled:
+            self.save()
+
+    async def _save_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.save()
+            except Exception as e:
+                self._stats["save_failures"] += 1
+                logger.warning(f"[Snapshot] Periodic save failed: {type(e).__name__}: {e}")
+
+    async def revalidate(self, agent_ids: List[str]):
+        """복원한 에이전트의 Agent Card를 conditional 요청으로 재검증 (동시성 제한)"""
+        start = time.perf_counter()
+        counts = await self._registry.refresh_agent_cards(agent_ids, concurrency=self.revalidate_concurrency)
+        self._stats["revalidated"] = counts
+        self._stats["revalidation_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(
+            f"[Snapshot] Revalidated {len(agent_ids)} agents in {self._stats['revalidation_ms']:.0f}ms "
+            f"(not modified: {counts['not_modified']}, updated: {counts['updated']}, failed: {counts['failed']})"
+        )
+
+    # =========================================================================
+    # Save
+    # =========================================================================
+
+    def save(self) -> bool:
+        """변경이 있으면 snapshot 파일 저장"""
+        if not self.enabled:
+            return False
+        header = {"version": SNAPSHOT_VERSION, **self._registry.export_snapshot()}
+
+        from .agent_vector_store import get_loaded_vector_store
+        store = get_loaded_vector_store()
+        vector_index = store.export_index_snapshot() if store else None
+        if vector_index is None:
+            vector_index = self._loaded_vector_index
+
+        # created_at 제외한 내용이 같으면 쓰지 않음
+        signature = _msgpack.packb([header, _vector_signature(vector_index)])
+        if signature == self._last_saved:
+            return False
+        try:
+            write_snapshot(self.path, {**header, "created_at": time.time()}, vector_index)
+        except Exception as e:
+            self._stats["save_failures"] += 1
+            logger.warning(f"[Snapshot] Failed to write {self.path}: {type(e).__name__}: {e}")
+            return False
+        self._last_saved = signature
+        self._stats["saves"] += 1
+        self._stats["last_saved_at"] = datetime.utcnow().isoformat()
+        logger.debug(f"[Snapshot] Saved {len(header['agents'])} agents to {self.path}")
+        return True
+
+    def get_stats(self) -> dict:
+        return {"enabled": self.enabled, "path": str(self.path) if self.path else None, **self._stats}
+
+
+def _vector_signature(vector_index: Optional[Dict[str, Any]]) -> Optional[List[Tuple[str, int, str]]]:
+    # 벡터 내용 대신 (에이전트, 벡터 수, 텍스트) 로 변경 여부 판단
+    if not vector_index:
+        return None
+    return [
+        (a["name"], len(a["kinds"]), "\n".join(a["texts"]))
+        for a in vector_index["agents"]
+    ] + [(vector_index["embedding_model"], vector_index["embedding_dim"], "")]
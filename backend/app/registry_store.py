@@ -0,0 +1,362 @@
+"""
+Registry Store - 워커 간 에이전트 레지스트리 공유 (Postgres)
+
+uvicorn --workers N 환경에서 각 워커의 AgentRegistry는 프로세스 메모리이므로,
+registered_agents 테이블을 원본(catalog)으로 사용하고 변경 사항을 LISTEN/NOTIFY로 전파합니다.
+
+- 시작 시 registered_agents 전체를 로드
+- 등록/수정/해제는 백그라운드 writer가 순서대로 DB에 쓰고 같은 트랜잭션에서 NOTIFY
+- 다른 워커의 NOTIFY를 받으면 해당 row를 다시 읽어 로컬 레지스트리에 반영
+- health probe는 advisory lock을 잡은 leader 워커 1개만 수행하고, 상태 변경을 NOTIFY로 공유
+- follower 워커가 받은 heartbeat lease는 leader에게 전달
+
+DB에 연결할 수 없으면 비활성화되며, 레지스트리는 워커별 메모리 + 워커별 health check로 동작합니다.
+"""
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from loguru import logger
+
+from .config import get_settings
+from .models import AgentInfo
+
+if TYPE_CHECKING:
+    from .registry import AgentRegistry
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+NOTIFY_CHANNEL = "agent_registry"
+# pg_try_advisory_lock 키 (health probe leader)
+LEADER_LOCK_KEY = 0x41474E5452454749  # "AGNTREGI"
+
+SCHEMA_SQL = [
+    "ALTER TABLE registered_agents ADD COLUMN IF NOT EXISTS replicas JSONB DEFAULT '[]'",
+    "ALTER TABLE registered_agents ADD COLUMN IF NOT EXISTS requirements JSONB DEFAULT '{}'",
+]
+
+UPSERT_SQL = """
+    INSERT INTO registered_agents (
+        id, name, description, url, replicas, version, skills, capabilities, requirements, status, last_seen
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        url = EXCLUDED.url,
+        replicas = EXCLUDED.replicas,
+        version = EXCLUDED.version,
+        skills = EXCLUDED.skills,
+        capabilities = EXCLUDED.capabilities,
+        requirements = EXCLUDED.requirements,
+        status = EXCLUDED.status,
+        last_seen = EXCLUDED.last_seen
+"""
+
+SELECT_SQL = """
+    SELECT id, name, description, url, replicas, version, skills, capabilities, requirements, status, last_seen
+    FROM registered_agents
+"""
+
+
+async def _init_connection(conn):
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+def _to_db_time(value: Optional[datetime]) -> Optional[datetime]:
+    # 레지스트리는 naive UTC datetime 사용
+    return value.replace(tzinfo=timezone.utc) if value else None
+
+
+def _from_db_time(value: Optional[datetime]) -> Optional[datetime]:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value else None
+
+
+def _agent_from_row(row) -> AgentInfo:
+    return AgentInfo(
+        id=str(row["id"]),
+        name=row["name"],
+        description=row["description"] or "",
+        url=row["url"],
+        replicas=row["replicas"] or [row["url"]],
+        version=row["version"] or "1.0.0",
+        skills=row["skills"] or [],
+        capabilities=row["capabilities"] or {},
+        requirements=row["requirements"] or {},
+        status=row["status"] or "offline",
+        last_seen=_from_db_time(row["last_seen"])
+    )
+
+
+class RegistryStore:
+    """registered_agents 영속화 + LISTEN/NOTIFY 전파 + health probe leader 선출"""
+
+    def __init__(self, registry: "AgentRegistry"):
+        self._registry = registry
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.enabled = False
+        self.is_leader = False
+
+        self._pool = None
+        self._listener = None  # LISTEN + advisory lock 전용 커넥션 (끊기면 leader 해제)
+        self._writes: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending_fetches: set = set()
+
+        self._stats: Dict[str, Any] = {
+            "writes": 0,
+            "write_failures": 0,
+            "notifications_sent": 0,
+            "notifications_received": 0,
+            "resyncs": 0,
+            "leader_changes": 0,
+        }
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    async def start(self) -> bool:
+        """
+        DB 연결, 스키마 확인, 전체 로드, LISTEN 시작.
+
+        Returns:
+            활성화 여부 (False면 워커별 메모리 레지스트리로 동작)
+        """
+        settings = get_settings()
+        if not settings.registry_persistence_enabled or not ASYNCPG_AVAILABLE:
+            return False
+
+        try:
+            self._pool = await asyncpg.create_pool(
+                host=settings.db_host,
+                port=settings.db_port,
+                database=settings.db_name,
+                user=settings.db_user,
+                password=settings.db_password or "",
+                min_size=1,
+                max_size=3,
+                init=_init_connection
+            )
+            async with self._pool.acquire() as conn:
+                for statement in SCHEMA_SQL:
+                    await conn.execute(statement)
+            await self._connect_listener()
+            await self.resync()
+        except Exception as e:
+            logger.warning(f"[RegistryStore] Shared registry disabled ({type(e).__name__}: {e}); using per-worker registry")
+            await self._close_connections()
+            return False
+
+        self.enabled = True
+        self._writes = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._write_loop()),
+            asyncio.create_task(self._leader_loop()),
+        ]
+        logger.info(f"[RegistryStore] Shared registry enabled (worker: {self.worker_id})")
+        return True
+
+    async def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        # 대기 중인 쓰기 반영 후 종료
+        if self._writes is not None:
+            try:
+                await asyncio.wait_for(self._writes.join(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning(f"[RegistryStore] {self._writes.qsize()} pending writes dropped on shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._set_leader(False)
+        await self._close_connections()
+
+    async def _close_connections(self):
+        if self._listener is not None:
+            try:
+                await self._listener.close()
+            except Exception:
+                pass
+            self._listener = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def _connect_listener(self):
+        settings = get_settings()
+        self._listener = await asyncpg.connect(
+            host=settings.db_host,
+            port=settings.db_port,
+            database=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password or ""
+        )
+        await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+
+    async def resync(self):
+        """registered_agents 전체를 다시 읽어 로컬 레지스트리와 맞춤 (시작 / 재연결 시)"""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(SELECT_SQL)
+        agents = [_agent_from_row(row) for row in rows]
+        self._registry.apply_remote_snapshot(agents)
+        self._stats["resyncs"] += 1
+        logger.info(f"[RegistryStore] Loaded {len(agents)} agents from registered_agents")
+
+    # =========================================================================
+    # Leader election (health probing)
+    # =========================================================================
+
+    async def _leader_loop(self):
+        interval = get_settings().registry_leader_retry_seconds
+        while True:
+            try:
+                if self._listener is None or self._listener.is_closed():
+                    # 커넥션이 끊기면 advisory lock도 해제됨 -> 재연결 후 놓친 변경 재동기화
+                    await self._set_leader(False)
+                    await self._connect_listener()
+                    await self.resync()
+                if not self.is_leader:
+                    acquired = await self._listener.fetchval("SELECT pg_try_advisory_lock($1)", LEADER_LOCK_KEY)
+                    if acquired:
+                        await self._set_leader(True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[RegistryStore] Listener connection error: {e}")
+                await self._set_leader(False)
+                self._listener = None
+            await asyncio.sleep(interval)
+
+    async def _set_leader(self, leader: bool):
+        if leader == self.is_leader:
+            return
+        self.is_leader = leader
+        self._stats["leader_changes"] += 1
+        logger.info(f"[RegistryStore] Worker {self.worker_id} {'is now' if leader else 'is no longer'} health-check leader")
+        await self._registry.on_leadership_change(leader)
+
+    # =========================================================================
+    # Writes (DB + NOTIFY in one transaction)
+    # =========================================================================
+
+    def _enqueue(self, op: str, **fields):
+        if self.enabled:
+            self._writes.put_nowait((op, fields))
+
+    def publish_upsert(self, agent: AgentInfo):
+        self._enqueue("upsert", agent=agent.model_copy(deep=True))
+
+    def publish_delete(self, agent_id: str):
+        self._enqueue("delete", id=agent_id)
+
+    def publish_health(self, agent: AgentInfo, down_replicas: List[str]):
+        """leader의 health 결과 (상태가 바뀐 경우만 호출)"""
+        self._enqueue("health", id=agent.id, status=agent.status, last_seen=agent.last_seen, down=down_replicas)
+
+    def publish_lease(self, agent_ids: List[str], lease_seconds: float):
+        """follower가 받은 heartbeat lease를 leader에게 전달"""
+        if self.is_leader:
+            return
+        # NOTIFY payload 크기 제한 (8000 bytes)
+        for i in range(0, len(agent_ids), 100):
+            self._enqueue("lease", ids=agent_ids[i:i + 100], lease_seconds=lease_seconds)
+
+    async def _write_loop(self):
+        while True:
+            op, fields = await self._writes.get()
+            try:
+                await self._write(op, fields)
+                self._stats["writes"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["write_failures"] += 1
+                logger.error(f"[RegistryStore] Failed to persist {op}: {type(e).__name__}: {e}")
+            finally:
+                self._writes.task_done()
+
+    async def _write(self, op: str, fields: Dict[str, Any]):
+        message = {"op": op, "origin": self.worker_id}
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                if op == "upsert":
+                    agent: AgentInfo = fields["agent"]
+                    data = agent.model_dump(mode="json")
+                    await conn.execute(
+                        UPSERT_SQL,
+                        agent.id, agent.name, agent.description, agent.url, data["replicas"],
+                        agent.version, data["skills"], data["capabilities"], data["requirements"],
+                        data["status"], _to_db_time(agent.last_seen)
+                    )
+                    message["id"] = agent.id
+                elif op == "delete":
+                    await conn.execute("DELETE FROM registered_agents WHERE id = $1", fields["id"])
+                    message["id"] = fields["id"]
+                elif op == "health":
+                    await conn.execute(
+                        "UPDATE registered_agents SET status = $2, last_seen = $3 WHERE id = $1",
+                        fields["id"], fields["status"], _to_db_time(fields["last_seen"])
+                    )
+                    message.update(id=fields["id"], status=fields["status"], down=fields["down"])
+                elif op == "lease":
+                    message.update(ids=fields["ids"], lease_seconds=fields["lease_seconds"])
+                await conn.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, json.dumps(message))
+        self._stats["notifications_sent"] += 1
+
+    # =========================================================================
+    # Notifications from other workers
+    # =========================================================================
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.worker_id:
+            return
+        self._stats["notifications_received"] += 1
+
+        op = message.get("op")
+        if op == "upsert":
+            # payload 크기 제한(8000 bytes) 때문에 row는 다시 읽음
+            task = asyncio.create_task(self._fetch_and_apply(message["id"]))
+            self._pending_fetches.add(task)
+            task.add_done_callback(self._pending_fetches.discard)
+        elif op == "delete":
+            self._registry.apply_remote_delete(message["id"])
+        elif op == "health":
+            self._registry.apply_remote_health(message["id"], message["status"], message.get("down", []))
+        elif op == "lease":
+            self._registry.apply_remote_lease(message["ids"], message["lease_seconds"])
+
+    async def _fetch_and_apply(self, agent_id: str):
+        try:
+            async with self._pool.acquire() as conn:
+                row = await conn.fetchrow(f"{SELECT_SQL} WHERE id = $1", agent_id)
+        except Exception as e:
+            logger.warning(f"[RegistryStore] Failed to load agent {agent_id}: {e}")
+            return
+        if row is None:
+            # 읽기 전에 삭제됨
+            self._registry.apply_remote_delete(agent_id)
+        else:
+            self._registry.apply_remote_upsert(_agent_from_row(row))
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "worker_id": self.worker_id,
+            "health_check_leader": self.is_leader,
+            "pending_writes": self._writes.qsize() if self._writes else 0,
+            **self._stats,
+        }
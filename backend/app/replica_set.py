@@ -0,0 +1,166 @@
+"""
+Replica Set - 논리 에이전트 1개를 구성하는 replica URL들의 부하 분산 상태
+
+같은 에이전트(이름)가 여러 URL로 등록되면 하나의 논리 에이전트 아래 replica로 묶입니다.
+- 선택: power-of-two-choices(기본) 또는 least-outstanding-requests
+- health probe 결과와 연속 실패(passive ejection)로 replica를 후보에서 제외
+- replica별 요청 수/지연은 여기서, 논리 에이전트 단위 메트릭은 AgentMetrics에서 집계
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .latency_histogram import SlidingWindowHistogram
+
+BALANCING_STRATEGIES = ("p2c", "least_outstanding")
+
+
+@dataclass(slots=True)
+class ReplicaState:
+    """replica 1개의 부하/상태"""
+    url: str
+    outstanding: int = 0
+    healthy: bool = True
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0  # time.monotonic() 기준
+    total_requests: int = 0
+    failed_requests: int = 0
+    latency: SlidingWindowHistogram = field(default_factory=SlidingWindowHistogram)
+
+    def is_available(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until
+
+    def to_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "ejected_for_s": round(self.ejected_until - now, 1) if self.ejected_until > now else None,
+            "outstanding": self.outstanding,
+            "total_requests": self.total_requests,
+            "failed_requests": self.failed_requests,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_5m": self.latency.window(300).summary(),
+        }
+
+
+class ReplicaSet:
+    """
+    논리 에이전트의 replica 목록과 선택 정책.
+
+    사용 가능한 replica가 하나도 없으면(전부 unhealthy/ejected) 전체 중에서 선택합니다 (fail-open).
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        strategy: str = "p2c",
+        eject_after_failures: int = 3,
+        eject_seconds: float = 30.0
+    ):
+        self.strategy = strategy if strategy in BALANCING_STRATEGIES else "p2c"
+        self.eject_after_failures = eject_after_failures
+        self.eject_seconds = eject_seconds
+        self._replicas: Dict[str, ReplicaState] = {}
+        for url in urls:
+            self.add(url)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url.rstrip("/")
+
+    @property
+    def urls(self) -> List[str]:
+        return [r.url for r in self._replicas.values()]
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    def __contains__(self, url: str) -> bool:
+        return self._key(url) in self._replicas
+
+    def add(self, url: str) -> bool:
+        key = self._key(url)
+        if key in self._replicas:
+            return False
+        self._replicas[key] = ReplicaState(url=url)
+        return True
+
+    def remove(self, url: str) -> bool:
+        return self._replicas.pop(self._key(url), None) is not None
+
+    def unhealthy_urls(self) -> List[str]:
+        """health probe 기준 비정상 replica (passive ejection 제외)"""
+        return [r.url for r in self._replicas.values() if not r.healthy]
+
+    def available_count(self) -> int:
+        now = time.monotonic()
+        return sum(1 for r in self._replicas.values() if r.is_available(now))
+
+    def pick(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """다음 요청을 보낼 replica URL (exclude: hedge 시 이미 사용 중인 replica)"""
+        excluded = {self._key(u) for u in exclude}
+        candidates = [r for k, r in self._replicas.items() if k not in excluded]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        available = [r for r in candidates if r.is_available(now)]
+        if available:
+            candidates = available
+        elif excluded:
+            # hedge 대상은 정상 replica만
+            return None
+
+        if len(candidates) == 1:
+            return candidates[0].url
+        if self.strategy == "least_outstanding":
+            fewest = min(r.outstanding for r in candidates)
+            return random.choice([r for r in candidates if r.outstanding == fewest]).url
+        first, second = random.sample(candidates, 2)
+        return (second if second.outstanding < first.outstanding else first).url
+
+    def start(self, url: str):
+        replica = self._replicas.get(self._key(url))
+        if replica:
+            replica.outstanding += 1
+
+    def finish(self, url: str, latency_ms: float, outcome: str):
+        """
+        요청 종료 반영.
+        outcome: success / failure / cancelled (cancelled는 hedge 패배 등 - 실패로 보지 않음)
+        """
+        replica = self._replicas.get(self._key(url))
+        if replica is None:
+            return
+        replica.outstanding = max(0, replica.outstanding - 1)
+        if outcome == "cancelled":
+            return
+
+        replica.total_requests += 1
+        if outcome == "success":
+            replica.consecutive_failures = 0
+            replica.latency.record(latency_ms)
+            return
+
+        replica.failed_requests += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_after_failures:
+            # passive ejection: 연속 실패 replica를 잠시 후보에서 제외
+            replica.ejected_until = time.monotonic() + self.eject_seconds
+            replica.consecutive_failures = 0
+
+    def set_health(self, url: str, healthy: bool):
+        replica = self._replicas.get(self._key(url))
+        if replica is None:
+            return
+        # passive ejection은 probe 결과와 무관하게 eject_seconds 동안 유지 (probe 성공 != 실제 요청 성공)
+        replica.healthy = healthy
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "available": self.available_count(),
+            "replicas": [r.to_dict() for r in self._replicas.values()],
+        }
@@ -0,0 +1,93 @@
+"""
+Request Timing - 요청 단위 단계별 소요 시간 수집 (contextvar 기반)
+
+채팅 요청 하나가 어느 단계(workflow 분석 LLM, 벡터 검색, 요약, DB, 에이전트 호출)에서
+시간을 썼는지 기록합니다. 같은 단계가 여러 번 실행되면 합산하고 횟수를 셉니다.
+
+- /api/chat/message: Server-Timing 헤더
+- /api/chat/message/stream: 마지막 "timing" SSE 이벤트
+- 응답/메시지 metadata["timings"]
+"""
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class RequestTimings:
+    """단계별 누적 소요 시간 (ms) 및 실행 횟수"""
+
+    __slots__ = ("started", "_durations", "_counts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._durations: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def add(self, stage: str, duration_ms: float):
+        self._durations[stage] = self._durations.get(stage, 0.0) + duration_ms
+        self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "stages": {
+                stage: {"ms": round(ms, 2), "count": self._counts[stage]}
+                for stage, ms in self._durations.items()
+            }
+        }
+
+    def to_server_timing(self) -> str:
+        """Server-Timing 헤더 값 (예: 'routing;dur=12.3, agent;dur=840.1, total;dur=901.7')"""
+        entries = [
+            f"{stage};dur={ms:.1f}" + (f';desc="x{self._counts[stage]}"' if self._counts[stage] > 1 else "")
+            for stage, ms in self._durations.items()
+        ]
+        entries.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timing() -> RequestTimings:
+    """현재 컨텍스트에 새 타이밍 수집 시작"""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def get_request_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record_timing(stage: str, duration_ms: float):
+    """진행 중인 요청이 있으면 단계 소요 시간 추가 (없으면 무시)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(stage, duration_ms)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(stage, (time.perf_counter() - started) * 1000)
+
+
+def timed_async(stage: str):
+    """async 함수 전체 소요 시간을 stage로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timed(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
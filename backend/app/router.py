@@ -10,6 +10,7 @@ from loguru import logger
 from .config import get_settings
 from .models import AgentInfo, Intent, RoutingDecision
 from .registry import registry
+from .agent_catalog import AgentCatalog
 from .llm_client import get_llm_client, BaseLLMClient
 
 
@@ -105,7 +106,8 @@ User message: {message}"""
                         "content": self.INTENT_PROMPT.format(message=message)
                     }
                 ],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="router.intent"
             )
             
             result = json.loads(response)
@@ -174,15 +176,23 @@ Respond in JSON format:
             enabled_agent_ids: Optional list of agent IDs that user has enabled.
                               If provided, only these agents will be considered for routing.
         """
-        # Get available agents
-        all_agents = registry.list_agents()
+        # Get available agents (shared immutable catalog snapshot)
+        catalog = registry.get_catalog()
+        all_agents = catalog.agents
         
         # Filter by enabled agents if provided
         if enabled_agent_ids is not None:
-            agents = [a for a in all_agents if a.id in enabled_agent_ids]
+            enabled = set(enabled_agent_ids)
+            agents = [a for a in all_agents if a.id in enabled]
             logger.info(f"Filtering to {len(agents)} enabled agents out of {len(all_agents)} total")
         else:
-            agents = all_agents
+            agents = list(all_agents)
+        
+        # Skip circuit-open agents (including a half-open trial in flight)
+        routable = [a for a in agents if registry.is_agent_available(a.id)]
+        if len(routable) < len(agents):
+            logger.info(f"Skipping {len(agents) - len(routable)} circuit-open agent(s)")
+        agents = routable
         
         if not agents:
             logger.warning("No agents available for routing")
@@ -193,7 +203,7 @@ Respond in JSON format:
         logger.info(f"Detected intent: {intent.category} (confidence: {intent.confidence})")
         
         # Try quick matching first (keyword-based)
-        quick_match = self._quick_match(intent, agents, message)
+        quick_match = self._quick_match(intent, agents, catalog, message)
         if quick_match:
             logger.info(f"Quick match found: {quick_match.agent_name}")
             return quick_match
@@ -205,13 +215,19 @@ Respond in JSON format:
                 return llm_result
         
         # Direct keyword matching on message as last resort
-        direct_match = self._direct_keyword_match(message, agents)
+        direct_match = self._direct_keyword_match(message, agents, catalog)
         if direct_match:
             return direct_match
         
         return None
     
-    def _quick_match(self, intent: Intent, agents: List[AgentInfo], message: str = "") -> Optional[RoutingDecision]:
+    def _quick_match(
+        self,
+        intent: Intent,
+        agents: List[AgentInfo],
+        catalog: AgentCatalog,
+        message: str = ""
+    ) -> Optional[RoutingDecision]:
         """
         Quick matching based on intent category and agent skills/description.
         """
@@ -249,7 +265,7 @@ Respond in JSON format:
         
         for agent in agents:
             # Check agent name and description
-            agent_text = f"{agent.name} {agent.description}".lower()
+            agent_text = catalog.search_text(agent)
             
             for keyword in keywords:
                 if keyword in agent_text:
@@ -278,44 +294,38 @@ Respond in JSON format:
         
         return None
     
-    def _direct_keyword_match(self, message: str, agents: List[AgentInfo]) -> Optional[RoutingDecision]:
+    def _direct_keyword_match(
+        self,
+        message: str,
+        agents: List[AgentInfo],
+        catalog: AgentCatalog
+    ) -> Optional[RoutingDecision]:
         """
         Direct keyword matching from message to agent skills.
         Used as fallback when intent analysis doesn't find a match.
         """
-        message_lower = message.lower()
-        
-        for agent in agents:
-            # Check skill tags directly against message
-            for skill in agent.skills:
-                if skill.tags:
-                    for tag in skill.tags:
-                        if tag.lower() in message_lower:
-                            return RoutingDecision(
-                                agent_id=agent.id,
-                                agent_name=agent.name,
-                                agent_url=agent.url,
-                                confidence=0.7,
-                                reasoning=f"Direct keyword match: '{tag}' found in message"
-                            )
-                
-                # Check skill examples
-                if skill.examples:
-                    for example in skill.examples:
-                        # Check if message is similar to examples
-                        example_words = set(example.lower().split())
-                        message_words = set(message_lower.split())
-                        common = example_words & message_words
-                        if len(common) >= 2:
-                            return RoutingDecision(
-                                agent_id=agent.id,
-                                agent_name=agent.name,
-                                agent_url=agent.url,
-                                confidence=0.65,
-                                reasoning=f"Message similar to skill example: '{example}'"
-                            )
+        # agents는 catalog.agents의 부분열 (활성화 / circuit 필터)
+        allowed = None if len(agents) == len(catalog) else {a.id for a in agents}
+        match = catalog.keyword_match(message.lower(), allowed)
+        if match is None:
+            return None
         
-        return None
+        agent, kind, matched = match
+        if kind == "tag":
+            return RoutingDecision(
+                agent_id=agent.id,
+                agent_name=agent.name,
+                agent_url=agent.url,
+                confidence=0.7,
+                reasoning=f"Direct keyword match: '{matched}' found in message"
+            )
+        return RoutingDecision(
+            agent_id=agent.id,
+            agent_name=agent.name,
+            agent_url=agent.url,
+            confidence=0.65,
+            reasoning=f"Message similar to skill example: '{matched}'"
+        )
     
     async def _llm_route(
         self,
@@ -352,7 +362,8 @@ Respond in JSON format:
                         )
                     }
                 ],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="router.llm_route"
             )
             
             result = json.loads(response)
@@ -3,18 +3,42 @@ Token Cache Service using Redis
 
 MCPHub 토큰을 Redis에 캐싱하여 성능을 개선합니다.
 TTL: 5분 (합의된 시간)
+
+get_or_load()는 Redis 앞에 워커 내 L1을 두고 스트리밍 요청마다의 Redis 왕복을 줄입니다.
+- L1: 짧은 TTL + 최대 개수
+- 무효화는 Redis pub/sub으로 모든 워커에 전파 - 구독 중일 때만 L1 사용
+  (구독 전/끊긴 동안은 다른 워커의 변경을 알 수 없으므로 L1을 쓰지 않음)
+- 토큰이 없는 사용자도 (negative) 캐싱 - L1 + Redis sentinel
+- 같은 사용자의 동시 miss는 DB 조회 1회로 합침 (single-flight)
+- 토큰 등록/삭제/비활성화 시 delete() / clear_user_tokens()로 L1 + Redis 무효화
 """
 
+import asyncio
+import json
 import os
 import logging
-from typing import Optional
+import socket
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
 from uuid import UUID
 
+from .metrics import observe_redis, record_cache_lookup
+
 logger = logging.getLogger(__name__)
 
 # Redis 연결 정보
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 300))  # 5분 = 300초
+TOKEN_CACHE_NEGATIVE_TTL = int(os.getenv("TOKEN_CACHE_NEGATIVE_TTL", 60))  # 토큰 없음 결과
+TOKEN_CACHE_L1_TTL = float(os.getenv("TOKEN_CACHE_L1_TTL", 30))  # 0이면 L1 비활성화
+TOKEN_CACHE_L1_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_L1_MAX_ENTRIES", 10000))
+
+# Redis에 저장하는 "토큰 없음" 표시
+NEGATIVE_SENTINEL = "__none__"
+
+# 워커 간 L1 무효화 전파 (Redis pub/sub)
+INVALIDATION_CHANNEL = "mcp_token_invalidate"
+LISTENER_RETRY_SECONDS = 5.0
 
 
 class TokenCacheService:
@@ -23,6 +47,15 @@ class TokenCacheService:
     def __init__(self):
         self._redis = None
         self._enabled = False
+        # L1: (user_id, token_name) -> (토큰 또는 None, 만료 시각)
+        self._l1: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        # 진행 중인 조회 (키별 세대 역할) - 무효화되면 제거되므로, 조회를 끝낸 task가
+        # 더 이상 자기 키의 진행 중 조회가 아니면 그 사이 해당 키가 무효화된 것 (결과를 저장하지 않음)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        # 무효화 채널 구독 중에만 L1 사용
+        self._l1_active = False
+        self._listener_task: Optional[asyncio.Task] = None
         self._initialize()
     
     def _initialize(self):
@@ -63,7 +96,8 @@ class TokenCacheService:
         
         try:
             key = self._get_cache_key(str(user_id), token_name)
-            token = await self._redis.get(key)
+            with observe_redis("get"):
+                token = await self._redis.get(key)
             if token:
                 logger.debug(f"[TokenCache] Cache HIT for user {str(user_id)[:8]}...")
                 return token
@@ -97,13 +131,108 @@ class TokenCacheService:
         
         try:
             key = self._get_cache_key(str(user_id), token_name)
-            await self._redis.setex(key, ttl or TOKEN_CACHE_TTL, token)
+            with observe_redis("setex"):
+                await self._redis.setex(key, ttl or TOKEN_CACHE_TTL, token)
             logger.debug(f"[TokenCache] Cached token for user {str(user_id)[:8]}... (TTL: {ttl or TOKEN_CACHE_TTL}s)")
             return True
         except Exception as e:
             logger.warning(f"[TokenCache] Set failed: {e}")
             return False
     
+    # =========================================================================
+    # L1 + single-flight
+    # =========================================================================
+
+    async def get_or_load(
+        self,
+        user_id: UUID,
+        loader: Callable[[], Awaitable[Optional[str]]],
+        token_name: str = "default"
+    ) -> Optional[str]:
+        """
+        L1 -> Redis -> loader 순으로 토큰 조회 (토큰 없음도 캐싱)
+        
+        Args:
+            user_id: 사용자 ID
+            loader: 캐시 miss 시 DB에서 토큰을 읽는 coroutine 함수 (같은 사용자의 동시 miss는 1회만 호출)
+            token_name: 토큰 별칭
+            
+        Returns:
+            토큰 또는 None
+        """
+        key = (str(user_id), token_name)
+        entry = self._l1.get(key) if self._l1_enabled else None
+        if entry is not None:
+            token, expires_at = entry
+            if expires_at > time.monotonic():
+                record_cache_lookup("mcp_token", "l1", "hit" if token else "negative_hit")
+                return token
+            del self._l1[key]
+        if self._l1_enabled:
+            record_cache_lookup("mcp_token", "l1", "miss")
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(user_id, token_name, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        # 요청 하나가 취소되어도 (클라이언트 연결 종료) 공유 조회는 계속
+        return await asyncio.shield(task)
+    
+    async def _load(
+        self,
+        user_id: UUID,
+        token_name: str,
+        loader: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        key = (str(user_id), token_name)
+        
+        token, found = await self._redis_lookup(user_id, token_name)
+        if not found:
+            token = await loader()
+            if self._is_current(key):
+                if token:
+                    await self.set(user_id, token, token_name)
+                else:
+                    await self.set(user_id, NEGATIVE_SENTINEL, token_name, ttl=TOKEN_CACHE_NEGATIVE_TTL)
+        
+        if self._l1_enabled and self._is_current(key):
+            self._l1.pop(key, None)
+            while len(self._l1) >= TOKEN_CACHE_L1_MAX_ENTRIES:
+                # 가장 오래 전에 저장된 항목부터 제거
+                del self._l1[next(iter(self._l1))]
+            self._l1[key] = (token, time.monotonic() + TOKEN_CACHE_L1_TTL)
+        return token
+    
+    @property
+    def _l1_enabled(self) -> bool:
+        return TOKEN_CACHE_L1_TTL > 0 and self._l1_active
+    
+    def _is_current(self, key: Tuple[str, str]) -> bool:
+        """현재 조회 task가 시작된 뒤 이 키(또는 사용자 전체)가 무효화되지 않았는지"""
+        return self._inflight.get(key) is asyncio.current_task()
+    
+    async def _redis_lookup(self, user_id: UUID, token_name: str) -> Tuple[Optional[str], bool]:
+        """Redis 조회 -> (토큰, 캐시 여부). negative 항목은 (None, True)"""
+        if not self._enabled or not self._redis:
+            return None, False
+        token = await self.get(user_id, token_name)
+        if token is None:
+            record_cache_lookup("mcp_token", "redis", "miss")
+            return None, False
+        if token == NEGATIVE_SENTINEL:
+            record_cache_lookup("mcp_token", "redis", "negative_hit")
+            return None, True
+        record_cache_lookup("mcp_token", "redis", "hit")
+        return token, True
+    
+    def _invalidate_local(self, user_id: UUID, token_name: Optional[str] = None):
+        """L1 항목과 진행 중인 조회 제거 (token_name이 None이면 사용자의 모든 토큰)"""
+        user = str(user_id)
+        for cache in (self._l1, self._inflight):
+            for key in [k for k in cache if k[0] == user and (token_name is None or k[1] == token_name)]:
+                del cache[key]
+    
     async def delete(self, user_id: UUID, token_name: str = "default") -> bool:
         """
         캐시에서 토큰 삭제
@@ -115,12 +244,15 @@ class TokenCacheService:
         Returns:
             삭제 성공 여부
         """
+        self._invalidate_local(user_id, token_name)
         if not self._enabled or not self._redis:
             return False
         
         try:
             key = self._get_cache_key(str(user_id), token_name)
-            await self._redis.delete(key)
+            with observe_redis("delete"):
+                await self._redis.delete(key)
+            await self._publish_invalidation(user_id, token_name)
             logger.debug(f"[TokenCache] Deleted cache for user {str(user_id)[:8]}...")
             return True
         except Exception as e:
@@ -137,6 +269,7 @@ class TokenCacheService:
         Returns:
             삭제된 키 개수
         """
+        self._invalidate_local(user_id)
         if not self._enabled or not self._redis:
             return 0
         
@@ -146,15 +279,85 @@ class TokenCacheService:
             async for key in self._redis.scan_iter(pattern):
                 keys.append(key)
             
+            deleted = 0
             if keys:
-                deleted = await self._redis.delete(*keys)
+                with observe_redis("delete"):
+                    deleted = await self._redis.delete(*keys)
                 logger.info(f"[TokenCache] Cleared {deleted} tokens for user {str(user_id)[:8]}...")
-                return deleted
-            return 0
+            # Redis에 키가 없어도 다른 워커의 L1에는 남아 있을 수 있음
+            await self._publish_invalidation(user_id)
+            return deleted
         except Exception as e:
             logger.warning(f"[TokenCache] Clear failed: {e}")
             return 0
     
+    # =========================================================================
+    # 워커 간 무효화 (Redis pub/sub)
+    # =========================================================================
+    
+    async def _publish_invalidation(self, user_id: UUID, token_name: Optional[str] = None):
+        """다른 워커의 L1 무효화 (token_name이 None이면 사용자의 모든 토큰)"""
+        payload = json.dumps({"origin": self.worker_id, "user_id": str(user_id), "token_name": token_name})
+        try:
+            with observe_redis("publish"):
+                await self._redis.publish(INVALIDATION_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"[TokenCache] Invalidation publish failed: {e}")
+    
+    def _on_invalidation(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.worker_id or not message.get("user_id"):
+            return
+        self._invalidate_local(message["user_id"], message.get("token_name"))
+    
+    def start(self):
+        """무효화 채널 구독 시작 (구독 중에만 L1 사용)"""
+        if not self._enabled or not self._redis or TOKEN_CACHE_L1_TTL <= 0:
+            return
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_loop())
+    
+    async def stop(self):
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+    
+    async def _listen_loop(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # 구독 전/끊긴 동안의 무효화를 놓쳤을 수 있으므로 L1과 진행 중인 조회의 저장을 버림
+                self._l1.clear()
+                self._inflight.clear()
+                self._l1_active = True
+                logger.info("[TokenCache] Listening for token invalidations, L1 enabled")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._on_invalidation(message["data"])
+                logger.warning("[TokenCache] Invalidation subscription closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[TokenCache] Invalidation subscription unavailable ({type(e).__name__}: {e}); L1 disabled")
+            finally:
+                self._l1_active = False
+                self._l1.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+    
     @property
     def is_enabled(self) -> bool:
         """캐시 활성화 여부"""
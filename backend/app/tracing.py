@@ -0,0 +1,184 @@
+"""
+Tracing - OpenTelemetry 커스텀 span
+
+FastAPI/httpx auto-instrumentation만으로는 요청 span 하나와 HTTP 호출만 보이므로,
+파이프라인 주요 구간에 속성을 가진 span을 추가합니다.
+
+- workflow.analyze: analyzer 종류, step 수
+- router.tier: HybridRouter tier별 결과, 후보 수, 유사도
+- llm.call: provider, model, call site, 토큰 사용량, prompt cache hit
+- workflow.step: 에이전트, 재시도 횟수, supervisor 결정
+- a2a.send: 에이전트 호출 (하위에 httpx span)
+- a2a.stream: 스트리밍 에이전트 호출 (TTFB, 종료 상태 - yield를 넘나들므로 현재 span으로 설정하지 않음)
+- db.*: ConversationService 쿼리
+
+샘플링은 head-based(ParentBased + TraceIdRatioBased)이며 OTEL_TRACES_SAMPLER_ARG로 비율을 지정합니다.
+opentelemetry가 설치되어 있지 않거나 TracerProvider가 설정되지 않으면 모든 span은 no-op입니다.
+"""
+import functools
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+TRACER_NAME = "agent-orchestrator"
+
+
+class _NoopSpan:
+    """opentelemetry 미설치 시 사용하는 no-op span"""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_tracer = None
+
+
+def get_tracer():
+    """configure_tracing()으로 설정된 tracer, 없으면 전역 TracerProvider의 tracer"""
+    global _tracer
+    if _tracer is None and OTEL_AVAILABLE:
+        _tracer = trace.get_tracer(TRACER_NAME)
+    return _tracer
+
+
+def _sample_ratio() -> float:
+    try:
+        return min(1.0, max(0.0, float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "1.0"))))
+    except ValueError:
+        return 1.0
+
+
+def configure_tracing(
+    exporter,
+    sample_ratio: Optional[float] = None,
+    resource=None,
+    batch: bool = True,
+    set_global: bool = True
+):
+    """
+    Head-based 샘플링 TracerProvider 구성.
+
+    Args:
+        exporter: SpanExporter (OTLP, InMemory 등)
+        sample_ratio: 루트 span 샘플링 비율 (기본: OTEL_TRACES_SAMPLER_ARG, 1.0)
+        resource: OpenTelemetry Resource
+        batch: BatchSpanProcessor 사용 여부 (False면 SimpleSpanProcessor)
+        set_global: 전역 TracerProvider로 등록 (auto-instrumentation과 공유)
+
+    Returns:
+        TracerProvider
+    """
+    global _tracer
+    if not OTEL_AVAILABLE:
+        return None
+
+    ratio = _sample_ratio() if sample_ratio is None else sample_ratio
+    kwargs = {"sampler": ParentBased(TraceIdRatioBased(ratio))}
+    if resource is not None:
+        kwargs["resource"] = resource
+    provider = TracerProvider(**kwargs)
+    provider.add_span_processor(BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter))
+
+    if set_global:
+        trace.set_tracer_provider(provider)
+    _tracer = provider.get_tracer(TRACER_NAME)
+    return provider
+
+
+def configure_in_memory_tracing(sample_ratio: float = 1.0):
+    """
+    테스트용 in-memory exporter 구성 (전역 provider는 건드리지 않음).
+
+    Returns:
+        InMemorySpanExporter - get_finished_spans()로 span 구조 검증
+    """
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter, sample_ratio=sample_ratio, batch=False, set_global=False)
+    return exporter
+
+
+def reset_tracing():
+    """configure_tracing() 설정 해제 (전역 TracerProvider 사용으로 복귀)"""
+    global _tracer
+    _tracer = None
+
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry 속성은 None을 허용하지 않음
+    return {k: v for k, v in attributes.items() if v is not None}
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """현재 컨텍스트의 자식 span 생성 (예외는 span에 기록 후 전파)"""
+    tracer = get_tracer()
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    with tracer.start_as_current_span(name, attributes=_clean(attributes or {})) as span:
+        yield span
+
+
+@contextmanager
+def start_detached_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    현재 컨텍스트의 자식 span이지만 현재 span으로 설정하지 않음.
+    async generator처럼 yield로 소비자 코드와 번갈아 실행되는 구간용 (소비자의 span이 하위로 붙지 않음).
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    span = tracer.start_span(name, attributes=_clean(attributes or {}))
+    try:
+        yield span
+    except Exception as e:
+        span.record_exception(e)
+        span.set_status(trace.Status(trace.StatusCode.ERROR, str(e)))
+        raise
+    finally:
+        span.end()
+
+
+def set_span_attributes(attributes: Dict[str, Any]):
+    """현재 span에 속성 추가"""
+    if OTEL_AVAILABLE:
+        trace.get_current_span().set_attributes(_clean(attributes))
+
+
+def add_span_event(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """현재 span에 이벤트 추가"""
+    if OTEL_AVAILABLE:
+        trace.get_current_span().add_event(name, _clean(attributes or {}))
+
+
+def traced(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """async 함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with start_span(name, attributes):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
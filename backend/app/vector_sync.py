@@ -0,0 +1,239 @@
+"""
+Vector Store Sync Pipeline
+레지스트리 변경 사항을 모아서(coalesce) 벡터 저장소에 일괄 반영
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from loguru import logger
+
+from .agent_vector_store import AgentRoutingMetadata, get_vector_store
+
+
+class VectorSyncPipeline:
+    """
+    Batched vector store sync pipeline.
+
+    - enqueue_upsert/enqueue_removal은 즉시 반환 (agent_name 기준으로 최신 값만 유지)
+    - 백그라운드 워커가 debounce 후 대기 중인 변경을 한 번에 flush
+    - flush는 upsert_agents (해시 비교 + 배치 임베딩 + executemany)를 사용
+    - 실패한 항목은 다시 대기열에 넣고 지수 백오프 후 자동 재시도 (새 변경이 없어도)
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float = 0.5,
+        max_batch_size: int = 500,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 60.0
+    ):
+        self.debounce_seconds = debounce_seconds
+        self.max_batch_size = max_batch_size
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._retry_attempts = 0  # 연속 실패 flush 수 (성공 시 0)
+
+        self._pending_upserts: Dict[str, AgentRoutingMetadata] = {}
+        self._pending_removals: Dict[str, None] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._worker_task: Optional[asyncio.Task] = None
+
+        self._stats: Dict[str, Any] = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "retries": 0,
+            "upserted": 0,
+            "embedded": 0,
+            "vectors": 0,
+            "skipped_unchanged": 0,
+            "removed": 0,
+            "failed": 0,
+            "last_flush_duration_ms": None,
+            "last_flush_at": None,
+            "last_error": None,
+        }
+
+    # =========================================================================
+    # Queue
+    # =========================================================================
+
+    def enqueue_upsert(self, metadata: AgentRoutingMetadata):
+        """에이전트 upsert 예약 (동일 에이전트의 이전 요청은 덮어씀)"""
+        name = metadata.agent_name
+        if name in self._pending_upserts:
+            self._stats["coalesced"] += 1
+        self._pending_removals.pop(name, None)
+        self._pending_upserts[name] = metadata
+        self._stats["enqueued"] += 1
+        self._schedule()
+
+    def enqueue_removal(self, agent_name: str):
+        """에이전트 제거 예약 (대기 중인 upsert는 취소)"""
+        if self._pending_upserts.pop(agent_name, None) is not None:
+            self._stats["coalesced"] += 1
+        self._pending_removals[agent_name] = None
+        self._stats["enqueued"] += 1
+        self._schedule()
+
+    def _schedule(self):
+        """워커 기동 및 wakeup (이벤트 루프 밖에서는 다음 flush까지 대기)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._worker_loop())
+        self._wakeup.set()
+
+    async def _worker_loop(self):
+        """debounce 후 flush 반복"""
+        while True:
+            await self._wakeup.wait()
+            # 등록이 몰릴 때 한 번에 처리되도록 잠시 대기
+            await asyncio.sleep(self.debounce_seconds)
+            if self._retry_attempts:
+                # 직전 flush가 실패한 상태 - 백오프 후 재시도
+                await asyncio.sleep(self._retry_delay())
+                self._stats["retries"] += 1
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"[VectorSync] Flush loop error: {e}")
+
+    # =========================================================================
+    # Flush
+    # =========================================================================
+
+    async def flush(self) -> Dict[str, int]:
+        """대기 중인 변경 사항을 벡터 저장소에 반영"""
+        async with self._flush_lock:
+            upserts = list(self._pending_upserts.values())
+            removals = list(self._pending_removals.keys())
+            self._pending_upserts.clear()
+            self._pending_removals.clear()
+
+            result = {"upserted": 0, "embedded": 0, "vectors": 0, "skipped": 0, "removed": 0, "failed": 0}
+            if not upserts and not removals:
+                return result
+
+            start = time.perf_counter()
+            try:
+                vector_store = await get_vector_store()
+
+                for i in range(0, len(upserts), self.max_batch_size):
+                    chunk = upserts[i:i + self.max_batch_size]
+                    stats = await vector_store.upsert_agents(chunk)
+                    for key in ("upserted", "embedded", "vectors", "skipped", "failed"):
+                        result[key] += stats[key]
+                    if stats["failed"]:
+                        self._requeue(chunk)
+
+                if removals:
+                    if await vector_store.remove_agents(removals):
+                        result["removed"] = len(removals)
+                    else:
+                        result["failed"] += len(removals)
+                        self._requeue_removals(removals)
+
+            except Exception as e:
+                logger.warning(f"[VectorSync] Flush failed ({len(upserts)} upserts, {len(removals)} removals): {e}")
+                self._requeue(upserts)
+                self._requeue_removals(removals)
+                result["failed"] += len(upserts) + len(removals)
+                self._stats["failed_flushes"] += 1
+                self._stats["last_error"] = str(e)
+
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._stats["flushes"] += 1
+            self._stats["upserted"] += result["upserted"]
+            self._stats["embedded"] += result["embedded"]
+            self._stats["vectors"] += result["vectors"]
+            self._stats["skipped_unchanged"] += result["skipped"]
+            self._stats["removed"] += result["removed"]
+            self._stats["failed"] += result["failed"]
+            self._stats["last_flush_duration_ms"] = round(duration_ms, 2)
+            self._stats["last_flush_at"] = datetime.now().isoformat()
+
+            logger.info(
+                f"[VectorSync] Flushed in {duration_ms:.1f}ms: upserted={result['upserted']}, "
+                f"embedded={result['embedded']}, unchanged={result['skipped']}, "
+                f"removed={result['removed']}, failed={result['failed']}"
+            )
+
+            if result["failed"] and (self._pending_upserts or self._pending_removals):
+                self._retry_attempts += 1
+                self._schedule()
+                logger.info(f"[VectorSync] Retrying failed items in {self._retry_delay():.1f}s")
+            else:
+                self._retry_attempts = 0
+            return result
+
+    def _retry_delay(self) -> float:
+        return min(self.retry_base_seconds * 2 ** (self._retry_attempts - 1), self.retry_max_seconds)
+
+    def _requeue(self, metadata_list: List[AgentRoutingMetadata]):
+        """실패 항목 재대기 (그 사이 들어온 최신 요청이 우선)"""
+        for metadata in metadata_list:
+            name = metadata.agent_name
+            if name not in self._pending_upserts and name not in self._pending_removals:
+                self._pending_upserts[name] = metadata
+
+    def _requeue_removals(self, agent_names: List[str]):
+        for name in agent_names:
+            if name not in self._pending_upserts:
+                self._pending_removals[name] = None
+
+    async def sync_now(self, metadata_list: List[AgentRoutingMetadata]) -> Dict[str, int]:
+        """전체 동기화: 목록을 대기열에 합친 뒤 즉시 flush"""
+        for metadata in metadata_list:
+            self._pending_removals.pop(metadata.agent_name, None)
+            self._pending_upserts[metadata.agent_name] = metadata
+        self._stats["enqueued"] += len(metadata_list)
+        return await self.flush()
+
+    async def stop(self):
+        """워커 종료 및 남은 변경 사항 flush"""
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+        if self._pending_upserts or self._pending_removals:
+            await self.flush()
+
+    # =========================================================================
+    # Status
+    # =========================================================================
+
+    def get_status(self) -> Dict[str, Any]:
+        """파이프라인 상태 및 누적 메트릭"""
+        return {
+            "pending_upserts": len(self._pending_upserts),
+            "pending_removals": len(self._pending_removals),
+            "worker_running": self._worker_task is not None and not self._worker_task.done(),
+            "debounce_seconds": self.debounce_seconds,
+            "max_batch_size": self.max_batch_size,
+            "retry_attempts": self._retry_attempts,
+            **self._stats,
+        }
+
+
+# 싱글톤 인스턴스
+_sync_pipeline: Optional[VectorSyncPipeline] = None
+
+
+def get_vector_sync_pipeline() -> VectorSyncPipeline:
+    """벡터 동기화 파이프라인 싱글톤 인스턴스 반환"""
+    global _sync_pipeline
+    if _sync_pipeline is None:
+        _sync_pipeline = VectorSyncPipeline()
+    return _sync_pipeline
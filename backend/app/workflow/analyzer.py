@@ -3,6 +3,8 @@ from typing import List, Optional, Dict
 from loguru import logger
 
 from ..llm_client import get_llm_client, BaseLLMClient
+from ..tracing import start_span
+from ..agent_catalog import AgentCatalog, format_agents_for_llm
 from .schema import Workflow, WorkflowStep, RetryPolicy
 
 class LLMWorkflowAnalyzer:
@@ -21,26 +23,10 @@ class LLMWorkflowAnalyzer:
             logger.warning("[WARN] LLM not available, falling back to pattern-based analysis")
     
     def _format_agents_for_llm(self, agents: List[Dict]) -> str:
-        """Format agent information for LLM prompt"""
-        if not agents:
-            return "사용 가능한 에이전트가 없습니다."
-        
-        lines = []
-        for agent in agents:
-            name = agent.get('name', 'Unknown')
-            desc = agent.get('description', 'No description')
-            agent_id = agent.get('id', '')
-            
-            skills = agent.get('skills', [])
-            skill_names = [s.get('name', '') for s in skills if s.get('name')]
-            skill_str = ', '.join(skill_names) if skill_names else 'None'
-            
-            lines.append(f"- **{name}** (ID: {agent_id})")
-            lines.append(f"  설명: {desc}")
-            lines.append(f"  스킬: {skill_str}")
-            lines.append("")
-        
-        return "\\n".join(lines)
+        """Format agent information for LLM prompt (catalog snapshot은 미리 만든 블록 사용)"""
+        if isinstance(agents, AgentCatalog):
+            return agents.workflow_prompt
+        return format_agents_for_llm(agents)
     
     async def analyze(
         self, 
@@ -116,7 +102,8 @@ class LLMWorkflowAnalyzer:
         try:
             response = await self.llm_client.chat_completion(
                 messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="workflow.analyzer"
             )
             
             result = json.loads(response)
@@ -534,4 +521,12 @@ async def analyze_workflow(
     previous_response: Optional[str] = None
 ) -> Optional[Workflow]:
     """Convenience function for async analysis"""
-    return await workflow_analyzer.analyze(user_message, available_agents, previous_response)
+    with start_span("workflow.analyze", {"workflow.available_agents": len(available_agents)}) as span:
+        workflow = await workflow_analyzer.analyze(user_message, available_agents, previous_response)
+        span.set_attribute("workflow.detected", workflow is not None)
+        if workflow:
+            span.set_attributes({
+                "workflow.analyzer": workflow.metadata.get("analyzer", "unknown"),
+                "workflow.steps": len(workflow.steps)
+            })
+        return workflow
@@ -8,6 +8,7 @@ from .enums import WorkflowStepStatus
 from .supervisor import supervisor_llm
 from .handoff import handoff_detector
 from .memory import memory_store
+from ..tracing import add_span_event, start_span
 
 class WorkflowExecutor:
     """Executes multi-agent workflows step by step."""
@@ -56,12 +57,23 @@ class WorkflowExecutor:
             
             logger.info(f"[STEP] Step {i+1}/{len(workflow.steps)}: {step.agent_name}")
             
-            success, should_continue = await self._execute_step_with_recovery(
-                step=step,
-                workflow=workflow,
-                context_id=context_id,
-                available_agents=available_agents
-            )
+            with start_span("workflow.step", {
+                "workflow.id": workflow.id,
+                "workflow.step_index": i,
+                "workflow.agent_id": step.agent_id,
+                "workflow.agent_name": step.agent_name
+            }) as span:
+                success, should_continue = await self._execute_step_with_recovery(
+                    step=step,
+                    workflow=workflow,
+                    context_id=context_id,
+                    available_agents=available_agents
+                )
+                span.set_attributes({
+                    "workflow.step_status": step.status.value,
+                    "workflow.retry_count": step.retry_count,
+                    "workflow.supervisor_action": (step.validation_result or {}).get("action")
+                })
             
             if not should_continue:
                 logger.error(f"[FAIL] Workflow aborted at step {i+1}")
@@ -131,9 +143,15 @@ class WorkflowExecutor:
                 response = await self.orchestrator._send_to_agent(
                     agent.url,
                     prompt,
-                    context_id
+                    context_id,
+                    agent_id=agent.id
                 )
                 
+                if response.get("circuit_open") or response.get("overloaded"):
+                    # Circuit breaker / 동시성 limit 차단 - 복구 로직(Supervisor fallback/재시도)으로 전환
+                    reason = "circuit open" if response.get("circuit_open") else "overloaded"
+                    raise RuntimeError(f"Agent unavailable ({reason}): {agent.name}")
+                
                 step.output = response.get("content", "")
                 raw_artifacts = response.get("artifacts", [])
                 step.artifacts = self._parse_artifacts(raw_artifacts)
@@ -181,6 +199,11 @@ class WorkflowExecutor:
                     decision = await self.supervisor.decide_error_recovery(
                         step, error_msg, workflow, available_agents
                     )
+                    add_span_event("supervisor.recovery", {
+                        "attempt": attempt + 1,
+                        "action": decision.action,
+                        "error": error_msg[:200]
+                    })
                     
                     if decision.action == "abort":
                         step.status = WorkflowStepStatus.FAILED
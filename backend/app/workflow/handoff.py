@@ -2,6 +2,7 @@ import json
 from typing import List, Optional, Dict
 from loguru import logger
 from ..llm_client import get_llm_client, BaseLLMClient
+from ..agent_catalog import agent_summary_block
 from .enums import HandoffReason
 from .schema import HandoffRequest
 
@@ -112,11 +113,7 @@ class HandoffDetector:
     ) -> Optional[HandoffRequest]:
         """Use LLM to detect handoff intent"""
         
-        agents_info = "\\n".join([
-            f"- {a.get('name')}: {a.get('description', '')[:100]}"
-            for a in available_agents
-            if a.get('name') != current_agent
-        ])
+        agents_info = agent_summary_block(available_agents, exclude=current_agent)
         
         prompt = f'''Analyze if this agent response suggests handing off to another agent.
 
@@ -149,7 +146,8 @@ If no handoff is needed:
         try:
             result = await self.llm_client.chat_completion(
                 messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="workflow.handoff"
             )
             
             data = json.loads(result)
@@ -238,7 +238,8 @@ class MemoryStore:
                 messages=[{
                     "role": "user",
                     "content": f"Summarize in 1-2 sentences:\\n{content[:1000]}"
-                }]
+                }],
+                call_site="workflow.memory"
             )
             return result[:200]
         except Exception as e:
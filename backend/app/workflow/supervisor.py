@@ -3,6 +3,7 @@ from typing import List, Optional, Dict
 from loguru import logger
 
 from ..llm_client import get_llm_client, BaseLLMClient
+from ..agent_catalog import agent_summary_block
 from .enums import WorkflowStepStatus
 from .schema import Workflow, WorkflowStep, SupervisorDecision
 
@@ -97,7 +98,8 @@ class SupervisorLLM:
         try:
             response = await self.llm_client.chat_completion(
                 messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="workflow.supervisor.validate"
             )
             
             result = json.loads(response)
@@ -157,10 +159,7 @@ class SupervisorLLM:
                 )
         
         # Format available agents
-        agents_info = "\\n".join([
-            f"- {a.get('name')}: {a.get('description', '')[:100]}"
-            for a in available_agents
-        ])
+        agents_info = agent_summary_block(available_agents)
         
         prompt = f"""당신은 멀티에이전트 워크플로우의 Supervisor입니다. 스텝 실행 중 오류가 발생했습니다. 복구 전략을 결정하세요.
 
@@ -199,7 +198,8 @@ class SupervisorLLM:
         try:
             response = await self.llm_client.chat_completion(
                 messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                call_site="workflow.supervisor.recovery"
             )
             
             result = json.loads(response)
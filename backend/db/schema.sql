@@ -10,6 +10,7 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS vector;
 
 -- =====================================================
 -- ROLES TABLE
@@ -152,9 +153,11 @@ CREATE TABLE IF NOT EXISTS registered_agents (
     name VARCHAR(255) NOT NULL,
     description TEXT,
     url VARCHAR(500) UNIQUE NOT NULL,
+    replicas JSONB DEFAULT '[]',             -- 같은 에이전트의 모든 replica URL (url 포함)
     version VARCHAR(50) DEFAULT '1.0.0',
     skills JSONB DEFAULT '[]',
     capabilities JSONB DEFAULT '{}',
+    requirements JSONB DEFAULT '{}',
     status VARCHAR(20) DEFAULT 'offline',
     registered_by UUID REFERENCES users(id),
     last_seen TIMESTAMP WITH TIME ZONE,
@@ -162,9 +165,71 @@ CREATE TABLE IF NOT EXISTS registered_agents (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- 기존 DB 마이그레이션 (registry_store도 시작 시 확인)
+ALTER TABLE registered_agents ADD COLUMN IF NOT EXISTS replicas JSONB DEFAULT '[]';
+ALTER TABLE registered_agents ADD COLUMN IF NOT EXISTS requirements JSONB DEFAULT '{}';
+
 CREATE INDEX IF NOT EXISTS idx_registered_agents_url ON registered_agents(url);
 CREATE INDEX IF NOT EXISTS idx_registered_agents_status ON registered_agents(status);
 
+-- =====================================================
+-- AGENT ROUTING METADATA TABLE (pgvector RAG 라우팅)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS agent_routing_metadata (
+    id SERIAL PRIMARY KEY,
+    agent_name VARCHAR(255) UNIQUE NOT NULL,
+    agent_url VARCHAR(500) NOT NULL,
+    domain VARCHAR(100) DEFAULT 'general',
+    category VARCHAR(100) DEFAULT '',
+    keywords TEXT[] DEFAULT '{}',
+    capabilities TEXT[] DEFAULT '{}',
+    description TEXT,
+    description_embedding vector,                     -- 차원은 embedding_dim 참조
+    embedding_model VARCHAR(100),                     -- 임베딩 모델 (openai / local-ngram-hash-v1 등)
+    embedding_dim INTEGER,                            -- 임베딩 차원 (모델이 다른 벡터 혼합 방지)
+    description_hash VARCHAR(64),                     -- sha256(모델:차원:라우팅 텍스트), 변경 없으면 재임베딩 생략
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_routing_model ON agent_routing_metadata(embedding_model, embedding_dim);
+
+-- HNSW ANN 인덱스 (차원별 partial expression index)
+-- 앱 시작 시 설정된 임베딩 차원으로 자동 생성됨 (VECTOR_INDEX_TYPE, VECTOR_HNSW_*)
+-- 검색 쿼리는 동일한 식 (description_embedding::vector(N)) 으로 정렬해야 인덱스 사용
+CREATE INDEX IF NOT EXISTS idx_agent_routing_hnsw_1536 ON agent_routing_metadata
+    USING hnsw ((description_embedding::vector(1536)) vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE embedding_dim = 1536;                      -- OpenAI text-embedding-ada-002 / 3-small
+CREATE INDEX IF NOT EXISTS idx_agent_routing_hnsw_512 ON agent_routing_metadata
+    USING hnsw ((description_embedding::vector(512)) vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE embedding_dim = 512;                       -- local-ngram-hash-v1 (기본 차원)
+
+-- 에이전트별 멀티 벡터 (description / 스킬 설명 / 예시 발화), 검색 시 에이전트별 max-sim
+CREATE TABLE IF NOT EXISTS agent_routing_vectors (
+    id SERIAL PRIMARY KEY,
+    agent_name VARCHAR(255) NOT NULL
+        REFERENCES agent_routing_metadata(agent_name) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL,                        -- description / skill / example
+    content TEXT NOT NULL,                            -- 임베딩 원문
+    embedding vector NOT NULL,
+    embedding_model VARCHAR(100) NOT NULL,
+    embedding_dim INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_routing_vectors_agent ON agent_routing_vectors(agent_name);
+CREATE INDEX IF NOT EXISTS idx_agent_routing_vectors_hnsw_1536 ON agent_routing_vectors
+    USING hnsw ((embedding::vector(1536)) vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE embedding_dim = 1536;
+CREATE INDEX IF NOT EXISTS idx_agent_routing_vectors_hnsw_512 ON agent_routing_vectors
+    USING hnsw ((embedding::vector(512)) vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE embedding_dim = 512;
+
 -- =====================================================
 -- FUNCTIONS
 -- =====================================================
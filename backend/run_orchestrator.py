@@ -20,13 +20,11 @@ def setup_opentelemetry():
         return None
     
     try:
-        from opentelemetry import trace
-        from opentelemetry.sdk.trace import TracerProvider
-        from opentelemetry.sdk.trace.export import BatchSpanProcessor
         from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
         from opentelemetry.sdk.resources import Resource
         from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
         from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from app.tracing import configure_tracing
         
         service_name = os.getenv("OTEL_SERVICE_NAME", "agent-orchestrator")
         otlp_endpoint = os.getenv(
@@ -42,13 +40,10 @@ def setup_opentelemetry():
             "deployment.environment": environment
         })
         
-        # TracerProvider 설정
-        provider = TracerProvider(resource=resource)
-        trace.set_tracer_provider(provider)
-        
-        # OTLP Exporter 설정 (HTTP)
+        # TracerProvider 설정 (OTLP HTTP exporter, head-based 샘플링)
         exporter = OTLPSpanExporter(endpoint=f"{otlp_endpoint}/v1/traces")
-        provider.add_span_processor(BatchSpanProcessor(exporter))
+        sample_ratio = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "1.0"))
+        configure_tracing(exporter, sample_ratio=sample_ratio, resource=resource)
         
         # HTTPX 클라이언트 계측 (에이전트 호출 추적)
         HTTPXClientInstrumentor().instrument()
@@ -57,6 +52,7 @@ def setup_opentelemetry():
         print(f"[OTEL]   Service: {service_name}")
         print(f"[OTEL]   Endpoint: {otlp_endpoint}")
         print(f"[OTEL]   Environment: {environment}")
+        print(f"[OTEL]   Sample ratio: {sample_ratio}")
         
         return FastAPIInstrumentor()
         
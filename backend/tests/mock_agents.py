@@ -123,6 +123,7 @@ def create_mock_agent_app(definition: Dict[str, Any]) -> FastAPI:
         }
     
     @app.post("/a2a")
+    @app.post("/tasks/send")  # orchestrator A2A endpoint
     async def handle_a2a(request: Dict[str, Any]):
         """A2A 메시지 처리 (Mock 응답)"""
         request_id = request.get("id", "1")
@@ -0,0 +1,119 @@
+"""
+Agent Vector Store 테스트 - upsert_agents 변경 분류 / 프로세스 내 인덱스 반영
+
+DB는 agent_routing_metadata row만 흉내 내는 fake pool로, 임베딩은 로컬 해싱 클라이언트로 대체합니다.
+"""
+import asyncio
+import sys
+import os
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.agent_vector_store import AgentRoutingMetadata, AgentVectorStore
+from app.embedding_client import LocalHashingEmbeddingClient
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def transaction(self):
+        return _AsyncContext(None)
+
+    async def fetch(self, query, names):
+        return [self.pool.rows[name] for name in names if name in self.pool.rows]
+
+    async def execute(self, query, names):
+        if query.startswith("UPDATE agent_routing_metadata SET is_active = false"):
+            for name in names:
+                self.pool.rows[name]["is_active"] = False
+        elif query.startswith("DELETE FROM agent_routing_vectors"):
+            self.pool.vectors = [v for v in self.pool.vectors if v[0] not in names]
+
+    async def executemany(self, query, records):
+        if query is AgentVectorStore.VECTOR_INSERT_SQL:
+            self.pool.vectors.extend(records)
+            return
+        for (name, url, domain, category, keywords, capabilities, _description,
+             _embedding, _model, _dim, desc_hash, is_active) in records:
+            self.pool.rows[name] = {
+                "agent_name": name, "agent_url": url, "domain": domain, "category": category,
+                "keywords": keywords, "capabilities": capabilities,
+                "is_active": is_active, "description_hash": desc_hash,
+            }
+
+
+class _AsyncContext:
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePool:
+    def __init__(self):
+        self.rows = {}
+        self.vectors = []
+
+    def acquire(self):
+        return _AsyncContext(FakeConnection(self))
+
+
+class CountingEmbeddingClient(LocalHashingEmbeddingClient):
+    def __init__(self):
+        super().__init__(dimension=64)
+        self.embedded = 0
+
+    async def embed(self, texts):
+        self.embedded += len(texts)
+        return await super().embed(texts)
+
+
+JIRA = AgentRoutingMetadata(
+    agent_name="Jira Agent", agent_url="http://jira:5011", domain="project", category="jira",
+    description="Jira 이슈 관리", skill_descriptions=["이슈 조회 및 생성"], examples=["내 이슈 보여줘"]
+)
+
+
+@pytest.fixture
+def store():
+    vector_store = AgentVectorStore(embedding_client=CountingEmbeddingClient())
+    vector_store._pool = FakePool()
+    vector_store._index_ready = True
+    return vector_store
+
+
+def test_unchanged_agent_is_skipped(store):
+    async def run():
+        await store.upsert_agents([JIRA])
+        return await store.upsert_agents([JIRA])
+
+    stats = asyncio.run(run())
+    assert stats["skipped"] == 1 and stats["embedded"] == 0
+    assert store._embedding_client.embedded == 3
+
+
+def test_reregistered_agent_returns_to_index(store):
+    async def run():
+        await store.upsert_agents([JIRA])
+        assert await store.remove_agents([JIRA.agent_name])
+        assert JIRA.agent_name not in store._index
+        # 같은 카드로 재등록 (description_hash 동일)
+        return await store.upsert_agents([JIRA])
+
+    stats = asyncio.run(run())
+    assert stats["embedded"] == 1
+    assert JIRA.agent_name in store._index
+    assert store._pool.rows[JIRA.agent_name]["is_active"] is True
+    assert len(store._pool.vectors) == 3
+
+    query = asyncio.run(store._embedding_client.embed_one("내 이슈 보여줘"))
+    results = store._index.search(query, limit=1, threshold=0.2)
+    assert [r["agent_name"] for r in results] == [JIRA.agent_name]
@@ -0,0 +1,169 @@
+"""
+Circuit Breaker Chaos 테스트 - 장애 에이전트에서 트래픽이 빠져나가는지 검증
+
+같은 도메인의 Mock 에이전트 2개(primary / backup)를 ASGI transport로 띄우고,
+primary를 장애(HTTP 503) 상태로 전환한 뒤 HybridRouter + orchestrator 경로로 요청을 보냅니다.
+"""
+import asyncio
+import sys
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.http_client import GlobalHttpClient
+from app.hybrid_router import HybridRouter
+from app.models import AgentRegistration, AgentSkill
+from app.orchestrator import orchestrator
+from app.registry import AgentRegistry
+from mock_agents import MOCK_AGENT_DEFINITIONS, create_mock_agent_app
+
+PRIMARY_DEF = next(d for d in MOCK_AGENT_DEFINITIONS if d["name"] == "Google Calendar Agent")
+BACKUP_DEF = {**PRIMARY_DEF, "name": "Google Calendar Backup Agent", "port": 5034}
+
+MESSAGE = "다음 주 화요일 오후에 팀 미팅 잡아줘"
+
+
+class ChaosTransport(httpx.AsyncBaseTransport):
+    """호스트별 Mock 에이전트로 전달, 장애 주입된 호스트는 503 응답"""
+
+    def __init__(self, definitions):
+        self._transports = {
+            f"localhost:{d['port']}": httpx.ASGITransport(app=create_mock_agent_app(d))
+            for d in definitions
+        }
+        self.failing = set()
+        self.calls = Counter()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = f"{request.url.host}:{request.url.port}"
+        self.calls[host] += 1
+        if host in self.failing:
+            return httpx.Response(503, json={"error": "chaos: agent down"})
+        return await self._transports[host].handle_async_request(request)
+
+
+class RankedVectorStore:
+    """primary가 항상 1순위인 벡터 검색 결과"""
+    routing_threshold = 0.2
+
+    async def search_similar(self, query, limit=5, domain_filter=None, threshold=0.0, **kwargs):
+        return [
+            {"agent_name": PRIMARY_DEF["name"], "similarity": 0.82, "domain": PRIMARY_DEF["domain"]},
+            {"agent_name": BACKUP_DEF["name"], "similarity": 0.78, "domain": BACKUP_DEF["domain"]},
+        ][:limit]
+
+
+def _registration(definition) -> AgentRegistration:
+    return AgentRegistration(
+        name=definition["name"],
+        description=definition["description"],
+        url=f"http://localhost:{definition['port']}",
+        skills=[
+            AgentSkill(id=skill, name=skill, description=f"{skill} functionality", tags=definition["keywords"][:3])
+            for skill in definition["skills"]
+        ]
+    )
+
+
+@pytest.fixture
+def chaos_env(monkeypatch):
+    test_registry = AgentRegistry()
+    for module in ("app.registry", "app.hybrid_router", "app.orchestrator"):
+        monkeypatch.setattr(f"{module}.registry", test_registry)
+
+    transport = ChaosTransport([PRIMARY_DEF, BACKUP_DEF])
+    monkeypatch.setattr(GlobalHttpClient, "_transport_override", transport)
+    monkeypatch.setattr(GlobalHttpClient, "_client", None)
+    monkeypatch.setattr(GlobalHttpClient, "_origin_clients", {})
+
+    hybrid = HybridRouter()
+    hybrid.use_llm = False
+    hybrid._vector_store = RankedVectorStore()
+
+    primary = asyncio.run(test_registry.register_agent(_registration(PRIMARY_DEF)))
+    backup = asyncio.run(test_registry.register_agent(_registration(BACKUP_DEF)))
+    return test_registry, transport, hybrid, primary, backup
+
+
+async def _send(hybrid: HybridRouter):
+    decision = await hybrid.route(MESSAGE)
+    result = await orchestrator._send_to_agent(
+        decision.agent_url, MESSAGE, "chaos-context", agent_id=decision.agent_id
+    )
+    return decision.agent_name, result
+
+
+def test_traffic_shifts_away_from_failing_agent(chaos_env):
+    test_registry, transport, hybrid, primary, backup = chaos_env
+
+    async def scenario():
+        # 정상 상태: primary가 모든 트래픽 처리
+        for _ in range(3):
+            agent_name, result = await _send(hybrid)
+            assert agent_name == primary.name
+            assert result["state"] != "failed"
+
+        # 장애 주입
+        transport.failing.add(f"localhost:{PRIMARY_DEF['port']}")
+        started = time.perf_counter()
+        routed = []
+        for _ in range(20):
+            agent_name, result = await _send(hybrid)
+            routed.append((agent_name, result["state"]))
+        shift_seconds = time.perf_counter() - started
+
+        return routed, shift_seconds
+
+    routed, shift_seconds = asyncio.run(scenario())
+
+    # 연속 3회 실패 후 circuit open -> 나머지 요청은 모두 backup으로 성공
+    assert [name for name, _ in routed[:3]] == [primary.name] * 3
+    assert all(state == "failed" for _, state in routed[:3])
+    assert all(name == backup.name and state != "failed" for name, state in routed[3:])
+    assert shift_seconds < 5.0
+
+    primary_metrics = test_registry.get_metrics(primary.id)
+    assert primary_metrics.circuit_breaker_open
+    assert primary_metrics.failed_requests == 3
+    assert test_registry.get_metrics(backup.id).successful_requests == 17
+
+
+def test_half_open_admits_single_trial(chaos_env):
+    test_registry, transport, hybrid, primary, backup = chaos_env
+    transport.failing.add(f"localhost:{PRIMARY_DEF['port']}")
+
+    async def scenario():
+        for _ in range(3):
+            await _send(hybrid)
+        metrics = test_registry.get_metrics(primary.id)
+        assert metrics.circuit_breaker_open
+
+        # 쿨다운 경과 -> half-open, 시험 요청은 1건만 허용
+        metrics.circuit_breaker_until = datetime.utcnow() - timedelta(seconds=1)
+        assert test_registry.try_acquire_request(primary.id)
+        assert not test_registry.try_acquire_request(primary.id)
+        assert (await hybrid.route(MESSAGE)).agent_name == backup.name
+
+        # 시험 요청 실패 -> 다시 open
+        test_registry.record_request_failure(primary.id, "still down")
+        assert metrics.circuit_breaker_open
+        assert not test_registry.is_agent_available(primary.id)
+
+        # 복구 후 쿨다운 경과 -> 라우팅된 시험 요청 성공으로 circuit close
+        transport.failing.clear()
+        metrics.circuit_breaker_until = datetime.utcnow() - timedelta(seconds=1)
+        agent_name, result = await _send(hybrid)
+        assert agent_name == primary.name
+        assert result["state"] != "failed"
+        assert not metrics.circuit_breaker_open
+        assert (await hybrid.route(MESSAGE)).agent_name == primary.name
+
+    asyncio.run(scenario())
@@ -0,0 +1,199 @@
+"""
+Adaptive Concurrency Limiter 테스트 - 슬롯 획득 / 대기열 / 취소 / AIMD limit 조정
+"""
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import orchestrator as orchestrator_module
+from app.concurrency_limiter import AdaptiveConcurrencyLimiter, AgentOverloadedError
+from app.models import AgentRegistration
+from app.orchestrator import orchestrator
+from app.registry import AgentRegistry
+
+
+def _limiter(limit: int = 1, baseline_ms: float = 0.0, **kwargs) -> AdaptiveConcurrencyLimiter:
+    kwargs.setdefault("queue_size", 2)
+    kwargs.setdefault("queue_timeout", 0.05)
+    return AdaptiveConcurrencyLimiter(lambda: baseline_ms, initial_limit=limit, **kwargs)
+
+
+def test_admits_up_to_limit_then_queues_until_release():
+    async def run():
+        limiter = _limiter(limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        assert not waiter.done() and limiter.to_dict()["waiting"] == 1
+
+        limiter.release(10.0, "cancelled")
+        await waiter
+        return limiter.to_dict()
+
+    stats = asyncio.run(run())
+    assert stats["in_flight"] == 2
+    assert stats["admitted"] == 3 and stats["queued"] == 1
+
+
+def test_queue_full_rejects_immediately():
+    async def run():
+        limiter = _limiter(limit=1, queue_size=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        with pytest.raises(AgentOverloadedError) as excinfo:
+            await limiter.acquire()
+        waiter.cancel()
+        return excinfo.value, limiter.to_dict()
+
+    error, stats = asyncio.run(run())
+    assert error.reason == "queue_full"
+    assert stats["queue_full"] == 1
+
+
+def test_queue_timeout_rejects_and_leaves_queue():
+    async def run():
+        limiter = _limiter(limit=1)
+        await limiter.acquire()
+        with pytest.raises(AgentOverloadedError) as excinfo:
+            await limiter.acquire()
+        return excinfo.value, limiter.to_dict()
+
+    error, stats = asyncio.run(run())
+    assert error.reason == "queue_timeout"
+    assert stats["queue_timeout"] == 1
+    assert stats["waiting"] == 0 and stats["in_flight"] == 1
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def run():
+        limiter = _limiter(limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return limiter.to_dict()
+
+    stats = asyncio.run(run())
+    assert stats["waiting"] == 0 and stats["in_flight"] == 1
+
+
+def test_cancel_after_slot_handoff_passes_slot_on(monkeypatch):
+    """release()가 슬롯을 넘긴 직후 waiter가 취소되면 슬롯은 다음 waiter에게 넘어가야 함"""
+    wait_for = asyncio.wait_for
+    cancelled = []
+
+    async def wait_for_then_cancel(future, timeout):
+        # 첫 waiter: 슬롯을 넘겨받은 뒤 재개되기 전에 취소가 도착한 경우
+        if not cancelled:
+            cancelled.append(future)
+            await future
+            raise asyncio.CancelledError()
+        return await wait_for(future, timeout)
+
+    async def run():
+        limiter = _limiter(limit=1)
+        await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+
+        limiter.release(10.0, "cancelled")
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, 1)
+        return limiter.to_dict()
+
+    monkeypatch.setattr(asyncio, "wait_for", wait_for_then_cancel)
+    stats = asyncio.run(run())
+    assert stats["in_flight"] == 1
+    assert stats["waiting"] == 0
+
+
+def test_try_acquire_does_not_wait_or_jump_the_queue():
+    async def run():
+        limiter = _limiter(limit=1)
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        limiter.release(10.0, "cancelled")
+        assert limiter.in_flight == 0
+
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        limiter.release(10.0, "cancelled")
+        # 대기 중인 요청이 슬롯을 넘겨받음
+        assert not limiter.try_acquire()
+        await waiter
+
+    asyncio.run(run())
+
+
+def test_aimd_increases_only_when_utilized():
+    limiter = _limiter(limit=2, baseline_ms=100.0)
+    limiter.in_flight = 1
+    limiter.release(50.0, "success")
+    # limit의 절반 미만 사용 중에는 증가하지 않음
+    assert limiter.limit == 2
+
+    for _ in range(3):
+        limiter.in_flight = 2
+        limiter.release(50.0, "success")
+    assert limiter.limit == 3
+
+
+@pytest.mark.parametrize("latency_ms, outcome", [(500.0, "success"), (50.0, "failure")])
+def test_aimd_decreases_once_per_congestion_window(latency_ms, outcome):
+    limiter = _limiter(limit=20, baseline_ms=100.0, backoff_ratio=0.5)
+    for _ in range(3):
+        limiter.in_flight = 10
+        limiter.release(latency_ms, outcome)
+    assert limiter.limit == 10
+    assert limiter.to_dict()["decreases"] == 1
+
+    # 취소된 요청은 limit에 반영하지 않음
+    limiter.in_flight = 10
+    limiter._next_decrease_at = 0.0
+    limiter.release(latency_ms, "cancelled")
+    assert limiter.limit == 10
+
+
+def test_decrease_respects_min_limit():
+    limiter = _limiter(limit=2, min_limit=2, backoff_ratio=0.1)
+    limiter.in_flight = 1
+    limiter.release(10.0, "failure")
+    assert limiter.limit == 2
+
+
+def test_long_stream_is_released_with_ttfb(monkeypatch):
+    """스트림 전체 시간이 길어도 TTFB가 정상이면 혼잡으로 보지 않음"""
+    registry = AgentRegistry()
+    agent = asyncio.run(registry.register_agent(AgentRegistration(
+        name="Jira Agent", description="Jira 이슈 관리", url="http://jira:5011"
+    )))
+    monkeypatch.setattr(orchestrator_module, "registry", registry)
+    # send 응답 p50 2s
+    for _ in range(50):
+        registry.record_request_success(agent.id, 2000.0)
+
+    limiter = registry._limiter(agent.id)
+    for _ in range(5):
+        limiter.in_flight = limiter.limit
+        # 30s짜리 SSE 응답, 첫 chunk는 1.5s
+        orchestrator._record_agent_call(
+            agent.id, agent.url, "stream", time.perf_counter() - 30, {"state": "completed"}, ttfb_ms=1500.0
+        )
+
+    stats = limiter.to_dict()
+    assert stats["decreases"] == 0
+    assert stats["baseline_latency_ms"] < 2500
@@ -0,0 +1,156 @@
+"""
+Conversation Affinity 테스트 - 후속 발화 재사용 / 토픽 전환 판단
+
+직전 턴이 Jira Agent였던 대화에서 현재 발화가 Jira Agent를 재사용하는지,
+다른 에이전트/워크플로우로 전환되어 전체 라우팅(None)으로 가는지 검증합니다.
+임베딩은 로컬 해싱 클라이언트를 사용하므로 네트워크 없이 실행됩니다.
+"""
+import asyncio
+import sys
+import os
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import conversation_affinity
+from app.conversation_affinity import ConversationAffinity
+from app.embedding_client import LocalHashingEmbeddingClient
+from app.models import AgentRegistration, AgentSkill, ChatMessage, Conversation, MessageRole
+from app.registry import AgentRegistry
+
+AGENTS = [
+    AgentRegistration(
+        name="Jira Agent",
+        description="Jira 이슈와 프로젝트 관리",
+        url="http://localhost:5011",
+        skills=[AgentSkill(
+            id="issue", name="이슈 관리",
+            description="Jira 이슈 생성, 조회, 담당자 변경, 상태 전환",
+            examples=["PROJ-123 이슈 담당자 바꿔줘", "버그 이슈 새로 만들어줘", "내게 할당된 이슈 보여줘"]
+        )]
+    ),
+    AgentRegistration(
+        name="Confluence Agent",
+        description="Confluence 문서와 위키 페이지 관리",
+        url="http://localhost:5012",
+        skills=[AgentSkill(
+            id="page", name="페이지 관리",
+            description="Confluence 페이지 검색, 작성, 수정",
+            examples=["회의록 페이지 작성해줘", "온보딩 가이드 찾아줘"]
+        )]
+    ),
+    AgentRegistration(
+        name="Google Calendar Agent",
+        description="Google 캘린더 일정 관리",
+        url="http://localhost:5013",
+        skills=[AgentSkill(
+            id="event", name="일정 관리",
+            description="캘린더 일정 생성, 조회, 변경",
+            examples=["내일 오후 3시에 미팅 잡아줘", "이번 주 일정 보여줘", "회의 시간 옮겨줘"]
+        )]
+    ),
+]
+
+
+class CountingEmbeddingClient(LocalHashingEmbeddingClient):
+    """임베딩된 텍스트 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    async def embed(self, texts):
+        self.embedded.extend(texts)
+        return await super().embed(texts)
+
+
+@pytest.fixture
+def affinity(monkeypatch):
+    test_registry = AgentRegistry()
+
+    async def register():
+        for registration in AGENTS:
+            await test_registry.register_agent(registration)
+
+    asyncio.run(register())
+    client = CountingEmbeddingClient()
+    monkeypatch.setattr(conversation_affinity, "registry", test_registry)
+    monkeypatch.setattr(conversation_affinity, "get_embedding_client", lambda: client)
+    return ConversationAffinity(), test_registry, client
+
+
+def _conversation(message: str) -> Conversation:
+    return Conversation(messages=[
+        ChatMessage(role=MessageRole.USER, content="PROJ-123 이슈 보여줘"),
+        ChatMessage(role=MessageRole.ASSISTANT, content="PROJ-123: 로그인 버그", metadata={"agent": "Jira Agent"}),
+        ChatMessage(role=MessageRole.USER, content=message),
+    ])
+
+
+def _resolve(aff: ConversationAffinity, message: str, enabled_agent_ids=None):
+    return asyncio.run(aff.resolve(_conversation(message), message, enabled_agent_ids, sticky_routing=True))
+
+
+@pytest.mark.parametrize("message", ["담당자를 김철수로 바꿔줘", "그거 상태 완료로 바꿔줘"])
+def test_follow_up_reuses_previous_agent(affinity, message):
+    aff, _, _ = affinity
+    decision = _resolve(aff, message)
+    assert decision is not None
+    assert decision.agent_name == "Jira Agent"
+    assert aff.get_stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("message", ["내일 오후 3시에 미팅 잡아줘", "회의 시간 옮겨줘"])
+def test_semantic_topic_shift_falls_back_to_routing(affinity, message):
+    aff, _, _ = affinity
+    assert _resolve(aff, message) is None
+    assert aff.get_stats()["shift_semantic"] == 1
+
+
+def test_semantic_shift_ignores_disabled_agents(affinity):
+    aff, test_registry, _ = affinity
+    jira = test_registry.get_agent_by_name("Jira Agent")
+    confluence = test_registry.get_agent_by_name("Confluence Agent")
+    # 일정 에이전트가 비활성화되어 있으면 전환할 대상이 없음
+    decision = _resolve(aff, "회의 시간 옮겨줘", enabled_agent_ids=[jira.id, confluence.id])
+    assert decision is not None and decision.agent_name == "Jira Agent"
+
+
+@pytest.mark.parametrize("message", ["검색하고 요약해줘", "완료 처리한 다음에 알려줘"])
+def test_workflow_request_falls_back_to_routing(affinity, message):
+    aff, _, _ = affinity
+    assert _resolve(aff, message) is None
+    assert aff.get_stats()["shift_workflow"] == 1
+
+
+def test_explicit_mention_falls_back_to_routing(affinity):
+    aff, _, _ = affinity
+    assert _resolve(aff, "이 결과 문서로 저장해줘") is None
+    assert aff.get_stats()["shift_explicit"] == 1
+
+
+def test_profiles_embedded_once_per_catalog_version(affinity):
+    aff, test_registry, client = affinity
+    _resolve(aff, "담당자를 김철수로 바꿔줘")
+    profile_texts = aff.get_stats()["profile_vectors"]
+    assert profile_texts > 0
+
+    # 같은 catalog version: 새 메시지만 임베딩 (직전 발화는 캐시)
+    client.embedded.clear()
+    _resolve(aff, "우선순위도 높음으로 올려줘")
+    assert client.embedded == ["우선순위도 높음으로 올려줘"]
+
+    # 에이전트 변경 후에는 바뀐 텍스트만 다시 임베딩
+    version = aff.get_stats()["profile_version"]
+    asyncio.run(test_registry.register_agent(AgentRegistration(
+        name="Google Calendar Agent",
+        description="Google 캘린더 일정과 회의실 관리",
+        url="http://localhost:5013",
+        skills=AGENTS[2].skills
+    )))
+    client.embedded.clear()
+    _resolve(aff, "우선순위도 높음으로 올려줘")
+    assert client.embedded == ["Google 캘린더 일정과 회의실 관리"]
+    assert aff.get_stats()["profile_version"] > version
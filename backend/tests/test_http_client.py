@@ -0,0 +1,73 @@
+"""
+HTTP Client 테스트 - origin별 풀 통계 (진행 중 요청 집계, httpcore 내부 구조 변경 시 부분 통계)
+"""
+import asyncio
+import sys
+import os
+
+import httpx
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.http_client import GlobalHttpClient
+
+AGENT_URL = "http://agent-a:5011"
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        for _ in range(3):
+            yield b"data: chunk\n\n"
+
+
+def _streaming_transport():
+    async def handler(request):
+        if request.url.path == "/health":
+            return httpx.Response(200, content=b"ok")
+        return httpx.Response(200, stream=ChunkStream())
+    return httpx.MockTransport(handler)
+
+
+def test_in_flight_counts_until_response_stream_closes(monkeypatch):
+    monkeypatch.setattr(GlobalHttpClient, "_transport_override", _streaming_transport())
+    monkeypatch.setattr(GlobalHttpClient, "_origin_clients", {})
+
+    async def run():
+        client = GlobalHttpClient.get_client(AGENT_URL)
+        async with client.stream("POST", f"{AGENT_URL}/tasks/send") as response:
+            during = GlobalHttpClient.get_pool_stats()["http://agent-a:5011"]
+            async for _ in response.aiter_lines():
+                pass
+        await client.get(f"{AGENT_URL}/health")
+        with_error = None
+        try:
+            async with client.stream("POST", f"{AGENT_URL}/tasks/send") as response:
+                raise RuntimeError("consumer failed")
+        except RuntimeError as e:
+            with_error = e
+        return during, GlobalHttpClient.get_pool_stats()["http://agent-a:5011"], with_error
+
+    during, after, error = asyncio.run(run())
+    assert during["in_flight"] == 1
+    assert after["in_flight"] == 0
+    assert error is not None
+    # mock transport에는 httpcore 풀이 없음 -> 커넥션 상태는 None
+    assert after["active"] is None and after["queued"] is None
+
+
+def test_pool_stats_are_partial_when_pool_internals_change(monkeypatch):
+    monkeypatch.setattr(GlobalHttpClient, "_transport_override", None)
+    monkeypatch.setattr(GlobalHttpClient, "_origin_clients", {})
+
+    client = GlobalHttpClient.get_client(AGENT_URL)
+    stats = GlobalHttpClient.get_pool_stats()["http://agent-a:5011"]
+    assert stats["active"] == 0 and stats["idle"] == 0 and stats["queued"] == 0
+    assert stats["max"] is not None
+
+    # httpcore 풀 구조가 달라져도 예외 없이 읽을 수 있는 값만 반환
+    client._transport.transport._pool = object()
+    stats = GlobalHttpClient.get_pool_stats()["http://agent-a:5011"]
+    assert stats["in_flight"] == 0
+    assert stats["active"] is None and stats["queued"] is None
+    assert stats["max"] is not None
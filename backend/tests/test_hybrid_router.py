@@ -4,11 +4,16 @@ Hybrid Router 테스트 - 다중 에이전트 라우팅 검증
 import asyncio
 import sys
 import os
+import time
+
+import pytest
 
 # 상위 디렉토리를 path에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app.agent_vector_store import AgentVectorStore, AgentRoutingMetadata, get_vector_store
+from app.agent_vector_index import AgentVectorIndex
+from app.embedding_client import LocalHashingEmbeddingClient
 from app.hybrid_router import HybridRouter, get_hybrid_router
 from app.config import get_settings
 
@@ -21,7 +26,12 @@ TEST_AGENTS = [
         category="jira",
         description="Jira 프로젝트의 이슈 검색, 생성, 분석을 수행하는 AI 에이전트입니다. 스프린트 관리, 이슈 추적, 프로젝트 현황 분석 등을 지원합니다.",
         keywords=["jira", "지라", "이슈", "issue", "프로젝트", "project", "스프린트", "sprint", "태스크", "task"],
-        capabilities=["search_issues", "create_issue", "update_issue", "analyze"]
+        capabilities=["search_issues", "create_issue", "update_issue", "analyze"],
+        skill_descriptions=[
+            "search_issues: JQL로 이슈를 검색하고 담당자/상태별로 정리",
+            "analyze: 스프린트 진척도와 프로젝트 이슈 현황을 분석",
+        ],
+        examples=["이번 스프린트 남은 작업 알려줘", "내게 할당된 이슈 목록 보여줘", "버그 티켓 상태 요약해줘"]
     ),
     AgentRoutingMetadata(
         agent_name="Confluence AI Agent",
@@ -30,7 +40,12 @@ TEST_AGENTS = [
         category="confluence",
         description="Confluence 페이지 검색, 생성, 수정을 수행하는 AI 에이전트입니다. 문서 관리, 지식 베이스 구축, 회의록 작성을 지원합니다.",
         keywords=["confluence", "컨플루언스", "문서", "document", "페이지", "page", "위키", "wiki", "보고서", "report"],
-        capabilities=["search_pages", "create_page", "update_page"]
+        capabilities=["search_pages", "create_page", "update_page"],
+        skill_descriptions=[
+            "create_page: 회의록, 주간 보고서 등 문서 페이지를 작성",
+            "search_pages: 스페이스에서 문서를 검색",
+        ],
+        examples=["어제 회의 내용 정리해서 올려줘", "주간 보고서 초안 작성해줘", "온보딩 가이드 문서 찾아줘"]
     ),
     AgentRoutingMetadata(
         agent_name="Slack Agent",
@@ -39,7 +54,12 @@ TEST_AGENTS = [
         category="slack",
         description="Slack 채널에 메시지를 전송하고, 채널 관리 및 알림 설정을 지원하는 AI 에이전트입니다.",
         keywords=["slack", "슬랙", "메시지", "message", "채널", "channel", "알림", "notification"],
-        capabilities=["send_message", "create_channel", "manage_notifications"]
+        capabilities=["send_message", "create_channel", "manage_notifications"],
+        skill_descriptions=[
+            "send_message: 채널이나 팀원에게 메시지와 공지를 전송",
+            "manage_notifications: 알림 규칙 설정",
+        ],
+        examples=["개발팀에게 배포 완료 공지 보내줘", "팀원들에게 알려줘", "리마인더 알림 설정해줘"]
     ),
     AgentRoutingMetadata(
         agent_name="GitHub Agent",
@@ -48,7 +68,12 @@ TEST_AGENTS = [
         category="github",
         description="GitHub 리포지토리 관리, PR 생성 및 리뷰, 이슈 관리를 수행하는 AI 에이전트입니다.",
         keywords=["github", "깃헙", "pr", "pull request", "커밋", "commit", "리포", "repo", "코드리뷰"],
-        capabilities=["create_pr", "review_pr", "manage_issues", "search_code"]
+        capabilities=["create_pr", "review_pr", "manage_issues", "search_code"],
+        skill_descriptions=[
+            "review_pr: 변경된 코드를 리뷰하고 개선점을 제안",
+            "search_code: 리포지토리에서 코드 검색",
+        ],
+        examples=["이 변경사항 리뷰 부탁해", "main 브랜치 최근 커밋 보여줘", "코드에서 함수 정의 찾아줘"]
     ),
     AgentRoutingMetadata(
         agent_name="Notion Agent",
@@ -57,7 +82,11 @@ TEST_AGENTS = [
         category="notion",
         description="Notion 페이지와 데이터베이스를 관리하고, 팀 위키를 구축하는 AI 에이전트입니다.",
         keywords=["notion", "노션", "페이지", "page", "데이터베이스", "database", "위키", "wiki"],
-        capabilities=["create_page", "update_page", "search_pages", "manage_database"]
+        capabilities=["create_page", "update_page", "search_pages", "manage_database"],
+        skill_descriptions=[
+            "manage_database: 노션 데이터베이스 항목 추가/수정",
+        ],
+        examples=["팀 위키에 새 항목 추가해줘", "노션 데이터베이스에 할 일 추가해줘"]
     ),
 ]
 
@@ -82,6 +111,23 @@ TEST_CASES = [
     ("보고서 만들어줘", "Confluence AI Agent", "ambiguous"),
 ]
 
+# 멀티 벡터 검증용 held-out 쿼리 - TEST_AGENTS의 설명/skill/example 문구와 독립적으로 작성
+# (message, 기대 에이전트, 로컬 해싱 임베더로 threshold를 넘는지)
+# threshold를 넘지 못하는 쿼리는 다른 에이전트로 보내지 않고 None (LLM 라우팅 fallback) 이어야 함
+HELD_OUT_CASES = [
+    ("우리 팀 백로그에서 우선순위 높은 티켓 뽑아줘", "Jira AI Agent", False),
+    ("QA에서 올라온 결함 몇 건 남았는지 세어줘", "Jira AI Agent", False),
+    ("이번 마일스톤 완료율 계산해줘", "Jira AI Agent", True),
+    ("분기 실적 리포트를 위키 문서로 정리해줘", "Confluence AI Agent", True),
+    ("킥오프 미팅 메모를 컨플루언스에 남겨줘", "Confluence AI Agent", False),
+    ("마케팅 채널에 점심 공지 띄워줘", "Slack Agent", False),
+    ("디자인팀한테 DM으로 시안 확인 부탁한다고 전해줘", "Slack Agent", False),
+    ("풀리퀘스트에 승인 코멘트 달아줘", "GitHub Agent", False),
+    ("레포에서 deprecated API 호출하는 곳 찾아줘", "GitHub Agent", True),
+    ("노션 칸반 보드에 카드 하나 만들어줘", "Notion Agent", True),
+    ("독서 목록 데이터베이스에 책 세 권 넣어줘", "Notion Agent", True),
+]
+
 
 async def setup_test_data():
     """테스트 데이터 설정"""
@@ -99,12 +145,27 @@ async def setup_test_data():
     print()
 
 
+_vector_store_error = None
+
+
+async def _require_vector_store():
+    """DB 벡터 저장소 (연결할 수 없으면 skip)"""
+    global _vector_store_error
+    if _vector_store_error is None:
+        try:
+            return await get_vector_store()
+        except OSError as e:
+            _vector_store_error = e
+    pytest.skip(f"PostgreSQL not reachable: {_vector_store_error}")
+
+
+@pytest.mark.asyncio
 async def test_vector_search():
     """벡터 검색 테스트"""
     print("\n🔍 Testing Vector Search...")
     print("=" * 60)
     
-    vector_store = await get_vector_store()
+    vector_store = await _require_vector_store()
     
     test_queries = [
         "이슈 현황 분석",
@@ -122,6 +183,7 @@ async def test_vector_search():
     print()
 
 
+@pytest.mark.asyncio
 async def test_hybrid_router():
     """하이브리드 라우터 테스트"""
     print("\n🚀 Testing Hybrid Router...")
@@ -130,7 +192,7 @@ async def test_hybrid_router():
     # Note: 실제 라우터 테스트는 레지스트리에 에이전트가 등록되어 있어야 함
     # 여기서는 벡터 검색만 테스트
     
-    vector_store = await get_vector_store()
+    vector_store = await _require_vector_store()
     
     passed = 0
     failed = 0
@@ -157,6 +219,89 @@ async def test_hybrid_router():
     print()
 
 
+def _build_index(client, multi_vector: bool) -> AgentVectorIndex:
+    """TEST_AGENTS로 프로세스 내 인덱스 구성 (single: description만, multi: description+skill+example)"""
+    index = AgentVectorIndex()
+    for agent in TEST_AGENTS:
+        texts = agent.routing_texts() if multi_vector else [("description", agent.description)]
+        index.upsert(
+            agent.agent_name,
+            info=agent.to_search_info(),
+            vectors=client.embed_sync([text for _, text in texts]),
+            kinds=[kind for kind, _ in texts],
+            texts=[text for _, text in texts]
+        )
+    return index
+
+
+_CLIENT = LocalHashingEmbeddingClient()
+_INDEXES = {}
+
+
+def _index(multi_vector: bool) -> AgentVectorIndex:
+    if multi_vector not in _INDEXES:
+        _INDEXES[multi_vector] = _build_index(_CLIENT, multi_vector)
+    return _INDEXES[multi_vector]
+
+
+def _route(message: str, multi_vector: bool):
+    """held-out 쿼리의 top-1 에이전트 (threshold 미만이면 None)"""
+    results = _index(multi_vector).search(
+        _CLIENT.embed_sync([message])[0], limit=1, threshold=_CLIENT.routing_threshold
+    )
+    return results[0]["agent_name"] if results else None
+
+
+@pytest.mark.parametrize("message, expected, resolved", HELD_OUT_CASES)
+def test_multi_vector_routing_held_out(message, expected, resolved):
+    """multi-vector(max-sim) 라우팅 - held-out 쿼리별 기대 결과 (DB 불필요)"""
+    actual = _route(message, multi_vector=True)
+    if resolved:
+        assert actual == expected
+    else:
+        # 벡터 경로가 확신하지 못해도 다른 에이전트가 아니라 LLM fallback(None)으로
+        assert actual in (expected, None)
+
+
+def compare_routing(repeat: int = 200) -> dict:
+    """
+    held-out 쿼리의 single-vector(description) vs multi-vector 비교
+    
+    Returns:
+        {"single"|"multi": {"correct": 정답 수, "search_ms": 쿼리당 평균 검색 시간}}
+        (검색 시간은 쿼리 임베딩을 제외한 인덱스 search만 측정)
+    """
+    queries = _CLIENT.embed_sync([message for message, _, _ in HELD_OUT_CASES])
+    comparison = {}
+    for label, multi_vector in (("single", False), ("multi", True)):
+        index = _index(multi_vector)
+        correct = sum(
+            _route(message, multi_vector) == expected for message, expected, _ in HELD_OUT_CASES
+        )
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                index.search(query, limit=1, threshold=_CLIENT.routing_threshold)
+        search_ms = (time.perf_counter() - started) * 1000 / (repeat * len(queries))
+        comparison[label] = {"correct": correct, "search_ms": search_ms}
+    return comparison
+
+
+def print_routing_comparison(comparison: dict):
+    for label, result in comparison.items():
+        print(
+            f"{label}-vector: {result['correct']}/{len(HELD_OUT_CASES)} held-out queries routed, "
+            f"{result['search_ms'] * 1000:.1f}us/query search"
+        )
+
+
+def test_multi_vector_not_worse_than_single_vector():
+    """multi-vector는 held-out 정확도에서 single-vector(description) 이상이어야 함"""
+    comparison = compare_routing()
+    print_routing_comparison(comparison)
+    assert comparison["multi"]["correct"] >= comparison["single"]["correct"]
+
+
 async def main():
     """메인 테스트 실행"""
     print("\n" + "=" * 60)
@@ -176,6 +321,9 @@ async def main():
         # 하이브리드 라우터 테스트
         await test_hybrid_router()
         
+        # 멀티 벡터 비교 (프로세스 내 인덱스)
+        print_routing_comparison(compare_routing())
+        
     except Exception as e:
         print(f"\n❌ Test failed with error: {e}")
         import traceback
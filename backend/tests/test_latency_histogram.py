@@ -0,0 +1,160 @@
+"""
+Latency Histogram 테스트 - 분위수 오차 / sliding window 만료 / 직렬화 및 워커 간 병합
+"""
+import asyncio
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.latency_histogram import LatencyHistogram, SlidingWindowHistogram
+from app.models import AgentRegistration
+from app.registry import AgentMetrics, AgentRegistry
+
+# 10초 / 60초 슬롯 경계에 맞춘 기준 시각
+BASE = 1_800_000_000.0
+
+
+def _fine_counts(histogram: SlidingWindowHistogram, now: float) -> int:
+    return histogram.window(60, now).count
+
+
+# =============================================================================
+# LatencyHistogram
+# =============================================================================
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantile_relative_error_within_bucket_width(q):
+    values = np.random.default_rng(7).lognormal(mean=5.0, sigma=1.2, size=20000)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(float(value))
+
+    exact = float(np.percentile(values, q * 100, method="inverted_cdf"))
+    assert abs(histogram.quantile(q) - exact) / exact < 0.015
+
+
+def test_quantile_does_not_exceed_max():
+    histogram = LatencyHistogram()
+    for value in (10.0, 20.0, 30.0):
+        histogram.record(value)
+    assert histogram.quantile(0.99) == 30.0
+    assert histogram.summary()["max_ms"] == 30.0
+
+
+# =============================================================================
+# SlidingWindowHistogram
+# =============================================================================
+
+def test_1m_window_expires_on_10s_slot_boundary():
+    histogram = SlidingWindowHistogram()
+    histogram.record(100.0, now=BASE + 5)
+
+    assert _fine_counts(histogram, BASE + 59.9) == 1
+    # 첫 10초 슬롯이 1m window(6개 슬롯) 밖으로 밀려남
+    assert _fine_counts(histogram, BASE + 60) == 0
+
+
+def test_5m_and_1h_windows_expire_on_60s_slot_boundary():
+    histogram = SlidingWindowHistogram()
+    histogram.record(100.0, now=BASE + 5)
+
+    assert histogram.window(300, BASE + 299.9).count == 1
+    assert histogram.window(300, BASE + 300).count == 0
+    assert histogram.window(3600, BASE + 3599.9).count == 1
+    assert histogram.window(3600, BASE + 3600).count == 0
+
+
+def test_reused_slot_drops_previous_epoch():
+    histogram = SlidingWindowHistogram()
+    histogram.record(100.0, now=BASE)
+    # 60초 뒤 같은 fine ring 위치 / 1시간 뒤 같은 coarse ring 위치
+    histogram.record(200.0, now=BASE + 60)
+    histogram.record(300.0, now=BASE + 3600)
+
+    assert _fine_counts(histogram, BASE + 3600) == 1
+    # BASE 슬롯은 BASE + 3600에 재사용됨 -> 1h window에는 BASE + 60, BASE + 3600만 남음
+    last_hour = histogram.window(3600, BASE + 3600)
+    assert last_hour.count == 2
+    assert last_hour.max_ms == 300.0
+    assert last_hour.total_ms == 500.0
+
+
+def test_dict_round_trip_preserves_windows():
+    histogram = SlidingWindowHistogram()
+    for offset, value in ((0, 12.0), (15, 40.0), (130, 75.0), (1800, 500.0), (1805, 9.0)):
+        histogram.record(value, now=BASE + offset)
+
+    restored = SlidingWindowHistogram.from_dict(histogram.to_dict())
+    now = BASE + 1810
+    assert {name: h.summary() for name, h in restored.windows(now).items()} == \
+        {name: h.summary() for name, h in histogram.windows(now).items()}
+
+
+def test_merge_adds_same_epoch_and_keeps_newer_epoch():
+    local, other = SlidingWindowHistogram(), SlidingWindowHistogram()
+    local.record(10.0, now=BASE)
+    other.record(20.0, now=BASE)
+    # 같은 ring 위치의 더 오래된 epoch (fine: -60s / coarse: -3600s) - 병합 시 무시
+    other_old = SlidingWindowHistogram()
+    other_old.record(999.0, now=BASE - 3600)
+
+    local.merge(other)
+    local.merge(other_old)
+    assert local.window(60, BASE).count == 2
+    assert local.window(3600, BASE).count == 2
+    assert local.window(3600, BASE).max_ms == 20.0
+
+    # 반대로 더 최신 epoch는 오래된 슬롯을 대체
+    stale = SlidingWindowHistogram()
+    stale.record(999.0, now=BASE - 3600)
+    stale.merge(SlidingWindowHistogram.from_dict(local.to_dict()))
+    assert stale.window(3600, BASE).count == 2
+    assert stale.window(3600, BASE).max_ms == 20.0
+
+
+def test_from_dict_keeps_newest_epoch_regardless_of_order():
+    newer, older = SlidingWindowHistogram(), SlidingWindowHistogram()
+    newer.record(20.0, now=BASE)
+    older.record(999.0, now=BASE - 60)
+    fine = {**newer.to_dict()["fine"], **older.to_dict()["fine"]}
+
+    restored = SlidingWindowHistogram.from_dict({"fine": fine})
+    assert restored.window(60, BASE).max_ms == 20.0
+
+
+# =============================================================================
+# Registry: 워커 간 병합
+# =============================================================================
+
+def test_get_all_metrics_merges_worker_snapshots():
+    registry = AgentRegistry()
+    agent = asyncio.run(registry.register_agent(AgentRegistration(
+        name="Jira Agent", description="Jira 이슈 관리", url="http://jira:5011"
+    )))
+    for _ in range(10):
+        registry.record_request_success(agent.id, 100.0)
+
+    other_worker = AgentMetrics()
+    for _ in range(30):
+        other_worker.record_success(400.0, ttfb_ms=50.0)
+    other_worker.record_failure("timeout")
+    only_remote = AgentMetrics()
+    only_remote.record_success(10.0)
+
+    merged = registry.get_all_metrics([{agent.id: other_worker.export(), "remote-agent": only_remote.export()}])
+    jira = merged[agent.id]
+    assert jira["total_requests"] == 41 and jira["failed_requests"] == 1
+    assert jira["latency"]["total"]["5m"]["count"] == 40
+    assert jira["latency"]["total"]["5m"]["p50_ms"] == pytest.approx(400.0, rel=0.01)
+    assert jira["latency"]["ttfb"]["1m"]["count"] == 30
+    assert merged["remote-agent"]["total_requests"] == 1
+
+    # 이 워커의 metrics는 변경되지 않음
+    local = registry.get_all_metrics()[agent.id]
+    assert local["total_requests"] == 10
+    assert local["latency"]["total"]["5m"]["p50_ms"] == pytest.approx(100.0, rel=0.01)
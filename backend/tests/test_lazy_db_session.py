@@ -0,0 +1,152 @@
+"""
+Lazy DB 세션 테스트 - 동시 SSE 스트림이 DB 커넥션 풀을 점유하지 않는지 검증
+
+커넥션 풀(크기 5, overflow 없음, checkout timeout 1초)을 흉내 낸 session maker로 교체하고
+익명 100 + 인증 100, 총 200개의 /api/chat/message/stream 요청을 동시에 엽니다.
+모든 스트림이 동시에 열린 상태가 되어야 종료되므로, 인증 조회가 스트림 동안 세션을 잡고 있으면
+풀 checkout timeout으로 실패합니다.
+"""
+import asyncio
+import sys
+import os
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app.database as database
+from app.api import chat_router
+from app.auth import user_cache
+from app.auth.models import UserInDB
+from app.auth.security import create_access_token
+from app.auth.service import auth_service
+from app.models import StreamEvent
+from app.orchestrator import orchestrator
+
+POOL_SIZE = 5
+STREAMS = 200
+AUTHENTICATED = 100
+
+
+class BoundedPool:
+    """pool_size=5, max_overflow=0 커넥션 풀 흉내 (checkout 수 / 최대 동시 checkout 기록)"""
+
+    def __init__(self, size: int, timeout: float = 1.0):
+        self._slots = asyncio.Semaphore(size)
+        self._timeout = timeout
+        self.checked_out = 0
+        self.peak = 0
+        self.checkouts = 0
+
+    def __call__(self):
+        return PooledSession(self)
+
+
+class PooledSession:
+    def __init__(self, pool: BoundedPool):
+        self._pool = pool
+
+    async def __aenter__(self):
+        # QueuePool처럼 timeout 안에 커넥션을 얻지 못하면 실패
+        await asyncio.wait_for(self._pool._slots.acquire(), self._pool._timeout)
+        self._pool.checked_out += 1
+        self._pool.checkouts += 1
+        self._pool.peak = max(self._pool.peak, self._pool.checked_out)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._pool.checked_out -= 1
+        self._pool._slots.release()
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    pool = BoundedPool(POOL_SIZE)
+    monkeypatch.setattr(database, "get_session_maker", lambda: pool)
+    monkeypatch.setattr(user_cache, "_user_cache", user_cache.UserCache())
+
+    lookups = []
+
+    async def get_user_by_id(db, user_id):
+        assert isinstance(db, PooledSession)
+        lookups.append(user_id)
+        await asyncio.sleep(0.01)  # 쿼리 시간
+        now = datetime.utcnow()
+        return UserInDB(
+            id=user_id, username=f"user-{user_id[:8]}", email=f"{user_id[:8]}@example.com",
+            password_hash="hash", name="Test User", role_id=2, role_name="user",
+            is_active=True, created_at=now, updated_at=now
+        )
+
+    monkeypatch.setattr(auth_service, "get_user_by_id", get_user_by_id)
+
+    state = {"open": 0, "peak": 0, "all_open": None}
+
+    async def process_message_stream(request, user_id=None, kauth_user_id=None, jwt_token=None):
+        state["open"] += 1
+        state["peak"] = max(state["peak"], state["open"])
+        if state["open"] == STREAMS:
+            state["all_open"].set()
+        try:
+            yield StreamEvent(event="status", data={"user_id": user_id})
+            # 모든 스트림이 동시에 열릴 때까지 스트림 유지
+            await asyncio.wait_for(state["all_open"].wait(), 10)
+            yield StreamEvent(event="done", data={"user_id": user_id})
+        finally:
+            state["open"] -= 1
+
+    monkeypatch.setattr(orchestrator, "process_message_stream", process_message_stream)
+
+    app = FastAPI()
+    app.include_router(chat_router, prefix="/api/chat")
+    return app, pool, lookups, state
+
+
+def test_concurrent_streams_do_not_hold_db_sessions(stream_env):
+    app, pool, lookups, state = stream_env
+    user_ids = [str(uuid.uuid4()) for _ in range(AUTHENTICATED)]
+
+    async def run():
+        state["all_open"] = asyncio.Event()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+
+            async def stream(i: int):
+                headers = {}
+                if i < AUTHENTICATED:
+                    token = create_access_token({"sub": user_ids[i]})
+                    headers["Authorization"] = f"Bearer {token}"
+                return await client.post(
+                    "/api/chat/message/stream", json={"message": f"hello {i}"}, headers=headers
+                )
+
+            return await asyncio.gather(*(stream(i) for i in range(STREAMS)))
+
+    responses = asyncio.run(run())
+
+    assert all(r.status_code == 200 for r in responses)
+    assert all("event: done" in r.text for r in responses)
+    for i, response in enumerate(responses[:AUTHENTICATED]):
+        assert user_ids[i] in response.text
+
+    # 200개 스트림이 동시에 열려 있었고, 그동안 세션은 인증 조회에만 잠깐 사용됨
+    assert state["peak"] == STREAMS
+    assert pool.peak <= POOL_SIZE
+    assert pool.checked_out == 0
+    # 익명 요청은 세션을 열지 않음 (인증 사용자당 1회 조회)
+    assert pool.checkouts == AUTHENTICATED
+    assert sorted(lookups) == sorted(user_ids)
@@ -0,0 +1,158 @@
+"""
+Registry Snapshot 테스트 - warm-start 파일 저장 / 복원 / 손상 파일 처리
+
+복원할 수 없는 snapshot(오래됨 / 손상 / 형식 버전 불일치 / 복원 도중 실패)은
+레지스트리를 비운 채 빈 목록을 반환하여 cold start 경로로 진행해야 합니다.
+"""
+import asyncio
+import sys
+import os
+import time
+
+import numpy as np
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import agent_vector_store, registry_snapshot
+from app.models import AgentRegistration, AgentSkill
+from app.registry import AgentRegistry
+from app.registry_snapshot import SNAPSHOT_VERSION, read_snapshot, write_snapshot
+
+pytestmark = pytest.mark.skipif(not registry_snapshot.MSGPACK_AVAILABLE, reason="msgpack not installed")
+
+DIM = 8
+
+
+def _registry(path) -> AgentRegistry:
+    test_registry = AgentRegistry()
+    snapshotter = test_registry._snapshotter
+    snapshotter.path = path
+    snapshotter.enabled = True
+    snapshotter.max_age = 3600
+    return test_registry
+
+
+def _vector_index():
+    rng = np.random.default_rng(0)
+    return {
+        "embedding_model": "local-ngram-hash-v1",
+        "embedding_dim": DIM,
+        "agents": [
+            {
+                "name": name,
+                "info": {"description": f"{name} description"},
+                "kinds": ["description", "example"],
+                "texts": [f"{name} description", f"{name} example"],
+                "vectors": rng.standard_normal((2, DIM)).astype(np.float32),
+            }
+            for name in ("Jira Agent", "Slack Agent")
+        ],
+    }
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_vector_store, "_warm_index", None)
+    return tmp_path / "registry_snapshot.bin"
+
+
+@pytest.fixture
+def saved(snapshot_path):
+    source = _registry(snapshot_path)
+
+    async def register():
+        for name, port in (("Jira Agent", 5011), ("Slack Agent", 5012)):
+            await source.register_agent(AgentRegistration(
+                name=name,
+                description=f"{name} description",
+                url=f"http://localhost:{port}",
+                skills=[AgentSkill(id="main", name="main", description="main skill", examples=["example"])]
+            ))
+
+    asyncio.run(register())
+    source._card_fetcher.restore_validators({"http://localhost:5011": {"path": "/.well-known/agent.json", "etag": '"v1"'}})
+    source._snapshotter._loaded_vector_index = _vector_index()
+    assert source._snapshotter.save()
+    # 내용이 같으면 다시 쓰지 않음
+    assert not source._snapshotter.save()
+    return source
+
+
+def _assert_cold(target: AgentRegistry, restored):
+    assert restored == []
+    assert target.list_agents() == []
+    assert target._card_fetcher.export_validators() == {}
+    assert agent_vector_store._warm_index is None
+    assert target._snapshotter._loaded_vector_index is None
+
+
+def test_round_trip(saved, snapshot_path):
+    target = _registry(snapshot_path)
+    restored = target._snapshotter.load()
+
+    assert sorted(restored) == sorted(a.id for a in saved.list_agents())
+    assert {a.name: a.skills for a in target.list_agents()} == {a.name: a.skills for a in saved.list_agents()}
+    assert target._card_fetcher.export_validators() == saved._card_fetcher.export_validators()
+
+    warm = agent_vector_store._warm_index
+    expected = _vector_index()
+    assert [a["name"] for a in warm["agents"]] == [a["name"] for a in expected["agents"]]
+    for loaded, original in zip(warm["agents"], expected["agents"]):
+        np.testing.assert_array_equal(loaded["vectors"], original["vectors"])
+        assert loaded["texts"] == original["texts"]
+
+
+def test_stale_snapshot_is_ignored(saved, snapshot_path):
+    snapshot = read_snapshot(snapshot_path)
+    header = {**snapshot.header, "created_at": time.time() - 7200}
+    header.pop("vector_index")
+    write_snapshot(snapshot_path, header, _vector_index())
+
+    target = _registry(snapshot_path)
+    _assert_cold(target, target._snapshotter.load())
+
+
+def test_version_mismatch_is_ignored(saved, snapshot_path):
+    header = {**read_snapshot(snapshot_path).header, "version": SNAPSHOT_VERSION + 1}
+    header.pop("vector_index")
+    write_snapshot(snapshot_path, header, _vector_index())
+
+    target = _registry(snapshot_path)
+    _assert_cold(target, target._snapshotter.load())
+
+
+@pytest.mark.parametrize("corruption", ["truncated_vectors", "bad_header", "bad_agent", "bad_magic"])
+def test_corrupt_snapshot_starts_cold(saved, snapshot_path, corruption):
+    data = snapshot_path.read_bytes()
+    if corruption == "truncated_vectors":
+        data = data[:-DIM * 4]
+    elif corruption == "bad_header":
+        data = data[:20] + b"\xff" * 16 + data[36:]
+    elif corruption == "bad_magic":
+        data = b"XXXXXXXX" + data[8:]
+    snapshot_path.write_bytes(data)
+    if corruption == "bad_agent":
+        header = read_snapshot(snapshot_path).header
+        header.pop("vector_index")
+        header["agents"][1] = {**header["agents"][1], "status": "not-a-status"}
+        write_snapshot(snapshot_path, header, _vector_index())
+
+    target = _registry(snapshot_path)
+    _assert_cold(target, target._snapshotter.load())
+
+
+def test_failure_after_partial_restore_resets_registry(saved, snapshot_path, monkeypatch):
+    def fail(snapshot):
+        if snapshot is not None:
+            raise RuntimeError("preload failed")
+
+    monkeypatch.setattr(agent_vector_store, "preload_index_snapshot", fail)
+    target = _registry(snapshot_path)
+    restored = target._snapshotter.load()
+
+    assert restored == []
+    assert target.list_agents() == []
+    assert target.get_catalog().agents == ()
+    assert target._card_fetcher.export_validators() == {}
@@ -0,0 +1,205 @@
+"""
+Registry Store 테스트 - 다른 워커의 NOTIFY 반영 / health check leader 전용 작업
+
+DB 없이 LISTEN 콜백(_on_notify)에 payload를 직접 넣고, upsert 시 row 재조회는 fake pool로 대체합니다.
+"""
+import asyncio
+import json
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models import AgentInfo, AgentRegistration, AgentSkill, AgentStatus
+from app.registry import AgentRegistry
+from app.registry_store import NOTIFY_CHANNEL
+
+AGENT_ID = "0d1e7c44-5b8f-5d0e-9a77-3c2b1f0e4d5a"
+URLS = ["http://jira-a:5011", "http://jira-b:5011"]
+
+
+def _row(**overrides) -> dict:
+    row = {
+        "id": AGENT_ID,
+        "name": "Jira Agent",
+        "description": "Jira 이슈 관리",
+        "url": URLS[0],
+        "replicas": URLS,
+        "version": "1.0.0",
+        "skills": [{"id": "issue", "name": "이슈 관리", "description": "Jira 이슈 조회"}],
+        "capabilities": {},
+        "requirements": {},
+        "status": "online",
+        "last_seen": None,
+    }
+    row.update(overrides)
+    return row
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetchrow(self, query, agent_id):
+        return self.rows.get(agent_id)
+
+
+class FakePool:
+    """registered_agents row 조회만 지원하는 asyncpg pool 대체"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return FakeConnection(pool.rows)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+@pytest.fixture
+def worker():
+    registry = AgentRegistry()
+    store = registry._store
+    store._pool = FakePool()
+    return registry, store
+
+
+def _notify(store, **message):
+    message.setdefault("origin", "other-host:1")
+    store._on_notify(None, 1, NOTIFY_CHANNEL, json.dumps(message))
+
+
+async def _drain(store):
+    await asyncio.gather(*list(store._pending_fetches))
+
+
+def test_remote_upsert_is_loaded_and_applied(worker):
+    registry, store = worker
+
+    async def run():
+        store._pool.rows[AGENT_ID] = _row()
+        _notify(store, op="upsert", id=AGENT_ID)
+        await _drain(store)
+        created = registry.get_agent(AGENT_ID)
+        assert created.name == "Jira Agent"
+        assert registry.get_replica_urls(AGENT_ID) == URLS
+
+        # 기존 에이전트 갱신: 설명 변경 + replica 제거
+        store._pool.rows[AGENT_ID] = _row(description="Jira 이슈와 스프린트 관리", replicas=URLS[:1])
+        _notify(store, op="upsert", id=AGENT_ID)
+        await _drain(store)
+        return created
+
+    created = asyncio.run(run())
+    updated = registry.get_agent(AGENT_ID)
+    assert updated is created
+    assert updated.description == "Jira 이슈와 스프린트 관리"
+    assert registry.get_replica_urls(AGENT_ID) == URLS[:1]
+    assert [a.description for a in registry.get_catalog().agents] == ["Jira 이슈와 스프린트 관리"]
+
+
+def test_remote_upsert_of_deleted_row_removes_agent(worker):
+    registry, store = worker
+    registry.apply_remote_upsert(AgentInfo(**_row(last_seen=datetime.utcnow())))
+
+    async def run():
+        _notify(store, op="upsert", id=AGENT_ID)
+        await _drain(store)
+
+    asyncio.run(run())
+    assert registry.get_agent(AGENT_ID) is None
+
+
+def test_own_notifications_are_ignored(worker):
+    registry, store = worker
+    registry.apply_remote_upsert(AgentInfo(**_row(last_seen=datetime.utcnow())))
+
+    _notify(store, op="delete", id=AGENT_ID, origin=store.worker_id)
+    assert registry.get_agent(AGENT_ID) is not None
+    _notify(store, op="delete", id=AGENT_ID)
+    assert registry.get_agent(AGENT_ID) is None
+
+
+def test_remote_health_updates_status_and_replicas(worker):
+    registry, store = worker
+    registry.apply_remote_upsert(AgentInfo(**_row(last_seen=datetime.utcnow())))
+
+    _notify(store, op="health", id=AGENT_ID, status="online", down=[URLS[1] + "/"])
+    assert registry.get_agent(AGENT_ID).status == AgentStatus.ONLINE
+    replicas = {r["url"]: r["healthy"] for r in registry._replica_sets[AGENT_ID].to_dict()["replicas"]}
+    assert replicas == {URLS[0]: True, URLS[1]: False}
+
+    _notify(store, op="health", id=AGENT_ID, status="offline", down=URLS)
+    assert registry.get_agent(AGENT_ID).status == AgentStatus.OFFLINE
+    assert registry.get_catalog().agents == ()
+    assert registry.list_available_agents() == []
+
+    # 모르는 에이전트의 health는 무시
+    _notify(store, op="health", id="unknown", status="online", down=[])
+
+
+def test_card_refresh_runs_only_on_leader(worker):
+    registry, store = worker
+    fetcher = registry._card_fetcher
+    fetcher.refresh_interval = 0.01
+    refreshed = []
+
+    async def refresh(agent_ids, concurrency=None):
+        refreshed.append(agent_ids)
+        return {"not_modified": len(agent_ids), "updated": 0, "failed": 0}
+
+    fetcher.refresh = refresh
+
+    async def run():
+        await registry.register_agent(AgentRegistration(
+            name="Jira Agent", description="Jira 이슈 관리", url=URLS[0],
+            skills=[AgentSkill(id="issue", name="이슈 관리", description="Jira 이슈 조회")]
+        ))
+        # follower: 갱신 / health check 없음
+        await asyncio.sleep(0.05)
+        follower_refreshes = len(refreshed)
+        assert registry._health_scheduler._task is None
+
+        await store._set_leader(True)
+        await asyncio.sleep(0.05)
+        leader_refreshes = len(refreshed)
+        assert registry._health_scheduler._task is not None
+
+        await store._set_leader(False)
+        await asyncio.sleep(0.05)
+        return follower_refreshes, leader_refreshes, len(refreshed)
+
+    follower, leader, after = asyncio.run(run())
+    assert follower == 0
+    assert leader > 0
+    assert after == leader
+    assert fetcher._task is None and registry._health_scheduler._task is None
+
+
+def test_follower_start_does_not_schedule_card_refresh(worker, monkeypatch):
+    registry, store = worker
+    registry._snapshotter.enabled = False
+
+    async def start_shared():
+        return True
+
+    monkeypatch.setattr(store, "start", start_shared)
+
+    async def run():
+        await registry.start()
+        running = registry._card_fetcher._task, registry._health_scheduler._task
+        await registry.stop()
+        return running
+
+    assert asyncio.run(run()) == (None, None)
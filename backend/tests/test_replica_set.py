@@ -0,0 +1,209 @@
+"""
+Replica 테스트 - replica 선택(p2c) / passive ejection / 같은 이름 등록 / hedge
+
+ReplicaSet 단위 동작과, 레지스트리 + orchestrator._send_to_replicas 경로의 hedge를 검증합니다.
+"""
+import asyncio
+import sys
+import os
+from collections import Counter
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import orchestrator as orchestrator_module
+from app.models import AgentRegistration, AgentSkill
+from app.orchestrator import orchestrator
+from app.registry import AgentConflictError, AgentRegistry
+from app.replica_set import ReplicaSet
+
+URLS = ["http://replica-a:5011", "http://replica-b:5011", "http://replica-c:5011"]
+SKILLS = [AgentSkill(id="issue", name="이슈 관리", description="Jira 이슈 조회", examples=["이슈 보여줘"])]
+
+
+def _registration(url: str, version: str = "1.0.0", skills=SKILLS, name: str = "Jira Agent") -> AgentRegistration:
+    return AgentRegistration(name=name, description="Jira 이슈 관리", url=url, version=version, skills=skills)
+
+
+# =============================================================================
+# ReplicaSet
+# =============================================================================
+
+def test_p2c_prefers_less_loaded_replica():
+    replicas = ReplicaSet(URLS[:2])
+    for _ in range(3):
+        replicas.start(URLS[0])
+    # 후보가 2개면 p2c는 항상 두 replica를 비교
+    assert {replicas.pick() for _ in range(50)} == {URLS[1]}
+
+
+def test_p2c_spreads_load_across_idle_replicas():
+    replicas = ReplicaSet(URLS)
+    picks = Counter(replicas.pick() for _ in range(3000))
+    assert set(picks) == set(URLS)
+    assert min(picks.values()) > 700
+
+
+def test_consecutive_failures_eject_replica():
+    replicas = ReplicaSet(URLS[:2], eject_after_failures=3, eject_seconds=30)
+    for _ in range(3):
+        replicas.start(URLS[0])
+        replicas.finish(URLS[0], 10.0, "failure")
+
+    assert replicas.available_count() == 1
+    assert {replicas.pick() for _ in range(20)} == {URLS[1]}
+    # 성공한 health probe가 passive ejection을 풀지 않음
+    replicas.set_health(URLS[0], True)
+    assert replicas.available_count() == 1
+    # hedge 후보에서도 제외
+    assert replicas.pick(exclude=(URLS[1],)) is None
+
+
+def test_cancelled_calls_do_not_count_as_failures():
+    replicas = ReplicaSet(URLS[:2], eject_after_failures=1)
+    replicas.start(URLS[0])
+    replicas.finish(URLS[0], 10.0, "cancelled")
+    assert replicas.available_count() == 2
+
+
+def test_all_unavailable_fails_open():
+    replicas = ReplicaSet(URLS[:2])
+    for url in URLS[:2]:
+        replicas.set_health(url, False)
+    assert replicas.pick() in URLS[:2]
+
+
+# =============================================================================
+# Registry: 같은 이름 등록
+# =============================================================================
+
+def test_same_card_at_new_url_is_added_as_replica():
+    registry = AgentRegistry()
+
+    async def run():
+        first = await registry.register_agent(_registration(URLS[0]))
+        second = await registry.register_agent(_registration(URLS[1]))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.id == second.id
+    assert registry.get_replica_urls(first.id) == URLS[:2]
+
+
+@pytest.mark.parametrize("version, skills", [
+    ("2.0.0", SKILLS),
+    ("1.0.0", [AgentSkill(id="sprint", name="스프린트", description="스프린트 관리")]),
+])
+def test_different_card_with_same_name_is_rejected(version, skills):
+    registry = AgentRegistry()
+
+    async def run():
+        await registry.register_agent(_registration(URLS[0]))
+        await registry.register_agent(_registration(URLS[1], version=version, skills=skills))
+
+    with pytest.raises(AgentConflictError):
+        asyncio.run(run())
+    agent = registry.get_agent_by_name("Jira Agent")
+    assert registry.get_replica_urls(agent.id) == URLS[:1]
+    assert agent.skills == SKILLS
+
+
+def test_released_replica_url_does_not_reuse_surviving_agent_id():
+    registry = AgentRegistry()
+
+    async def run():
+        jira = await registry.register_agent(_registration(URLS[0]))
+        await registry.register_agent(_registration(URLS[1]))
+        # primary URL을 replica에서 빼고, 그 URL에 다른 에이전트 등록
+        assert registry.remove_replica(jira.id, URLS[0])
+        other = await registry.register_agent(_registration(URLS[0], name="Confluence Agent"))
+        return jira, other
+
+    jira, other = asyncio.run(run())
+    assert other.id != jira.id
+    assert registry.get_agent(jira.id).name == "Jira Agent"
+    assert registry.get_agent(other.id).name == "Confluence Agent"
+
+
+# =============================================================================
+# Hedge
+# =============================================================================
+
+@pytest.fixture
+def hedged_registry(monkeypatch):
+    registry = AgentRegistry()
+
+    async def register():
+        agent = await registry.register_agent(_registration(URLS[0]))
+        await registry.register_agent(_registration(URLS[1]))
+        return agent
+
+    agent = asyncio.run(register())
+    # 최근 지연 20ms -> hedge 지연은 최소값(a2a_hedge_min_delay_ms)
+    for _ in range(50):
+        registry._metrics[agent.id].latency.record(20.0)
+    monkeypatch.setattr(orchestrator_module, "registry", registry)
+    return registry, agent
+
+
+def _slow_first_send(calls):
+    async def send(url):
+        calls.append(url)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return {"state": "completed", "url": url}
+    return send
+
+
+def test_idempotent_call_is_hedged_to_second_replica(hedged_registry):
+    registry, agent = hedged_registry
+    assert registry.hedge_delay_seconds(agent.id) is not None
+    calls = []
+
+    async def run():
+        return await asyncio.wait_for(
+            orchestrator._send_to_replicas(agent.id, agent.url, _slow_first_send(calls), idempotent=True), 2
+        )
+
+    result = asyncio.run(run())
+    assert len(calls) == 2 and calls[0] != calls[1]
+    assert result["url"] == calls[1]
+    # 패배한 primary는 취소되고 실패로 기록되지 않음
+    replicas = registry._replica_sets[agent.id]
+    stats = {r["url"]: r for r in replicas.to_dict()["replicas"]}
+    assert all(r["outstanding"] == 0 for r in stats.values())
+    assert stats[calls[0]]["failed_requests"] == 0
+    # hedge가 잡은 동시성 슬롯은 반환됨
+    assert registry.get_concurrency_stats()[agent.id]["in_flight"] == 0
+
+
+def test_hedge_skipped_without_free_concurrency_slot(hedged_registry):
+    registry, agent = hedged_registry
+    limiter = registry._limiter(agent.id)
+    # primary 호출이 limit을 모두 사용 중
+    limiter.in_flight = limiter.limit
+    calls = []
+
+    async def send(url):
+        calls.append(url)
+        await asyncio.sleep(0.2)
+        return {"state": "completed", "url": url}
+
+    result = asyncio.run(orchestrator._send_to_replicas(agent.id, agent.url, send, idempotent=True))
+    assert calls == [result["url"]]
+    assert limiter.in_flight == limiter.limit
+
+
+def test_non_idempotent_call_is_not_hedged(hedged_registry):
+    _, agent = hedged_registry
+    calls = []
+
+    async def send(url):
+        calls.append(url)
+        await asyncio.sleep(0.1)
+        return {"state": "completed", "url": url}
+
+    result = asyncio.run(orchestrator._send_to_replicas(agent.id, agent.url, send, idempotent=False))
+    assert calls == [result["url"]]
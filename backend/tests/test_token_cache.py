@@ -0,0 +1,237 @@
+"""
+Token Cache 테스트 - get_or_load (L1 / negative 캐싱 / single-flight / 조회 중 무효화)
+
+Redis는 dict 기반 fake로, 무효화 pub/sub은 fake 구독 큐로 대체합니다.
+"""
+import asyncio
+import sys
+import os
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.token_cache import NEGATIVE_SENTINEL, TokenCacheService
+
+USER = "6f1c2c56-8a0e-4b8e-9d3c-0c6f7e1a2b3c"
+OTHER_USER = "0b9d3a71-2f4e-4c55-8a1d-5e6f7a8b9c0d"
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def reset(self):
+        self.redis.subscribers.remove(self)
+
+
+class FakeRedis:
+    """여러 워커(TokenCacheService)가 공유하는 Redis"""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+        self.subscribers = []
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(self.subscribers)
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def scan_iter(self, pattern):
+        prefix = pattern.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+def _worker(redis) -> TokenCacheService:
+    service = TokenCacheService()
+    service._redis = redis
+    service._enabled = True
+    return service
+
+
+@pytest.fixture
+def cache():
+    service = _worker(FakeRedis())
+    # 무효화 채널 구독 중인 상태
+    service._l1_active = True
+    return service
+
+
+class Loader:
+    """호출 횟수를 세고, gate가 열릴 때까지 DB 조회를 붙잡아 두는 loader"""
+
+    def __init__(self, token):
+        self.token = token
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.token
+
+
+def test_l1_hit_skips_redis_and_loader(cache):
+    loader = Loader("token-1")
+
+    async def run():
+        first = await cache.get_or_load(USER, loader)
+        second = await cache.get_or_load(USER, loader)
+        return first, second
+
+    assert asyncio.run(run()) == ("token-1", "token-1")
+    assert loader.calls == 1
+    assert cache._redis.gets == 1
+    assert cache._redis.data[f"mcp_token:{USER}:default"] == "token-1"
+
+
+def test_missing_token_is_negatively_cached(cache):
+    loader = Loader(None)
+
+    async def run():
+        results = [await cache.get_or_load(USER, loader) for _ in range(3)]
+        # L1이 비어도 Redis sentinel로 DB 조회 생략
+        cache._l1.clear()
+        results.append(await cache.get_or_load(USER, loader))
+        return results
+
+    assert asyncio.run(run()) == [None] * 4
+    assert loader.calls == 1
+    assert cache._redis.data[f"mcp_token:{USER}:default"] == NEGATIVE_SENTINEL
+
+
+def test_concurrent_misses_share_one_load(cache):
+    loader = Loader("token-1")
+
+    async def run():
+        loader.gate = asyncio.Event()
+        waiters = [asyncio.create_task(cache.get_or_load(USER, loader)) for _ in range(20)]
+        await asyncio.sleep(0)
+        # 요청 하나가 취소되어도 공유 조회는 계속
+        waiters[0].cancel()
+        loader.gate.set()
+        return await asyncio.gather(*waiters[1:])
+
+    assert asyncio.run(run()) == ["token-1"] * 19
+    assert loader.calls == 1
+    assert cache._inflight == {}
+
+
+def test_invalidate_during_load_is_not_cached(cache):
+    loader = Loader("stale-token")
+
+    async def run():
+        loader.gate = asyncio.Event()
+        pending = asyncio.create_task(cache.get_or_load(USER, loader))
+        await asyncio.sleep(0)
+        await cache.delete(USER)
+        loader.gate.set()
+        stale = await pending
+
+        loader.token = "fresh-token"
+        loader.gate = None
+        return stale, await cache.get_or_load(USER, loader)
+
+    stale, fresh = asyncio.run(run())
+    assert stale == "stale-token"
+    assert fresh == "fresh-token"
+    assert loader.calls == 2
+
+
+def test_invalidating_another_key_keeps_load(cache):
+    loader = Loader("token-1")
+
+    async def run():
+        loader.gate = asyncio.Event()
+        pending = asyncio.create_task(cache.get_or_load(USER, loader))
+        await asyncio.sleep(0)
+        # 다른 사용자 / 다른 토큰의 무효화는 이 조회의 결과 저장을 막지 않음
+        await cache.clear_user_tokens(OTHER_USER)
+        await cache.delete(USER, token_name="secondary")
+        loader.gate.set()
+        await pending
+        return await cache.get_or_load(USER, loader)
+
+    assert asyncio.run(run()) == "token-1"
+    assert loader.calls == 1
+
+
+def test_clear_user_tokens_discards_all_names(cache):
+    loader = Loader("token-1")
+
+    async def run():
+        await cache.get_or_load(USER, loader)
+        await cache.get_or_load(USER, loader, token_name="secondary")
+        await cache.clear_user_tokens(USER)
+        return await cache.get_or_load(USER, loader)
+
+    assert asyncio.run(run()) == "token-1"
+    assert loader.calls == 3
+
+
+def test_invalidation_reaches_other_workers():
+    redis = FakeRedis()
+    worker_a, worker_b = _worker(redis), _worker(redis)
+    worker_b.worker_id = "other-host:1"
+    loader = Loader("token-1")
+
+    async def run():
+        worker_a.start()
+        worker_b.start()
+        await asyncio.sleep(0)
+        assert worker_a._l1_active and worker_b._l1_active
+
+        await worker_a.get_or_load(USER, loader)
+        # worker_b에서 토큰 변경 -> worker_a의 L1도 제거
+        loader.token = "token-2"
+        await worker_b.delete(USER)
+        await asyncio.sleep(0)
+        result = await worker_a.get_or_load(USER, loader)
+
+        await worker_a.stop()
+        await worker_b.stop()
+        return result
+
+    assert asyncio.run(run()) == "token-2"
+    assert loader.calls == 2
+    assert not worker_a._l1_active and worker_a._l1 == {}
+
+
+def test_l1_unused_without_invalidation_subscription():
+    service = _worker(FakeRedis())
+    loader = Loader("token-1")
+
+    async def run():
+        await service.get_or_load(USER, loader)
+        return await service.get_or_load(USER, loader)
+
+    assert asyncio.run(run()) == "token-1"
+    # L1 없이 Redis에서 조회
+    assert service._l1 == {}
+    assert service._redis.gets == 2 and loader.calls == 1
@@ -0,0 +1,145 @@
+"""
+Tracing 테스트 - in-memory exporter로 커스텀 span 구조 검증 (collector 불필요)
+"""
+import asyncio
+import sys
+import os
+
+import httpx
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import tracing
+from app.http_client import GlobalHttpClient
+from app.hybrid_router import HybridRouter
+from app.metrics import observe_llm_call, record_llm_usage
+from app.models import AgentRegistration, AgentSkill
+from app.orchestrator import orchestrator
+from app.registry import AgentRegistry
+from mock_agents import MOCK_AGENT_DEFINITIONS, create_mock_agent_app
+
+AGENT_DEF = next(d for d in MOCK_AGENT_DEFINITIONS if d["name"] == "Google Calendar Agent")
+MESSAGE = "다음 주 화요일 오후에 팀 미팅 잡아줘"
+
+
+class SingleResultVectorStore:
+    routing_threshold = 0.2
+
+    async def search_similar(self, query, limit=5, domain_filter=None, threshold=0.0, **kwargs):
+        return [{"agent_name": AGENT_DEF["name"], "similarity": 0.82, "domain": AGENT_DEF["domain"]}]
+
+
+@pytest.fixture
+def span_exporter():
+    exporter = tracing.configure_in_memory_tracing()
+    yield exporter
+    tracing.reset_tracing()
+
+
+@pytest.fixture
+def routed_env(monkeypatch):
+    test_registry = AgentRegistry()
+    for module in ("app.registry", "app.hybrid_router", "app.orchestrator"):
+        monkeypatch.setattr(f"{module}.registry", test_registry)
+
+    transport = httpx.ASGITransport(app=create_mock_agent_app(AGENT_DEF))
+    monkeypatch.setattr(GlobalHttpClient, "_transport_override", transport)
+    monkeypatch.setattr(GlobalHttpClient, "_client", None)
+    monkeypatch.setattr(GlobalHttpClient, "_origin_clients", {})
+
+    hybrid = HybridRouter()
+    hybrid.use_llm = False
+    hybrid._vector_store = SingleResultVectorStore()
+
+    agent = asyncio.run(test_registry.register_agent(AgentRegistration(
+        name=AGENT_DEF["name"],
+        description=AGENT_DEF["description"],
+        url=f"http://localhost:{AGENT_DEF['port']}",
+        skills=[AgentSkill(id=s, name=s, description=f"{s} functionality") for s in AGENT_DEF["skills"]]
+    )))
+    return hybrid, agent
+
+
+def _by_name(spans, name):
+    return [s for s in spans if s.name == name]
+
+
+def test_routing_and_a2a_spans(span_exporter, routed_env):
+    hybrid, agent = routed_env
+
+    async def scenario():
+        with tracing.start_span("chat.request"):
+            decision = await hybrid.route(MESSAGE)
+            await orchestrator._send_to_agent(
+                decision.agent_url, MESSAGE, "trace-context", agent_id=decision.agent_id
+            )
+
+    asyncio.run(scenario())
+    spans = span_exporter.get_finished_spans()
+    root = _by_name(spans, "chat.request")[0]
+
+    tiers = _by_name(spans, "router.tier")
+    assert [s.attributes["router.tier"] for s in tiers] == ["explicit", "vector"]
+    assert all(s.parent.span_id == root.context.span_id for s in tiers)
+    assert tiers[0].attributes["router.result"] == "miss"
+    vector = tiers[1].attributes
+    assert vector["router.result"] == "hit"
+    assert vector["router.candidates"] == 1
+    assert vector["router.vector.results"] == 1
+    assert vector["router.vector.top_similarity"] == pytest.approx(0.82)
+    assert vector["router.agent_id"] == agent.id
+
+    a2a = _by_name(spans, "a2a.send")[0]
+    assert a2a.parent.span_id == root.context.span_id
+    assert a2a.attributes["a2a.agent_id"] == agent.id
+    assert a2a.attributes["a2a.state"] != "failed"
+
+
+def test_llm_call_span_attributes(span_exporter):
+    with observe_llm_call("claude", "claude-test", "router.intent"):
+        record_llm_usage(120, 30, cached_tokens=100)
+
+    span = _by_name(span_exporter.get_finished_spans(), "llm.call")[0]
+    assert span.attributes["gen_ai.system"] == "claude"
+    assert span.attributes["gen_ai.request.model"] == "claude-test"
+    assert span.attributes["llm.call_site"] == "router.intent"
+    assert span.attributes["gen_ai.usage.input_tokens"] == 120
+    assert span.attributes["gen_ai.usage.output_tokens"] == 30
+    assert span.attributes["llm.cache_hit"] is True
+
+
+def test_head_sampling_drops_unsampled_traces():
+    exporter = tracing.configure_in_memory_tracing(sample_ratio=0.0)
+    try:
+        with tracing.start_span("chat.request"):
+            with tracing.start_span("router.tier", {"router.tier": "explicit"}):
+                pass
+        assert exporter.get_finished_spans() == ()
+    finally:
+        tracing.reset_tracing()
+
+
+def test_a2a_stream_span(span_exporter, routed_env):
+    _, agent = routed_env
+
+    async def scenario():
+        with tracing.start_span("chat.request"):
+            return [chunk async for chunk in orchestrator._stream_from_agent(
+                agent.url, MESSAGE, "trace-context", agent_id=agent.id
+            )]
+
+    asyncio.run(scenario())
+    spans = span_exporter.get_finished_spans()
+    root = _by_name(spans, "chat.request")[0]
+
+    stream = _by_name(spans, "a2a.stream")[0]
+    assert stream.parent.span_id == root.context.span_id
+    assert stream.attributes["a2a.agent_id"] == agent.id
+    assert stream.attributes["a2a.agent_url"] == agent.url
+    assert stream.attributes["a2a.state"] in ("completed", "failed")
+    # 스트리밍 실패 시 fallback a2a.send는 stream span이 아닌 요청 span 아래에 기록
+    for send in _by_name(spans, "a2a.send"):
+        assert send.parent.span_id == root.context.span_id
@@ -0,0 +1,133 @@
+"""
+User Cache 테스트 - TTL 만료 / 조회 중 무효화 / 다른 워커의 무효화 알림 처리
+"""
+import asyncio
+import json
+import sys
+import os
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.auth import user_cache
+from app.auth.models import UserInDB
+from app.auth.service import auth_service
+
+DB = object()  # get_user(db=...)로 넘기는 세션 자리 (auth_service 조회는 fake)
+
+
+class UserSource:
+    """auth_service.get_user_by_id 대체 - 조회 횟수 기록, gate가 열릴 때까지 조회를 붙잡음"""
+
+    def __init__(self):
+        self.role = "user"
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self, db, user_id):
+        self.calls += 1
+        role = self.role
+        if self.gate is not None:
+            await self.gate.wait()
+        now = datetime.utcnow()
+        return UserInDB(
+            id=user_id, username="tester", email="tester@example.com", password_hash="hash",
+            name="Tester", role_id=2, role_name=role, is_active=True, created_at=now, updated_at=now
+        )
+
+
+@pytest.fixture
+def env(monkeypatch):
+    source = UserSource()
+    monkeypatch.setattr(auth_service, "get_user_by_id", source)
+    clock = [1000.0]
+    monkeypatch.setattr(user_cache, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    return user_cache.UserCache(), source, clock
+
+
+def test_cached_until_ttl_expires(env):
+    cache, source, clock = env
+    user_id = str(uuid.uuid4())
+
+    async def run():
+        first = await cache.get_user(user_id, DB)
+        clock[0] += cache.ttl - 1
+        second = await cache.get_user(user_id, DB)
+        clock[0] += 2
+        source.role = "admin"
+        third = await cache.get_user(user_id, DB)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert source.calls == 2
+    assert first.password_hash == "" and second is first
+    assert third.role_name == "admin"
+
+
+def test_invalidate_during_load_is_not_cached(env):
+    cache, source, _ = env
+    user_id, other_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    async def run():
+        source.gate = asyncio.Event()
+        pending = asyncio.create_task(cache.get_user(user_id, DB))
+        other = asyncio.create_task(cache.get_user(other_id, DB))
+        await asyncio.sleep(0)
+        source.role = "admin"
+        await cache.invalidate([user_id])
+        source.gate.set()
+        stale = await pending
+        await other
+
+        source.gate = None
+        return stale, await cache.get_user(user_id, DB)
+
+    stale, fresh = asyncio.run(run())
+    assert stale.role_name == "user"
+    assert fresh.role_name == "admin"
+    # 조회 중 무효화된 사용자만 다시 조회 (다른 사용자의 결과는 저장됨)
+    assert source.calls == 3
+    assert other_id in cache._entries
+    assert cache._loading == {}
+
+
+def test_clear_during_load_is_not_cached(env):
+    cache, source, _ = env
+    user_id = str(uuid.uuid4())
+
+    async def run():
+        source.gate = asyncio.Event()
+        pending = asyncio.create_task(cache.get_user(user_id, DB))
+        await asyncio.sleep(0)
+        cache.clear()
+        source.gate.set()
+        await pending
+
+    asyncio.run(run())
+    assert cache._entries == {}
+
+
+def test_notify_from_other_worker_invalidates(env):
+    cache, source, _ = env
+    user_id = str(uuid.uuid4())
+
+    async def run():
+        await cache.get_user(user_id, DB)
+        # 자기 자신이 보낸 알림은 무시 (invalidate()로 이미 처리)
+        cache._on_notify(None, 1, user_cache.NOTIFY_CHANNEL, json.dumps({"origin": cache.worker_id, "ids": [user_id]}))
+        assert user_id in cache._entries
+        cache._on_notify(None, 1, user_cache.NOTIFY_CHANNEL, "not json")
+        assert user_id in cache._entries
+
+        cache._on_notify(None, 1, user_cache.NOTIFY_CHANNEL, json.dumps({"origin": "other-host:1", "ids": [user_id]}))
+        assert user_id not in cache._entries
+        await cache.get_user(user_id, DB)
+
+    asyncio.run(run())
+    assert source.calls == 2
+    assert cache.get_stats()["notifications_received"] == 1
@@ -0,0 +1,68 @@
+"""
+Vector Sync Pipeline 테스트 - 실패한 flush가 새 변경 없이도 백오프 후 재시도되는지 검증
+"""
+import asyncio
+import sys
+import os
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import vector_sync
+from app.agent_vector_store import AgentRoutingMetadata
+from app.vector_sync import VectorSyncPipeline
+
+
+class FlakyVectorStore:
+    """첫 upsert는 실패, 이후 성공"""
+
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.calls = []
+
+    async def upsert_agents(self, chunk):
+        self.calls.append([m.agent_name for m in chunk])
+        failed = len(chunk) if len(self.calls) <= self.failures else 0
+        return {
+            "upserted": len(chunk) - failed, "embedded": len(chunk) - failed,
+            "vectors": len(chunk) - failed, "skipped": 0, "failed": failed,
+        }
+
+    async def remove_agents(self, names):
+        return True
+
+
+def _metadata(name: str) -> AgentRoutingMetadata:
+    return AgentRoutingMetadata(
+        agent_name=name, agent_url="http://localhost:5011", domain="jira",
+        category="project", description=f"{name} description"
+    )
+
+
+def test_failed_flush_is_retried_with_backoff(monkeypatch):
+    store = FlakyVectorStore(failures=2)
+
+    async def get_vector_store():
+        return store
+
+    monkeypatch.setattr(vector_sync, "get_vector_store", get_vector_store)
+
+    async def run():
+        pipeline = VectorSyncPipeline(debounce_seconds=0, retry_base_seconds=0.05)
+        pipeline.enqueue_upsert(_metadata("Jira Agent"))
+        # 새 enqueue 없이 재시도로만 성공해야 함
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if pipeline.get_status()["upserted"]:
+                break
+        status = pipeline.get_status()
+        await pipeline.stop()
+        return status
+
+    status = asyncio.run(run())
+    assert store.calls == [["Jira Agent"]] * 3
+    assert status["upserted"] == 1
+    assert status["failed"] == 2
+    assert status["retries"] == 2
+    assert status["retry_attempts"] == 0
+    assert status["pending_upserts"] == 0